@@ -0,0 +1,1114 @@
+#Adapter_Executor.py
+#
+#NAME
+#
+#        Adapter_Executor - runs the chatbot's logic adapters side by side on a worker
+#                           pool, each within its own time budget, or one at a time
+#                           cheapest first stopping at the first confident answer,
+#                           and keeps count of what every adapter costs and
+#                           contributes.
+#
+#SYNOPSIS
+#
+#        Adapter_Executor.py
+#
+#            concurrent.futures    --> standard python library, the worker pool the
+#                                      adapters run on
+#
+#            contextvars           --> standard python library, each adapter runs in a
+#                                      copy of the caller's context so prefetched
+#                                      candidates (see Statement_Index) reach it
+#
+#            threading             --> standard python library, guards the counters
+#
+#            time                  --> standard python library, budgets and latency
+#
+#            re                    --> standard python library, splits the input into
+#                                      words for the gates
+#
+#            itertools, logging    --> standard python libraries, numbers the adapters
+#                                      in flight and logs the concurrency check
+#
+#            ADAPTER_COSTS         --> order the adapters are tried in pipeline mode
+#
+#            ADAPTER_GATES         --> quick checks an input must pass before an adapter
+#                                      is run in pipeline mode
+#
+#            SharedSearch          --> lets adapters using the same search algorithm
+#                                      share one scan per input
+#
+#            AdapterExecutor       --> replacement for the chatbot's generate_response()
+#
+#            CheckConcurrency      --> runs many messages at once through simulated
+#                                      adapters
+#
+#DESCRIPTION
+#
+#        chatterbot's generate_response() asks MathematicalEvaluation, BestMatch,
+#        TimeLogicAdapter and the second BestMatch for an answer one after another, so
+#        every message waits for the sum of them. The executor submits every adapter
+#        to a worker pool at once and collects the answers in adapter order, giving
+#        each adapter until its own budget (counted from when the message arrived)
+#        runs out. An adapter still running at that point, or one that raises, is
+#        left out of the vote and logged. If no adapter answers in time the default
+#        response is used. A running adapter cannot be stopped, so one that overran
+#        keeps its worker busy until it finishes. An adapter that was still queued
+#        when its budget ran out is not run at all, and once as many adapters
+#        have overrun as there are workers, new adapters are shed instead of being
+#        queued behind them, so one slow message cannot make the next ones time
+#        out in turn. Adapters that are queued or running within their budget
+#        never count towards shedding, they only wait for a worker. A response that is missing an adapter for any of these reasons, or
+#        that fell back on the default response, is marked degraded so the
+#        response cache does not keep it. The answers that did arrive are chosen between exactly as
+#        chatterbot does, highest confidence first and a majority of three or more
+#        adapters agreeing over that. The adapters are mostly python code, so they
+#        overlap where they wait on sqlite or numpy rather than in pure python work,
+#        which is where BestMatch spends its time. Every run is logged on the
+#        chatbot's logger with its latency and confidence, and Stats() totals them per
+#        adapter along with how often each adapter's answer was the one chosen.
+#
+#        In pipeline mode the adapters are run one at a time in order of
+#        ADAPTER_COSTS instead. An adapter with a gate in ADAPTER_GATES is only run
+#        when the input passes it, so MathematicalEvaluation is not asked about input
+#        without a number in it and TimeLogicAdapter is not asked about input without
+#        a time word. The first answer at or above a_StopConfidence is used straight
+#        away and the remaining adapters are not run. Otherwise every answer is
+#        chosen between as above. The two BestMatch adapters share one search
+#        algorithm and differ only in their thresholds and default response, so in
+#        pipeline mode the candidate scan is run once per message and replayed to
+#        the second of them. Side by side they only share it when the first scan
+#        finishes before the second starts.
+#
+#RETURNS
+#
+#        When run directly runs CheckConcurrency(). Otherwise does not return
+#        anything, provides AttachAdapterExecutor() for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:50am 10/17/2026                                                          #
+
+import concurrent.futures
+import contextvars
+import threading
+import time
+import re
+import itertools
+import logging
+
+#Adapter_Executor::ADAPTER_COSTS Adapter_Executor::ADAPTER_COSTS
+#
+#NAME
+#
+#        Adapter_Executor::ADAPTER_COSTS - rough relative cost of each adapter class,
+#                                          cheapest tried first in pipeline mode.
+#                                          Classes not listed cost DEFAULT_ADAPTER_COST
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+ADAPTER_COSTS = {'MathematicalEvaluation': 1, 
+                 'TimeLogicAdapter': 2, 
+                 'BestMatch': 10}
+
+DEFAULT_ADAPTER_COST = 5
+
+#Adapter_Executor::ADAPTER_COSTS
+
+#Adapter_Executor::NUMBER_WORDS Adapter_Executor::NUMBER_WORDS
+#
+#NAME
+#
+#        Adapter_Executor::NUMBER_WORDS - words mathparse reads as numbers. Without a
+#                                         digit or one of these there is nothing for
+#                                         MathematicalEvaluation to evaluate
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+NUMBER_WORDS = {'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 
+                'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 
+                'seventeen', 'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty', 
+                'sixty', 'seventy', 'eighty', 'ninety', 'hundred', 'thousand', 'million', 
+                'billion', 'trillion'}
+
+#Adapter_Executor::NUMBER_WORDS
+
+#Adapter_Executor::TIME_WORDS Adapter_Executor::TIME_WORDS
+#
+#NAME
+#
+#        Adapter_Executor::TIME_WORDS - words one of TimeLogicAdapter's questions
+#                                       needs, every question it is trained to
+#                                       answer asks for the "time"
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+TIME_WORDS = {'time', 'clock', "o'clock", 'oclock', 'hour'}
+
+#Adapter_Executor::TIME_WORDS
+
+#Adapter_Executor::HasNumber(a_Text) Adapter_Executor::HasNumber(a_Text)
+#
+#NAME
+#
+#        Adapter_Executor::HasNumber - gate for MathematicalEvaluation
+#
+#SYNOPSIS
+#
+#        bool Adapter_Executor::HasNumber(a_Text)
+#
+#            a_Text           --> input text
+#
+#RETURNS
+#
+#        Returns True if the text has a digit or a number word in it.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+def HasNumber(a_Text):
+
+    if any(character.isdigit() for character in a_Text):
+
+        return True
+
+    return not NUMBER_WORDS.isdisjoint(re.findall(r"[a-z']+", a_Text.lower()))
+
+#Adapter_Executor::HasNumber(a_Text)
+
+#Adapter_Executor::HasTimeWord(a_Text) Adapter_Executor::HasTimeWord(a_Text)
+#
+#NAME
+#
+#        Adapter_Executor::HasTimeWord - gate for TimeLogicAdapter
+#
+#SYNOPSIS
+#
+#        bool Adapter_Executor::HasTimeWord(a_Text)
+#
+#            a_Text           --> input text
+#
+#RETURNS
+#
+#        Returns True if the text has one of TIME_WORDS in it.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+def HasTimeWord(a_Text):
+
+    return not TIME_WORDS.isdisjoint(re.findall(r"[a-z']+", a_Text.lower()))
+
+#Adapter_Executor::HasTimeWord(a_Text)
+
+#Adapter_Executor::ADAPTER_GATES Adapter_Executor::ADAPTER_GATES
+#
+#NAME
+#
+#        Adapter_Executor::ADAPTER_GATES - dictionary of adapter class to the check an
+#                                          input must pass for the adapter to be run
+#                                          in pipeline mode
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+ADAPTER_GATES = {'MathematicalEvaluation': HasNumber, 
+                 'TimeLogicAdapter': HasTimeWord}
+
+#Adapter_Executor::ADAPTER_GATES
+
+#Adapter_Executor::SharedSearch Adapter_Executor::SharedSearch
+#
+#NAME
+#
+#        Adapter_Executor::SharedSearch - search algorithm wrapper replaying a scan to
+#                                         every adapter that asks for the same input
+#
+#SYNOPSIS
+#
+#        obj Adapter_Executor::SharedSearch(a_Search)
+#
+#            a_Search         --> search algorithm being shared
+#
+#            scans            --> ContextVar holding the dictionary of input to
+#                                 finished scan for the message being answered, None
+#                                 outside of Share()
+#
+#            run, shared      --> counters of scans run and scans replayed
+#
+#DESCRIPTION
+#
+#        Every adapter using a_Search is given the same SharedSearch. Outside of a
+#        Share() block it passes straight through to a_Search. Inside one the first
+#        search for an input is run in full and kept, and later searches for it in
+#        the same block replay the kept results, which is what the BestMatch loop
+#        would have read off the generator.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see search().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:25am 10/17/2026                                                          #
+
+class SharedSearch:
+
+    def __init__(self, a_Search):
+
+        self.searchAlgorithm = a_Search
+        self.name = a_Search.name
+
+        self.scans = contextvars.ContextVar('scans', default = None)
+        self.lock = threading.Lock()
+
+        self.run = 0
+        self.shared = 0
+
+    #SharedSearch::Share()
+    #
+    #DESCRIPTION
+    #
+    #        Starts keeping scans for the current message.
+    #
+    #RETURNS
+    #
+    #        Returns the token Unshare() needs.
+
+    def Share(self):
+
+        return self.scans.set({})
+
+    #SharedSearch::Unshare(a_Token)
+    #
+    #DESCRIPTION
+    #
+    #        Drops the scans kept since Share().
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Unshare(self, a_Token):
+
+        self.scans.reset(a_Token)
+
+    #SharedSearch::search(input_statement, **additional_parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Named and shaped like chatterbot's search algorithms so the adapters
+    #        call it unchanged.
+    #
+    #RETURNS
+    #
+    #        Returns an iterator of ever closer matching statements.
+
+    def search(self, input_statement, **additional_parameters):
+
+        scans = self.scans.get()
+
+        if scans is None:
+
+            return self.searchAlgorithm.search(input_statement, **additional_parameters)
+
+        key = (input_statement.text, tuple(sorted(additional_parameters.items())))
+
+        if key in scans:
+
+            with self.lock:
+
+                self.shared += 1
+
+            return iter(scans[key])
+
+        scans[key] = list(self.searchAlgorithm.search(input_statement, **additional_parameters))
+
+        with self.lock:
+
+            self.run += 1
+
+        return iter(scans[key])
+
+#Adapter_Executor::SharedSearch
+
+#Adapter_Executor::AdapterExecutor Adapter_Executor::AdapterExecutor
+#
+#NAME
+#
+#        Adapter_Executor::AdapterExecutor - parallel, time boxed generate_response()
+#
+#SYNOPSIS
+#
+#        obj Adapter_Executor::AdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget, a_Workers,
+#                                              a_Pipeline, a_StopConfidence)
+#
+#            a_ChatBot        --> chatbot whose logic adapters are run
+#
+#            a_Budgets        --> dictionary of adapter label ("1:BestMatch") or class
+#                                 name ("BestMatch") to seconds it may take
+#
+#            a_DefaultBudget  --> seconds for adapters not in a_Budgets
+#
+#            a_Workers        --> worker threads, by default two per adapter so an
+#                                 adapter that overran its budget does not hold up
+#                                 the next message
+#
+#            pending          --> dictionary of every adapter submitted to the pool
+#                                 and not yet finished to its deadline, the ones
+#                                 past it have overrun
+#
+#            a_Pipeline       --> True to run the adapters one at a time, cheapest
+#                                 first, instead of side by side
+#
+#            a_StopConfidence --> in pipeline mode an answer at or above this
+#                                 confidence is used without running the rest
+#
+#            order            --> adapter positions in the order pipeline mode tries
+#                                 them
+#
+#            searches         --> the SharedSearch of every search algorithm in use
+#
+#            labels           --> position and class name of every adapter, so the two
+#                                 BestMatch adapters are counted apart
+#
+#            counters         --> one dictionary of counters per adapter for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see
+#        GenerateResponse().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:50am 10/17/2026                                                          #
+
+class AdapterExecutor:
+
+    def __init__(self, a_ChatBot, a_Budgets = None, a_DefaultBudget = 1.0, a_Workers = None, a_Pipeline = False, a_StopConfidence = 0.95):
+
+        self.chatbot = a_ChatBot
+        self.adapters = list(a_ChatBot.logic_adapters)
+        self.budgets = dict(a_Budgets or {})
+        self.defaultBudget = a_DefaultBudget
+        self.pipeline = a_Pipeline
+        self.stopConfidence = a_StopConfidence
+
+        self.labels = [str(position) + ":" + adapter.class_name for position, adapter in enumerate(self.adapters)]
+
+        self.workers = a_Workers or 2 * len(self.adapters)
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = "LogicAdapter")
+        self.pending = {}
+        self.numbers = itertools.count()
+
+        self.lock = threading.Lock()
+        self.counters = [{'runs': 0, 'skipped': 0, 'gated': 0, 'timeouts': 0, 'errors': 0, 'shed': 0, 'selected': 0, 'seconds': 0.0, 'confidence': 0.0} for adapter in self.adapters]
+        self.earlyExits = 0
+
+        #stable sort, so adapters of the same cost keep their configured order
+        self.order = sorted(range(len(self.adapters)), key = lambda position: ADAPTER_COSTS.get(self.adapters[position].class_name, DEFAULT_ADAPTER_COST))
+
+        self.searches = {}
+
+        for adapter in self.adapters:
+
+            searchAlgorithm = getattr(adapter, 'search_algorithm', None)
+
+            if searchAlgorithm is None:
+
+                continue
+
+            if id(searchAlgorithm) not in self.searches:
+
+                self.searches[id(searchAlgorithm)] = SharedSearch(searchAlgorithm)
+
+            adapter.search_algorithm = self.searches[id(searchAlgorithm)]
+
+    #AdapterExecutor::Budget(a_Position)
+    #
+    #DESCRIPTION
+    #
+    #        Looks up an adapter's budget by label, then by class name.
+    #
+    #RETURNS
+    #
+    #        Returns the budget in seconds.
+
+    def Budget(self, a_Position):
+
+        label = self.labels[a_Position]
+
+        return self.budgets.get(label, self.budgets.get(self.adapters[a_Position].class_name, self.defaultBudget))
+
+    #AdapterExecutor::RunAdapter(a_Adapter, a_Statement, a_Parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Runs one adapter on a worker thread.
+    #
+    #RETURNS
+    #
+    #        Returns (response or None if the adapter cannot process the statement,
+    #        seconds taken).
+
+    def RunAdapter(self, a_Adapter, a_Statement, a_Parameters):
+
+        started = time.monotonic()
+
+        if not a_Adapter.can_process(a_Statement):
+
+            return None, time.monotonic() - started
+
+        output = a_Adapter.process(a_Statement, a_Parameters)
+
+        return output, time.monotonic() - started
+
+    #AdapterExecutor::Submit(a_Adapter, a_Statement, a_Parameters, a_Deadline)
+    #
+    #DESCRIPTION
+    #
+    #        Queues RunPooled() on the pool in a copy of the caller's context,
+    #        unless as many adapters as there are workers are still running past
+    #        their deadlines. Adapters within their budget only make it wait.
+    #
+    #RETURNS
+    #
+    #        Returns the future, or None if the adapter was shed.
+
+    def Submit(self, a_Adapter, a_Statement, a_Parameters, a_Deadline):
+
+        with self.lock:
+
+            now = time.monotonic()
+
+            if sum(1 for deadline in self.pending.values() if deadline <= now) >= self.workers:
+
+                return None
+
+            number = next(self.numbers)
+            self.pending[number] = a_Deadline
+
+        return self.pool.submit(contextvars.copy_context().run, self.RunPooled, number, a_Adapter, a_Statement, a_Parameters, a_Deadline)
+
+    #AdapterExecutor::RunPooled(a_Number, a_Adapter, a_Statement, a_Parameters, a_Deadline)
+    #
+    #DESCRIPTION
+    #
+    #        Runs one adapter on a worker thread unless its deadline passed while it
+    #        was queued, and removes it from pending either way.
+    #
+    #RETURNS
+    #
+    #        Returns what RunAdapter() returns, raises TimeoutError for an adapter
+    #        that was not run.
+
+    def RunPooled(self, a_Number, a_Adapter, a_Statement, a_Parameters, a_Deadline):
+
+        try:
+
+            if time.monotonic() >= a_Deadline:
+
+                raise concurrent.futures.TimeoutError()
+
+            return self.RunAdapter(a_Adapter, a_Statement, a_Parameters)
+
+        finally:
+
+            with self.lock:
+
+                del self.pending[a_Number]
+
+    #AdapterExecutor::Count(a_Position, a_Counter, a_Seconds, a_Confidence)
+    #
+    #DESCRIPTION
+    #
+    #        Adds to an adapter's counters.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Count(self, a_Position, a_Counter, a_Seconds = 0.0, a_Confidence = 0.0):
+
+        with self.lock:
+
+            counters = self.counters[a_Position]
+            counters[a_Counter] += 1
+            counters['seconds'] += a_Seconds
+            counters['confidence'] += a_Confidence
+
+    #AdapterExecutor::GenerateResponse(input_statement, additional_response_selection_parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Drop in replacement for ChatBot.generate_response(), named and shaped
+    #        like it so get_response() calls it unchanged.
+    #
+    #RETURNS
+    #
+    #        Returns the response statement with its confidence set, and degraded
+    #        set to True if an adapter timed out, failed or was shed, or no adapter
+    #        answered and the default response was used.
+
+    def GenerateResponse(self, input_statement, additional_response_selection_parameters = None):
+
+        logger = self.chatbot.logger
+
+        tokens = [(search, search.Share()) for search in self.searches.values()]
+
+        try:
+
+            if self.pipeline:
+
+                results, complete = self.PipelineResults(input_statement, additional_response_selection_parameters)
+
+            else:
+
+                results, complete = self.ParallelResults(input_statement, additional_response_selection_parameters)
+
+        finally:
+
+            for search, token in tokens:
+
+                search.Unshare(token)
+
+        if results:
+
+            position, result = self.SelectResult(results)
+
+            self.Count(position, 'selected')
+
+        else:
+
+            result = self.DefaultResponse(input_statement)
+            complete = False
+
+            logger.info('No adapter answered within its budget, using the default response')
+
+        Statement = self.chatbot.storage.get_object('statement')
+
+        response = Statement(text = result.text,
+                             in_response_to = input_statement.text,
+                             conversation = input_statement.conversation,
+                             persona = 'bot:' + self.chatbot.name)
+
+        response.confidence = result.confidence
+        response.degraded = not complete
+
+        return response
+
+    #AdapterExecutor::ParallelResults(a_Statement, a_Parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Runs every adapter at once on the pool, each in its own copy of the
+    #        context, and waits for each until its budget runs out.
+    #
+    #RETURNS
+    #
+    #        Returns a list of (adapter position, response) in adapter order, and
+    #        False if any adapter timed out, failed or was shed, otherwise True.
+
+    def ParallelResults(self, a_Statement, a_Parameters):
+
+        logger = self.chatbot.logger
+        started = time.monotonic()
+
+        futures = [self.Submit(adapter, a_Statement, a_Parameters, started + self.Budget(position))
+                   for position, adapter in enumerate(self.adapters)]
+
+        results = []
+        complete = True
+
+        for position, future in enumerate(futures):
+
+            label = self.labels[position]
+            deadline = started + self.Budget(position)
+
+            if future is None:
+
+                self.Count(position, 'shed')
+                complete = False
+
+                logger.info('{} shed, every worker is held by an adapter that overran'.format(label))
+
+                continue
+
+            try:
+
+                output, seconds = future.result(timeout = max(0.0, deadline - time.monotonic()))
+
+            except concurrent.futures.TimeoutError:
+
+                future.cancel()
+                self.Count(position, 'timeouts', self.Budget(position))
+                complete = False
+
+                logger.info('{} dropped after its {:.0f}ms budget'.format(label, self.Budget(position) * 1000))
+
+                continue
+
+            except Exception as e:
+
+                self.Count(position, 'errors')
+                complete = False
+
+                logger.warning('{} failed: {}'.format(label, e))
+
+                continue
+
+            if output is None:
+
+                self.Count(position, 'skipped', seconds)
+
+                logger.info('{} skipped in {:.1f}ms'.format(label, seconds * 1000))
+
+                continue
+
+            self.Count(position, 'runs', seconds, output.confidence)
+            results.append((position, output))
+
+            logger.info('{} selected "{}" in {:.1f}ms with a confidence of {}'.format(label, output.text, seconds * 1000, output.confidence))
+
+        return results, complete
+
+    #AdapterExecutor::PipelineResults(a_Statement, a_Parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Runs the adapters one at a time on the calling thread, cheapest first,
+    #        skipping those whose gate the input fails or whose budget has already
+    #        run out, and stopping at the first answer at or above a_StopConfidence.
+    #        Running on the calling thread keeps the scans shared, since they live
+    #        in its context.
+    #
+    #RETURNS
+    #
+    #        Returns a list of (adapter position, response) in adapter order, just
+    #        the confident answer if there was one, and False if an adapter was
+    #        not run for lack of budget or failed before that answer, otherwise True.
+
+    def PipelineResults(self, a_Statement, a_Parameters):
+
+        logger = self.chatbot.logger
+        started = time.monotonic()
+
+        results = []
+        complete = True
+
+        for position in self.order:
+
+            adapter = self.adapters[position]
+            label = self.labels[position]
+            gate = ADAPTER_GATES.get(adapter.class_name)
+
+            if gate is not None and not gate(a_Statement.text):
+
+                self.Count(position, 'gated')
+
+                logger.info('{} gated out'.format(label))
+
+                continue
+
+            if time.monotonic() - started >= self.Budget(position):
+
+                self.Count(position, 'timeouts')
+                complete = False
+
+                logger.info('{} not run, its {:.0f}ms budget ran out waiting its turn'.format(label, self.Budget(position) * 1000))
+
+                continue
+
+            try:
+
+                output, seconds = self.RunAdapter(adapter, a_Statement, a_Parameters)
+
+            except Exception as e:
+
+                self.Count(position, 'errors')
+                complete = False
+
+                logger.warning('{} failed: {}'.format(label, e))
+
+                continue
+
+            if output is None:
+
+                self.Count(position, 'skipped', seconds)
+
+                logger.info('{} skipped in {:.1f}ms'.format(label, seconds * 1000))
+
+                continue
+
+            self.Count(position, 'runs', seconds, output.confidence)
+
+            logger.info('{} selected "{}" in {:.1f}ms with a confidence of {}'.format(label, output.text, seconds * 1000, output.confidence))
+
+            if output.confidence >= self.stopConfidence:
+
+                with self.lock:
+
+                    self.earlyExits += 1
+
+                return [(position, output)], complete
+
+            results.append((position, output))
+
+        return sorted(results, key = lambda result: result[0]), complete
+
+    #AdapterExecutor::SelectResult(a_Results)
+    #
+    #DESCRIPTION
+    #
+    #        Chooses between the answers the same way chatterbot does. The highest
+    #        confidence wins, earliest adapter first on a tie, unless three or more
+    #        answers came back and more than one of them agree, in which case the most
+    #        agreed upon answer wins at its best confidence.
+    #
+    #RETURNS
+    #
+    #        Returns (adapter position, response) of the chosen answer.
+
+    def SelectResult(self, a_Results):
+
+        best = a_Results[0]
+
+        for position, output in a_Results:
+
+            if output.confidence > best[1].confidence:
+
+                best = (position, output)
+
+        if len(a_Results) < 3:
+
+            return best
+
+        options = {}
+
+        for position, output in a_Results:
+
+            key = output.text + ':' + (output.in_response_to or '')
+
+            if key in options:
+
+                options[key][0] += 1
+
+                if options[key][2].confidence < output.confidence:
+
+                    options[key][1:] = [position, output]
+
+            else:
+
+                options[key] = [1, position, output]
+
+        mostCommon = list(options.values())[0]
+
+        for option in options.values():
+
+            if option[0] > mostCommon[0]:
+
+                mostCommon = option
+
+        if mostCommon[0] > 1:
+
+            return mostCommon[1], mostCommon[2]
+
+        return best
+
+    #AdapterExecutor::DefaultResponse(a_Statement)
+    #
+    #DESCRIPTION
+    #
+    #        Falls back on the first adapter that was configured with a default
+    #        response, or the first adapter's random response if none was.
+    #
+    #RETURNS
+    #
+    #        Returns a response statement with a confidence of 0.
+
+    def DefaultResponse(self, a_Statement):
+
+        for adapter in self.adapters:
+
+            if adapter.default_responses:
+
+                return adapter.get_default_response(a_Statement)
+
+        return self.adapters[0].get_default_response(a_Statement)
+
+    #AdapterExecutor::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the per adapter counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of adapter label to its runs, skips, gated
+    #        skips, timeouts, errors, times shed, times chosen, budget, average latency in
+    #        milliseconds and average confidence, plus the pipeline settings,
+    #        early exits, and scans run and shared.
+
+    def Stats(self):
+
+        stats = {}
+
+        with self.lock:
+
+            for position, counters in enumerate(self.counters):
+
+                calls = max(counters['runs'] + counters['skipped'] + counters['timeouts'], 1)
+
+                stats[self.labels[position]] = {'runs': counters['runs'],
+                                                'skipped': counters['skipped'],
+                                                'gated': counters['gated'],
+                                                'timeouts': counters['timeouts'],
+                                                'errors': counters['errors'],
+                                                'shed': counters['shed'],
+                                                'selected': counters['selected'],
+                                                'budget_ms': 1000 * self.Budget(position),
+                                                'average_ms': 1000 * counters['seconds'] / calls,
+                                                'average_confidence': counters['confidence'] / max(counters['runs'], 1)}
+
+            stats['pipeline'] = {'enabled': self.pipeline,
+                                 'stop_confidence': self.stopConfidence,
+                                 'early_exits': self.earlyExits,
+                                 'scans_run': sum(search.run for search in self.searches.values()),
+                                 'scans_shared': sum(search.shared for search in self.searches.values())}
+
+        return stats
+
+#Adapter_Executor::AdapterExecutor
+
+#Adapter_Executor::AttachAdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget, a_Pipeline, a_StopConfidence) Adapter_Executor::AttachAdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget, a_Pipeline, a_StopConfidence)
+#
+#NAME
+#
+#        Adapter_Executor::AttachAdapterExecutor - switches a chatbot over to parallel
+#                                                  adapter evaluation
+#
+#SYNOPSIS
+#
+#        obj Adapter_Executor::AttachAdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget,
+#                                                    a_Pipeline, a_StopConfidence)
+#
+#            a_ChatBot        --> chatbot object to switch over
+#
+#            a_Budgets, a_DefaultBudget
+#                             --> adapter time budgets, see AdapterExecutor
+#
+#            a_Pipeline, a_StopConfidence
+#                             --> pipeline mode and its early exit, see AdapterExecutor
+#
+#DESCRIPTION
+#
+#        Replaces generate_response() on this one chatbot object, so get_response()
+#        and everything built on it (the response cache, the batcher) use the
+#        executor without any other change.
+#
+#RETURNS
+#
+#        Returns the AdapterExecutor that was attached.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:50am 10/17/2026                                                          #
+
+def AttachAdapterExecutor(a_ChatBot, a_Budgets = None, a_DefaultBudget = 1.0, a_Pipeline = False, a_StopConfidence = 0.95):
+
+    executor = AdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget, a_Pipeline = a_Pipeline, a_StopConfidence = a_StopConfidence)
+
+    a_ChatBot.generate_response = executor.GenerateResponse
+
+    return executor
+
+#Adapter_Executor::AttachAdapterExecutor(a_ChatBot, a_Budgets, a_DefaultBudget, a_Pipeline, a_StopConfidence)
+
+#Adapter_Executor::CheckConcurrency(a_Messages, a_Seconds) Adapter_Executor::CheckConcurrency(a_Messages, a_Seconds)
+#
+#NAME
+#
+#        Adapter_Executor::CheckConcurrency - answers many messages at once with
+#                                             simulated adapters and checks what is
+#                                             shed
+#
+#SYNOPSIS
+#
+#        void Adapter_Executor::CheckConcurrency(a_Messages, a_Seconds)
+#
+#            a_Messages       --> messages answered at the same time, more adapters
+#                                 than the pool has workers
+#
+#            a_Seconds        --> time each simulated adapter takes
+#
+#DESCRIPTION
+#
+#        Four adapters each taking a_Seconds, well inside their one second budget,
+#        are asked about a_Messages messages at once, which queues far more
+#        adapters than the pool has workers. None of the answers may be degraded,
+#        as nothing overran. Then an adapter that always overruns its budget is
+#        asked one message after another on a pool of two workers, and the third
+#        message has to be shed while the first two still hold both workers.
+#
+#RETURNS
+#
+#        Prints the time taken and the counters, raises AssertionError if anything
+#        was shed or degraded that should not have been.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:10pm 10/17/2026                                                          #
+
+def CheckConcurrency(a_Messages = 8, a_Seconds = 0.05):
+
+    class SimulatedStatement:
+
+        def __init__(self, text, in_response_to = None, conversation = None, persona = None, confidence = 0.0):
+
+            self.text = text
+            self.in_response_to = in_response_to
+            self.conversation = conversation
+            self.persona = persona
+            self.confidence = confidence
+
+    class SimulatedAdapter:
+
+        def __init__(self, a_Name, a_Seconds, a_Confidence):
+
+            self.class_name = a_Name
+            self.seconds = a_Seconds
+            self.confidence = a_Confidence
+            self.default_responses = []
+
+        def can_process(self, a_Statement):
+
+            return True
+
+        def process(self, a_Statement, a_Parameters = None):
+
+            time.sleep(self.seconds)
+
+            return SimulatedStatement(self.class_name + " answers " + a_Statement.text, confidence = self.confidence)
+
+        def get_default_response(self, a_Statement):
+
+            return SimulatedStatement("I do not understand.")
+
+    class SimulatedStorage:
+
+        def get_object(self, a_Name):
+
+            return SimulatedStatement
+
+    class SimulatedChatBot:
+
+        def __init__(self, a_Adapters):
+
+            self.name = "Simulated"
+            self.logic_adapters = a_Adapters
+            self.logger = logging.getLogger("Adapter_Executor")
+            self.storage = SimulatedStorage()
+
+    adapters = [SimulatedAdapter("Adapter" + str(number), a_Seconds, 0.1 * (number + 1)) for number in range(4)]
+    executor = AdapterExecutor(SimulatedChatBot(adapters), a_DefaultBudget = 1.0)
+
+    start = threading.Barrier(a_Messages)
+    degraded = []
+
+    def Message(a_Number):
+
+        start.wait()
+
+        response = executor.GenerateResponse(SimulatedStatement("message " + str(a_Number)))
+
+        if response.degraded:
+
+            degraded.append(a_Number)
+
+    messages = [threading.Thread(target = Message, args = (number,)) for number in range(a_Messages)]
+
+    started = time.perf_counter()
+
+    for message in messages:
+
+        message.start()
+
+    for message in messages:
+
+        message.join()
+
+    shed = sum(counters['shed'] for counters in executor.counters)
+
+    print(a_Messages, "messages,", a_Messages * len(adapters), "adapters on", executor.workers, "workers in", round(time.perf_counter() - started, 3), "s,", len(degraded), "degraded,", shed, "shed")
+
+    assert not degraded and shed == 0
+
+    overrunning = AdapterExecutor(SimulatedChatBot([SimulatedAdapter("Overrunning", 10 * a_Seconds, 0.5)]), a_DefaultBudget = a_Seconds, a_Workers = 2)
+
+    responses = [overrunning.GenerateResponse(SimulatedStatement("message " + str(number))) for number in range(3)]
+
+    print("overrunning adapter on 2 workers:", overrunning.Stats()['0:Overrunning'])
+
+    assert all(response.degraded for response in responses) and overrunning.counters[0]['timeouts'] == 2 and overrunning.counters[0]['shed'] == 1
+
+#Adapter_Executor::CheckConcurrency(a_Messages, a_Seconds)
+
+
+#Checks that adapters within their budget are never shed however many messages arrive at once
+if __name__ == "__main__":
+
+    CheckConcurrency()
+
+#Adapter_Executor.py
@@ -0,0 +1,504 @@
+#Admission_Control.py
+#
+#NAME
+#
+#        Admission_Control - limits how much work the flask server takes on at once,
+#                            per class of request and per client, and turns the rest
+#                            away quickly with a time to retry.
+#
+#SYNOPSIS
+#
+#        Admission_Control.py
+#
+#            threading             --> standard python library, the condition each class's
+#                                      slots are guarded by
+#
+#            contextlib            --> standard python library, Admit() is a with block
+#
+#            math                  --> standard python library, rounds Retry-After up to
+#                                      whole seconds
+#
+#            time                  --> standard python library, wait timeouts, service
+#                                      times and token refills
+#
+#            Response_Cache        --> LRUCache holding the per client token buckets, so
+#                                      they are bounded like the sessions themselves
+#
+#            AdmissionRejected     --> raised when a request is turned away
+#
+#            ClassLimit            --> in flight limit and bounded wait queue of one class
+#
+#            TokenBucket           --> rate limit of one client
+#
+#            AdmissionController   --> the limits of every class plus the client buckets
+#
+#DESCRIPTION
+#
+#        GetBotResponse() accepted every request, so a burst of chatbot queries or
+#        wikipedia lookups queued behind each other without bound and even "what time
+#        is it" waited behind them for a server thread. Requests are now sorted by the
+#        cost class of their intent (see Intent_Router::INTENT_TABLE) and each class
+#        has its own number of requests allowed in flight, so heavy classes can be
+#        saturated while cheap ones keep their own slots. A request finding its class
+#        full waits in a short bounded queue. If that queue is full too, or the wait
+#        runs past a_WaitTimeout, the request is rejected straight away and told how
+#        long to wait before retrying, estimated from the class's recent service time.
+#        Each client also has a token bucket, so one client sending faster than
+#        a_Rate requests a second (after a burst of a_Burst) is turned away before it
+#        can use up a class's slots.
+#
+#RETURNS
+#
+#        Does not return anything, provides the AdmissionController for the other files
+#        to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+import threading
+import contextlib
+import math
+import time
+from Response_Cache import LRUCache
+
+#Admission_Control::AdmissionRejected Admission_Control::AdmissionRejected
+#
+#NAME
+#
+#        Admission_Control::AdmissionRejected - a request was turned away
+#
+#SYNOPSIS
+#
+#        obj Admission_Control::AdmissionRejected(a_Reason, a_RetryAfter)
+#
+#            reason           --> "rate" for a client over its rate limit, "queue" for a
+#                                 class whose wait queue is full, "timeout" for a wait
+#                                 that ran out
+#
+#            retryAfter       --> whole seconds the client should wait before retrying
+#
+#RETURNS
+#
+#        Since this is an exception it does not return anything itself.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+class AdmissionRejected(Exception):
+
+    def __init__(self, a_Reason, a_RetryAfter):
+
+        Exception.__init__(self, a_Reason + ", retry after " + str(a_RetryAfter) + "s")
+
+        self.reason = a_Reason
+        self.retryAfter = a_RetryAfter
+
+#Admission_Control::AdmissionRejected
+
+#Admission_Control::ClassLimit Admission_Control::ClassLimit
+#
+#NAME
+#
+#        Admission_Control::ClassLimit - in flight slots and wait queue of one cost class
+#
+#SYNOPSIS
+#
+#        obj Admission_Control::ClassLimit(a_MaxInFlight, a_MaxWaiting, a_WaitTimeout)
+#
+#            a_MaxInFlight    --> requests of the class allowed to run at once
+#
+#            a_MaxWaiting     --> requests allowed to wait for a slot, 0 rejects as soon
+#                                 as the slots are full
+#
+#            a_WaitTimeout    --> longest time in seconds a request waits for a slot
+#
+#            serviceTime      --> moving average of how long a request of the class
+#                                 holds its slot, used to estimate Retry-After
+#
+#            admitted, rejected, timeouts
+#                             --> counters for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Acquire().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+class ClassLimit:
+
+    def __init__(self, a_MaxInFlight, a_MaxWaiting, a_WaitTimeout = 2.0):
+
+        self.maxInFlight = a_MaxInFlight
+        self.maxWaiting = a_MaxWaiting
+        self.waitTimeout = a_WaitTimeout
+
+        self.inFlight = 0
+        self.waiting = 0
+        self.serviceTime = 0.1
+
+        self.changed = threading.Condition()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    #ClassLimit::RetryAfter()
+    #
+    #DESCRIPTION
+    #
+    #        Estimates how long until a slot frees up for a new request, from the
+    #        requests ahead of it and the average service time. Called with the
+    #        lock held.
+    #
+    #RETURNS
+    #
+    #        Returns whole seconds, at least 1.
+
+    def RetryAfter(self):
+
+        ahead = (self.waiting + 1) / max(self.maxInFlight, 1)
+
+        return max(1, math.ceil(ahead * self.serviceTime))
+
+    #ClassLimit::Acquire()
+    #
+    #DESCRIPTION
+    #
+    #        Takes a slot, waiting in the queue for one if the class is full.
+    #
+    #RETURNS
+    #
+    #        Returns the monotonic time the slot was taken, raises AdmissionRejected
+    #        if the queue is full or the wait times out.
+
+    def Acquire(self):
+
+        with self.changed:
+
+            if self.inFlight >= self.maxInFlight:
+
+                if self.waiting >= self.maxWaiting:
+
+                    self.rejected += 1
+
+                    raise AdmissionRejected("queue", self.RetryAfter())
+
+                self.waiting += 1
+
+                try:
+
+                    available = self.changed.wait_for(lambda: self.inFlight < self.maxInFlight, self.waitTimeout)
+
+                finally:
+
+                    self.waiting -= 1
+
+                if not available:
+
+                    self.timeouts += 1
+
+                    raise AdmissionRejected("timeout", self.RetryAfter())
+
+            self.inFlight += 1
+            self.admitted += 1
+
+            return time.monotonic()
+
+    #ClassLimit::Release(a_Started)
+    #
+    #DESCRIPTION
+    #
+    #        Frees the slot taken at a_Started, folds its service time into the
+    #        average, and wakes one waiting request.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Release(self, a_Started):
+
+        with self.changed:
+
+            self.inFlight -= 1
+            self.serviceTime = 0.8 * self.serviceTime + 0.2 * (time.monotonic() - a_Started)
+
+            self.changed.notify()
+
+    #ClassLimit::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the class counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the limits, current load, and counters.
+
+    def Stats(self):
+
+        with self.changed:
+
+            return {'max_in_flight': self.maxInFlight,
+                    'max_waiting': self.maxWaiting,
+                    'in_flight': self.inFlight,
+                    'waiting': self.waiting,
+                    'admitted': self.admitted,
+                    'rejected': self.rejected,
+                    'timeouts': self.timeouts,
+                    'service_time_ms': 1000 * self.serviceTime}
+
+#Admission_Control::ClassLimit
+
+#Admission_Control::TokenBucket Admission_Control::TokenBucket
+#
+#NAME
+#
+#        Admission_Control::TokenBucket - request rate limit of one client
+#
+#SYNOPSIS
+#
+#        obj Admission_Control::TokenBucket(a_Rate, a_Burst)
+#
+#            a_Rate           --> tokens added per second
+#
+#            a_Burst          --> most tokens the bucket holds, and what it starts with
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Take().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+class TokenBucket:
+
+    def __init__(self, a_Rate, a_Burst):
+
+        self.rate = a_Rate
+        self.burst = a_Burst
+
+        self.tokens = float(a_Burst)
+        self.refilled = time.monotonic()
+        self.lock = threading.Lock()
+
+    #TokenBucket::Take()
+    #
+    #DESCRIPTION
+    #
+    #        Refills the bucket for the time since the last call and takes a token
+    #        if there is one.
+    #
+    #RETURNS
+    #
+    #        Returns 0 if a token was taken, otherwise the whole seconds until the
+    #        next one.
+
+    def Take(self):
+
+        with self.lock:
+
+            now = time.monotonic()
+
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+            self.refilled = now
+
+            if self.tokens >= 1:
+
+                self.tokens -= 1
+
+                return 0
+
+            return max(1, math.ceil((1 - self.tokens) / self.rate))
+
+#Admission_Control::TokenBucket
+
+#Admission_Control::AdmissionController Admission_Control::AdmissionController
+#
+#NAME
+#
+#        Admission_Control::AdmissionController - admission checks for every request
+#                                                 the flask server answers
+#
+#SYNOPSIS
+#
+#        obj Admission_Control::AdmissionController(a_Limits, a_WaitTimeout, a_Rate,
+#                                                   a_Burst, a_MaxClients)
+#
+#            a_Limits         --> dictionary of cost class to (max in flight, max
+#                                 waiting). Classes not listed are not limited
+#
+#            a_WaitTimeout    --> longest time in seconds a request waits for a slot
+#
+#            a_Rate, a_Burst  --> requests a second each client may make, and how many
+#                                 it may make at once after being idle. a_Rate of 0
+#                                 turns the per client limit off
+#
+#            a_MaxClients     --> most client buckets remembered
+#
+#            classes          --> dictionary of cost class to its ClassLimit
+#
+#            buckets          --> LRUCache of client address to its TokenBucket
+#
+#            rateRejected     --> counter for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Admit().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+class AdmissionController:
+
+    def __init__(self, a_Limits, a_WaitTimeout = 2.0, a_Rate = 5.0, a_Burst = 10, a_MaxClients = 1000):
+
+        self.classes = {cost: ClassLimit(maxInFlight, maxWaiting, a_WaitTimeout) for cost, (maxInFlight, maxWaiting) in a_Limits.items()}
+
+        self.rate = a_Rate
+        self.burst = a_Burst
+
+        self.buckets = LRUCache(a_MaxClients)
+        self.bucketsLock = threading.Lock()
+
+        self.rateRejected = 0
+
+    #AdmissionController::CheckRate(a_Client)
+    #
+    #DESCRIPTION
+    #
+    #        Takes a token from the client's bucket, creating the bucket on its
+    #        first request.
+    #
+    #RETURNS
+    #
+    #        Returns nothing, raises AdmissionRejected if the client is over its rate.
+
+    def CheckRate(self, a_Client):
+
+        if a_Client is None or self.rate <= 0:
+
+            return
+
+        with self.bucketsLock:
+
+            bucket = self.buckets.Get(a_Client)
+
+            if bucket is LRUCache.MISSING:
+
+                bucket = TokenBucket(self.rate, self.burst)
+                self.buckets.Put(a_Client, bucket)
+
+        retryAfter = bucket.Take()
+
+        if retryAfter:
+
+            self.rateRejected += 1
+
+            raise AdmissionRejected("rate", retryAfter)
+
+    #AdmissionController::Admit(a_Cost, a_Client)
+    #
+    #DESCRIPTION
+    #
+    #        With block admitting one request of cost class a_Cost from client
+    #        a_Client (its address, or None to skip the rate limit). The slot is
+    #        held until the block ends.
+    #
+    #RETURNS
+    #
+    #        Yields nothing, raises AdmissionRejected if the request is turned away.
+
+    @contextlib.contextmanager
+    def Admit(self, a_Cost, a_Client = None):
+
+        release = self.Hold(a_Cost, a_Client)
+
+        try:
+
+            yield
+
+        finally:
+
+            release()
+
+    #AdmissionController::Hold(a_Cost, a_Client)
+    #
+    #DESCRIPTION
+    #
+    #        Admits a request like Admit(), for work that outlives the block it
+    #        starts in, such as a streamed response. The slot is held until the
+    #        returned function is called, and calling it again does nothing.
+    #
+    #RETURNS
+    #
+    #        Returns the function releasing the slot, raises AdmissionRejected if
+    #        the request is turned away.
+
+    def Hold(self, a_Cost, a_Client = None):
+
+        self.CheckRate(a_Client)
+
+        limit = self.classes.get(a_Cost)
+
+        if limit is None:
+
+            return lambda: None
+
+        started = limit.Acquire()
+        releasing = threading.Lock()
+
+        def Release():
+
+            if releasing.acquire(False):
+
+                limit.Release(started)
+
+        return Release
+
+    #AdmissionController::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of every class and the rate limit.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of cost class to its Stats(), plus the number of
+    #        requests rejected for rate.
+
+    def Stats(self):
+
+        stats = {cost: limit.Stats() for cost, limit in self.classes.items()}
+        stats['rate_rejected'] = self.rateRejected
+
+        return stats
+
+#Admission_Control::AdmissionController
+
+#Admission_Control.py
@@ -0,0 +1,362 @@
+#Alarm_Scheduler.py
+#
+#NAME
+#
+#        Alarm_Scheduler - single background thread that fires every alarm the Virtual
+#                          Assistant sets, kept in a heap ordered by due time and saved
+#                          to disk so alarms survive a restart.
+#
+#SYNOPSIS
+#
+#        Alarm_Scheduler.py
+#
+#            heapq                 --> standard python library, min heap of (due time, id)
+#                                      so the next alarm is always on top
+#
+#            threading             --> standard python library, the scheduler thread and
+#                                      the condition it sleeps on
+#
+#            json                  --> standard python library, alarm file format
+#
+#            os                    --> standard python library, atomic replace of the
+#                                      alarm file
+#
+#            time                  --> standard python library, wall clock due times
+#
+#            AlarmScheduler        --> thread owning the alarm heap
+#
+#DESCRIPTION
+#
+#        SetAlarm() used to sleep in the calling thread until the alarm was due, which
+#        held a flask request open for hours and raised an error for an hour that had
+#        already passed. Alarms are now records in a heap serviced by one thread that
+#        sleeps until the earliest one is due (or until an alarm is added, canceled or
+#        snoozed), so adding an alarm returns straight away and any number of alarms
+#        cost the same single thread. Canceled and snoozed alarms leave their old heap
+#        entries behind, which are skipped when they reach the top. Every change is
+#        written to the alarm file, and alarms that fell due while the assistant was
+#        not running are fired as soon as it starts again.
+#
+#RETURNS
+#
+#        Does not return anything, provides the AlarmScheduler for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+import heapq
+import threading
+import json
+import os
+import time
+
+#Alarm_Scheduler::AlarmScheduler Alarm_Scheduler::AlarmScheduler
+#
+#NAME
+#
+#        Alarm_Scheduler::AlarmScheduler - daemon thread firing alarms in due time order
+#
+#SYNOPSIS
+#
+#        obj Alarm_Scheduler::AlarmScheduler(a_Path, a_OnFire)
+#
+#            a_Path           --> json file the alarms are saved to, None to keep them
+#                                 in memory only
+#
+#            a_OnFire         --> function called on the scheduler thread with the alarm
+#                                 record (a dictionary of id, due and label) when an
+#                                 alarm goes off
+#
+#            alarms           --> dictionary of alarm id to record for every pending alarm
+#
+#            dueHeap          --> heap of (due time, alarm id), may hold stale entries
+#
+#            lastFired        --> record of the most recent alarm to go off, so it can
+#                                 be snoozed
+#
+#            changed          --> condition the thread sleeps on, notified on every change
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Add(), List(),
+#        Cancel() and Snooze().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+class AlarmScheduler(threading.Thread):
+
+    #longest single sleep, so a change to the system clock is noticed within a minute
+    MAXIMUM_WAIT = 60.0
+
+    def __init__(self, a_Path, a_OnFire):
+
+        threading.Thread.__init__(self, name = "AlarmScheduler", daemon = True)
+
+        self.path = a_Path
+        self.onFire = a_OnFire
+
+        self.alarms = {}
+        self.dueHeap = []
+        self.nextId = 1
+        self.lastFired = None
+
+        self.changed = threading.Condition()
+        self.stopping = False
+
+        self.Load()
+
+    #AlarmScheduler::Load()
+    #
+    #DESCRIPTION
+    #
+    #        Reads the alarm file, if there is one, and rebuilds the heap.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Load(self):
+
+        if self.path is None or not os.path.exists(self.path):
+
+            return
+
+        with open(self.path, 'r', encoding = 'utf-8') as alarmFile:
+
+            saved = json.load(alarmFile)
+
+        for alarm in saved.get('alarms', []):
+
+            self.alarms[alarm['id']] = alarm
+            heapq.heappush(self.dueHeap, (alarm['due'], alarm['id']))
+
+        self.nextId = max([saved.get('next_id', 1)] + [alarm['id'] + 1 for alarm in self.alarms.values()])
+
+    #AlarmScheduler::Save()
+    #
+    #DESCRIPTION
+    #
+    #        Writes every pending alarm to a temporary file, syncs it to disk, and
+    #        swaps it into place, so neither a crash mid write nor a power cut just
+    #        after the swap leaves a half written or empty alarm file. Called with
+    #        the lock held.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Save(self):
+
+        if self.path is None:
+
+            return
+
+        temporaryPath = self.path + '.tmp'
+
+        with open(temporaryPath, 'w', encoding = 'utf-8') as alarmFile:
+
+            json.dump({'next_id': self.nextId, 'alarms': sorted(self.alarms.values(), key = lambda alarm: alarm['due'])}, alarmFile, indent = 1)
+
+            alarmFile.flush()
+            os.fsync(alarmFile.fileno())
+
+        os.replace(temporaryPath, self.path)
+
+    #AlarmScheduler::Schedule(a_Alarm)
+    #
+    #DESCRIPTION
+    #
+    #        Stores the record, pushes its due time, saves, and wakes the thread.
+    #        Called with the lock held.
+    #
+    #RETURNS
+    #
+    #        Returns the alarm record.
+
+    def Schedule(self, a_Alarm):
+
+        self.alarms[a_Alarm['id']] = a_Alarm
+        heapq.heappush(self.dueHeap, (a_Alarm['due'], a_Alarm['id']))
+
+        self.Save()
+        self.changed.notify()
+
+        return a_Alarm
+
+    #AlarmScheduler::Add(a_Due, a_Label)
+    #
+    #DESCRIPTION
+    #
+    #        Adds an alarm going off at a_Due, seconds since the epoch.
+    #
+    #RETURNS
+    #
+    #        Returns the new alarm record.
+
+    def Add(self, a_Due, a_Label):
+
+        with self.changed:
+
+            alarm = {'id': self.nextId, 'due': float(a_Due), 'label': a_Label}
+            self.nextId += 1
+
+            return self.Schedule(alarm)
+
+    #AlarmScheduler::List()
+    #
+    #DESCRIPTION
+    #
+    #        Copies every pending alarm.
+    #
+    #RETURNS
+    #
+    #        Returns a list of alarm records, soonest first.
+
+    def List(self):
+
+        with self.changed:
+
+            return sorted((dict(alarm) for alarm in self.alarms.values()), key = lambda alarm: alarm['due'])
+
+    #AlarmScheduler::Cancel(a_Id)
+    #
+    #DESCRIPTION
+    #
+    #        Removes a pending alarm, its heap entry is skipped when it comes up.
+    #
+    #RETURNS
+    #
+    #        Returns the canceled record, or None if there was no such alarm.
+
+    def Cancel(self, a_Id):
+
+        with self.changed:
+
+            alarm = self.alarms.pop(a_Id, None)
+
+            if alarm is not None:
+
+                self.Save()
+                self.changed.notify()
+
+            return alarm
+
+    #AlarmScheduler::Snooze(a_Id, a_Minutes)
+    #
+    #DESCRIPTION
+    #
+    #        Pushes a pending alarm back by a_Minutes, or when a_Id is None brings
+    #        back the alarm that last went off a_Minutes from now.
+    #
+    #RETURNS
+    #
+    #        Returns the rescheduled record, or None if there was nothing to snooze.
+
+    def Snooze(self, a_Id = None, a_Minutes = 10):
+
+        with self.changed:
+
+            if a_Id is None:
+
+                if self.lastFired is None:
+
+                    return None
+
+                alarm = dict(self.lastFired, due = time.time() + a_Minutes * 60)
+                self.lastFired = None
+
+            elif a_Id in self.alarms:
+
+                alarm = dict(self.alarms[a_Id])
+                alarm['due'] += a_Minutes * 60
+
+            else:
+
+                return None
+
+            return self.Schedule(alarm)
+
+    #AlarmScheduler::run()
+    #
+    #DESCRIPTION
+    #
+    #        Sleeps until the earliest alarm is due, pops it and fires it. Stale heap
+    #        entries (canceled alarms, or due times changed by a snooze) are dropped.
+    #
+    #RETURNS
+    #
+    #        Returns after Stop().
+
+    def run(self):
+
+        while True:
+
+            with self.changed:
+
+                while not self.stopping:
+
+                    while self.dueHeap and self.alarms.get(self.dueHeap[0][1], {}).get('due') != self.dueHeap[0][0]:
+
+                        heapq.heappop(self.dueHeap)
+
+                    if self.dueHeap and self.dueHeap[0][0] <= time.time():
+
+                        break
+
+                    wait = self.MAXIMUM_WAIT
+
+                    if self.dueHeap:
+
+                        wait = min(wait, self.dueHeap[0][0] - time.time())
+
+                    self.changed.wait(wait)
+
+                if self.stopping:
+
+                    return
+
+                due, alarmId = heapq.heappop(self.dueHeap)
+                alarm = self.alarms.pop(alarmId)
+                self.lastFired = alarm
+
+                self.Save()
+
+            try:
+
+                self.onFire(alarm)
+
+            except Exception as e:
+
+                print(type(e), e)
+
+    #AlarmScheduler::Stop()
+    #
+    #DESCRIPTION
+    #
+    #        Wakes the thread and lets it exit, pending alarms stay in the alarm file.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Stop(self):
+
+        with self.changed:
+
+            self.stopping = True
+            self.changed.notify()
+
+#Alarm_Scheduler::AlarmScheduler
+
+#Alarm_Scheduler.py
@@ -12,19 +12,16 @@
 #            webbrowser            --> allows python to open web pages in user's 
 #                                      default browser option.
 #
-#            speech_recognition    --> simple speech to text library to allow 
-#                                      voice control of the chatbot and virtual 
+#            Listening_Service     --> keeps a calibrated speech recognizer and the microphone 
+#                                      open to allow voice control of the chatbot and virtual 
 #                                      assistant
 #
-#            pyttsx3               --> takes the input from chatbot or virtual assistant 
-#                                      and synthesizes its' "voice" for the user to hear
-#
 #            datetime              --> standard python library for receiving the time 
 #                                      of day as well as the date
 #
-#            wikipedia             --> allows python to parse wikipedia for search results 
-#                                      and return either a webpage or a string of the page 
-#                                      contents
+#            Wikipedia_Cache       --> memory and disk cache in front of the wikipedia library, 
+#                                      which allows python to parse wikipedia for search results 
+#                                      and return a string of the page contents
 #
 #            os                    --> standard python library for opening, reading, and 
 #                                      writing files 
@@ -48,11 +45,6 @@
 #                                      Ubuntu Dialogue Corpus, which is a massive dataset. If the 
 #                                      corpus has already been downloaded it skips that step 
 #                                      
-#            LevenshteinDistance   --> chatterbot dialogue library and setting that determines the 
-#                                      algorithm the chatbot uses to decide response similarity, in 
-#                                      this instance the algorithm is Levenshtein Distance 
-#                                      (the mathematical formula) 
-#                                      
 #            flask                 --> web local host based user interface, utilizes html and style 
 #                                      sheets to create a more visually pleasing display, sets up a 
 #                                      local server on the current machine if desired 
@@ -60,12 +52,49 @@
 #            request               --> flask function that enables a hosted web server to send 
 #                                      information back to the machine it is being run on 
 #                                      
-#            time                  --> python standard library for setting alarms and scheduling 
-#                                      operations 
-#                                      
 #            subprocess            --> python API for spawning processes, threads, and running 
 #                                      separate programs from within the current one
 #
+#            Intent_Router         --> shared table of Virtual Assistant commands compiled into 
+#                                      a keyword automaton, used to route each query to its 
+#                                      handler in a single pass
+#
+#            Statement_Index       --> inverted index over the trained statements that narrows 
+#                                      each chatbot query to a small set of candidates before 
+#                                      they are scored by LevenshteinDistance
+#
+#            Batch_Comparison      --> LevenshteinDistance replacement that scores a query 
+#                                      against every candidate at once with numpy and only 
+#                                      runs the stock comparison on candidates that can win
+#
+#            Response_Cache        --> bounded least recently used cache of chatbot responses, 
+#                                      cleared whenever the training database changes
+#
+#            threading             --> python standard library, guards the lazy start of 
+#                                      the speech worker and the listening service
+#
+#            Speech_Worker         --> background thread owning the one pyttsx3 engine, 
+#                                      speaks queued responses without blocking the caller
+#
+#            Output_Channel        --> Say() and Show() write handler messages to the channel 
+#                                      chosen by the caller, the terminal prints and speaks 
+#                                      them while the flask server can collect them instead
+#
+#            Alarm_Scheduler       --> one background thread firing every alarm in due time 
+#                                      order, saved to disk so alarms survive a restart
+#
+#            Note_Journal          --> keeps the note file open and writes notes to it in 
+#                                      timed batches
+#
+#            argparse              --> python standard library, reads the speech recognition 
+#                                      backend option from the command line
+#
+#            Micro_Batcher         --> gathers chatbot queries from concurrent flask requests 
+#                                      so their candidates are scored in one pass
+#
+#            Single_Flight         --> identical chatbot queries in flight at the same time 
+#                                      share one answer
+#
 #DESCRIPTION
 #
 #        This file serves to house the majority of the functions 
@@ -99,20 +128,30 @@
 #        8:19pm 8/12/2021                                                          #
 
 import webbrowser
-import speech_recognition as sr
-import pyttsx3
 import datetime
-import wikipedia
 import os
 from chatterbot import ChatBot
 from chatterbot.trainers import ListTrainer
 from chatterbot.trainers import ChatterBotCorpusTrainer
 from chatterbot.trainers import UbuntuCorpusTrainer
-from chatterbot.comparisons import LevenshteinDistance
 from os.path import join
 from flask import Flask, request
-import time
 import subprocess
+import threading
+from Intent_Router import CreateRouter, TERMINAL_FIRST
+from Statement_Index import AttachStatementIndex
+from Batch_Comparison import BatchLevenshteinDistance
+from Response_Cache import ResponseCache
+from Speech_Worker import SpeechWorker
+from Output_Channel import Say, Show, SetDefaultChannel, TerminalChannel
+from Listening_Service import ListeningService, CreateBackend
+from Alarm_Scheduler import AlarmScheduler
+from Wikipedia_Cache import WikipediaCache
+from Note_Journal import NoteJournal
+from Micro_Batcher import MicroBatcher
+from Single_Flight import SingleFlight
+from Adapter_Executor import AttachAdapterExecutor
+import argparse
 
 
 #Assistant_Chatbot_Merge::ListenCheck() Assistant_Chatbot_Merge::ListenCheck()
@@ -127,16 +166,15 @@ import subprocess
 #
 #        string Assistant_Chatbot_Merge::ListenCheck()
 #
-#            recognized       --> storage variable for audio from microphone
-#
-#            source           --> audio input, a microphone in this case
+#            listeningService --> Listening_Service::ListeningService keeping the 
+#                                 calibrated recognizer and the microphone open, 
+#                                 started the first time voice control listens
 #
-#            audio            --> storage variable for cleaned and parsed 
-#                                 audio after passing source to recognized
-#
-#            query            --> audio converted to appropriate language 
-#                                 (english in this case) and cleaned up as 
-#                                 a string for use by ChatBot and Virtual Assistant
+#            listeningBackend --> recognizer used by listeningService, "google" by 
+#                                 default, "sphinx" to work offline, or 
+#                                 "replay:<transcript path>" to stand in for a microphone, 
+#                                 taken from the ASSISTANT_LISTENING_BACKEND environment 
+#                                 variable or set by SetListeningBackend()
 #
 #DESCRIPTION
 #
@@ -144,7 +182,9 @@ import subprocess
 #        voice control mode of the Virtual Assistant, when it detects audio input 
 #        from the user's microphone it will attempt to understand the language and 
 #        parse it into a readable and usable string variable for the 
-#        Virtual Assistant or ChatBot to respond to.
+#        Virtual Assistant or ChatBot to respond to. It first waits for anything 
+#        queued by Speak() to finish playing so the assistant does not hear itself. 
+#        The microphone is only calibrated for background noise the first time.
 #
 #RETURNS
 #
@@ -159,35 +199,80 @@ import subprocess
 #
 #        7:23pm 3/25/2021                                                          #
 
+listeningService = None
+listeningBackend = os.environ.get("ASSISTANT_LISTENING_BACKEND", "google")
+listeningServiceLock = threading.Lock()
+
 def ListenCheck():
 
-    recognized = sr.Recognizer()
+    global listeningService
+
+    #lets anything still being spoken finish so the microphone does not hear it
+    if speechWorker is not None:
+
+        speechWorker.WaitIdle()
+
+    with listeningServiceLock:
+
+        if listeningService is None:
+
+            listeningService = ListeningService(CreateBackend(listeningBackend), a_PauseThreshold = 1.0)
+            listeningService.start()
+
+    return listeningService.Listen()
 
-    with sr.Microphone() as source:
+#Assistant_Chatbot_Merge::ListenCheck()
 
-        print('Listening')
+#Assistant_Chatbot_Merge::SetListeningBackend(a_Name) Assistant_Chatbot_Merge::SetListeningBackend(a_Name)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::SetListeningBackend - chooses the recognizer ListenCheck() 
+#                                                       starts the listening service with
+#
+#SYNOPSIS
+#
+#        void Assistant_Chatbot_Merge::SetListeningBackend(a_Name)
+#
+#            a_Name           --> "google", "sphinx", or "replay:<transcript path>"
+#
+#DESCRIPTION
+#
+#        The backend is built once here so an unknown name or a missing transcript 
+#        is reported when the program starts rather than the first time voice 
+#        control listens. It has to be called before the listening service is 
+#        started, afterwards the service keeps the backend it was started with.
+#
+#RETURNS
+#
+#        Returns nothing, raises ValueError for an unknown backend, OSError for a 
+#        transcript that cannot be read, and RuntimeError once the service is started.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
 
-        recognized.pause_threshold = 1.0
-        audio = recognized.listen(source)
+def SetListeningBackend(a_Name):
 
-        try:
+    global listeningBackend
 
-            print("Recognizing")
+    CreateBackend(a_Name)
 
-            query = recognized.recognize_google(audio, language = 'en-in')
-            print("Recognized command = ", query)
+    with listeningServiceLock:
 
-        except Exception as e:
+        if listeningService is not None:
 
-            print(type(e), e)
-            print("Error recognizing, please repeat command or statement.")
-            return "None"
+            raise RuntimeError("The listening service is already running with " + listeningBackend)
 
-        return query
+        listeningBackend = a_Name
 
-#Assistant_Chatbot_Merge::ListenCheck()
+#Assistant_Chatbot_Merge::SetListeningBackend(a_Name)
 
-#Assistant_Chatbot_Merge::Speak(a_Audio) Assistant_Chatbot_Merge::Speak(a_Audio)
+#Assistant_Chatbot_Merge::Speak(a_Audio, a_Wait) Assistant_Chatbot_Merge::Speak(a_Audio, a_Wait)
 #
 #NAME
 #
@@ -198,30 +283,30 @@ def ListenCheck():
 #
 #SYNOPSIS
 #
-#        void Assistant_Chatbot_Merge::Speak(string a_Audio)
+#        obj Assistant_Chatbot_Merge::Speak(string a_Audio, a_Wait)
 #
 #            a_Audio          --> text string returned by the ChatBot or 
 #                                 Virtual Assistant to be converted into playable audio
 #
-#            speechResource   --> audio synthesizer intilialization, has subsections of 
-#                                 "voices", and "voice" to determine what the audio playback 
-#                                 sounds like
+#            a_Wait           --> when True blocks until the audio has finished playing, 
+#                                 used before the program exits
 #
-#            voices           --> voice synthesizer options for audio playback, different 
-#                                 array elements correspond to different narrators
+#            speechWorker     --> background thread owning the one audio synthesizer, 
+#                                 started the first time anything is spoken
 #
 #DESCRIPTION
 #
 #        This function will attempt to receive a string from the ChatBot or 
 #        Virtual Assistant instance and convert it into a playable audio instance. 
 #        Effectively synthesizing text to speech so that the Bot can be replied to 
-#        without directly looking at the UI for the written statement.
+#        without directly looking at the UI for the written statement. The text is 
+#        handed to speechWorker and played in order in the background, so the 
+#        caller carries on while the audio plays.
 #
 #RETURNS
 #
-#        Does not return a specific variable for output or storage, instead plays 
-#        an audio wavform that it temporarily creates based on the string provided 
-#        by a_Audio when the function is called.
+#        Returns the queued Speech_Worker::Utterance, which can be waited on or 
+#        canceled.
 #
 #AUTHOR
 #
@@ -231,16 +316,45 @@ def ListenCheck():
 #
 #        9:45pm 3/26/2021                                                          #
 
-def Speak(a_Audio):
+speechWorker = None
+speechWorkerLock = threading.Lock()
+
+def Speak(a_Audio, a_Wait = False):
+
+    global speechWorker
 
-    speechResource = pyttsx3.init()
-    voices = speechResource.getProperty('voices')
-    speechResource.setProperty('voice', voices[1].id)
+    with speechWorkerLock:
 
-    speechResource.say(a_Audio)
-    speechResource.runAndWait()
+        if speechWorker is None:
 
-#Assistant_Chatbot_Merge::Speak(a_Audio)
+            speechWorker = SpeechWorker(a_VoiceIndex = 1)
+            speechWorker.start()
+
+    return speechWorker.Say(a_Audio, a_Wait)
+
+#Assistant_Chatbot_Merge::Speak(a_Audio, a_Wait)
+
+#Assistant_Chatbot_Merge::terminalChannel Assistant_Chatbot_Merge::terminalChannel
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::terminalChannel - output channel that prints every 
+#                                                   handler message and speaks it with 
+#                                                   Speak(), the default for any thread 
+#                                                   that has not chosen its own channel
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+terminalChannel = TerminalChannel(Speak)
+SetDefaultChannel(terminalChannel)
+
+#Assistant_Chatbot_Merge::terminalChannel
 
 #Assistant_Chatbot_Merge::TextOrSpeech() Assistant_Chatbot_Merge::TextOrSpeech()
 #
@@ -421,8 +535,7 @@ def DayOfTheWeek():
 
         printableDay = dictionaryDay[currentDay]
 
-        print(printableDay)
-        Speak("Today is " + printableDay)
+        Say(printableDay, "Today is " + printableDay)
         return str("Today is " + printableDay)
 
 #Assistant_Chatbot_Merge::DayOfTheWeek()
@@ -472,12 +585,12 @@ def DayOfTheWeek():
 def WhatTime():
     currentTime = str(datetime.datetime.now())
 
-    print(currentTime)
+    Show(currentTime)
 
     hour = currentTime[11:13]
     minute = currentTime[14:16]
 
-    Speak("It is " + hour + " hours and " + minute + " minutes.")
+    Say("It is " + hour + " hours and " + minute + " minutes.")
     return str("It is " + hour + " hours and " + minute + " minutes.")
 
 #Assistant_Chatbot_Merge::WhatTime()
@@ -520,8 +633,7 @@ def WhatTime():
 
 def Greeting():
 
-    print("Greetings, I am your Virtual Assistant. How can I be of assistance?")
-    Speak("Greetings, I am your Virtual Assistant. How can I be of assistance?")
+    Say("Greetings, I am your Virtual Assistant. How can I be of assistance?")
 
 #Assistant_Chatbot_Merge::Greeting()
 
@@ -564,8 +676,7 @@ def Greeting():
 
 def GoogleLaunch():
 
-    print("Launching google.com")
-    Speak("Launching Google dot Com")
+    Say("Launching google.com", "Launching Google dot Com")
 
     webbrowser.open("www.google.com")
     return str("Launching google.com")
@@ -631,8 +742,7 @@ def GoogleQuery(a_Query):
 
     a_Query = a_Query.replace("google", "")
 
-    print("Googling: " + a_Query)
-    Speak("Googling: " + a_Query)
+    Say("Googling: " + a_Query)
 
     webbrowser.open("https://letmegooglethat.com/?q=" + a_Query)
 
@@ -695,8 +805,7 @@ def GoogleQuery(a_Query):
 
 def GoodbyeStatement(a_Query):
 
-    print("Are you sure you want to say Goodbye? Please input Y to confirm, or N to cancel: ")
-    Speak("Are you sure you want to say Goodbye?")
+    Say("Are you sure you want to say Goodbye? Please input Y to confirm, or N to cancel: ", "Are you sure you want to say Goodbye?")
 
     for i in range(5):
 
@@ -704,22 +813,19 @@ def GoodbyeStatement(a_Query):
 
         if a_Query == 'Y':
 
-            print("Goodbye! Until next time.")
-            Speak("Goodbye! Until next time.")
+            Say("Goodbye! Until next time.", a_Wait = True)
 
             return a_Query
     
         elif a_Query == 'N':
 
-            print("Shutdown Request Canceled.")
-            Speak("Shutdown Request Canceled.")
+            Say("Shutdown Request Canceled.")
 
             return a_Query
             
         elif (a_Query != 'Y' and a_Query != 'N'):
 
-            print("Invalid Input Received, Please Try Again (Y/N): ")
-            Speak("Invalid Input Received, Please Try Again.")
+            Say("Invalid Input Received, Please Try Again (Y/N): ", "Invalid Input Received, Please Try Again.")
 
             i = 0
 
@@ -772,8 +878,7 @@ def GoodbyeStatement(a_Query):
 
 def GoodbyeStatementVoice(a_Query):
 
-    print("Are you sure you want to say Goodbye? Please input Y to confirm, or N to cancel: ")
-    Speak("Are you sure you want to say Goodbye? Please state yes to confirm, or no to cancel: ")
+    Say("Are you sure you want to say Goodbye? Please input Y to confirm, or N to cancel: ", "Are you sure you want to say Goodbye? Please state yes to confirm, or no to cancel: ")
 
     for i in range(5):
 
@@ -781,22 +886,19 @@ def GoodbyeStatementVoice(a_Query):
 
         if a_Query == "yes":
 
-            print("Goodbye! Until next time.")
-            Speak("Goodbye! Until next time.")
+            Say("Goodbye! Until next time.", a_Wait = True)
 
             return a_Query
 
         elif a_Query == "no":
 
-            print("Shutdown Request Canceled.")
-            Speak("Shutdown Request Canceled.")
+            Say("Shutdown Request Canceled.")
 
             return a_Query
 
         elif (a_Query != "yes" and a_Query != "no"):
 
-            print("Invalid Input Received, Please Try Again (Y/N): ")
-            Speak("Invalid Input Received, Please Try Again.")
+            Say("Invalid Input Received, Please Try Again (Y/N): ", "Invalid Input Received, Please Try Again.")
 
             i = 0
 
@@ -825,9 +927,13 @@ def GoodbyeStatementVoice(a_Query):
 #                                 the wikipedia library to search for the topic most 
 #                                 similar to the string a_Query.
 #
+#            status           --> "ok" when a page was found, "disambiguation" when 
+#                                 the topic could mean several pages, or "missing"
+#
 #            result           --> string variable storing the first sentence of the 
 #                                 article pulled up by the wikipedia function using 
-#                                 a_Query as a search term
+#                                 a_Query as a search term, or the pages the topic 
+#                                 may refer to
 #
 #DESCRIPTION
 #
@@ -835,7 +941,9 @@ def GoodbyeStatementVoice(a_Query):
 #        receive the first sentence from the starting paragraph at the top of the 
 #        page matching whatever search term has been provided. It will play the 
 #        information back in audio form as well as will print it into the 
-#        flask user interface.
+#        flask user interface. Lookups go through wikipediaCache, so a topic 
+#        asked about before is answered without going back to wikipedia. If 
+#        wikipedia does not answer in time the user is told to try again later.
 #
 #RETURNS
 #
@@ -856,16 +964,33 @@ def FromWikipedia(a_Query):
 
     a_Query = a_Query.replace("wikipedia", "")
 
-    print("Searching wikipedia for " + a_Query)
-    Speak("Searching wikipedia for " + a_Query)
+    Say("Searching wikipedia for " + a_Query)
 
-    result = wikipedia.summary(a_Query, sentences=1)
+    try:
 
-    print("According to wikipedia: ")
-    Speak("According to wikipedia")
+        status, result = wikipediaCache.Lookup(a_Query)
 
-    print(result)
-    Speak(result)
+    except TimeoutError:
+
+        Say("Wikipedia is not answering right now, please try again later")
+
+        return str("Wikipedia is not answering right now, please try again later")
+
+    if status == "disambiguation":
+
+        Say("That could mean several pages: " + result)
+
+        return str("That could mean several pages: " + result)
+
+    if status == "missing":
+
+        Say("Wikipedia does not have a page for " + a_Query)
+
+        return str("Wikipedia does not have a page for " + a_Query)
+
+    Say("According to wikipedia: ", "According to wikipedia")
+
+    Say(result)
 
     return str("According to wikipedia: " + result)
 
@@ -909,8 +1034,7 @@ def FromWikipedia(a_Query):
 
 def NameResponse():
 
-    print("I am your virtual desktop assistant Vai, feel free to ask me anything. If you need help use the command HELP for options.")
-    Speak("I am your virtual desktop assistant Vai, feel free to ask me anything. If you need help use the command HELP for options.")
+    Say("I am your virtual desktop assistant Vai, feel free to ask me anything. If you need help use the command HELP for options.")
 
     return str("I am your virtual desktop assistant Vai, feel free to ask me anything. If you need help use the command HELP for options.")
 
@@ -944,13 +1068,12 @@ def NameResponse():
 #                                 noteWords joined together into a single string 
 #                                 instead of a list
 #
-#            textFile         --> object used to open and write the 'note' string 
-#                                 to the designated 'assistant_Note.txt' file
-#
 #DESCRIPTION
 #
 #        This function will attempt to parse from user input a string to be saved 
-#        to the text file in the installation directory underneath the 'notes' folder.
+#        to the text file in the installation directory underneath the 'notes' folder. 
+#        The note is handed to noteJournal, which stamps it with the time and writes 
+#        it to the file along with any other notes taken within the same second.
 #
 #RETURNS
 #
@@ -975,15 +1098,11 @@ def NoteQuery(a_Query):
     noteWords = [word for word in queryWords if word.lower() not in removalWords]
     note = ' '.join(noteWords)
 
-    textFile = open(join("notes", "assistant_Note.txt"), "a+")
-
-    textFile.write(note + "\r\n")
-    textFile.close()
+    noteJournal.Write(note)
 
-    print("The note has been recorded and saved in the notes folder in the installation directory.")
-    Speak("The note has been recorded and saved in the notes folder in the installation directory.")
+    Say("The note has been recorded and saved in the notes folder in the installation directory.")
 
-    print(a_Query)
+    Show(a_Query)
     
     return str("The note has been recorded and saved in the notes folder in the installation directory.")
 
@@ -1006,13 +1125,10 @@ def NoteQuery(a_Query):
 #                                 function. Reused to store the user's microphone input for the 
 #                                 note that is to be recorded.
 #
-#            textFile         --> object to store, open, close, and write to the designated text 
-#                                 file in the 'notes' directory of the local installation
-#
 #DESCRIPTION
 #
-#        This function will attempt to open a text file from the 'notes' directory and will save 
-#        the user's prompted audio input as a string within that text file. Simpler than the 
+#        This function will attempt to save the user's prompted audio input as a string 
+#        within the text file in the 'notes' directory through noteJournal. Simpler than the 
 #        non-voice application as this one can reprompt the user prior to writing the note, 
 #        as the other one creates the note instantaneously.
 #
@@ -1032,22 +1148,17 @@ def NoteQuery(a_Query):
 
 def NoteQueryVoice(a_Query):
 
-    print("What would you like me to make note of?")
-    Speak("What would you like me to make note of?")
-
-    textFile = open(join("notes", "assistant_Note.txt"), "a+")
+    Say("What would you like me to make note of?")
 
     a_Query = ListenCheck().lower()
 
-    textFile.write(a_Query + "\r\n")
-    textFile.close()
+    noteJournal.Write(a_Query)
 
-    print("The note has been recorded and saved in the notes folder in the installation directory.")
-    Speak("The note has been recorded and saved in the notes folder in the installation directory.")
+    Say("The note has been recorded and saved in the notes folder in the installation directory.")
 
-    print(a_Query)
+    Show(a_Query)
     a_Query = ""
-    print(a_Query)
+    Show(a_Query)
 
 #Assistant_Chatbot_Merge::NoteQueryVoice(a_Query)
 
@@ -1081,7 +1192,8 @@ def NoteQueryVoice(a_Query):
 #
 #        This function will attempt to open take the provided user input, whether 
 #        voice or text, and will provide a chatbot response with the highest 
-#        similarity according to its' database.
+#        similarity according to its' database. Repeated queries are answered 
+#        from responseCache instead of searching the database again.
 #
 #RETURNS
 #
@@ -1098,10 +1210,9 @@ def NoteQueryVoice(a_Query):
 
 def GetChatbotResponse(a_Query):
 
-    botResponse = dialogueBot.get_response(a_Query)
+    botResponse = responseCache.GetResponse(a_Query)
 
-    print(botResponse)
-    Speak(botResponse)
+    Say(botResponse)
 
 #Assistant_Chatbot_Merge::GetChatbotResponse(a_Query)
 
@@ -1151,7 +1262,7 @@ def GetChatbotResponse(a_Query):
 def PlayAudioFile(a_Query):
 
     song = a_Query.replace("play ", "") + ".mp3"
-    Speak("Playing song labeled: " + song)
+    Say("Playing song labeled: " + song)
     
     os.startfile('C:\\audio\\' + song)
 
@@ -1201,8 +1312,7 @@ def PlayAudioFile(a_Query):
 
 def OpenEmail():
 
-    print("Launching Gmail...")
-    Speak("Launching Gmail.")
+    Say("Launching Gmail...", "Launching Gmail.")
 
     webbrowser.open("https://gmail.com")
 
@@ -1224,33 +1334,29 @@ def OpenEmail():
 #
 #            a_Query          --> string variable passed from the Virtual Assistant 
 #                                 to the function that contains an integer between 
-#                                 1 and 24. Used to set the alarm.
+#                                 0 and 24, 0 and 24 both meaning midnight. Used to 
+#                                 set the alarm.
 #
 #            currentTime      --> variable to storm the current time in 00:00:00 
 #                                 format
 #
-#            alarmTime        --> variable to store the alarm time based on the 
-#                                 difference between the integer value given in 
-#                                 a_Query and currentTime
-#
-#            alarm            --> string varialbe that stores the name of the 
-#                                 alarm sound in the 'audio' file related to 
-#                                 the local installation directory
+#            alarmTime        --> the next time the clock reads the hour given in 
+#                                 a_Query, today if that hour is still to come and 
+#                                 tomorrow otherwise
 #
 #DESCRIPTION
 #
-#        This function will attempt to set an alarm via the standard sleep() 
-#        function based on the value given from a_Query. When the alarm 
-#        finishes it will play the designated audio file through the default 
-#        audio player. In this instance sleep() does not freeze the program 
-#        when running on the localhost as flask is creating multiple threads 
-#        and processes.
+#        This function will attempt to set an alarm with alarmScheduler based on 
+#        the value given from a_Query and returns straight away. When the alarm 
+#        goes off PlayAlarm(a_Alarm) plays the designated audio file through the 
+#        default audio player. Alarms are saved to disk so they still go off after 
+#        the Virtual Assistant is restarted. An hour outside 0 to 24 is turned 
+#        down rather than wrapped around the clock.
 #
 #RETURNS
 #
 #        Returns a string to the Virtual Assistant to give the user confirmation 
-#        that an alarm has been set. When the alarm finishes/goes off plays 
-#        the designated audio file.
+#        that an alarm has been set, or telling them the hour was not valid.
 #
 #AUTHOR
 #
@@ -1262,22 +1368,209 @@ def OpenEmail():
 
 def SetAlarm(a_Query):
 
-    print("Setting Alarm")
-    Speak("Setting Alarm")
+    if a_Query < 0 or a_Query > 24:
+
+        return str("There is no hour " + str(a_Query) + ", please give an hour between 0 and 24.")
+
+    Say("Setting Alarm")
 
     currentTime = datetime.datetime.now()
-    alarmTime = datetime.datetime.combine(currentTime.date(), datetime.time(a_Query, 0, 0))
+    alarmTime = datetime.datetime.combine(currentTime.date(), datetime.time(a_Query % 24, 0, 0))
 
-    time.sleep((alarmTime - currentTime).total_seconds())
+    if alarmTime <= currentTime:
 
-    alarm = 'Loud_Alarm_Clock_Buzzer'
+        alarmTime += datetime.timedelta(days = 1)
 
-    os.startfile('C:\\audio\\' + alarm)
+    alarmScheduler.Add(alarmTime.timestamp(), "Alarm for " + str(a_Query) + " hours")
 
     return str("Setting Alarm for " + str(a_Query) + " hours.")
 
 #Assistant_Chatbot_Merge:SetAlarm(a_Query)
 
+#Assistant_Chatbot_Merge::PlayAlarm(a_Alarm) Assistant_Chatbot_Merge::PlayAlarm(a_Alarm)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::PlayAlarm - called by alarmScheduler when an alarm 
+#                                             goes off
+#
+#SYNOPSIS
+#
+#        void Assistant_Chatbot_Merge::PlayAlarm(a_Alarm)
+#
+#            a_Alarm          --> the alarm record, a dictionary of its id, due time 
+#                                 and label
+#
+#            alarm            --> string varialbe that stores the name of the 
+#                                 alarm sound in the 'audio' file related to 
+#                                 the local installation directory
+#
+#DESCRIPTION
+#
+#        Announces the alarm and plays the designated audio file through the 
+#        default audio player. Runs on the scheduler's thread.
+#
+#RETURNS
+#
+#        Does not return anything.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+def PlayAlarm(a_Alarm):
+
+    Say(a_Alarm['label'] + ". Say snooze to hear it again in ten minutes.")
+
+    alarm = 'Loud_Alarm_Clock_Buzzer'
+
+    os.startfile('C:\\audio\\' + alarm)
+
+#Assistant_Chatbot_Merge::PlayAlarm(a_Alarm)
+
+#Assistant_Chatbot_Merge::ListAlarms() Assistant_Chatbot_Merge::ListAlarms()
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::ListAlarms - tells the user every alarm still to go off
+#
+#SYNOPSIS
+#
+#        string Assistant_Chatbot_Merge::ListAlarms()
+#
+#            alarms           --> pending alarm records from alarmScheduler, soonest first
+#
+#RETURNS
+#
+#        Returns a string with one line per alarm giving its number and due time.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+def ListAlarms():
+
+    alarms = alarmScheduler.List()
+
+    if not alarms:
+
+        Say("There are no alarms set.")
+
+        return str("There are no alarms set.")
+
+    lines = ["Alarm " + str(alarm['id']) + ": " + datetime.datetime.fromtimestamp(alarm['due']).strftime("%A %H:%M") for alarm in alarms]
+
+    Say("\n".join(lines), "You have " + str(len(alarms)) + " alarms set.")
+
+    return str("\n".join(lines))
+
+#Assistant_Chatbot_Merge::ListAlarms()
+
+#Assistant_Chatbot_Merge::CancelAlarm(a_Query) Assistant_Chatbot_Merge::CancelAlarm(a_Query)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::CancelAlarm - cancels the alarm numbered in a 
+#                                               "cancel alarm 3" command, or the 
+#                                               next alarm due when no number is given
+#
+#SYNOPSIS
+#
+#        string Assistant_Chatbot_Merge::CancelAlarm(a_Query)
+#
+#            a_Query          --> string variable passed from the Virtual Assistant
+#
+#            alarmNumber      --> the alarm number left over once the command words 
+#                                 are removed
+#
+#RETURNS
+#
+#        Returns a string confirming which alarm was canceled.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+def CancelAlarm(a_Query):
+
+    alarmNumber = a_Query.split("cancel alarm", 1)[1].strip()
+    alarms = alarmScheduler.List()
+
+    if alarmNumber.isdigit():
+
+        canceled = alarmScheduler.Cancel(int(alarmNumber))
+
+    elif alarms:
+
+        canceled = alarmScheduler.Cancel(alarms[0]['id'])
+
+    else:
+
+        canceled = None
+
+    if canceled is None:
+
+        Say("There is no such alarm to cancel.")
+
+        return str("There is no such alarm to cancel.")
+
+    Say("Canceled " + canceled['label'] + ".")
+
+    return str("Canceled " + canceled['label'] + ".")
+
+#Assistant_Chatbot_Merge::CancelAlarm(a_Query)
+
+#Assistant_Chatbot_Merge::SnoozeAlarm() Assistant_Chatbot_Merge::SnoozeAlarm()
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::SnoozeAlarm - brings back the alarm that last went 
+#                                               off in ten minutes
+#
+#SYNOPSIS
+#
+#        string Assistant_Chatbot_Merge::SnoozeAlarm()
+#
+#RETURNS
+#
+#        Returns a string confirming the snooze.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
+
+def SnoozeAlarm():
+
+    snoozed = alarmScheduler.Snooze(a_Minutes = 10)
+
+    if snoozed is None:
+
+        Say("There is no alarm to snooze.")
+
+        return str("There is no alarm to snooze.")
+
+    Say("Snoozing for ten minutes.")
+
+    return str("Snoozing " + snoozed['label'] + " for ten minutes.")
+
+#Assistant_Chatbot_Merge::SnoozeAlarm()
+
 #Assistant_Chatbot_Merge::LaunchProgram(a_Path) Assistant_Chatbot_Merge::LaunchProgram(a_Path)
 #
 #NAME
@@ -1305,15 +1598,17 @@ def SetAlarm(a_Query):
 #            program          --> string varialbe storing the text contained 
 #                                 within the filed opened and read by 'file'
 #
-#            subprocess.call  --> function from the subprocess library that 
-#                                 launches the program at the designated path 
-#                                 provided by 'program'
+#            subprocess.Popen --> class from the subprocess library that 
+#                                 starts the program at the designated path 
+#                                 provided by 'program' without waiting for it
 #
 #DESCRIPTION
 #
 #        This function will attempt to take the filename from a_Path and open the 
 #        corresponding textfile, reading in the file path contained within. 
-#        It will then attempt to launch the program at said location.
+#        It will then attempt to launch the program at said location and returns 
+#        as soon as it has started, rather than holding the caller, a flask 
+#        request thread included, until the program is closed.
 #
 #RETURNS
 #
@@ -1333,14 +1628,14 @@ def SetAlarm(a_Query):
 def LaunchProgram(a_Path):
 
     fileName = a_Path + ".txt"
-    file = open(join("paths", fileName), 'r')
 
-    program = file.read()
+    with open(join("paths", fileName), 'r') as file:
 
-    print("Launching Program...")
-    Speak("Launching Program")
+        program = file.read()
 
-    subprocess.call([program])
+    Say("Launching Program...", "Launching Program")
+
+    subprocess.Popen([program])
 
     return str("Launching Program: " + a_Path)
 
@@ -1388,48 +1683,38 @@ def Help():
 
     helpFile = open(join("help_text", "help_function_text.txt"), 'r')
     helpString = helpFile.read()
+    helpFile.close()
+
+    Show(helpString)
 
     return str(helpString)
 
 #Assistant_Chatbot_Merge::Help()
 
-#Assistant_Chatbot_Merge::Assist(a_Answer) Assistant_Chatbot_Merge::Assist(a_Answer)
+#Assistant_Chatbot_Merge::SetAlarmQuery(a_Query) Assistant_Chatbot_Merge::SetAlarmQuery(a_Query)
 #
 #NAME
 #
-#        Assistant_Chatbot_Merge::Assist - function utilized to run the Virtual Assistant 
-#                                          in offline mode without the localhost server 
-#                                          or flaskUI, allows for text control or voice 
-#                                          control upon initialization.
+#        Assistant_Chatbot_Merge::SetAlarmQuery - parses the hour out of a "set alarm for" 
+#                                                 command and passes it along to SetAlarm
 #
 #SYNOPSIS
 #
-#        void Assistant_Chatbot_Merge::Assist(a_Answer)
+#        string Assistant_Chatbot_Merge::SetAlarmQuery(a_Query)
 #
-#            a_Answer         --> integer variable passed to the function through 
-#                                 user input in the terminal window, can have a value 
-#                                 of 1 or 2. Controls the bootup mode of the 
-#                                 Virtual Assistant
+#            a_Query          --> string variable passed from the Virtual Assistant in 
+#                                 the form "set alarm for 7 hours"
 #
-#            query            --> string variable storing user input from the 
-#                                 terminal or synthesized from their microphone 
-#                                 in voice control mode
+#            setTime          --> the hour left over once the command words are removed
 #
 #DESCRIPTION
 #
-#        Controller function for the Virtual Assistant when it is not being used on 
-#        the flask user interface or localhost server. Determines whether the 
-#        program is being operated in text control or voice control mode. Depending 
-#        on user input can call any of the functions associated with the 
-#        Virtual Assistant or chatbot in order to trigger an action or response.
+#        This function strips the command words from the user's input so that 
+#        the terminal and the flask user interface set alarms the same way.
 #
 #RETURNS
 #
-#        Does not explicitly return anything. Some of the functions that Assist(a_Answer) 
-#        calls can return a string or integer variable. If no functions are called and 
-#        the chatbot is utilized it simply prints the response to the terminal and 
-#        provides audio playback. If an invalid response is somehow provided will 
-#        raise an exception. Can be used to turn the program off.
+#        Returns the string provided by SetAlarm(a_Query).
 #
 #AUTHOR
 #
@@ -1437,208 +1722,286 @@ def Help():
 #
 #DATE
 #
-#        4:30pm 4/11/2021                                                          #
-
-def Assist(a_Answer):
-    Greeting()
-
-    #Provides text control of the Virtual Assistant
-    if a_Answer == 1:
+#        2:40pm 10/17/2026                                                          #
 
-        while(True):
-            
-            query = input()
+def SetAlarmQuery(a_Query):
 
-            if "open google" in query:
+    setTime = a_Query.replace("set alarm for ", "").replace(" hours", "")
 
-                #Attempts to Launch google.com with the default browser
-                GoogleLaunch()
+    return SetAlarm(int(setTime))
 
-                query = ""
+#Assistant_Chatbot_Merge::SetAlarmQuery(a_Query)
 
-                continue
+#Assistant_Chatbot_Merge::LaunchProgramQuery(a_Query) Assistant_Chatbot_Merge::LaunchProgramQuery(a_Query)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::LaunchProgramQuery - parses the program name out of a 
+#                                                      "launch program" command and passes 
+#                                                      it along to LaunchProgram
+#
+#SYNOPSIS
+#
+#        string Assistant_Chatbot_Merge::LaunchProgramQuery(a_Query)
+#
+#            a_Query          --> string variable passed from the Virtual Assistant in 
+#                                 the form "launch program notepad"
+#
+#DESCRIPTION
+#
+#        This function strips the command words from the user's input so that 
+#        the terminal and the flask user interface launch programs the same way.
+#
+#RETURNS
+#
+#        Returns the string provided by LaunchProgram(a_Path).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:40pm 10/17/2026                                                          #
 
-            elif "google" in query:
+def LaunchProgramQuery(a_Query):
 
-                #Attempts to search google.com using the provided query term
-                GoogleQuery(query)
+    return LaunchProgram(a_Query.replace("launch program ", ""))
 
-                query = ""
+#Assistant_Chatbot_Merge::LaunchProgramQuery(a_Query)
 
-                continue
-
-            elif "what day is it" in query:
-
-                #Prints out and playsback audio for the day of the week
-                DayOfTheWeek()
-
-                query = ""
-
-                continue
-
-            elif "what time is it" in query:
-
-                #Prints out and playsback audio for the time in military time
-                WhatTime()
-
-                query = ""
-
-                continue
-
-            elif "goodbye" in query:
-
-                #Checks whether the user really wants to exit the Virtual Assistant
-                query = GoodbyeStatement(query)
-                
-                if query == 'Y':
+#Assistant_Chatbot_Merge::assistantHandlers Assistant_Chatbot_Merge::assistantHandlers
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::assistantHandlers - dictionary of intent name to the 
+#                                                     function that carries it out, shared 
+#                                                     by the terminal and the flask server
+#
+#DESCRIPTION
+#
+#        Every handler takes the user's query string and returns the string to show 
+#        the user. The keywords for each intent live in Intent_Router::INTENT_TABLE, 
+#        each entry point adds its own handlers for the intents that behave 
+#        differently there (goodbye, voice notes, switching control mode).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:40pm 10/17/2026                                                          #
 
-                    break
-                
-                elif query == 'N':
+assistantHandlers = {"OpenGoogle": lambda a_Query: GoogleLaunch(), 
+                     "GoogleQuery": GoogleQuery, 
+                     "DayOfTheWeek": lambda a_Query: DayOfTheWeek(), 
+                     "WhatTime": lambda a_Query: WhatTime(), 
+                     "FromWikipedia": FromWikipedia, 
+                     "NameResponse": lambda a_Query: NameResponse(), 
+                     "NoteQuery": NoteQuery, 
+                     "OpenEmail": lambda a_Query: OpenEmail(), 
+                     "SetAlarm": SetAlarmQuery, 
+                     "ListAlarms": lambda a_Query: ListAlarms(), 
+                     "CancelAlarm": CancelAlarm, 
+                     "SnoozeAlarm": lambda a_Query: SnoozeAlarm(), 
+                     "LaunchProgram": LaunchProgramQuery, 
+                     "PlayAudioFile": PlayAudioFile, 
+                     "Help": lambda a_Query: Help()}
 
-                    continue
+#Assistant_Chatbot_Merge::assistantHandlers
 
-                else:
+#Assistant_Chatbot_Merge::alarmScheduler Assistant_Chatbot_Merge::alarmScheduler
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::alarmScheduler - the one thread that fires every alarm, 
+#                                                  saving them to assistant_Alarms.json in 
+#                                                  the installation directory
+#
+#DESCRIPTION
+#
+#        Started by StartServices() as soon as the Virtual Assistant is launched so 
+#        alarms saved by an earlier run go off without the user having to set 
+#        anything first.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:50pm 10/17/2026                                                          #
 
-                    raise ValueError('Response in Query Invalid After Executing goodbyeStatement(query)')
+alarmScheduler = AlarmScheduler("assistant_Alarms.json", PlayAlarm)
 
-            elif "from wikipedia" in query:
+#Assistant_Chatbot_Merge::alarmScheduler
 
-                #Prints and speaks the first sentence from the 
-                #corresponding wikipedia page designated by query
-                FromWikipedia(query)
+#Assistant_Chatbot_Merge::wikipediaCache Assistant_Chatbot_Merge::wikipediaCache
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::wikipediaCache - summaries fetched by FromWikipedia(a_Query), 
+#                                                  kept in memory and in 
+#                                                  assistant_Wikipedia.sqlite3 in the 
+#                                                  installation directory
+#
+#DESCRIPTION
+#
+#        Summaries are kept for a week, ambiguous and missing topics for a day.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
 
-                query = ""
+wikipediaCache = WikipediaCache("assistant_Wikipedia.sqlite3", a_MaxSize = 512, a_TimeToLive = 7 * 24 * 3600, a_NegativeTimeToLive = 24 * 3600)
 
-                continue
+#Assistant_Chatbot_Merge::wikipediaCache
 
-            elif "who are you" in query:
+#Assistant_Chatbot_Merge::noteJournal Assistant_Chatbot_Merge::noteJournal
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::noteJournal - the 'notes/assistant_Note.txt' file 
+#                                               every note is written to
+#
+#DESCRIPTION
+#
+#        The file is opened and its flush thread started by StartServices(), or by 
+#        the first note if nothing started it before. Buffered notes are flushed to 
+#        disk together once a second, and whatever is left is flushed when the 
+#        program exits.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:05pm 10/17/2026                                                          #
 
-                #Prints out the bots name and notifies the user of the HELP command
-                NameResponse()
+noteJournal = NoteJournal(join("notes", "assistant_Note.txt"), a_FlushInterval = 1.0)
 
-                query = ""
+#Assistant_Chatbot_Merge::noteJournal
 
-                continue
-            
+#Assistant_Chatbot_Merge::Assist(a_Answer) Assistant_Chatbot_Merge::Assist(a_Answer)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::Assist - function utilized to run the Virtual Assistant 
+#                                          in offline mode without the localhost server 
+#                                          or flaskUI, allows for text control or voice 
+#                                          control upon initialization.
+#
+#SYNOPSIS
+#
+#        void Assistant_Chatbot_Merge::Assist(a_Answer)
+#
+#            a_Answer         --> integer variable passed to the function through 
+#                                 user input in the terminal window, can have a value 
+#                                 of 1 or 2. Controls the bootup mode of the 
+#                                 Virtual Assistant
+#
+#            router           --> IntentRouter built from assistantHandlers, with the 
+#                                 goodbye and note handlers swapped for their voice 
+#                                 variants in voice control mode. Goodbye is checked 
+#                                 straight after the time as it always has been here
+#
+#            query            --> string variable storing user input from the 
+#                                 terminal or synthesized from their microphone 
+#                                 in voice control mode
+#
+#            intent           --> name of the command found in query by the router, 
+#                                 None if the query should go to the chatbot
+#
+#DESCRIPTION
+#
+#        Controller function for the Virtual Assistant when it is not being used on 
+#        the flask user interface or localhost server. Determines whether the 
+#        program is being operated in text control or voice control mode. Each query 
+#        is routed in one pass through the shared command table in Intent_Router, 
+#        so the terminal understands the same commands as the flask server. 
+#        Anything that is not a command is answered by the chatbot.
+#
+#RETURNS
+#
+#        Does not explicitly return anything. Some of the functions that Assist(a_Answer) 
+#        calls can return a string or integer variable. If no functions are called and 
+#        the chatbot is utilized it simply prints the response to the terminal and 
+#        provides audio playback. If an invalid response is somehow provided will 
+#        raise an exception. Can be used to turn the program off.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:30pm 4/11/2021                                                          #
 
-            elif "make a note" in query:
+def Assist(a_Answer):
+    Greeting()
 
-                #Parses user input to make a note of anything in the string 
-                #except for 'make a note' and saves it in the local 'notes directory'
-                NoteQuery(query)
+    #Provides text control of the Virtual Assistant
+    if a_Answer == 1:
 
-                query = ""
+        router = CreateRouter(dict(assistantHandlers, Goodbye = GoodbyeStatement), TERMINAL_FIRST)
+        confirmExit = 'Y'
+        cancelExit = 'N'
 
-                continue
+    #Provides voice control of the Virtual Assistant, notes are dictated 
+    #as a second statement after the command
+    elif a_Answer == 2:
 
-            else:
+        router = CreateRouter(dict(assistantHandlers, Goodbye = GoodbyeStatementVoice, NoteQuery = NoteQueryVoice), TERMINAL_FIRST)
+        confirmExit = "yes"
+        cancelExit = "no"
 
-                #Pulls a response from the chatbot algorithm based on the query 
-                #if it matches no Virtual Assistant Commands
-                GetChatbotResponse(query)
+    else:
 
-                query = ""
+        raise Exception('Returned Answer value for TextOrSpeech() Invalid.')
 
-                continue
+    while(True):
 
+        if a_Answer == 1:
 
-    #Provides voice control of the Virtual Assistant
-    elif a_Answer == 2:
+            query = input()
 
-        while(True):
+        else:
 
             #User input from their microphone instead of the terminal
             query = ListenCheck().lower()
 
-            if "open google" in query:
-
-                GoogleLaunch()
-
-                query = ""
-
-                continue
-
-            elif "google" in query:
-            
-                GoogleQuery(query)
-
-                query = ""
-
-                continue
-
-            elif "what day is it" in query:
-
-                DayOfTheWeek()
+        intent = router.Match(query)
 
-                query = ""
+        if intent is None:
 
-                continue
-
-            elif "what time is it" in query:
-
-                WhatTime()
-
-                query = ""
-
-                continue
+            #Pulls a response from the chatbot algorithm based on the query 
+            #if it matches no Virtual Assistant Commands
+            GetChatbotResponse(query)
 
-            elif "goodbye" in query:
+            continue
 
-                #Checks whether the user would actually like to exit the 
-                #Virtual Assistant via voice control
-                query = GoodbyeStatementVoice(query)
+        query = router.handlers[intent](query)
 
-                if query == "yes":
+        if intent == "Goodbye":
 
-                    break
+            #Checks whether the user really wants to exit the Virtual Assistant
+            if query == confirmExit:
 
-                elif query == "no":
+                break
 
-                    continue
-
-                else:
-
-                    raise ValueError('Response in Query Invalid After Executing goodbyeStatementVoice(query).')
-
-            elif "from wikipedia" in query:
-
-                FromWikipedia(query)
-
-                query = ""
-
-                continue
-
-            elif "who are you" in query:
-
-                NameResponse()
-
-                query = ""
-
-                continue
-            
-
-            elif "make a note" in query:
-
-                #Prompts the user after stating the command to input 
-                #a new statement, which it records in a note in 
-                #the'notes' folder of the installation directory
-                NoteQueryVoice(query)
-
-                query = ""
+            elif query == cancelExit:
 
                 continue
 
             else:
 
-                GetChatbotResponse(query)
-
-                query = ""
-
-                continue
-    else:
-
-        raise Exception('Returned Answer value for TextOrSpeech() Invalid.')
+                raise ValueError('Response in Query Invalid After Executing ' + router.handlers[intent].__name__ + '(query)')
 
 #Assistant_Chatbot_Merge:Assist(a_Answer)
 
@@ -1670,7 +2033,8 @@ def Assist(a_Answer):
 #                                              input that removes unnecessary whitespace from 
 #                                              the string, removes escape characters from html 
 #                                              links it can see, and can convert hexadecimal 
-#                                              to ascii if required.
+#                                              to ascii if required. All three are done in 
+#                                              one call by Text_Normalizer.NormalizeStatement
 #
 #            filters                       --> filter to skip repetitive responses and 
 #                                              provide the previous answer to save 
@@ -1718,15 +2082,13 @@ def Assist(a_Answer):
 #        1:15pm 3/15/2021                                                          #
 
 dialogueBot = ChatBot(name = 'Vai', 
-                        statement_comparison_function = LevenshteinDistance,
+                        statement_comparison_function = BatchLevenshteinDistance,
 
                         utils = ['chatterbot.utils.remove_stopwords'],
 
                         parsing = ['chatterbot.parsing.datetime_parsing'],
 
-                        preprocessors= ['chatterbot.preprocessors.clean_whitespace', 
-                                        'chatterbot.preprocessors.unescape_html', 
-                                        'chatterbot.preprocessors.convert_to_ascii'],
+                        preprocessors= ['Text_Normalizer.NormalizeStatement'],
 
                         filters = ['chatterbot.filters.RepetitiveResponseFilter'],
 
@@ -1748,9 +2110,417 @@ dialogueBot = ChatBot(name = 'Vai',
 
 #Assistant_Chatbot_Merge::dialogueBot
 
+#Assistant_Chatbot_Merge::statementSearch Assistant_Chatbot_Merge::statementSearch
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::statementSearch - indexed search attached to dialogueBot 
+#                                                   so that its BestMatch adapters only 
+#                                                   score the top candidates for a query
+#
+#DESCRIPTION
+#
+#        The index is built from the database by StartServices(), or by the first 
+#        query if nothing started them, and built again by the first query after 
+#        the database is written to. candidateCount can be raised for better recall 
+#        at the cost of more comparisons per message, see Statement_Index.py for a 
+#        recall report.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+statementSearch = AttachStatementIndex(dialogueBot, a_CandidateCount = 200)
+
+#Assistant_Chatbot_Merge::statementSearch
+
+#Assistant_Chatbot_Merge::adapterExecutor Assistant_Chatbot_Merge::adapterExecutor
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::adapterExecutor - runs dialogueBot's logic adapters 
+#                                                   side by side, each within a budget
+#
+#DESCRIPTION
+#
+#        MathematicalEvaluation and TimeLogicAdapter answer in well under a 
+#        millisecond when they can, so a quarter second only cuts off one that has 
+#        gone wrong. The BestMatch adapters do the real searching and get two 
+#        seconds each. An adapter past its budget is left out of the answer. Setting 
+#        pipeline runs them one at a time instead, cheapest first, stopping at the 
+#        first confident answer, see Adapter_Executor.py.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:50am 10/17/2026                                                          #
+
+adapterExecutor = AttachAdapterExecutor(dialogueBot, a_Budgets = {'MathematicalEvaluation': 0.25, 
+                                                                  'TimeLogicAdapter': 0.25, 
+                                                                  'BestMatch': 2.0})
+
+#Assistant_Chatbot_Merge::adapterExecutor
+
+#Assistant_Chatbot_Merge::responseCache Assistant_Chatbot_Merge::responseCache
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::responseCache - cache of dialogueBot's responses shared 
+#                                                 by the terminal and the flask server
+#
+#DESCRIPTION
+#
+#        Holds the last 1024 distinct queries for up to an hour. Retraining the 
+#        chatbot writes to db.sqlite3, which empties the cache on the next query, 
+#        and AskChatbot() and AnswerChatbotBatch() have statementSearch rebuild its 
+#        index before looking a query up, so stale answers are not served after new 
+#        dialogue is learned.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        8:10pm 10/17/2026                                                          #
+
+responseCache = ResponseCache(dialogueBot, a_MaxSize = 1024, a_TimeToLive = 3600)
+
+#Assistant_Chatbot_Merge::responseCache
+
+#Assistant_Chatbot_Merge::AnswerChatbotBatch(a_Queries) Assistant_Chatbot_Merge::AnswerChatbotBatch(a_Queries)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::AnswerChatbotBatch - gets dialogueBot's responses for 
+#                                                      several queries, scoring all of 
+#                                                      their candidates together
+#
+#SYNOPSIS
+#
+#        list Assistant_Chatbot_Merge::AnswerChatbotBatch(a_Queries)
+#
+#            a_Queries        --> list of query strings for the chatbot
+#
+#            uncached         --> normalized queries the response cache cannot answer, 
+#                                 only these are prefetched
+#
+#DESCRIPTION
+#
+#        Candidates for every uncached query are drawn from the statement index and 
+#        scored in one pass by statementSearch.Prefetch(), then each query is 
+#        answered through responseCache as usual. Used by the flask server's 
+#        /get_batch route.
+#
+#RETURNS
+#
+#        Returns the response statements in the order of a_Queries, with the 
+#        exception in place of the response for any query that failed.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+def AnswerChatbotBatch(a_Queries):
+
+    statementSearch.Refresh()
+
+    uncached = []
+
+    for query in a_Queries:
+
+        key = responseCache.NormalizeQuery(query)
+
+        if not responseCache.Contains(key):
+
+            uncached.append(key)
+
+    responses = []
+
+    with statementSearch.Prefetch(uncached):
+
+        for query in a_Queries:
+
+            try:
+
+                responses.append(responseCache.GetResponse(query))
+
+            except Exception as e:
+
+                responses.append(e)
+
+    return responses
+
+#Assistant_Chatbot_Merge::AnswerChatbotBatch(a_Queries)
+
+#Assistant_Chatbot_Merge::PrefetchChatbotBatch(a_Keys) Assistant_Chatbot_Merge::PrefetchChatbotBatch(a_Keys)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::PrefetchChatbotBatch - scores the candidates of several 
+#                                                        chatbot queries together without 
+#                                                        answering them
+#
+#SYNOPSIS
+#
+#        list Assistant_Chatbot_Merge::PrefetchChatbotBatch(a_Keys)
+#
+#            a_Keys           --> list of queries already run through 
+#                                 responseCache.NormalizeQuery()
+#
+#DESCRIPTION
+#
+#        Only the shared scoring pass runs here, on chatbotBatcher's one thread. 
+#        Each query is then answered by AskChatbot() on its own request thread, so 
+#        one slow get_response() never holds up the others in its batch.
+#
+#RETURNS
+#
+#        Returns the (candidates, batch scores) entry of each key for 
+#        statementSearch.UsePrefetched(), None where there is nothing prefetched.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:20pm 10/17/2026                                                          #
+
+def PrefetchChatbotBatch(a_Keys):
+
+    entries = statementSearch.ScoreCandidates(a_Keys)
+
+    return [entries.get(key) for key in a_Keys]
+
+#Assistant_Chatbot_Merge::PrefetchChatbotBatch(a_Keys)
+
+#Assistant_Chatbot_Merge::chatbotBatcher Assistant_Chatbot_Merge::chatbotBatcher
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::chatbotBatcher - gathers chatbot queries arriving at 
+#                                                  the same time from different flask 
+#                                                  requests into one PrefetchChatbotBatch() 
+#
+#DESCRIPTION
+#
+#        Up to 16 queries arriving within 5ms of the first are scored together. 
+#        The flask server's --batch-size and --batch-window options change this, 
+#        and its /stats route shows the batch fill and queueing delay. Started by 
+#        StartServices(), or by the first query submitted to it. A query waits at 
+#        most PREFETCH_TIMEOUT seconds for its scores before it is answered 
+#        without them.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+chatbotBatcher = MicroBatcher(PrefetchChatbotBatch, a_MaxBatch = 16, a_Window = 0.005, a_Name = "ChatbotBatcher")
+
+#seconds AnswerPrefetched() waits on chatbotBatcher before scoring the query itself
+PREFETCH_TIMEOUT = 1.0
+
+#Assistant_Chatbot_Merge::chatbotBatcher
+
+#Assistant_Chatbot_Merge::AskChatbot(a_Query) Assistant_Chatbot_Merge::AskChatbot(a_Query)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::AskChatbot - gets dialogueBot's response for a query 
+#                                              from a flask request
+#
+#SYNOPSIS
+#
+#        obj Assistant_Chatbot_Merge::AskChatbot(a_Query)
+#
+#            a_Query          --> string variable of the user's query
+#
+#            chatbotFlight    --> SingleFlight keyed by the normalized query
+#
+#            prefetched       --> candidates and scores for the query from 
+#                                 chatbotBatcher, None if there are none
+#
+#DESCRIPTION
+#
+#        The statement index is brought up to date first, so that a database 
+#        written to since it was built is indexed again here rather than inside a 
+#        logic adapter's budget. A query responseCache already holds is answered 
+#        straight away. Requests asking the same normalized query while one is 
+#        already being answered wait for that answer instead of submitting their 
+#        own, so a burst of identical greetings costs one trip through 
+#        chatbotBatcher. The batcher only scores the candidates, the query is 
+#        answered here on the request's own thread. If the scoring fails or takes 
+#        longer than PREFETCH_TIMEOUT the query is still answered, with its 
+#        candidates scored by the search as usual. chatbotFlight.Stats() counts 
+#        how many requests were coalesced.
+#
+#RETURNS
+#
+#        Returns the chatbot's response statement.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:40am 10/17/2026                                                          #
+
+chatbotFlight = SingleFlight()
+
+def AskChatbot(a_Query):
+
+    statementSearch.Refresh()
+
+    key = responseCache.NormalizeQuery(a_Query)
+    response = responseCache.GetCached(key)
+
+    if response is not responseCache.MISSING:
+
+        return response
+
+    return chatbotFlight.Do(key, lambda: AnswerPrefetched(key))
+
+#Assistant_Chatbot_Merge::AskChatbot(a_Query)
+
+#Assistant_Chatbot_Merge::AnswerPrefetched(a_Key) Assistant_Chatbot_Merge::AnswerPrefetched(a_Key)
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::AnswerPrefetched - answers a query that missed the 
+#                                                    cache with the candidates scored 
+#                                                    for it by chatbotBatcher
+#
+#SYNOPSIS
+#
+#        obj Assistant_Chatbot_Merge::AnswerPrefetched(a_Key)
+#
+#            a_Key            --> query already run through responseCache.NormalizeQuery()
+#
+#RETURNS
+#
+#        Returns the chatbot's response statement.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        5:20pm 10/17/2026                                                          #
+
+def AnswerPrefetched(a_Key):
+
+    try:
+
+        prefetched = chatbotBatcher.Submit(a_Key).result(timeout = PREFETCH_TIMEOUT)
+
+    except Exception:
+
+        prefetched = None
+
+    with statementSearch.UsePrefetched({} if prefetched is None else {a_Key: prefetched}):
+
+        return responseCache.Answer(a_Key)
+
+#Assistant_Chatbot_Merge::AnswerPrefetched(a_Key)
+
+
+#Assistant_Chatbot_Merge::StartServices() Assistant_Chatbot_Merge::StartServices()
+#
+#NAME
+#
+#        Assistant_Chatbot_Merge::StartServices - starts the background threads of 
+#                                                 the Virtual Assistant
+#
+#SYNOPSIS
+#
+#        void Assistant_Chatbot_Merge::StartServices()
+#
+#            servicesStarted  --> True once the threads are running
+#
+#DESCRIPTION
+#
+#        alarmScheduler, noteJournal and chatbotBatcher used to be started as soon 
+#        as this file was imported, so anything importing it, a training script or 
+#        a test, fired saved alarms and held the note file open. They are now 
+#        started here, called by the terminal main below and by the flask server's 
+#        LaunchAssistantFlask(). Calling it again does nothing. The note file and 
+#        the wikipedia cache file are only opened once they are used. The 
+#        statement index is built here too, before the first query, so the first 
+#        answers are not held up by it.
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:30pm 10/17/2026                                                          #
+
+servicesStarted = False
+servicesLock = threading.Lock()
+
+def StartServices():
+
+    global servicesStarted
+
+    with servicesLock:
+
+        if servicesStarted:
+
+            return
+
+        alarmScheduler.start()
+
+        noteJournal.start()
+
+        chatbotBatcher.start()
+
+        statementSearch.Refresh()
+
+        servicesStarted = True
+
+#Assistant_Chatbot_Merge::StartServices()
+
 
 #Utilized if running Virtual Assistant without the user interface
 if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Run the Virtual Assistant in the terminal.")
+    parser.add_argument("--listening-backend", default = listeningBackend, help = 'speech recognizer for voice control, google, sphinx, or replay:<transcript path>')
+    arguments = parser.parse_args()
+
+    try:
+
+        SetListeningBackend(arguments.listening_backend)
+
+    except (ValueError, OSError) as error:
+
+        raise SystemExit("--listening-backend: " + str(error))
+
+    StartServices()
+
     LaunchAssistant()
 
 # Assistant_Chatbot_Merge.py
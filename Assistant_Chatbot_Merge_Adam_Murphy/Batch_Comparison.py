@@ -0,0 +1,672 @@
+#Batch_Comparison.py
+#
+#NAME
+#
+#        Batch_Comparison - statement comparison function for the chatbot that scores
+#                           one query against a whole batch of candidate statements at once.
+#
+#SYNOPSIS
+#
+#        Batch_Comparison.py
+#
+#            numpy                 --> numerical array library, runs the edit distance
+#                                      dynamic programming over every candidate at the
+#                                      same time instead of one python pair at a time
+#
+#            timeit                --> standard python library used by the benchmark
+#                                      when this file is run directly
+#
+#            chatterbot            --> library that includes all chatbot functions for
+#                                      initialization, training, and interactivity
+#
+#            LevenshteinDistance   --> chatterbot's stock comparison function, subclassed so
+#                                      single comparisons give exactly the same score
+#
+#DESCRIPTION
+#
+#        LevenshteinDistance compares the query to each candidate statement one pair at a
+#        time from python. BatchLevenshteinDistance is a drop-in replacement that can also
+#        score the query against a list of candidates in one call. The candidates are
+#        converted to a padded array of code points and the longest common subsequence of
+#        every candidate with the query is computed together, either with a bit-parallel
+#        form of the dynamic programming table (queries up to 64 characters) or with the
+#        plain table one cell at a time (longer queries).
+#
+#        The batch similarity is 2 * LCS / (length of both strings), the edit distance
+#        ratio python-Levenshtein gives. The stock function builds its matching blocks
+#        greedily with difflib so it never scores a pair higher than this, which makes
+#        the batch score an upper bound. closest_matches() uses that bound to skip every
+#        candidate that cannot beat the best match so far and only runs the stock
+#        comparison on the rest, so the chatbot picks exactly the same statement with
+#        the same confidence as before.
+#
+#RETURNS
+#
+#        When run directly prints a benchmark of the stock comparator against the batched
+#        one at 1k, 10k and 100k candidates. Otherwise provides BatchLevenshteinDistance
+#        for the chatbot to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+import numpy
+import timeit
+from chatterbot.comparisons import LevenshteinDistance
+from chatterbot.conversation import Statement
+
+#queries longer than this fall back from the bit-parallel kernel to the plain table
+WORD_BITS = 64
+
+#candidates are grouped by length into chunks of this size so padding stays small
+CHUNK_SIZE = 4096
+
+#Batch_Comparison::EncodeStrings(a_Texts) Batch_Comparison::EncodeStrings(a_Texts)
+#
+#NAME
+#
+#        Batch_Comparison::EncodeStrings - converts a list of strings into a padded
+#                                          array of unicode code points
+#
+#SYNOPSIS
+#
+#        tuple Batch_Comparison::EncodeStrings(a_Texts)
+#
+#            a_Texts          --> list of lowercase strings of any length
+#
+#            lengths          --> integer array of the length of every string
+#
+#            codes            --> two dimensional array with one row per string,
+#                                 padded with -1 past the end of each string
+#
+#DESCRIPTION
+#
+#        Every string is encoded as UTF-32 in one join so the whole batch is converted
+#        by numpy without a python loop over the characters.
+#
+#RETURNS
+#
+#        Returns the code point array and the length array.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+def EncodeStrings(a_Texts):
+
+    lengths = numpy.fromiter((len(text) for text in a_Texts), dtype = numpy.int64, count = len(a_Texts))
+    width = int(lengths.max()) if len(a_Texts) else 0
+
+    codes = numpy.full((len(a_Texts), max(width, 1)), -1, dtype = numpy.int32)
+
+    flat = numpy.frombuffer("".join(a_Texts).encode('utf-32-le'), dtype = numpy.int32)
+    rows = numpy.repeat(numpy.arange(len(a_Texts)), lengths)
+    columns = numpy.arange(len(flat)) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+
+    codes[rows, columns] = flat
+
+    return codes, lengths
+
+#Batch_Comparison::EncodeStrings(a_Texts)
+
+#Batch_Comparison::BitParallelLCS(a_Query, a_Codes) Batch_Comparison::BitParallelLCS(a_Query, a_Codes)
+#
+#NAME
+#
+#        Batch_Comparison::BitParallelLCS - longest common subsequence of one query of
+#                                           up to 64 characters with every row of a_Codes
+#
+#SYNOPSIS
+#
+#        array Batch_Comparison::BitParallelLCS(a_Query, a_Codes)
+#
+#            a_Query          --> lowercase query string, 1 to 64 characters
+#
+#            a_Codes          --> padded code point array from EncodeStrings()
+#
+#            matchMasks       --> for every character of the query alphabet, a 64 bit
+#                                 word with a bit set at each position it appears
+#
+#            vector           --> one 64 bit word per candidate holding a column of
+#                                 the dynamic programming table as bit differences
+#
+#DESCRIPTION
+#
+#        Each column of the LCS table differs from its neighbour by at most one per
+#        row, so a whole column fits in one machine word and advancing it by one
+#        candidate character is an add, a subtract, an and and an or (Hyyro, 2004).
+#        One numpy operation therefore advances the table of every candidate by a
+#        full column. Padding characters have an empty mask and leave the column as
+#        it was.
+#
+#RETURNS
+#
+#        Returns an integer array of the LCS length for every candidate.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+def BitParallelLCS(a_Query, a_Codes):
+
+    alphabet = sorted(set(a_Query))
+    alphabetCodes = numpy.array([ord(character) for character in alphabet], dtype = numpy.int32)
+
+    #mask 0 is reserved for characters that are not in the query
+    matchMasks = numpy.zeros(len(alphabet) + 1, dtype = numpy.uint64)
+
+    for position, character in enumerate(a_Query):
+
+        matchMasks[alphabet.index(character) + 1] |= numpy.uint64(1 << position)
+
+    slots = numpy.searchsorted(alphabetCodes, a_Codes)
+    slots[slots >= len(alphabet)] = len(alphabet)
+
+    found = alphabetCodes[numpy.minimum(slots, len(alphabet) - 1)] == a_Codes
+    maskIndex = numpy.where(found, slots + 1, 0)
+
+    vector = numpy.full(a_Codes.shape[0], numpy.uint64(0xFFFFFFFFFFFFFFFF), dtype = numpy.uint64)
+
+    for column in range(a_Codes.shape[1]):
+
+        match = matchMasks[maskIndex[:, column]]
+        carry = vector & match
+        vector = (vector + carry) | (vector - carry)
+
+    queryBits = numpy.uint64((1 << len(a_Query)) - 1)
+
+    return CountBits((~vector) & queryBits)
+
+#Batch_Comparison::BitParallelLCS(a_Query, a_Codes)
+
+#Batch_Comparison::BitParallelLCSMany(a_Queries, a_QueryRows, a_Codes) Batch_Comparison::BitParallelLCSMany(a_Queries, a_QueryRows, a_Codes)
+#
+#NAME
+#
+#        Batch_Comparison::BitParallelLCSMany - BitParallelLCS() for a batch of queries,
+#                                               each row of a_Codes compared with its
+#                                               own query
+#
+#SYNOPSIS
+#
+#        array Batch_Comparison::BitParallelLCSMany(a_Queries, a_QueryRows, a_Codes)
+#
+#            a_Queries        --> list of lowercase queries, 1 to 64 characters each
+#
+#            a_QueryRows      --> integer array giving, for every row of a_Codes, the
+#                                 position in a_Queries of the query it is compared with
+#
+#            a_Codes          --> padded code point array from EncodeStrings()
+#
+#            matchMasks       --> one row of masks per query over the alphabet of every
+#                                 query in the batch
+#
+#DESCRIPTION
+#
+#        The same column update as BitParallelLCS(), except each row picks its match
+#        mask from its own query's row of matchMasks. A whole batch of messages is
+#        then scored against all of their candidates in one pass.
+#
+#RETURNS
+#
+#        Returns an integer array of the LCS length for every row.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:30pm 10/17/2026                                                          #
+
+def BitParallelLCSMany(a_Queries, a_QueryRows, a_Codes):
+
+    alphabet = sorted(set("".join(a_Queries)))
+    alphabetCodes = numpy.array([ord(character) for character in alphabet], dtype = numpy.int32)
+    alphabetSlots = {character: slot + 1 for slot, character in enumerate(alphabet)}
+
+    matchMasks = numpy.zeros((len(a_Queries), len(alphabet) + 1), dtype = numpy.uint64)
+
+    for queryNumber, query in enumerate(a_Queries):
+
+        for position, character in enumerate(query):
+
+            matchMasks[queryNumber, alphabetSlots[character]] |= numpy.uint64(1 << position)
+
+    slots = numpy.searchsorted(alphabetCodes, a_Codes)
+    slots[slots >= len(alphabet)] = len(alphabet)
+
+    found = alphabetCodes[numpy.minimum(slots, len(alphabet) - 1)] == a_Codes
+    maskIndex = numpy.where(found, slots + 1, 0)
+
+    vector = numpy.full(a_Codes.shape[0], numpy.uint64(0xFFFFFFFFFFFFFFFF), dtype = numpy.uint64)
+
+    for column in range(a_Codes.shape[1]):
+
+        match = matchMasks[a_QueryRows, maskIndex[:, column]]
+        carry = vector & match
+        vector = (vector + carry) | (vector - carry)
+
+    queryBits = numpy.array([(1 << len(query)) - 1 for query in a_Queries], dtype = numpy.uint64)
+
+    return CountBits((~vector) & queryBits[a_QueryRows])
+
+#Batch_Comparison::BitParallelLCSMany(a_Queries, a_QueryRows, a_Codes)
+
+#Batch_Comparison::CountBits(a_Words) Batch_Comparison::CountBits(a_Words)
+#
+#NAME
+#
+#        Batch_Comparison::CountBits - number of set bits in every 64 bit word
+#
+#SYNOPSIS
+#
+#        array Batch_Comparison::CountBits(a_Words)
+#
+#            a_Words          --> uint64 array
+#
+#RETURNS
+#
+#        Returns an integer array of the bit counts.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+def CountBits(a_Words):
+
+    #numpy 2 counts bits directly, older versions count them a byte at a time
+    if hasattr(numpy, 'bitwise_count'):
+
+        return numpy.bitwise_count(a_Words).astype(numpy.int64)
+
+    byteBits = numpy.array([bin(value).count("1") for value in range(256)], dtype = numpy.int64)
+
+    return byteBits[a_Words.view(numpy.uint8).reshape(-1, 8)].sum(axis = 1)
+
+#Batch_Comparison::CountBits(a_Words)
+
+#Batch_Comparison::TableLCS(a_Query, a_Codes) Batch_Comparison::TableLCS(a_Query, a_Codes)
+#
+#NAME
+#
+#        Batch_Comparison::TableLCS - longest common subsequence of a query of any
+#                                     length with every row of a_Codes
+#
+#SYNOPSIS
+#
+#        array Batch_Comparison::TableLCS(a_Query, a_Codes)
+#
+#            a_Query          --> lowercase query string
+#
+#            a_Codes          --> padded code point array from EncodeStrings()
+#
+#            previous         --> row of the table for the previous query character,
+#                                 one row per candidate
+#
+#DESCRIPTION
+#
+#        Fills the ordinary LCS table one cell at a time, with each cell computed for
+#        every candidate at once. Used for queries too long for BitParallelLCS().
+#
+#RETURNS
+#
+#        Returns an integer array of the LCS length for every candidate.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+def TableLCS(a_Query, a_Codes):
+
+    count, width = a_Codes.shape
+
+    previous = numpy.zeros((count, width + 1), dtype = numpy.int32)
+
+    for character in a_Query:
+
+        equal = a_Codes == ord(character)
+        current = numpy.zeros_like(previous)
+
+        for column in range(width):
+
+            current[:, column + 1] = numpy.maximum(numpy.maximum(previous[:, column + 1], current[:, column]),
+                                                   previous[:, column] + equal[:, column])
+
+        previous = current
+
+    return previous[:, width].astype(numpy.int64)
+
+#Batch_Comparison::TableLCS(a_Query, a_Codes)
+
+#Batch_Comparison::BatchLevenshteinDistance Batch_Comparison::BatchLevenshteinDistance
+#
+#NAME
+#
+#        Batch_Comparison::BatchLevenshteinDistance - comparison function that can score
+#                                                     a query against one statement or a
+#                                                     whole batch of statements
+#
+#SYNOPSIS
+#
+#        obj Batch_Comparison::BatchLevenshteinDistance(language)
+#
+#            language         --> language of the chatbot's tagger, passed in by
+#                                 chatterbot when it creates the comparison function
+#
+#DESCRIPTION
+#
+#        compare() is inherited from LevenshteinDistance so the object can be given 
+#        anywhere the stock comparison function is expected. compare_batch() scores 
+#        every candidate in one call and closest_matches() is used by the statement 
+#        index search to find the best candidates with as few stock comparisons 
+#        as possible.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see 
+#        compare_batch() and closest_matches().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+class BatchLevenshteinDistance(LevenshteinDistance):
+
+    #BatchLevenshteinDistance::compare_batch(statement, candidates)
+    #
+    #DESCRIPTION
+    #
+    #        Compares the text of statement to every entry of candidates, which can be
+    #        statements or plain strings. Candidates are sorted by length and scored in
+    #        chunks so that each chunk is only padded to its own longest string.
+    #
+    #RETURNS
+    #
+    #        Returns a list of similarities between 0 and 1, in the order given, each
+    #        rounded to two places and never lower than compare() for the same pair.
+
+    def compare_batch(self, statement, candidates):
+
+        query = str(getattr(statement, 'text', statement) or "").lower()
+        texts = [str(getattr(candidate, 'text', candidate) or "").lower() for candidate in candidates]
+
+        similarities = numpy.zeros(len(texts), dtype = numpy.float64)
+
+        if not query or not texts:
+
+            return similarities.tolist()
+
+        order = numpy.argsort(numpy.fromiter((len(text) for text in texts), dtype = numpy.int64, count = len(texts)), kind = 'stable')
+
+        for start in range(0, len(order), CHUNK_SIZE):
+
+            chunk = order[start:start + CHUNK_SIZE]
+            codes, lengths = EncodeStrings([texts[index] for index in chunk])
+
+            if len(query) <= WORD_BITS:
+
+                common = BitParallelLCS(query, codes)
+
+            else:
+
+                common = TableLCS(query, codes)
+
+            total = lengths + len(query)
+
+            similarities[chunk] = numpy.where(lengths > 0, 2.0 * common / total, 0.0)
+
+        #rounded by python rather than numpy so that ties at the third decimal
+        #place round the same way LevenshteinDistance rounds them
+        return [round(similarity, 2) for similarity in similarities.tolist()]
+
+    #BatchLevenshteinDistance::compare_many(statements, candidate_lists)
+    #
+    #DESCRIPTION
+    #
+    #        compare_batch() for a batch of statements, each with its own list of
+    #        candidates. Every distinct candidate text is encoded once, and every
+    #        (statement, candidate) pair with a statement of up to 64 characters is
+    #        scored in the same BitParallelLCSMany() pass. Longer statements are
+    #        scored on their own with compare_batch().
+    #
+    #RETURNS
+    #
+    #        Returns one list of similarities per statement, each the same as
+    #        compare_batch() would give for that statement.
+
+    def compare_many(self, statements, candidate_lists):
+
+        queries = [str(getattr(statement, 'text', statement) or "").lower() for statement in statements]
+        results = [[0.0] * len(candidates) for candidates in candidate_lists]
+
+        textNumbers = {}
+        pairQuery = []
+        pairText = []
+        pairPosition = []
+
+        for queryNumber, (query, candidates) in enumerate(zip(queries, candidate_lists)):
+
+            if not query or not candidates:
+
+                continue
+
+            if len(query) > WORD_BITS:
+
+                results[queryNumber] = self.compare_batch(query, candidates)
+
+                continue
+
+            for position, candidate in enumerate(candidates):
+
+                text = str(getattr(candidate, 'text', candidate) or "").lower()
+
+                pairQuery.append(queryNumber)
+                pairText.append(textNumbers.setdefault(text, len(textNumbers)))
+                pairPosition.append(position)
+
+        if not pairQuery:
+
+            return results
+
+        texts = list(textNumbers)
+        textCodes, textLengths = EncodeStrings(texts)
+
+        #long statements were already scored above and take no part in the kernel
+        shortQueries = [query if len(query) <= WORD_BITS else "" for query in queries]
+
+        pairQuery = numpy.array(pairQuery, dtype = numpy.int64)
+        pairText = numpy.array(pairText, dtype = numpy.int64)
+        similarities = numpy.zeros(len(pairQuery), dtype = numpy.float64)
+
+        queryLengths = numpy.array([len(query) for query in queries], dtype = numpy.int64)
+        order = numpy.argsort(textLengths[pairText], kind = 'stable')
+
+        for start in range(0, len(order), CHUNK_SIZE):
+
+            chunk = order[start:start + CHUNK_SIZE]
+            lengths = textLengths[pairText[chunk]]
+            codes = textCodes[pairText[chunk], :max(int(lengths.max()), 1)]
+
+            common = BitParallelLCSMany(shortQueries, pairQuery[chunk], codes)
+            total = lengths + queryLengths[pairQuery[chunk]]
+
+            similarities[chunk] = numpy.where(lengths > 0, 2.0 * common / total, 0.0)
+
+        for queryNumber, position, similarity in zip(pairQuery.tolist(), pairPosition, similarities.tolist()):
+
+            results[queryNumber][position] = round(similarity, 2)
+
+        return results
+
+    #BatchLevenshteinDistance::closest_matches(statement, candidates, bounds)
+    #
+    #DESCRIPTION
+    #
+    #        Walks candidates in order and yields each one that is a closer match than
+    #        every candidate before it, exactly as chatterbot's search does with the
+    #        stock comparison. Candidates whose batch score is not above the best so far
+    #        cannot be closer and are skipped without calling compare(). The batch
+    #        scores can be passed in as bounds when compare_many() has already
+    #        computed them.
+    #
+    #RETURNS
+    #
+    #        Yields (position in candidates, confidence) pairs.
+
+    def closest_matches(self, statement, candidates, bounds = None):
+
+        if bounds is None:
+
+            bounds = self.compare_batch(statement, candidates)
+
+        closestConfidence = 0
+
+        for position, bound in enumerate(bounds):
+
+            if bound <= closestConfidence:
+
+                continue
+
+            candidate = candidates[position]
+
+            if isinstance(candidate, str):
+
+                candidate = Statement(text = candidate)
+
+            confidence = self.compare(statement, candidate)
+
+            if confidence > closestConfidence:
+
+                closestConfidence = confidence
+
+                yield position, confidence
+
+#Batch_Comparison::BatchLevenshteinDistance
+
+#Batch_Comparison::BenchmarkComparison(a_Sizes) Batch_Comparison::BenchmarkComparison(a_Sizes)
+#
+#NAME
+#
+#        Batch_Comparison::BenchmarkComparison - times the stock LevenshteinDistance
+#                                                against BatchLevenshteinDistance
+#
+#SYNOPSIS
+#
+#        void Batch_Comparison::BenchmarkComparison(a_Sizes)
+#
+#            a_Sizes          --> list of candidate counts to measure
+#
+#            lines            --> dialogue lines from testing_data.txt, repeated as
+#                                 needed to reach each candidate count
+#
+#            StockSearch      --> the closest match search chatterbot runs with the
+#                                 stock comparison, one compare() per candidate
+#
+#DESCRIPTION
+#
+#        For each candidate count reports the time per query of the stock search, of
+#        compare_batch() scoring every candidate, and of the closest_matches() search
+#        the chatbot uses, along with whether that search picked the same closest
+#        match with the same confidence as the stock one for every query.
+#
+#RETURNS
+#
+#        Prints the results, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:20pm 10/17/2026                                                          #
+
+def BenchmarkComparison(a_Sizes = (1000, 10000, 100000)):
+
+    dataFile = open("cornell movie-dialogs corpus/testing_data.txt")
+    lines = [line.strip() for line in dataFile if line.strip()]
+    dataFile.close()
+
+    queries = [Statement(text = text) for text in ["how are you doing today?",
+                                                   "where did you put the car keys",
+                                                   "I do not think that is a good idea at all."]]
+
+    stock = LevenshteinDistance(language = None)
+    batch = BatchLevenshteinDistance(language = None)
+
+    print("candidates    stock search (s)    batch scores (s)    batch search (s)    speedup    same match")
+
+    for size in a_Sizes:
+
+        texts = (lines * (size // len(lines) + 1))[:size]
+        candidates = [Statement(text = text) for text in texts]
+
+        def StockSearch():
+
+            results = []
+
+            for query in queries:
+
+                closest = (None, 0)
+
+                for position, candidate in enumerate(candidates):
+
+                    confidence = stock.compare(query, candidate)
+
+                    if confidence > closest[1]:
+
+                        closest = (position, confidence)
+
+                results.append(closest)
+
+            return results
+
+        def BatchScores():
+
+            return [batch.compare_batch(query, texts) for query in queries]
+
+        def BatchSearch():
+
+            return [list(batch.closest_matches(query, texts))[-1:] or [(None, 0)] for query in queries]
+
+        stockTime = timeit.timeit(StockSearch, number = 1) / len(queries)
+        scoreTime = timeit.timeit(BatchScores, number = 1) / len(queries)
+        searchTime = timeit.timeit(BatchSearch, number = 1) / len(queries)
+
+        sameMatch = StockSearch() == [found[0] for found in BatchSearch()]
+
+        print("%10d    %16.4f    %16.4f    %16.4f    %6.1fx    %10s" % (size, stockTime, scoreTime, searchTime, stockTime / searchTime, sameMatch))
+
+#Batch_Comparison::BenchmarkComparison(a_Sizes)
+
+
+#Runs the comparison benchmark
+if __name__ == "__main__":
+    BenchmarkComparison()
+
+#Batch_Comparison.py
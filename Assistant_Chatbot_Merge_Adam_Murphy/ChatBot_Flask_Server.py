@@ -27,6 +27,19 @@
 #            os                      --> standard python library for opening, reading, and 
 #                                        writing files 
 #
+#            argparse                --> standard python library, reads the production, headless, 
+#                                        and address options from the command line
+#
+#            json, queue, itertools  --> standard python libraries, event data, the event queue 
+#                                        each open stream reads from, and message ids
+#
+#            concurrent.futures,     --> standard python libraries, run chatbot and external 
+#            contextvars                 requests on deadlineExecutor in the context of the 
+#                                        flask request they answer
+#
+#            waitress                --> optional multi-threaded production WSGI server, imported 
+#                                        only when --production is used
+#
 #            render_template         --> flask function to render a template based on a provided 
 #                                        html file, said html file can then call a style sheet to 
 #                                        further customize its' appearance
@@ -34,6 +47,39 @@
 #            request                 --> allow the localhost instance/flask server to 
 #                                        ask for and receive user input
 #
+#            Intent_Router           --> shared table of Virtual Assistant commands compiled into 
+#                                        a keyword automaton, used to route each query to its 
+#                                        handler in a single pass
+#
+#            Output_Channel          --> lets each request choose where handler messages go, 
+#                                        text mode requests collect them for the browser and 
+#                                        never wait on the speaker
+#
+#            jsonify                 --> flask function that builds a JSON response, used when 
+#                                        the browser asks for format=json
+#
+#            make_response, g        --> flask response object used to set the session cookie, 
+#                                        and per request storage holding the client's session
+#
+#            Response                --> flask response class, streams the server-sent events 
+#                                        of /stream
+#
+#            Session_Store           --> bounded table of per client sessions replacing the 
+#                                        global control mode
+#
+#            Admission_Control       --> per cost class limits on requests in flight with a 
+#                                        bounded wait queue, and a per client address rate limit
+#
+#            chatbotBatcher          --> Micro_Batcher::MicroBatcher that scores the candidates of 
+#                                        chatbot queries from requests arriving together in one pass
+#
+#            AnswerChatbotBatch      --> answers a list of chatbot queries in one scoring pass, 
+#                                        used for the chatbot bound messages of /get_batch
+#
+#            AskChatbot              --> answers one chatbot query from the response cache, or by 
+#                                        joining an identical one already in flight, or with its 
+#                                        candidates scored by chatbotBatcher
+#
 #DESCRIPTION
 #
 #        This file houses all of the flask server specific functions, and also sets up and 
@@ -61,11 +107,20 @@
 #        6:19pm 7/16/2021                                                          #
 
 from chatterbot import ChatBot
-from Assistant_Chatbot_Merge import GoogleLaunch, GoogleQuery, DayOfTheWeek, WhatTime, FromWikipedia, NameResponse, NoteQuery, Help
-from Assistant_Chatbot_Merge import OpenEmail, PlayAudioFile, ListenCheck, Speak, TextOrSpeech, dialogueBot, SetAlarm, LaunchProgram
-from flask import Flask, render_template, request
+from Assistant_Chatbot_Merge import ListenCheck, SetListeningBackend, StartServices, listeningBackend, TextOrSpeech, dialogueBot, assistantHandlers, responseCache, terminalChannel, noteJournal, chatbotBatcher, AnswerChatbotBatch, AskChatbot, chatbotFlight, wikipediaCache, adapterExecutor
+from Intent_Router import CreateRouter, CHATBOT_COST
+from Output_Channel import Say, UseChannel, ActiveChannel, JsonChannel, StreamChannel, CompositeChannel
+from flask import Flask, render_template, request, jsonify, make_response, g, Response
+from Session_Store import SessionStore
+from Admission_Control import AdmissionController, AdmissionRejected
 import webbrowser
 import os
+import argparse
+import json
+import queue
+import itertools
+import concurrent.futures
+import contextvars
 
 #initializing the object for the server to run off of
 chatbotApp = Flask(__name__)
@@ -73,35 +128,95 @@ chatbotApp = Flask(__name__)
 #sets the folder for where to look for html templates
 chatbotApp.static_folder = 'static'
 
-#global variable necessary to set the control mode between text and speech
-voice = 0
+#ChatBot_Flask_Server::sessionStore ChatBot_Flask_Server::sessionStore
+#
+#NAME
+#
+#        ChatBot_Flask_Server::sessionStore - state of every client of the server, holding 
+#                                             each one's control mode between text and 
+#                                             speech, and its open event streams
+#
+#DESCRIPTION
+#
+#        Clients are told their session token in the SESSION_COOKIE cookie. Clients 
+#        that do not keep cookies can send it back in an X-Session-Token header or a 
+#        session query parameter instead.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+SESSION_COOKIE = "assistant_session"
 
-#ChatBot_Flask_Server::Home() ChatBot_Flask_Server::Home()
+sessionStore = SessionStore(a_MaxSessions = 1000, a_IdleSeconds = 30 * 60)
+
+#ChatBot_Flask_Server::sessionStore
+
+#ChatBot_Flask_Server::LookupSession() ChatBot_Flask_Server::LookupSession()
 #
 #NAME
 #
-#        ChatBot_Flask_Server::Home - starts the server and renders it via 
-#                                     the linked html template
+#        ChatBot_Flask_Server::LookupSession - finds the session of the client making 
+#                                              the current request
 #
 #SYNOPSIS
 #
-#        obj Chatbot_Flask_Server::Home()
+#        obj Chatbot_Flask_Server::LookupSession()
 #
-#            render_template            --> flask function to render a page based on 
-#                                           the provided html template, in this 
-#                                           case 'Local_Host_ChatBot.html'
+#DESCRIPTION
+#
+#        Reads the token from the cookie, header, or query parameter and stores the 
+#        session in flask's per request g object, so handlers such as EnableVoice 
+#        can change their own client's control mode and nobody else's.
+#
+#RETURNS
+#
+#        Returns the client's Session_Store::Session, a new one for a new client.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+def LookupSession():
+
+    token = request.cookies.get(SESSION_COOKIE) or request.headers.get("X-Session-Token") or request.args.get('session')
+
+    g.session = sessionStore.GetSession(token)
+
+    return g.session
+
+#ChatBot_Flask_Server::LookupSession()
+
+#ChatBot_Flask_Server::ClientAddress() ChatBot_Flask_Server::ClientAddress()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::ClientAddress - the client the current request is rate 
+#                                              limited as
+#
+#SYNOPSIS
+#
+#        string Chatbot_Flask_Server::ClientAddress()
 #
 #DESCRIPTION
 #
-#        Simple built-in flask function to render and initialize our server based 
-#        on the provided html template. The default location we are using to 
-#        access this server is localhost within your webbrowser.
+#        The rate limit used to be kept per session token, but a client that drops 
+#        its cookie is handed a new session, and with it a full bucket, on every 
+#        request, churning the bucket table as it goes. The remote address is the 
+#        one thing a client cannot change from request to request, so every 
+#        session from one address shares its bucket.
 #
 #RETURNS
 #
-#        Returns an object containing all of the parameters designated in the 
-#        template html file, and is used to set up the server visually 
-#        and functionally prior to launch.
+#        Returns the remote address of the current request.
 #
 #AUTHOR
 #
@@ -109,56 +224,105 @@ voice = 0
 #
 #DATE
 #
-#        12:35pm 6/06/2021                                                          #
+#        5:50pm 10/17/2026                                                          #
 
-#routes set places for the html template to pull from when writing functions
-@chatbotApp.route("/")
-def Home():
-    return render_template("Local_Host_ChatBot.html")
+def ClientAddress():
 
-#ChatBot_Flask_Server::Home()
+    return request.remote_addr
 
-#ChatBot_Flask_Server::GetBotResponse() ChatBot_Flask_Server::GetBotResponse()
+#ChatBot_Flask_Server::ClientAddress()
+
+#ChatBot_Flask_Server::AttachSession(a_Reply, a_Session) ChatBot_Flask_Server::AttachSession(a_Reply, a_Session)
 #
 #NAME
 #
-#        ChatBot_Flask_Server::GetBotResponse - receives user input from either 
-#                                               their microphone or the message 
-#                                               bar in the user interface and 
-#                                               determines which Virtual Assistant 
-#                                               function to call, otherwise will 
-#                                               default to a calculated ChatBot 
-#                                               response based on the received input. 
-#                                               Can also be used to shut the server 
-#                                               down or change the control mode from 
-#                                               between voice and text.
+#        ChatBot_Flask_Server::AttachSession - sends the client its session token
 #
 #SYNOPSIS
 #
-#        string Chatbot_Flask_Server::GetBotResponse()
+#        obj Chatbot_Flask_Server::AttachSession(a_Reply, a_Session)
+#
+#            a_Reply          --> string or flask response being returned
+#
+#            a_Session        --> the client's session
+#
+#RETURNS
+#
+#        Returns the flask response with the session cookie set.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+def AttachSession(a_Reply, a_Session):
+
+    reply = make_response(a_Reply)
+    reply.set_cookie(SESSION_COOKIE, a_Session.token, httponly = True, samesite = 'Lax')
+
+    return reply
+
+#ChatBot_Flask_Server::AttachSession(a_Reply, a_Session)
+
+#ChatBot_Flask_Server::admissionController ChatBot_Flask_Server::admissionController
+#
+#NAME
 #
-#            voice            --> accessible global variable being used to determine 
-#                                 the control type to use, this variable is global 
-#                                 because python does not have the ability to create 
-#                                 static variables, therefore I need to initialize 
-#                                 this variable outside of the function 
-#                                 I am calling it in.
+#        ChatBot_Flask_Server::admissionController - limits on the requests the server 
+#                                                    answers at once
 #
 #DESCRIPTION
 #
-#        Control function similar to Assist(a_Answer) from Assistant_Chatbot_Merge, 
-#        but modified to work within the flask user interface and when receiving 
-#        strings from the browser. Provides the ability to choose between the two 
-#        separate control modes, text or voice. If a function is called from the 
-#        Virtual Assistant it imports the reference from Assistant_Chatbot_Merge, 
-#        otherwise it is utilizing the dialogueBot instance that has been imported 
-#        to generate a response for the user.
+#        ADMISSION_LIMITS gives (requests in flight, requests waiting) for each cost 
+#        class of Intent_Router::INTENT_TABLE, plus STREAM_COST for the open /stream 
+#        connections, which hold a server thread for as long as they are open and 
+#        never wait for a slot. A waiting request still holds a server thread, so 
+#        the chatbot, external and stream classes together hold at most 20 threads 
+#        and the default 24 threads always leave some for cheap commands such as 
+#        WhatTime. Each client address may make 5 requests a second after a burst 
+#        of 10, see ClientAddress(). 
+#        All of this can be changed with --limit, --wait-timeout, --rate and --burst.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+STREAM_COST = "stream"
+
+ADMISSION_LIMITS = {"cheap": (16, 16), 
+                    CHATBOT_COST: (8, 4), 
+                    "external": (2, 2), 
+                    STREAM_COST: (4, 0)}
+
+admissionController = AdmissionController(ADMISSION_LIMITS, a_WaitTimeout = 2.0, a_Rate = 5.0, a_Burst = 10)
+
+#ChatBot_Flask_Server::admissionController
+
+#ChatBot_Flask_Server::BusyReply(a_Rejected, a_Json) ChatBot_Flask_Server::BusyReply(a_Rejected, a_Json)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::BusyReply - reply for a request admission control turned away
+#
+#SYNOPSIS
+#
+#        obj Chatbot_Flask_Server::BusyReply(a_Rejected, a_Json)
+#
+#            a_Rejected       --> the AdmissionRejected raised
+#
+#            a_Json           --> True to answer in JSON, otherwise in plain text
 #
 #RETURNS
 #
-#        By default returns a string provided by the chatbot instance of the program, 
-#        otherwise it provides strings given to it by the various 
-#        Virtual Assistant functions it is calling.
+#        Returns a flask response with status 429 for a client over its rate limit 
+#        or 503 for a full server, and a Retry-After header either way.
 #
 #AUTHOR
 #
@@ -166,141 +330,206 @@ def Home():
 #
 #DATE
 #
-#        1:45pm 6/27/2021                                                          #
-
-#Separate route tag for the html to use when writing a function to call GetBotResponse()
-@chatbotApp.route("/get")
-def GetBotResponse():
+#        2:30am 10/17/2026                                                          #
 
-    global voice
+def BusyReply(a_Rejected, a_Json):
 
-    for i in range(1):
-        if voice == 0:
-            
-            query = request.args.get('Message')
+    if a_Json:
 
-        elif voice == 1:
+        reply = make_response(jsonify(error = "busy", reason = a_Rejected.reason, retry_after = a_Rejected.retryAfter))
 
-            query = str(ListenCheck()).lower()
+    else:
 
-        else:
+        reply = make_response(str("I am busy right now, please try again in " + str(a_Rejected.retryAfter) + " seconds."))
 
-            query = request.args.get('Message')
+    reply.status_code = 429 if a_Rejected.reason == "rate" else 503
+    reply.headers["Retry-After"] = str(a_Rejected.retryAfter)
 
-    if "open google" in query:
+    return reply
 
-        return str(GoogleLaunch())
+#ChatBot_Flask_Server::BusyReply(a_Rejected, a_Json)
 
-    elif "google" in query:
-            
-        return str(GoogleQuery(query))
+#ChatBot_Flask_Server::deadlineExecutor ChatBot_Flask_Server::deadlineExecutor
+#
+#NAME
+#
+#        ChatBot_Flask_Server::deadlineExecutor - threads the chatbot and external 
+#                                                 requests run on, so the server 
+#                                                 thread can stop waiting for them
+#
+#DESCRIPTION
+#
+#        REQUEST_TIMEOUT is how many seconds a request of a class in DEADLINE_COSTS 
+#        may run before its client is told it took too long, 0 for no limit. A 
+#        request that runs over keeps its admission slot until it finishes, so 
+#        deadlineExecutor never has more work than the in flight limits of those 
+#        classes, and it is given that many threads. --request-timeout sets 
+#        requestTimeout, and ConfigureAdmission() sizes a new executor for the 
+#        --limit options.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:05pm 10/17/2026                                                          #
 
-    elif "what day is it" in query:
+REQUEST_TIMEOUT = 10.0
 
-        return str(DayOfTheWeek())
+DEADLINE_COSTS = (CHATBOT_COST, "external")
 
-    elif "what time is it" in query:
+requestTimeout = REQUEST_TIMEOUT
 
-        return str(WhatTime())
+deadlineExecutor = concurrent.futures.ThreadPoolExecutor(max_workers = sum(ADMISSION_LIMITS[cost][0] for cost in DEADLINE_COSTS), thread_name_prefix = "RequestDeadline")
 
-    elif "from wikipedia" in query:
+#ChatBot_Flask_Server::deadlineExecutor
 
-        return str(FromWikipedia(query))
+#ChatBot_Flask_Server::RequestTimedOut ChatBot_Flask_Server::RequestTimedOut
+#
+#NAME
+#
+#        ChatBot_Flask_Server::RequestTimedOut - raised when a request runs past 
+#                                                requestTimeout
+#
+#SYNOPSIS
+#
+#        obj Chatbot_Flask_Server::RequestTimedOut(a_Seconds)
+#
+#            a_Seconds        --> the deadline the request ran past
+#
+#RETURNS
+#
+#        Since this is an exception it does not return anything itself.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:05pm 10/17/2026                                                          #
 
-    elif "who are you" in query:
+class RequestTimedOut(Exception):
 
-        return str(NameResponse())
+    def __init__(self, a_Seconds):
 
-    elif "make a note" in query:
+        Exception.__init__(self, "request ran past its " + str(a_Seconds) + " second deadline")
 
-        return str(NoteQuery(query))
+        self.seconds = a_Seconds
 
-    elif "open email" in query:
+#ChatBot_Flask_Server::RequestTimedOut
 
-        return str(OpenEmail())
+#ChatBot_Flask_Server::RunAdmitted(a_Cost, a_Client, a_Function) ChatBot_Flask_Server::RunAdmitted(a_Cost, a_Client, a_Function)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::RunAdmitted - runs a request's handler once admission 
+#                                            control has a slot for it, within 
+#                                            requestTimeout for the slow classes
+#
+#SYNOPSIS
+#
+#        obj Chatbot_Flask_Server::RunAdmitted(a_Cost, a_Client, a_Function)
+#
+#            a_Cost           --> cost class of the request
+#
+#            a_Client         --> client address for the rate limit, None to skip it
+#
+#            a_Function       --> called with no arguments to answer the request
+#
+#            release          --> gives the admission slot back, called when 
+#                                 a_Function returns even if that is after the deadline
+#
+#            channel, context --> the calling thread's active output channel, and a 
+#                                 copy of its context holding the flask request
+#
+#DESCRIPTION
+#
+#        Requests of a class in DEADLINE_COSTS run on deadlineExecutor with the 
+#        output channel made active by the caller, and in a copy of its context 
+#        so the flask request and session go with them. The server thread waits 
+#        at most requestTimeout seconds for the answer. Every other request runs 
+#        on the calling thread as before.
+#
+#RETURNS
+#
+#        Returns what a_Function returns, raises AdmissionRejected if the request 
+#        is turned away, RequestTimedOut if it runs past the deadline, or 
+#        whatever a_Function raises.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:05pm 10/17/2026                                                          #
 
-    elif "set alarm for" in query:
+def RunAdmitted(a_Cost, a_Client, a_Function):
 
-        setTime1 = query.replace("set alarm for ", "")
-        setTime2 = setTime1.replace(" hours", "")
+    release = admissionController.Hold(a_Cost, a_Client)
+    deadline = requestTimeout
 
-        return str(SetAlarm(int(setTime2)))
+    if a_Cost not in DEADLINE_COSTS or not deadline:
 
-    elif "launch program" in query:
+        try:
 
-        filePath = query.replace("launch program ", "")
+            return a_Function()
 
-        return str(LaunchProgram(filePath))
+        finally:
 
-    elif "enable voice" in query:
+            release()
 
-        voice = 1
-        Speak("Voice control enabled.")
+    channel = ActiveChannel()
+    context = contextvars.copy_context()
 
-        return str("Voice control enabled. Please input any text before speaking to enable microphone.")
+    def RunInContext():
 
-    elif "disable voice" in query:
+        with UseChannel(channel):
 
-        voice = 0
-        Speak("Voice control disabled.")
+            return context.run(a_Function)
 
-        return str("Voice control disabled.")
+    try:
 
-    elif "play" in query:
+        future = deadlineExecutor.submit(RunInContext)
 
-        return str(PlayAudioFile(query))
+    except BaseException:
 
-    elif "help" in query:
+        release()
 
-        return str(Help())
+        raise
 
-    elif "goodbye" in query:
+    future.add_done_callback(lambda a_Future: release())
 
-        Speak("Goodbye.")
+    try:
 
-        os._exit(0)
+        return future.result(timeout = deadline)
 
-    else:
+    except concurrent.futures.TimeoutError:
 
-        return str(dialogueBot.get_response(query))
+        raise RequestTimedOut(deadline)
 
-#ChatBot_Flask_Server::GetBotResponse()
+#ChatBot_Flask_Server::RunAdmitted(a_Cost, a_Client, a_Function)
 
-#ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice) ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice)
+#ChatBot_Flask_Server::TimeoutReply(a_TimedOut, a_Json) ChatBot_Flask_Server::TimeoutReply(a_TimedOut, a_Json)
 #
 #NAME
 #
-#        ChatBot_Flask_Server::LaunchAssistantFlask - takes user input to decide which control 
-#                                                     mode to boot the Virtual Assistant up in, 
-#                                                     otherwise it launches the corresponding 
-#                                                     webpage for the flask server, and runs 
-#                                                     the server itself after deciding.
+#        ChatBot_Flask_Server::TimeoutReply - reply for a request that ran past 
+#                                             requestTimeout
 #
 #SYNOPSIS
 #
-#        void Chatbot_Flask_Server::LaunchAssistantFlask(a_Voice)
-#
-#            a_Voice            --> integer variable that the function modifies 
-#                                   to determine starting control type of 
-#                                   the Virtual Assistant
-#
-#            answer             --> interger variable receiving user input from 
-#                                   the terminal after calling the TextOrSpeech() 
-#                                   function imported from Assistant_Chatbot_Merge
+#        obj Chatbot_Flask_Server::TimeoutReply(a_TimedOut, a_Json)
 #
-#DESCRIPTION
+#            a_TimedOut       --> the RequestTimedOut raised
 #
-#        Standard launch function allowing the user to pick their preferred startup 
-#        type via terminal input. Also launches the correct url for the localhost 
-#        server so the user does not have to. This function also runs the actual 
-#        user interface itself so it is necessary to begin interacting with 
-#        the Virtual Assistant.
+#            a_Json           --> True to answer in JSON, otherwise in plain text
 #
 #RETURNS
 #
-#        No explicit returns are made, simply takes user input, 
-#        modifies a variable, launches a webpage, 
-#        and then launches the Virtual Assistant server to be interacted with.
+#        Returns a flask response with status 504.
 #
 #AUTHOR
 #
@@ -308,30 +537,1275 @@ def GetBotResponse():
 #
 #DATE
 #
-#        1:43am 9/22/2021                                                          #
+#        7:05pm 10/17/2026                                                          #
 
-def LaunchAssistantFlask(a_Voice):
-    
-    answer = TextOrSpeech()
+def TimeoutReply(a_TimedOut, a_Json):
 
-    if answer == 1:
+    if a_Json:
 
-        a_Voice = 0
-        webbrowser.open("http://127.0.0.1:5000/")
-        chatbotApp.run()
+        reply = make_response(jsonify(error = "timeout", seconds = a_TimedOut.seconds))
 
-    elif answer == 2:
+    else:
 
-        a_Voice = 1
-        webbrowser.open("http://127.0.0.1:5000/")
-        chatbotApp.run()
+        reply = make_response(str("That is taking too long to answer, please try again later."))
 
-#ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice)
+    reply.status_code = 504
+
+    return reply
+
+#ChatBot_Flask_Server::TimeoutReply(a_TimedOut, a_Json)
+
+#ChatBot_Flask_Server::Home() ChatBot_Flask_Server::Home()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::Home - starts the server and renders it via 
+#                                     the linked html template
+#
+#SYNOPSIS
+#
+#        obj Chatbot_Flask_Server::Home()
+#
+#            render_template            --> flask function to render a page based on 
+#                                           the provided html template, in this 
+#                                           case 'Local_Host_ChatBot.html'
+#
+#DESCRIPTION
+#
+#        Simple built-in flask function to render and initialize our server based 
+#        on the provided html template. The default location we are using to 
+#        access this server is localhost within your webbrowser.
+#
+#RETURNS
+#
+#        Returns an object containing all of the parameters designated in the 
+#        template html file, and is used to set up the server visually 
+#        and functionally prior to launch.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:35pm 6/06/2021                                                          #
+
+#routes set places for the html template to pull from when writing functions
+@chatbotApp.route("/")
+def Home():
+    return render_template("Local_Host_ChatBot.html")
+
+#ChatBot_Flask_Server::Home()
+
+#ChatBot_Flask_Server::GetBotResponse() ChatBot_Flask_Server::GetBotResponse()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::GetBotResponse - receives user input from either 
+#                                               their microphone or the message 
+#                                               bar in the user interface and 
+#                                               determines which Virtual Assistant 
+#                                               function to call, otherwise will 
+#                                               default to a calculated ChatBot 
+#                                               response based on the received input. 
+#                                               Can also be used to shut the server 
+#                                               down or change the control mode from 
+#                                               between voice and text.
+#
+#SYNOPSIS
+#
+#        string Chatbot_Flask_Server::GetBotResponse()
+#
+#            session          --> the client's Session_Store::Session, its voice 
+#                                 member determines the control type to use for 
+#                                 this client only
+#
+#            webChannel       --> JsonChannel collecting every message the handler 
+#                                 writes for this request
+#
+#            outputChannel    --> channel active while the handler runs, webChannel 
+#                                 alone in text mode, webChannel and the terminal 
+#                                 (printing and speaking) in voice mode
+#
+#DESCRIPTION
+#
+#        Control function similar to Assist(a_Answer) from Assistant_Chatbot_Merge, 
+#        but modified to work within the flask user interface and when receiving 
+#        strings from the browser. Provides the ability to choose between the two 
+#        separate control modes, text or voice. The query is routed in one pass by 
+#        flaskRouter, which shares its command table with Assist(a_Answer). If a 
+#        Virtual Assistant command is found its handler is called, otherwise it is 
+#        utilizing the dialogueBot instance that has been imported to generate a 
+#        response for the user through AskChatbot(), so identical queries in flight 
+#        share one answer and chatbot queries from requests arriving together are 
+#        scored in one pass. Handlers write to 
+#        outputChannel, so a request typed 
+#        in text mode returns without any audio playback on the server. Nothing 
+#        a request changes is shared with other clients, so requests can be 
+#        answered side by side. The handler only runs once admissionController 
+#        has a slot for its cost class and the client is within its rate.
+#
+#RETURNS
+#
+#        By default returns a string provided by the chatbot instance of the program, 
+#        otherwise it provides strings given to it by the various 
+#        Virtual Assistant functions it is calling. With format=json returns the 
+#        response, the matched intent, every message the handler wrote, and the 
+#        session token. A request turned away by admission control gets 
+#        BusyReply() instead.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:45pm 6/27/2021                                                          #
+
+#Separate route tag for the html to use when writing a function to call GetBotResponse()
+@chatbotApp.route("/get")
+def GetBotResponse():
+
+    session = LookupSession()
+
+    for i in range(1):
+        if session.voice == 0:
+            
+            query = request.args.get('Message')
+
+        elif session.voice == 1:
+
+            query = str(ListenCheck()).lower()
+
+        else:
+
+            query = request.args.get('Message')
+
+    webChannel = JsonChannel()
+
+    if session.voice == 1:
+
+        outputChannel = CompositeChannel([terminalChannel, webChannel])
+
+    else:
+
+        outputChannel = webChannel
+
+    intent = flaskRouter.Match(query)
+
+    handler = AskChatbot if intent is None else flaskRouter.handlers[intent]
+
+    try:
+
+        with UseChannel(outputChannel):
+
+            response = str(RunAdmitted(flaskRouter.Cost(intent), ClientAddress(), lambda: handler(query)))
+
+    except AdmissionRejected as e:
+
+        return AttachSession(BusyReply(e, request.args.get('format') == 'json'), session)
+
+    except RequestTimedOut as e:
+
+        return AttachSession(TimeoutReply(e, request.args.get('format') == 'json'), session)
+
+    if request.args.get('format') == 'json':
+
+        return AttachSession(jsonify(response = response, intent = intent, messages = webChannel.messages, session = session.token), session)
+
+    return AttachSession(response, session)
+
+#ChatBot_Flask_Server::GetBotResponse()
+
+#ChatBot_Flask_Server::GetBatchResponse() ChatBot_Flask_Server::GetBatchResponse()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::GetBatchResponse - answers a whole list of messages in 
+#                                                 one request, for replay and 
+#                                                 integration tools
+#
+#SYNOPSIS
+#
+#        json Chatbot_Flask_Server::GetBatchResponse()
+#
+#            messages         --> posted JSON, either an array or an object with a 
+#                                 "messages" array. Each message is a string, or an 
+#                                 object with a "message" string and optionally the 
+#                                 "session" token it belongs to
+#
+#            sessions         --> sessions looked up for this batch by token, messages 
+#                                 without a token share the one from the cookie or 
+#                                 X-Session-Token header
+#
+#DESCRIPTION
+#
+#        Every message is routed by flaskRouter exactly as GetBotResponse() routes a 
+#        single one and answered by AnswerBatch(). Messages are always read from 
+#        the posted text, a batch never listens to the microphone. A batch holds 
+#        at most MAX_BATCH_MESSAGES messages, and each one counts against the 
+#        client's rate like a request of its own, so replay tools sending more 
+#        than --burst messages at once should run the server with a higher --rate 
+#        or --rate 0.
+#
+#RETURNS
+#
+#        Returns JSON with a "responses" array in the order the messages were sent, 
+#        each holding the response, matched intent, handler messages, and session 
+#        token, or an error for that message alone. Returns status 400 if the body 
+#        is not a list of messages or holds too many.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:05pm 10/17/2026                                                          #
+
+MAX_BATCH_MESSAGES = 64
+
+@chatbotApp.route("/get_batch", methods = ["POST"])
+def GetBatchResponse():
+
+    payload = request.get_json(silent = True)
+
+    if isinstance(payload, dict):
+
+        payload = payload.get('messages')
+
+    if not isinstance(payload, list):
+
+        return jsonify(error = "expected a JSON array of messages"), 400
+
+    if len(payload) > MAX_BATCH_MESSAGES:
+
+        return jsonify(error = "a batch holds at most " + str(MAX_BATCH_MESSAGES) + " messages"), 400
+
+    defaultToken = request.cookies.get(SESSION_COOKIE) or request.headers.get("X-Session-Token")
+
+    sessions = {}
+    entries = []
+
+    for message in payload:
+
+        if isinstance(message, dict):
+
+            query = str(message.get('message') or "")
+            token = message.get('session') or defaultToken
+
+        else:
+
+            query = str(message)
+            token = defaultToken
+
+        if token not in sessions:
+
+            sessions[token] = sessionStore.GetSession(token)
+
+        entries.append((query, sessions[token], flaskRouter.Match(query)))
+
+    reply = jsonify(responses = AnswerBatch(entries))
+
+    if defaultToken in sessions:
+
+        return AttachSession(reply, sessions[defaultToken])
+
+    return reply
+
+#ChatBot_Flask_Server::GetBatchResponse()
+
+#ChatBot_Flask_Server::AnswerBatch(a_Entries) ChatBot_Flask_Server::AnswerBatch(a_Entries)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::AnswerBatch - answers the routed messages of a 
+#                                            /get_batch request
+#
+#SYNOPSIS
+#
+#        list Chatbot_Flask_Server::AnswerBatch(a_Entries)
+#
+#            a_Entries        --> list of (query, session, intent) in the order sent
+#
+#            responses        --> reply for each entry, filled in as it is answered
+#
+#            chatbotEntries   --> positions of the messages no command matched
+#
+#            commandEntries   --> positions of the command messages allowed in a batch
+#
+#DESCRIPTION
+#
+#        Only the commands in BATCH_INTENTS, which just read local state or look 
+#        something up, can run in a batch. Commands that change something on the 
+#        server, open programs or the browser, play audio, or shut the server down 
+#        with Goodbye are turned down, as a replayed batch should never do any of 
+#        those. Each message first takes a token from the client's rate. The 
+#        messages left for the chatbot are then answered together by 
+#        AnswerChatbotBatch(), which scores all of their candidates in a single 
+#        pass while holding one chatbot slot, and each command message runs its 
+#        handler in order, with its own JsonChannel and session, once admission 
+#        control has a slot for its cost class. The chatbot messages together, and 
+#        each external command, must be answered within requestTimeout, see 
+#        RunAdmitted(). A message that is turned away, runs out of time, or fails 
+#        gets an error in its place and the rest are still answered.
+#
+#RETURNS
+#
+#        Returns a list of dictionaries, one per entry, of response, intent, 
+#        handler messages, and session token. An entry that was not answered has 
+#        an error of "busy" (with the reason and retry_after of BusyReply()), 
+#        "timeout" (with the seconds of the deadline), "not allowed in a batch", 
+#        or "failed" (with its detail) instead of a response and messages.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+BATCH_INTENTS = {"DayOfTheWeek", "WhatTime", "FromWikipedia", "NameResponse", "ListAlarms", "Help"}
+
+def AnswerBatch(a_Entries):
+
+    responses = [None] * len(a_Entries)
+    chatbotEntries = []
+    commandEntries = []
+
+    for position, (query, session, intent) in enumerate(a_Entries):
+
+        if intent is not None and intent not in BATCH_INTENTS:
+
+            responses[position] = {'error': "not allowed in a batch", 'intent': intent, 'session': session.token}
+
+            continue
+
+        try:
+
+            admissionController.CheckRate(ClientAddress())
+
+        except AdmissionRejected as e:
+
+            responses[position] = BatchBusy(e, intent, session)
+
+            continue
+
+        if intent is None:
+
+            chatbotEntries.append(position)
+
+        else:
+
+            commandEntries.append(position)
+
+    if chatbotEntries:
+
+        queries = [a_Entries[position][0] for position in chatbotEntries]
+
+        try:
+
+            chatbotAnswers = RunAdmitted(CHATBOT_COST, None, lambda: AnswerChatbotBatch(queries))
+
+        except (AdmissionRejected, RequestTimedOut) as e:
+
+            chatbotAnswers = [e] * len(chatbotEntries)
+
+        for position, answer in zip(chatbotEntries, chatbotAnswers):
+
+            session = a_Entries[position][1]
+
+            if isinstance(answer, AdmissionRejected):
+
+                responses[position] = BatchBusy(answer, None, session)
+
+            elif isinstance(answer, RequestTimedOut):
+
+                responses[position] = {'error': "timeout", 'seconds': answer.seconds, 'intent': None, 'session': session.token}
+
+            elif isinstance(answer, Exception):
+
+                responses[position] = {'error': "failed", 'detail': str(answer), 'intent': None, 'session': session.token}
+
+            else:
+
+                responses[position] = {'response': str(answer), 'intent': None, 'messages': [], 'session': session.token}
+
+    for position in commandEntries:
+
+        query, session, intent = a_Entries[position]
+
+        g.session = session
+        webChannel = JsonChannel()
+
+        try:
+
+            with UseChannel(webChannel):
+
+                response = str(RunAdmitted(flaskRouter.Cost(intent), None, lambda: flaskRouter.handlers[intent](query)))
+
+        except AdmissionRejected as e:
+
+            responses[position] = BatchBusy(e, intent, session)
+
+            continue
+
+        except RequestTimedOut as e:
+
+            responses[position] = {'error': "timeout", 'seconds': e.seconds, 'intent': intent, 'session': session.token}
+
+            continue
+
+        except Exception as e:
+
+            responses[position] = {'error': "failed", 'detail': str(e), 'intent': intent, 'session': session.token}
+
+            continue
+
+        responses[position] = {'response': response, 
+                               'intent': intent, 
+                               'messages': webChannel.messages, 
+                               'session': session.token}
+
+    return responses
+
+#ChatBot_Flask_Server::AnswerBatch(a_Entries)
+
+#ChatBot_Flask_Server::BatchBusy(a_Rejected, a_Intent, a_Session) ChatBot_Flask_Server::BatchBusy(a_Rejected, a_Intent, a_Session)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::BatchBusy - entry of a /get_batch reply for a message 
+#                                          admission control turned away
+#
+#SYNOPSIS
+#
+#        dict Chatbot_Flask_Server::BatchBusy(a_Rejected, a_Intent, a_Session)
+#
+#            a_Rejected       --> the AdmissionRejected raised
+#
+#            a_Intent         --> intent the message matched, None for the chatbot
+#
+#            a_Session        --> the message's session
+#
+#RETURNS
+#
+#        Returns the same error, reason and retry_after BusyReply() sends in JSON, 
+#        with the intent and session token of the message.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:55pm 10/17/2026                                                          #
+
+def BatchBusy(a_Rejected, a_Intent, a_Session):
+
+    return {'error': "busy", 
+            'reason': a_Rejected.reason, 
+            'retry_after': a_Rejected.retryAfter, 
+            'intent': a_Intent, 
+            'session': a_Session.token}
+
+#ChatBot_Flask_Server::BatchBusy(a_Rejected, a_Intent, a_Session)
+
+#ChatBot_Flask_Server::streamMessageIds ChatBot_Flask_Server::streamMessageIds
+#
+#NAME
+#
+#        ChatBot_Flask_Server::streamMessageIds - numbers each message sent through /send 
+#                                                 so its events can be matched up on the 
+#                                                 client
+#
+#DESCRIPTION
+#
+#        STREAM_KEEPALIVE is how many seconds an idle stream waits before sending a 
+#        comment line, which stops proxies from closing it and keeps its session 
+#        from being dropped as idle.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+STREAM_KEEPALIVE = 15
+
+streamMessageIds = itertools.count(1)
+
+#ChatBot_Flask_Server::streamMessageIds
+
+#ChatBot_Flask_Server::FormatEvent(a_Event, a_Data) ChatBot_Flask_Server::FormatEvent(a_Event, a_Data)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::FormatEvent - writes one server-sent event
+#
+#SYNOPSIS
+#
+#        string Chatbot_Flask_Server::FormatEvent(a_Event, a_Data)
+#
+#            a_Event          --> event name, what the browser's EventSource listens for
+#
+#            a_Data           --> dictionary sent as the event's JSON data
+#
+#RETURNS
+#
+#        Returns the event in the text/event-stream format.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+def FormatEvent(a_Event, a_Data):
+
+    return str("event: " + a_Event + "\ndata: " + json.dumps(a_Data) + "\n\n")
+
+#ChatBot_Flask_Server::FormatEvent(a_Event, a_Data)
+
+#ChatBot_Flask_Server::StreamEvents() ChatBot_Flask_Server::StreamEvents()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::StreamEvents - persistent server-sent event stream for 
+#                                             the chat page
+#
+#SYNOPSIS
+#
+#        stream Chatbot_Flask_Server::StreamEvents()
+#
+#            session          --> the client's session, every event published to it 
+#                                 is sent down this stream
+#
+#            events           --> the stream's queue from session.Subscribe()
+#
+#DESCRIPTION
+#
+#        The page opens this once with an EventSource and keeps it open, then sends 
+#        each message with /send instead of waiting on a whole /get reply. For 
+#        every message the stream carries, each tagged with the message id: 
+#
+#            ack      --> sent as soon as the message is received
+#
+#            intent   --> the command matched, or "chatbot"
+#
+#            partial  --> each message the handler writes, as it writes it, so a 
+#                         wikipedia lookup shows "Searching wikipedia" before the 
+#                         summary arrives
+#
+#            final    --> the finished response
+#
+#            error    --> sent instead of final if the handler failed
+#
+#            busy     --> sent instead of intent if admission control turned the 
+#                         message away, with the seconds to wait before retrying
+#
+#        An open stream holds one server thread for as long as it is open, so it 
+#        holds a STREAM_COST slot from admissionController for just as long, 
+#        released when the server closes the response. Once every stream slot is 
+#        taken a new stream is turned away at once with BusyReply() rather than 
+#        waiting, and --limit stream=INFLIGHT:0 sets how many may be open.
+#
+#RETURNS
+#
+#        Returns a text/event-stream response that stays open until the client 
+#        disconnects, or BusyReply() if no stream slot is free.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+@chatbotApp.route("/stream")
+def StreamEvents():
+
+    session = LookupSession()
+
+    try:
+
+        release = admissionController.Hold(STREAM_COST, ClientAddress())
+
+    except AdmissionRejected as e:
+
+        return AttachSession(BusyReply(e, True), session)
+
+    events = session.Subscribe()
+
+    def Generate():
+
+        try:
+
+            yield FormatEvent("open", {"session": session.token})
+
+            while True:
+
+                try:
+
+                    event, data = events.get(timeout = STREAM_KEEPALIVE)
+
+                except queue.Empty:
+
+                    sessionStore.GetSession(session.token)
+
+                    yield ": keepalive\n\n"
+
+                    continue
+
+                yield FormatEvent(event, data)
+
+        finally:
+
+            session.Unsubscribe(events)
+
+    reply = Response(Generate(), mimetype = "text/event-stream", headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    #the server closes the response even if the stream was never read, which 
+    #the generator's finally alone would miss
+    reply.call_on_close(release)
+    reply.call_on_close(lambda: session.Unsubscribe(events))
+
+    return AttachSession(reply, session)
+
+#ChatBot_Flask_Server::StreamEvents()
+
+#ChatBot_Flask_Server::SendMessage() ChatBot_Flask_Server::SendMessage()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::SendMessage - answers one message, publishing its 
+#                                            progress to the client's open streams
+#
+#SYNOPSIS
+#
+#        json Chatbot_Flask_Server::SendMessage()
+#
+#            messageId        --> number tagging every event for this message
+#
+#            webChannel       --> StreamChannel publishing each handler message as a 
+#                                 partial event as soon as it is written
+#
+#DESCRIPTION
+#
+#        Takes the message from a posted JSON {"message": ...} or the Message 
+#        parameter (or the microphone for voice sessions, as /get does), routes it 
+#        with flaskRouter, and answers it exactly as GetBotResponse() does, while 
+#        publishing the ack, intent, partial, and final events to every stream the 
+#        session has open. The reply can be ignored by a page reading the stream.
+#
+#RETURNS
+#
+#        Returns JSON of the message id, response, intent, handler messages, and 
+#        session token, the same data the final event carries.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+@chatbotApp.route("/send", methods = ["GET", "POST"])
+def SendMessage():
+
+    session = LookupSession()
+    messageId = next(streamMessageIds)
+
+    if session.voice == 1:
+
+        query = str(ListenCheck()).lower()
+
+    else:
+
+        payload = request.get_json(silent = True)
+        query = str((payload or {}).get('message') or request.values.get('Message') or "")
+
+    session.Publish("ack", {"id": messageId, "message": query})
+
+    webChannel = StreamChannel(lambda a_Message: session.Publish("partial", dict(a_Message, id = messageId)))
+
+    if session.voice == 1:
+
+        outputChannel = CompositeChannel([terminalChannel, webChannel])
+
+    else:
+
+        outputChannel = webChannel
+
+    intent = flaskRouter.Match(query)
+    handler = AskChatbot if intent is None else flaskRouter.handlers[intent]
+
+    def Answer():
+
+        session.Publish("intent", {"id": messageId, "intent": intent or "chatbot"})
+
+        return str(handler(query))
+
+    try:
+
+        with UseChannel(outputChannel):
+
+            response = RunAdmitted(flaskRouter.Cost(intent), ClientAddress(), Answer)
+
+    except AdmissionRejected as e:
+
+        session.Publish("busy", {"id": messageId, "reason": e.reason, "retry_after": e.retryAfter})
+
+        return AttachSession(BusyReply(e, True), session)
+
+    except RequestTimedOut as e:
+
+        session.Publish("timeout", {"id": messageId, "seconds": e.seconds})
+
+        return AttachSession(TimeoutReply(e, True), session)
+
+    except Exception as e:
+
+        session.Publish("error", {"id": messageId, "error": str(e)})
+
+        raise
+
+    session.Publish("final", {"id": messageId, "response": response, "intent": intent})
+
+    return AttachSession(jsonify(id = messageId, response = response, intent = intent, messages = webChannel.messages, session = session.token), session)
+
+#ChatBot_Flask_Server::SendMessage()
+
+#ChatBot_Flask_Server::GetStats() ChatBot_Flask_Server::GetStats()
+#
+#NAME
+#
+#        ChatBot_Flask_Server::GetStats - counters of the server's shared services
+#
+#SYNOPSIS
+#
+#        json Chatbot_Flask_Server::GetStats()
+#
+#DESCRIPTION
+#
+#        Lets the batch size and window be tuned against real load, showing how 
+#        full chatbotBatcher's batches run and the queueing delay they add, next 
+#        to the response cache, coalescing, wikipedia cache, admission, and session 
+#        counters. adapters shows each logic adapter's latency, timeouts, and how 
+#        often its answer was chosen, for setting the adapter budgets.
+#
+#RETURNS
+#
+#        Returns JSON of the batcher, cache, single flight, wikipedia, admission 
+#        control, session store, and adapter executor Stats().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+@chatbotApp.route("/stats")
+def GetStats():
+
+    return jsonify(batcher = chatbotBatcher.Stats(), 
+                   cache = responseCache.Stats(), 
+                   coalescing = chatbotFlight.Stats(), 
+                   wikipedia = wikipediaCache.Stats(), 
+                   admission = admissionController.Stats(), 
+                   sessions = sessionStore.Stats(), 
+                   adapters = adapterExecutor.Stats())
+
+#ChatBot_Flask_Server::GetStats()
+
+#ChatBot_Flask_Server::EnableVoice(a_Query) ChatBot_Flask_Server::EnableVoice(a_Query)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::EnableVoice - switches the flask user interface over 
+#                                            to voice control
+#
+#SYNOPSIS
+#
+#        string Chatbot_Flask_Server::EnableVoice(a_Query)
+#
+#            a_Query          --> string variable passed from GetBotResponse(), unused 
+#                                 but kept so every handler has the same signature
+#
+#            g.session        --> the requesting client's session, its voice member 
+#                                 is set to 1 for voice
+#
+#DESCRIPTION
+#
+#        Sets the control mode so that the next request listens to the microphone 
+#        instead of reading the message bar, and confirms it on the request's 
+#        output channel.
+#
+#RETURNS
+#
+#        Returns a string to the flask user interface confirming voice control.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:55pm 10/17/2026                                                          #
+
+def EnableVoice(a_Query):
+
+    g.session.voice = 1
+    Say("Voice control enabled.")
+
+    return str("Voice control enabled. Please input any text before speaking to enable microphone.")
+
+#ChatBot_Flask_Server::EnableVoice(a_Query)
+
+#ChatBot_Flask_Server::DisableVoice(a_Query) ChatBot_Flask_Server::DisableVoice(a_Query)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::DisableVoice - switches the flask user interface back 
+#                                             to text control
+#
+#SYNOPSIS
+#
+#        string Chatbot_Flask_Server::DisableVoice(a_Query)
+#
+#            a_Query          --> string variable passed from GetBotResponse(), unused 
+#                                 but kept so every handler has the same signature
+#
+#            g.session        --> the requesting client's session, its voice member 
+#                                 is set to 0 for text
+#
+#DESCRIPTION
+#
+#        Sets the control mode so that requests read the message bar again, 
+#        and confirms it on the request's output channel.
+#
+#RETURNS
+#
+#        Returns a string to the flask user interface confirming text control.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:55pm 10/17/2026                                                          #
+
+def DisableVoice(a_Query):
+
+    g.session.voice = 0
+    Say("Voice control disabled.")
+
+    return str("Voice control disabled.")
+
+#ChatBot_Flask_Server::DisableVoice(a_Query)
+
+#ChatBot_Flask_Server::Goodbye(a_Query) ChatBot_Flask_Server::Goodbye(a_Query)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::Goodbye - says goodbye and shuts down the localhost server
+#
+#SYNOPSIS
+#
+#        void Chatbot_Flask_Server::Goodbye(a_Query)
+#
+#            a_Query          --> string variable passed from GetBotResponse(), unused 
+#                                 but kept so every handler has the same signature
+#
+#DESCRIPTION
+#
+#        Says goodbye on the request's output channel, waiting for any audio 
+#        playback to finish, and exits the process, which stops 
+#        the flask server. Refreshing the page will confirm this if need be.
+#
+#RETURNS
+#
+#        Does not return, the process exits.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:55pm 10/17/2026                                                          #
+
+def Goodbye(a_Query):
+
+    Say("Goodbye.", a_Wait = True)
+
+    #os._exit skips the atexit handlers, so the last notes are flushed here
+    noteJournal.Close()
+
+    os._exit(0)
+
+#ChatBot_Flask_Server::Goodbye(a_Query)
+
+#ChatBot_Flask_Server::flaskRouter ChatBot_Flask_Server::flaskRouter
+#
+#NAME
+#
+#        ChatBot_Flask_Server::flaskRouter - IntentRouter used by GetBotResponse(), built 
+#                                            from the shared assistantHandlers plus the 
+#                                            flask specific voice and goodbye handlers
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:55pm 10/17/2026                                                          #
+
+flaskRouter = CreateRouter(dict(assistantHandlers, 
+                                EnableVoice = EnableVoice, 
+                                DisableVoice = DisableVoice, 
+                                Goodbye = Goodbye))
+
+#ChatBot_Flask_Server::flaskRouter
+
+#ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice) ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::LaunchAssistantFlask - takes user input to decide which control 
+#                                                     mode to boot the Virtual Assistant up in, 
+#                                                     otherwise it launches the corresponding 
+#                                                     webpage for the flask server, and runs 
+#                                                     the server itself after deciding.
+#
+#SYNOPSIS
+#
+#        void Chatbot_Flask_Server::LaunchAssistantFlask(a_Voice, a_Arguments)
+#
+#            a_Voice            --> integer variable that the function modifies 
+#                                   to determine starting control type of 
+#                                   the Virtual Assistant, new sessions start 
+#                                   in this mode
+#
+#            a_Arguments        --> command line options from ParseArguments(), None 
+#                                   to run the development server on 127.0.0.1:5000 
+#                                   as before
+#
+#            answer             --> interger variable receiving user input from 
+#                                   the terminal after calling the TextOrSpeech() 
+#                                   function imported from Assistant_Chatbot_Merge, 
+#                                   or taken from --mode when running headless
+#
+#DESCRIPTION
+#
+#        Standard launch function allowing the user to pick their preferred startup 
+#        type via terminal input. Also launches the correct url for the localhost 
+#        server so the user does not have to. This function also runs the actual 
+#        user interface itself so it is necessary to begin interacting with 
+#        the Virtual Assistant. With --headless the prompt and the browser are 
+#        skipped, and with --production the server is run by ServeProduction(). 
+#        --batch-size and --batch-window set how chatbotBatcher groups queries, 
+#        --adapter-mode and --stop-confidence how adapterExecutor runs the logic 
+#        adapters, the admission options are applied by ConfigureAdmission(), and 
+#        --listening-backend picks the speech recognizer used in voice control. 
+#        The alarm, note and batching threads are started with StartServices() 
+#        once the options are applied.
+#
+#RETURNS
+#
+#        No explicit returns are made, simply takes user input, 
+#        modifies a variable, launches a webpage, 
+#        and then launches the Virtual Assistant server to be interacted with.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:43am 9/22/2021                                                          #
+
+def LaunchAssistantFlask(a_Voice, a_Arguments = None):
+
+    if a_Arguments is None:
+
+        a_Arguments = ParseArguments([])
+
+    if a_Arguments.headless:
+
+        answer = 2 if a_Arguments.mode == "voice" else 1
+
+    else:
+
+        answer = TextOrSpeech()
+
+    if answer == 1:
+
+        a_Voice = 0
+
+    elif answer == 2:
+
+        a_Voice = 1
+
+    sessionStore.defaultVoice = a_Voice
+
+    if a_Arguments.batch_size < 1:
+
+        raise SystemExit("--batch-size must be at least 1")
+
+    chatbotBatcher.maxBatch = a_Arguments.batch_size
+    chatbotBatcher.window = a_Arguments.batch_window / 1000.0
+
+    adapterExecutor.pipeline = a_Arguments.adapter_mode == "pipeline"
+    adapterExecutor.stopConfidence = a_Arguments.stop_confidence
+
+    ConfigureAdmission(a_Arguments)
+
+    try:
+
+        SetListeningBackend(a_Arguments.listening_backend)
+
+    except (ValueError, OSError) as error:
+
+        raise SystemExit("--listening-backend: " + str(error))
+
+    StartServices()
+
+    if not a_Arguments.headless:
+
+        webbrowser.open("http://" + a_Arguments.host + ":" + str(a_Arguments.port) + "/")
+
+    if a_Arguments.production:
+
+        ServeProduction(a_Arguments.host, a_Arguments.port, a_Arguments.threads, a_Arguments.idle_timeout)
+
+    else:
+
+        chatbotApp.run(host = a_Arguments.host, port = a_Arguments.port)
+
+#ChatBot_Flask_Server::LaunchAssistantFlask(a_Voice)
+
+#ChatBot_Flask_Server::ConfigureAdmission(a_Arguments) ChatBot_Flask_Server::ConfigureAdmission(a_Arguments)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::ConfigureAdmission - applies the admission control options 
+#                                                   to admissionController
+#
+#SYNOPSIS
+#
+#        void Chatbot_Flask_Server::ConfigureAdmission(a_Arguments)
+#
+#            a_Arguments        --> command line options from ParseArguments()
+#
+#            reserved           --> server threads the chatbot, external and stream classes 
+#                                   can hold between their requests in flight and waiting
+#
+#DESCRIPTION
+#
+#        Each --limit CLASS=INFLIGHT:WAITING replaces that class's limits. If the 
+#        classes other than cheap could hold every production server thread between 
+#        them, a warning is printed, since cheap commands would then queue behind 
+#        them for a thread. --request-timeout is applied too, and deadlineExecutor 
+#        is replaced by one with a thread for each chatbot and external request 
+#        the new limits allow in flight.
+#
+#RETURNS
+#
+#        Returns nothing, exits with a message for a badly formed --limit or a 
+#        negative --request-timeout.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:30am 10/17/2026                                                          #
+
+def ConfigureAdmission(a_Arguments):
+
+    global requestTimeout, deadlineExecutor
+
+    for limit in a_Arguments.limit:
+
+        try:
+
+            cost, sizes = limit.split("=")
+            maxInFlight, maxWaiting = [int(size) for size in sizes.split(":")]
+
+        except ValueError:
+
+            raise SystemExit("--limit expects CLASS=INFLIGHT:WAITING, got " + limit)
+
+        if cost not in admissionController.classes:
+
+            raise SystemExit("--limit class must be one of " + ", ".join(admissionController.classes))
+
+        admissionController.classes[cost].maxInFlight = maxInFlight
+        admissionController.classes[cost].maxWaiting = maxWaiting
+
+    for classLimit in admissionController.classes.values():
+
+        classLimit.waitTimeout = a_Arguments.wait_timeout
+
+    admissionController.rate = a_Arguments.rate
+    admissionController.burst = a_Arguments.burst
+
+    if a_Arguments.request_timeout < 0:
+
+        raise SystemExit("--request-timeout must not be negative")
+
+    requestTimeout = a_Arguments.request_timeout
+    deadlineExecutor = concurrent.futures.ThreadPoolExecutor(max_workers = max(1, sum(admissionController.classes[cost].maxInFlight for cost in DEADLINE_COSTS)), thread_name_prefix = "RequestDeadline")
+
+    reserved = sum(classLimit.maxInFlight + classLimit.maxWaiting for cost, classLimit in admissionController.classes.items() if cost != "cheap")
+
+    if a_Arguments.production and reserved >= a_Arguments.threads:
+
+        print("Warning: the chatbot, external and stream limits can hold " + str(reserved) + " of the " + str(a_Arguments.threads) + " server threads, raise --threads so cheap commands are not held up.")
+
+#ChatBot_Flask_Server::ConfigureAdmission(a_Arguments)
+
+#ChatBot_Flask_Server::ServeProduction(a_Host, a_Port, a_Threads, a_IdleTimeout) ChatBot_Flask_Server::ServeProduction(a_Host, a_Port, a_Threads, a_IdleTimeout)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::ServeProduction - runs chatbotApp on a multi-threaded 
+#                                                production WSGI server
+#
+#SYNOPSIS
+#
+#        void Chatbot_Flask_Server::ServeProduction(a_Host, a_Port, a_Threads, a_IdleTimeout)
+#
+#            a_Host, a_Port     --> address to listen on
+#
+#            a_Threads          --> number of worker threads answering requests
+#
+#            a_IdleTimeout      --> seconds a connection may sit without sending or 
+#                                   receiving anything before the server closes it, 
+#                                   waitress's channel_timeout
+#
+#DESCRIPTION
+#
+#        chatbotApp.run() is flask's development server, which handles one request 
+#        at a time, so one slow chatbot or wikipedia lookup held up every other 
+#        user. waitress answers requests from a pool of threads instead and runs 
+#        the same way on Windows and Linux. Threads rather than forked processes 
+#        are used on purpose. dialogueBot, its statement index, and the response 
+#        cache are loaded once when this file imports Assistant_Chatbot_Merge, 
+#        before the first worker starts, and the alarm scheduler, note journal, 
+#        and speech worker are single objects that forked copies could not share. 
+#        The shared objects a request reaches, the session store, admission 
+#        control, response and wikipedia caches, note journal, alarm scheduler and 
+#        chatbot batcher, each guard their state with their own lock. dialogueBot 
+#        itself is asked from every request thread that misses the response 
+#        cache, and relies on chatterbot opening a database session 
+#        per call rather than on a lock of its own. a_IdleTimeout only closes 
+#        quiet connections. The deadline on a request is --request-timeout: 
+#        chatbot and external requests run on deadlineExecutor, see RunAdmitted(), 
+#        and the server thread answers with a 504 once the deadline passes, 
+#        while the admission limits stop overrunning handlers piling up. If 
+#        waitress is not installed the development server is run with threading 
+#        turned on, and a message says how to install waitress.
+#
+#RETURNS
+#
+#        Does not return until the server is stopped.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:10pm 10/17/2026                                                          #
+
+def ServeProduction(a_Host, a_Port, a_Threads, a_IdleTimeout):
+
+    try:
+
+        import waitress
+
+    except ImportError:
+
+        print("waitress is not installed, run 'pip install waitress' for the production server. Using the threaded development server.")
+        chatbotApp.run(host = a_Host, port = a_Port, threaded = True)
+
+        return
+
+    print("Serving on http://" + a_Host + ":" + str(a_Port) + " with " + str(a_Threads) + " threads")
+
+    waitress.serve(chatbotApp, host = a_Host, port = a_Port, threads = a_Threads, channel_timeout = a_IdleTimeout)
+
+#ChatBot_Flask_Server::ServeProduction(a_Host, a_Port, a_Threads, a_IdleTimeout)
+
+#ChatBot_Flask_Server::ParseArguments(a_Arguments) ChatBot_Flask_Server::ParseArguments(a_Arguments)
+#
+#NAME
+#
+#        ChatBot_Flask_Server::ParseArguments - reads the server options from the 
+#                                               command line
+#
+#SYNOPSIS
+#
+#        obj Chatbot_Flask_Server::ParseArguments(a_Arguments)
+#
+#            a_Arguments        --> list of command line words, None for sys.argv
+#
+#RETURNS
+#
+#        Returns the parsed options, with no options given the server starts the 
+#        same way it always has.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:10pm 10/17/2026                                                          #
+
+def ParseArguments(a_Arguments = None):
+
+    parser = argparse.ArgumentParser(description = "Run the Virtual Assistant flask server.")
+    parser.add_argument("--production", action = "store_true", help = "serve with the multi-threaded waitress server")
+    parser.add_argument("--threads", type = int, default = 24, help = "worker threads for --production")
+    parser.add_argument("--idle-timeout", type = int, default = 120, help = "seconds a connection may send and receive nothing before it is closed in --production, see --request-timeout for how long a request may run")
+    parser.add_argument("--request-timeout", type = float, default = REQUEST_TIMEOUT, help = "seconds a chatbot or external request may run before the client is told it took too long, 0 for no limit")
+    parser.add_argument("--headless", action = "store_true", help = "skip the control mode prompt and the web browser")
+    parser.add_argument("--mode", choices = ["text", "voice"], default = "text", help = "control mode used with --headless")
+    parser.add_argument("--batch-size", type = int, default = 16, help = "most chatbot queries answered in one batch, 1 turns batching off")
+    parser.add_argument("--batch-window", type = float, default = 5.0, help = "milliseconds a chatbot query waits for others to batch with")
+    parser.add_argument("--adapter-mode", choices = ["parallel", "pipeline"], default = "parallel", help = "run the logic adapters side by side, or one at a time cheapest first")
+    parser.add_argument("--stop-confidence", type = float, default = 0.95, help = "confidence at which --adapter-mode pipeline stops trying adapters")
+    parser.add_argument("--limit", action = "append", default = [], metavar = "CLASS=INFLIGHT:WAITING", help = "requests of a cost class (cheap, chatbot, external, stream) allowed in flight and waiting, may be repeated")
+    parser.add_argument("--wait-timeout", type = float, default = 2.0, help = "seconds a request waits for a slot before being turned away")
+    parser.add_argument("--rate", type = float, default = 5.0, help = "requests a second each client address may make, 0 for no limit")
+    parser.add_argument("--burst", type = int, default = 10, help = "requests a client address may make at once after being idle")
+    parser.add_argument("--listening-backend", default = listeningBackend, help = 'speech recognizer for voice control, google, sphinx, or replay:<transcript path>')
+    parser.add_argument("--host", default = "127.0.0.1", help = "address to listen on")
+    parser.add_argument("--port", type = int, default = 5000, help = "port to listen on")
+
+    return parser.parse_args(a_Arguments)
+
+#ChatBot_Flask_Server::ParseArguments(a_Arguments)
 
 
 #Simply runs the server and prompts the user for their preferred intial input type
 if __name__ == "__main__":
 
-    LaunchAssistantFlask(voice)
+    LaunchAssistantFlask(0, ParseArguments())
 
 #Chatbot_Flask_Server.py
@@ -25,10 +25,6 @@
 #                                        languages can be chosen from though most options 
 #                                        are very bare bones
 #
-#            UbuntuCorpusTrainer     --> Downloads and trains off of the Ubuntu Dialogue corpus, 
-#                                        this is a very large corpus and takes an extremely 
-#                                        long time to both download as well as train
-#
 #            LevenshteinDistance     --> algorithm for deciding chatbot response similarity, 
 #                                        dictates how the chatbot responds to the user after 
 #                                        training has been complete 
@@ -36,15 +32,54 @@
 #            os                      --> standard python library for opening, reading, and 
 #                                        writing files
 #
+#            argparse                --> standard python library for the command line options
+#
+#            time                    --> standard python library, training throughput
+#
+#            sys                     --> standard python library, tells apart the units 
+#                                        the peak memory is reported in
+#
+#            resource                --> standard python library on linux and mac, peak 
+#                                        memory of the training process. psutil is used 
+#                                        on windows if it is installed
+#
 #            dialogueBot             --> necessary chatbot object being passed through 
-#                                        for the trainer to train
+#                                        for the trainer to train, imported only when 
+#                                        this file is run so that training worker 
+#                                        processes do not each build the chatbot
+#
+#            Sharded_Train           --> parallel training of the Cornell and Ubuntu 
+#                                        corpora across worker processes
+#
+#            Text_Normalizer         --> search terms written for every statement once 
+#                                        training is done
+#
+#            sqlalchemy              --> library the chatbot's storage is built on, used 
+#                                        to write the search terms in bulk
+#
+#            Training_Manifest       --> how much of every corpus has been trained, so 
+#                                        a stopped run resumes and a re-run only trains 
+#                                        what is new
+#
+#            Cornell_Corpus          --> trains the Cornell corpus conversation by 
+#                                        conversation while movie_lines.txt still has 
+#                                        its ids
 #
 #DESCRIPTION
 #
 #        This file is to be used to train the chatbot instance used within the 
 #        Virtual Assistant, it can be modified to train the chatbot with different 
 #        databases. If the chatbot needs to be wiped the database can be 
-#        deleted from the program's local directory.
+#        deleted from the program's local directory. After training the search 
+#        terms of the statements trained since the last run are written by 
+#        NormalizeCorpus(), so the statement index does not have to work them 
+#        out each time it starts, --normalize-only rewrites all of them. 
+#        The Cornell lines are trained by StreamTrain(), which reads and writes 
+#        them a batch at a time so memory stays flat however large the corpus is. 
+#        Progress through every corpus file is checkpointed in the training 
+#        manifest with each batch, so running this again after it was stopped, 
+#        or after lines were added to a corpus, trains only what is not in the 
+#        database yet. --show-manifest prints what has been trained.
 #
 #RETURNS
 #
@@ -63,12 +98,28 @@
 from chatterbot import ChatBot
 from chatterbot.trainers import ListTrainer
 from chatterbot.trainers import ChatterBotCorpusTrainer
-from chatterbot.trainers import UbuntuCorpusTrainer
 from chatterbot.comparisons import LevenshteinDistance
 from os.path import join
-from Assistant_Chatbot_Merge import dialogueBot
+import os
+import argparse
+import datetime
+import time
+import sys
+from Sharded_Train import ShardedTrainLines, ShardedTrainUbuntu
+from Text_Normalizer import SearchText, searchTable
+from Training_Manifest import TrainingManifest, Plan, manifestTable
+from Cornell_Corpus import HasFields, TrainCornell, LINES_FILE
+from sqlalchemy import select
+
+try:
+
+    import resource
+
+except ImportError:
+
+    resource = None
 
-#ChatBot_Train::ChatterbotTrain(a_DialogueBot) ChatBot_Train::ChatterbotTrain(a_DialogueBot)
+#ChatBot_Train::ChatterbotTrain(a_DialogueBot, a_BatchSize, a_Encoding, a_Workers, a_RetrainLines) ChatBot_Train::ChatterbotTrain(a_DialogueBot, a_BatchSize, a_Encoding, a_Workers, a_RetrainLines)
 #
 #NAME
 #
@@ -78,19 +129,34 @@ from Assistant_Chatbot_Merge import dialogueBot
 #
 #SYNOPSIS
 #
-#        void ChatBot_Train::ChatterbotTrain(a_DialogueBot)
+#        void ChatBot_Train::ChatterbotTrain(a_DialogueBot, a_BatchSize, a_Encoding, a_Workers, a_RetrainLines)
 #
 #            a_DialogueBot            --> variable passed from the 
 #                                         Assistant_Chatbot_Merge file that 
 #                                         holds the chatbot initialization 
 #                                         and settings
 #
-#            trainingData             --> object to open and store the database 
-#                                         file being used to train the chatbot instance
+#            a_BatchSize, a_Encoding  --> statements written per transaction and the 
+#                                         encoding of movie_lines.txt, see StreamTrain()
+#
+#            a_Workers                --> worker processes, above 1 the Cornell 
+#                                         corpus is trained by Sharded_Train, the 
+#                                         Ubuntu corpus always is
+#
+#            a_RetrainLines           --> replace Cornell conversations with the lines 
+#                                         of a movie_lines.txt cleaned since
+#
+#            trainer, trainedBy       --> how movie_lines.txt is to be trained now and 
+#                                         how the manifest says it was, "cornell" or 
+#                                         "lines"
+#
+#            manifest                 --> Training_Manifest::TrainingManifest of the 
+#                                         database, every corpus skips what it records 
+#                                         as trained
 #
 #            trainer1                 --> object to process and train the chatbot 
-#                                         via the ListTrainer utilizing the database 
-#                                         passed from trainingData
+#                                         via the ListTrainer utilizing the chatterbot 
+#                                         english corpus
 #
 #            trainer2                 --> similar to trainer1 this is an object to 
 #                                         process and train the chatbot utilizing 
@@ -102,7 +168,17 @@ from Assistant_Chatbot_Merge import dialogueBot
 #        to use my personal dialogue database, as well as the Ubuntu Dialogue Corpus 
 #        to get an even larger sample set. The trainers can be easily altered, 
 #        and to change the ListTrainer all that need be done is alter the file 
-#        being used for training.
+#        being used for training. While movie_lines.txt has not been through 
+#        Clean_Corpus, the Cornell corpus is trained by Cornell_Corpus::TrainCornell() 
+#        as its real conversations, otherwise the cleaned lines are trained as one 
+#        conversation. Which of the two trained movie_lines.txt is recorded in the 
+#        manifest, since they keep separate records, and once it has been trained 
+#        as Cornell conversations a cleaned file is not trained again as one chain 
+#        on top of them unless a_RetrainLines asks for the conversations to be 
+#        removed first. With more than one worker the two large corpora 
+#        are tagged in parallel and merged in order, giving the same database. 
+#        The chatterbot english corpus is trained once and recorded in the 
+#        manifest, since ListTrainer cannot resume part way through it.
 #
 #RETURNS
 #
@@ -119,21 +195,438 @@ from Assistant_Chatbot_Merge import dialogueBot
 #
 #        3:30pm 8/05/2021                                                          #
 
-def ChatterbotTrain(a_DialogueBot):
+def ChatterbotTrain(a_DialogueBot, a_BatchSize = 5000, a_Encoding = 'iso-8859-1', a_Workers = 1, a_RetrainLines = False):
+
+    manifest = TrainingManifest(a_DialogueBot.storage)
 
     #movie_lines.txt is by default in the installation directory of this program
-    trainingData = open('cornell movie-dialogs corpus/movie_lines.txt').read().splitlines()
+    trainer = "cornell" if HasFields(join('cornell movie-dialogs corpus', LINES_FILE), a_Encoding) else "lines"
+    trainedBy = manifest.Trainer(LINES_FILE)
+
+    #a database trained before the trainer was recorded still shows it in its sources
+    if trainedBy is None:
+
+        if manifest.Entries("cornell/"):
+
+            trainedBy = "cornell"
+
+        elif manifest.Get(LINES_FILE) is not None:
+
+            trainedBy = "lines"
+
+    if trainedBy == "cornell" and trainer == "lines" and not a_RetrainLines:
+
+        print(LINES_FILE, "was trained as Cornell conversations and has lost its fields since, most likely to Clean_Corpus.py, "
+              "so it is not trained again as lines. Restore it, or run with --retrain-lines to replace the conversations with the lines")
+
+    else:
+
+        if trainedBy == "cornell" and trainer == "lines":
+
+            print("removed", manifest.Forget(list(manifest.Entries("cornell/"))), "statements trained from the Cornell conversations")
+
+        manifest.RecordTrainer(LINES_FILE, trainer)
+
+        if trainer == "cornell":
+
+            TrainCornell(a_DialogueBot, 'cornell movie-dialogs corpus', max(1, a_Workers), a_BatchSize, a_Encoding, manifest)
+
+        elif a_Workers > 1:
+
+            ShardedTrainLines(a_DialogueBot, 'cornell movie-dialogs corpus/movie_lines.txt', a_Workers, a_BatchSize, a_Encoding, manifest)
+
+        else:
+
+            StreamTrain(a_DialogueBot, 'cornell movie-dialogs corpus/movie_lines.txt', a_BatchSize, a_Encoding, manifest)
+
+    if manifest.Get("chatterbot.corpus.english") is None:
+
+        trainer1 = ListTrainer(a_DialogueBot)
+        trainer1.train("chatterbot.corpus.english")
+
+        with a_DialogueBot.storage.engine.begin() as connection:
+
+            connection.execute(manifestTable.insert(), {'source': "chatterbot.corpus.english", 'updated_at': datetime.datetime.now()})
+
+    #UbuntuCorpusTrainer cannot resume, so its corpus always goes through Sharded_Train
+    ShardedTrainUbuntu(a_DialogueBot, max(1, a_Workers), a_BatchSize, manifest)
+
+    NormalizeCorpus(a_DialogueBot)
+
+#ChatBot_Train::ChatterbotTrain(a_DialogueBot, a_BatchSize, a_Encoding, a_Workers, a_RetrainLines)
+
+#ChatBot_Train::ReadBatches(a_Path, a_BatchSize, a_Encoding, a_Offset, a_Hash) ChatBot_Train::ReadBatches(a_Path, a_BatchSize, a_Encoding, a_Offset, a_Hash)
+#
+#NAME
+#
+#        ChatBot_Train::ReadBatches - reads a corpus file lazily, a batch of lines at 
+#                                     a time
+#
+#SYNOPSIS
+#
+#        gen ChatBot_Train::ReadBatches(a_Path, a_BatchSize, a_Encoding, a_Offset, a_Hash)
+#
+#            a_Path                   --> corpus file, one statement per line
+#
+#            a_BatchSize              --> lines in each batch
+#
+#            a_Encoding               --> encoding the lines are decoded with, the 
+#                                         Cornell corpus is iso-8859-1
+#
+#            a_Offset                 --> byte offset to start reading at
+#
+#            a_Hash                   --> hashlib object updated with every byte 
+#                                         read, or None
+#
+#DESCRIPTION
+#
+#        The file is read in binary through python's buffered reader, so only one 
+#        batch of lines is held at a time and the byte offset after each batch is 
+#        exact, whatever the encoding. Undecodable bytes are replaced rather than 
+#        stopping the run.
+#
+#RETURNS
+#
+#        Yields (list of decoded lines without their line endings, byte offset 
+#        just past the batch).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:15am 10/17/2026                                                          #
+
+def ReadBatches(a_Path, a_BatchSize = 5000, a_Encoding = 'iso-8859-1', a_Offset = 0, a_Hash = None):
+
+    with open(a_Path, 'rb') as corpusFile:
+
+        corpusFile.seek(a_Offset)
+
+        offset = a_Offset
+        lines = []
+
+        for line in corpusFile:
+
+            offset += len(line)
+
+            if a_Hash is not None:
+
+                a_Hash.update(line)
+
+            lines.append(line.decode(a_Encoding, 'replace').rstrip('\r\n'))
+
+            if len(lines) >= a_BatchSize:
+
+                yield lines, offset
+
+                lines = []
+
+        if lines:
+
+            yield lines, offset
+
+#ChatBot_Train::ReadBatches(a_Path, a_BatchSize, a_Encoding, a_Offset, a_Hash)
+
+#ChatBot_Train::PeakMemory() ChatBot_Train::PeakMemory()
+#
+#NAME
+#
+#        ChatBot_Train::PeakMemory - largest resident memory the training process 
+#                                    has used
+#
+#SYNOPSIS
+#
+#        float ChatBot_Train::PeakMemory()
+#
+#RETURNS
+#
+#        Returns the peak resident set size in megabytes, or None when neither 
+#        resource nor psutil is available.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:15am 10/17/2026                                                          #
+
+def PeakMemory():
+
+    if resource is not None:
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        #linux reports kilobytes and mac reports bytes
+        return peak / 1048576.0 if sys.platform == 'darwin' else peak / 1024.0
+
+    try:
+
+        import psutil
+
+    except ImportError:
+
+        return None
+
+    memory = psutil.Process().memory_info()
+
+    return getattr(memory, 'peak_wset', memory.rss) / 1048576.0
 
-    trainer1 = ListTrainer(a_DialogueBot)
-    trainer1.train(trainingData)
-    trainer1.train("chatterbot.corpus.english")
+#ChatBot_Train::PeakMemory()
 
-    trainer2 = UbuntuCorpusTrainer(a_DialogueBot)
-    trainer2.train()
+#ChatBot_Train::StreamTrain(a_DialogueBot, a_Path, a_BatchSize, a_Encoding, a_Manifest, a_Source) ChatBot_Train::StreamTrain(a_DialogueBot, a_Path, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+#
+#NAME
+#
+#        ChatBot_Train::StreamTrain - trains a corpus file as one conversation, the 
+#                                     way ListTrainer does, in bounded memory
+#
+#SYNOPSIS
+#
+#        int ChatBot_Train::StreamTrain(a_DialogueBot, a_Path, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+#
+#            a_DialogueBot            --> chatbot whose database is trained
+#
+#            a_Path                   --> corpus file, one statement per line
+#
+#            a_BatchSize              --> statements written in each transaction
+#
+#            a_Encoding               --> encoding of a_Path
+#
+#            a_Manifest               --> TrainingManifest to resume from and 
+#                                         checkpoint, or None to train the whole file
+#
+#            a_Source                 --> name of the file in the manifest, its base 
+#                                         name by default
+#
+#            previousText, previousSearchText
+#                                     --> the last statement of the batch before, 
+#                                         so each line still answers the one before 
+#                                         it across batches
+#
+#DESCRIPTION
+#
+#        ListTrainer needs the whole corpus as a list and then builds an ORM object 
+#        per statement before saving them all in one session. Here each batch of 
+#        lines is preprocessed, tagged, and written with a single executemany 
+#        insert in its own transaction, then dropped. Blank lines are skipped 
+#        rather than stored as empty statements. The statements written, their 
+#        rate, and the peak memory so far are printed after each batch. With a 
+#        manifest, reading starts after the bytes already trained and each 
+#        batch's transaction also records how far the file has been trained.
+#
+#RETURNS
+#
+#        Returns the number of statements written.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:15am 10/17/2026                                                          #
+
+def StreamTrain(a_DialogueBot, a_Path, a_BatchSize = 5000, a_Encoding = 'iso-8859-1', a_Manifest = None, a_Source = None):
+
+    storage = a_DialogueBot.storage
+    statementTable = storage.get_model('statement').__table__
+    Statement = storage.get_object('statement')
+
+    source = a_Source or os.path.basename(a_Path)
+    conversation = 'training'
+    plan = Plan()
+
+    if a_Manifest is not None:
+
+        plan = a_Manifest.PlanFile(source, a_Path)
+
+        if plan is None:
+
+            print(source, "is already trained")
+
+            return 0
+
+        conversation = a_Manifest.Conversation(source)
+
+    previousText = plan.lastText
+    previousSearchText = plan.lastSearchText
+
+    written = 0
+    started = time.perf_counter()
+
+    for lines, offset in ReadBatches(a_Path, a_BatchSize, a_Encoding, plan.start, plan.hasher):
+
+        rows = []
+
+        for line in lines:
+
+            statement = Statement(text = line)
+
+            for preprocessor in a_DialogueBot.preprocessors:
+
+                statement = preprocessor(statement)
+
+            if not statement.text:
+
+                continue
+
+            searchText = storage.tagger.get_text_index_string(statement.text)
+
+            rows.append({'text': statement.text,
+                         'search_text': searchText,
+                         'conversation': conversation,
+                         'persona': '',
+                         'in_response_to': previousText,
+                         'search_in_response_to': previousSearchText})
+
+            previousText = statement.text
+            previousSearchText = searchText
+
+        with storage.engine.begin() as connection:
+
+            if rows:
+
+                connection.execute(statementTable.insert(), rows)
+
+            if a_Manifest is not None:
+
+                a_Manifest.Checkpoint(connection, source, a_Path, offset, plan.hasher.hexdigest(), previousText, previousSearchText, plan.statements + written + len(rows))
+
+        written += len(rows)
+        elapsed = time.perf_counter() - started
+
+        peak = PeakMemory()
 
-#ChatBot_Train::ChatterbotTrain(a_DialogueBot)
+        print("\r" + a_Path + ":", written, "statements,", round(written / max(elapsed, 1e-9)), "statements/s, peak memory",
+              "unknown" if peak is None else str(round(peak)) + " MB", end = "", flush = True)
 
+    print()
+
+    return written
+
+#ChatBot_Train::StreamTrain(a_DialogueBot, a_Path, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+
+#ChatBot_Train::NormalizeCorpus(a_DialogueBot, a_BatchSize, a_Rebuild) ChatBot_Train::NormalizeCorpus(a_DialogueBot, a_BatchSize, a_Rebuild)
+#
+#NAME
+#
+#        ChatBot_Train::NormalizeCorpus - writes the search terms of the trained 
+#                                         statements into the statement_search table
+#
+#SYNOPSIS
+#
+#        int ChatBot_Train::NormalizeCorpus(a_DialogueBot, a_BatchSize, a_Rebuild)
+#
+#            a_DialogueBot            --> chatbot whose database is normalized
+#
+#            a_BatchSize              --> statements read and written at a time
+#
+#            a_Rebuild                --> empty the table and write every statement 
+#                                         again, for when SearchText() has changed
+#
+#            lastId                   --> id of the last statement written, each 
+#                                         batch is read from after it so the read 
+#                                         never holds a cursor open across the writes
+#
+#DESCRIPTION
+#
+#        The database is read only once trained, so the normalized, lowercased and 
+#        stopword stripped search terms of each statement (Text_Normalizer::SearchText) 
+#        only have to be worked out once. The training manifest records the id of 
+#        the last statement written, and only the statements after it are read, so 
+#        a run that trained a few new lines does not rewrite the whole table. The 
+#        table is emptied and written from the start with a_Rebuild, or when the 
+#        manifest has no record of it. The new rows and the mark are written in a 
+#        single transaction, so the statement index never reads half of them. 
+#        Statements without search terms are still indexed, only more slowly.
+#
+#RETURNS
+#
+#        Returns the number of statements written.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def NormalizeCorpus(a_DialogueBot, a_BatchSize = 5000, a_Rebuild = False):
+
+    engine = a_DialogueBot.storage.engine
+    statementTable = a_DialogueBot.storage.get_model('statement').__table__
+    manifest = TrainingManifest(a_DialogueBot.storage)
+
+    searchTable.create(engine, checkfirst = True)
+
+    written = 0
+    lastId = None if a_Rebuild else manifest.Normalized()
+
+    with engine.begin() as connection:
+
+        if lastId is None:
+
+            connection.execute(searchTable.delete())
+
+            lastId = 0
+
+        else:
+
+            connection.execute(searchTable.delete().where(searchTable.c.statement_id > lastId))
+
+        while True:
+
+            rows = connection.execute(select([statementTable.c.id, statementTable.c.text])
+                                      .where(statementTable.c.id > lastId)
+                                      .order_by(statementTable.c.id)
+                                      .limit(a_BatchSize)).fetchall()
+
+            if not rows:
+
+                break
+
+            connection.execute(searchTable.insert(), [{'statement_id': statementId, 'search_terms': SearchText(text or "")} for statementId, text in rows])
+
+            written += len(rows)
+            lastId = rows[-1][0]
+
+        manifest.MarkNormalized(connection, lastId)
+
+    print("Wrote search terms for", written, "statements")
+
+    return written
+
+#ChatBot_Train::NormalizeCorpus(a_DialogueBot, a_BatchSize, a_Rebuild)
+
+#Trains the chatbot, or with --normalize-only just rewrites the search terms of 
+#an already trained database, or with --show-manifest prints its training progress
 if __name__ == "__main__":
-    ChatterbotTrain(dialogueBot)
+
+    parser = argparse.ArgumentParser(description = "Train the chatbot's database.")
+    parser.add_argument("--normalize-only", action = "store_true", help = "skip training and only rewrite the statement search terms")
+    parser.add_argument("--batch-size", type = int, default = 5000, help = "statements written per transaction while streaming a corpus file")
+    parser.add_argument("--encoding", default = "iso-8859-1", help = "encoding of the corpus files")
+    parser.add_argument("--workers", type = int, default = 1, help = "worker processes tagging the Cornell and Ubuntu corpora, see Sharded_Train.py for a scaling benchmark")
+    parser.add_argument("--show-manifest", action = "store_true", help = "print how much of every corpus has been trained and exit")
+    parser.add_argument("--retrain-lines", action = "store_true", help = "replace the Cornell conversations with the lines of a cleaned movie_lines.txt")
+    arguments = parser.parse_args()
+
+    from Assistant_Chatbot_Merge import dialogueBot
+
+    if arguments.show_manifest:
+
+        TrainingManifest(dialogueBot.storage).Report()
+
+    elif arguments.normalize_only:
+
+        NormalizeCorpus(dialogueBot, a_Rebuild = True)
+
+    else:
+
+        ChatterbotTrain(dialogueBot, arguments.batch_size, arguments.encoding, arguments.workers, arguments.retrain_lines)
 
 #ChatBot_Train.py
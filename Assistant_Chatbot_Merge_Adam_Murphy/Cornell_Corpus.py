@@ -0,0 +1,965 @@
+#Cornell_Corpus.py
+#
+#NAME
+#
+#        Cornell_Corpus - reads the raw Cornell movie-dialogs corpus into compact
+#                         columns with integer ids, rebuilds its real conversations,
+#                         and trains the chatbot on them exchange by exchange.
+#
+#SYNOPSIS
+#
+#        Cornell_Corpus.py
+#
+#            array                 --> standard python library, the integer and float
+#                                      columns
+#
+#            json, struct          --> standard python library, the header of the
+#                                      binary cache
+#
+#            os, tempfile          --> standard python library, source signatures and
+#                                      the atomic cache write
+#
+#            re                    --> standard python library, the line ids and
+#                                      genres written as python lists in the corpus
+#
+#            sys                   --> standard python library, interns the repeated
+#                                      strings
+#
+#            time, argparse        --> standard python library, the load benchmark
+#
+#            Sharded_Train         --> tags the conversations in worker processes and
+#                                      merges them in order
+#
+#            Training_Manifest     --> resumes and checkpoints the training
+#
+#            CornellCorpus         --> the corpus as columns
+#
+#DESCRIPTION
+#
+#        Clean_Corpus strips movie_lines.txt down to its text, and ChatBot_Train then
+#        trains the whole file as one conversation, so every line is stored as the
+#        answer to whatever line came before it, across scenes and across movies.
+#        The corpus already says which lines answer which. movie_conversations.txt
+#        lists the line ids of every conversation in order, and movie_lines.txt
+#        gives each line its id, character, and movie.
+#
+#        Here the raw files are parsed once into columns, arrays of integers and a
+#        single string holding every line's text with an array of offsets into it.
+#        Character names, genders, credit positions, years, and genres repeat
+#        across rows and are interned. Ids such as L1045, u0, and m0 become rows
+#        in their tables. The columns are written to a binary cache beside the
+#        corpus, stamped with the size and modification time of every source
+#        file, so later runs load them in a fraction of the time parsing takes.
+#        Training stores every conversation as its own chain of statements, the
+#        first line answering nothing and each later line answering the one
+#        before it. If movie_conversations.txt is missing, runs of consecutive
+#        line ids in the same movie stand in for conversations. A run ends where
+#        the ids skip or one character speaks twice in a row, which is close to
+#        the corpus's own conversations but not exact.
+#
+#RETURNS
+#
+#        When run directly prints how long parsing and loading the cache take, the
+#        size of the columns, and how many of the links a single chain would make
+#        are not real exchanges. Otherwise provides LoadCorpus() and TrainCornell()
+#        for ChatBot_Train to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+import array
+import json
+import struct
+import os
+import tempfile
+import re
+import sys
+import time
+import argparse
+from Sharded_Train import ShardedTrain, TrainConversationsShard
+from Training_Manifest import Plan, HashRange, HashFile
+
+#separator between the fields of every corpus file
+FIELD_SEPARATOR = " +++$+++ "
+
+#the corpus files, by what they hold
+LINES_FILE = "movie_lines.txt"
+CHARACTERS_FILE = "movie_characters_metadata.txt"
+TITLES_FILE = "movie_titles_metadata.txt"
+CONVERSATIONS_FILE = "movie_conversations.txt"
+
+#first bytes of the binary cache, bumped whenever its columns change
+CACHE_MAGIC = b"CORNELL1"
+CACHE_NAME = "cornell_corpus.cache"
+
+#most conversations in one training shard, so each merge checkpoints a bounded amount of work
+CONVERSATION_SHARD_SIZE = 5000
+
+LINE_IDS = re.compile(r"L(\d+)")
+GENRES = re.compile(r"'([^']*)'")
+
+#Cornell_Corpus::CornellCorpus Cornell_Corpus::CornellCorpus
+#
+#NAME
+#
+#        Cornell_Corpus::CornellCorpus - the corpus as columns
+#
+#SYNOPSIS
+#
+#        obj Cornell_Corpus::CornellCorpus()
+#
+#            movieIds, movieTitles, movieYears, movieRatings, movieVotes, movieGenres
+#                             --> one entry per movie, m0 has movie id 0. Genres
+#                                 are joined with commas
+#
+#            characterIds, characterNames, characterMovies, characterGenders,
+#            characterPositions
+#                             --> one entry per character, characterMovies holds
+#                                 movie rows
+#
+#            lineIds, lineCharacters, lineMovies
+#                             --> one entry per line, holding character and movie
+#                                 rows
+#
+#            lineText, lineOffsets
+#                             --> the text of every line in one string, line row r
+#                                 is lineText[lineOffsets[r]:lineOffsets[r + 1]]
+#
+#            lineRows         --> line row of every line id, -1 where there is none
+#
+#            conversationStarts, conversationLines
+#                             --> the line rows of conversation c are
+#                                 conversationLines[conversationStarts[c]:
+#                                 conversationStarts[c + 1]]
+#
+#            conversationMovies, conversationEnds
+#                             --> movie row of each conversation and the byte offset
+#                                 just past it in movie_conversations.txt
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see
+#        Text(), Conversations(), and Exchanges().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+class CornellCorpus:
+
+    #every column, its kind, and the array typecode of the numeric ones
+    COLUMNS = (('movieIds', 'array', 'l'), ('movieTitles', 'strings', None), ('movieYears', 'strings', None), ('movieRatings', 'array', 'd'),
+               ('movieVotes', 'array', 'l'), ('movieGenres', 'strings', None),
+               ('characterIds', 'array', 'l'), ('characterNames', 'strings', None), ('characterMovies', 'array', 'l'), ('characterGenders', 'strings', None),
+               ('characterPositions', 'strings', None),
+               ('lineIds', 'array', 'l'), ('lineCharacters', 'array', 'l'), ('lineMovies', 'array', 'l'), ('lineText', 'text', None), ('lineOffsets', 'array', 'q'),
+               ('lineRows', 'array', 'l'),
+               ('conversationStarts', 'array', 'q'), ('conversationLines', 'array', 'l'), ('conversationMovies', 'array', 'l'), ('conversationEnds', 'array', 'q'))
+
+    def __init__(self):
+
+        for name, kind, typecode in self.COLUMNS:
+
+            if kind == 'array':
+
+                setattr(self, name, array.array(typecode))
+
+            elif kind == 'strings':
+
+                setattr(self, name, [])
+
+            else:
+
+                setattr(self, name, "")
+
+        self.conversationStarts.append(0)
+
+    #CornellCorpus::Text(a_Row)
+    #
+    #DESCRIPTION
+    #
+    #        The text of the line at line row a_Row.
+    #
+    #RETURNS
+    #
+    #        Returns the text as a string.
+
+    def Text(self, a_Row):
+
+        return self.lineText[self.lineOffsets[a_Row]:self.lineOffsets[a_Row + 1]]
+
+    #CornellCorpus::Conversations()
+    #
+    #DESCRIPTION
+    #
+    #        The conversations of the corpus in the order they are listed, or the
+    #        runs of consecutive line ids that stand in for them when
+    #        movie_conversations.txt was missing.
+    #
+    #RETURNS
+    #
+    #        Returns a list of (list of line rows, byte offset past the conversation
+    #        in movie_conversations.txt or None).
+
+    def Conversations(self):
+
+        if len(self.conversationEnds):
+
+            return [(list(self.conversationLines[self.conversationStarts[number]:self.conversationStarts[number + 1]]), self.conversationEnds[number])
+                    for number in range(len(self.conversationEnds))]
+
+        order = sorted(range(len(self.lineIds)), key = lambda row: (self.lineMovies[row], self.lineIds[row]))
+
+        conversations = []
+        run = []
+
+        for row in order:
+
+            if run:
+
+                previous = run[-1]
+
+                if (self.lineMovies[row] != self.lineMovies[previous] or self.lineIds[row] != self.lineIds[previous] + 1 or
+                    self.lineCharacters[row] == self.lineCharacters[previous]):
+
+                    conversations.append((run, None))
+                    run = []
+
+            run.append(row)
+
+        if run:
+
+            conversations.append((run, None))
+
+        return conversations
+
+    #CornellCorpus::Exchanges()
+    #
+    #DESCRIPTION
+    #
+    #        Every prompt and the line that answers it, within each conversation.
+    #
+    #RETURNS
+    #
+    #        Yields (prompt line row, response line row).
+
+    def Exchanges(self):
+
+        for rows, end in self.Conversations():
+
+            for prompt, response in zip(rows, rows[1:]):
+
+                yield prompt, response
+
+#Cornell_Corpus::CornellCorpus
+
+#Cornell_Corpus::ReadRecords(a_Path, a_Encoding, a_Fields) Cornell_Corpus::ReadRecords(a_Path, a_Encoding, a_Fields)
+#
+#NAME
+#
+#        Cornell_Corpus::ReadRecords - splits the lines of a corpus file into their
+#                                      fields
+#
+#SYNOPSIS
+#
+#        gen Cornell_Corpus::ReadRecords(a_Path, a_Encoding, a_Fields)
+#
+#            a_Path           --> corpus file
+#
+#            a_Encoding       --> encoding of a_Path, undecodable bytes are replaced
+#
+#            a_Fields         --> fields on every line, the last is never split so
+#                                 a separator in a line's text is kept
+#
+#RETURNS
+#
+#        Yields (list of fields, byte offset just past the line). Lines with too few
+#        fields are skipped.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def ReadRecords(a_Path, a_Encoding, a_Fields):
+
+    offset = 0
+
+    with open(a_Path, 'rb') as corpusFile:
+
+        for line in corpusFile:
+
+            offset += len(line)
+
+            fields = line.decode(a_Encoding, 'replace').rstrip('\r\n').split(FIELD_SEPARATOR, a_Fields - 1)
+
+            if len(fields) == a_Fields:
+
+                yield fields, offset
+
+#Cornell_Corpus::ReadRecords(a_Path, a_Encoding, a_Fields)
+
+#Cornell_Corpus::HasFields(a_Path, a_Encoding) Cornell_Corpus::HasFields(a_Path, a_Encoding)
+#
+#NAME
+#
+#        Cornell_Corpus::HasFields - tells a raw movie_lines.txt from one Clean_Corpus
+#                                    has already stripped
+#
+#SYNOPSIS
+#
+#        bool Cornell_Corpus::HasFields(a_Path, a_Encoding)
+#
+#            a_Path           --> movie_lines.txt
+#
+#            a_Encoding       --> encoding of a_Path
+#
+#RETURNS
+#
+#        Returns True if the first line of a_Path still has all five fields.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def HasFields(a_Path, a_Encoding = 'iso-8859-1'):
+
+    if not os.path.exists(a_Path):
+
+        return False
+
+    with open(a_Path, 'rb') as corpusFile:
+
+        return corpusFile.readline().decode(a_Encoding, 'replace').count(FIELD_SEPARATOR) >= 4
+
+#Cornell_Corpus::HasFields(a_Path, a_Encoding)
+
+#Cornell_Corpus::ParseCorpus(a_Directory, a_Encoding) Cornell_Corpus::ParseCorpus(a_Directory, a_Encoding)
+#
+#NAME
+#
+#        Cornell_Corpus::ParseCorpus - reads the corpus files into a CornellCorpus
+#
+#SYNOPSIS
+#
+#        obj Cornell_Corpus::ParseCorpus(a_Directory, a_Encoding)
+#
+#            a_Directory      --> directory holding the corpus files
+#
+#            a_Encoding       --> encoding of the corpus files
+#
+#DESCRIPTION
+#
+#        Only movie_lines.txt has to be there. A character or movie the metadata
+#        does not list is added from the line that names it, with what the line
+#        says about it.
+#
+#RETURNS
+#
+#        Returns the CornellCorpus.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def ParseCorpus(a_Directory, a_Encoding = 'iso-8859-1'):
+
+    corpus = CornellCorpus()
+
+    movieRows = {}
+    characterRows = {}
+
+    def AddMovie(a_Id, a_Title = "", a_Year = "", a_Rating = 0.0, a_Votes = 0, a_Genres = ""):
+
+        movieRows[a_Id] = len(corpus.movieIds)
+
+        corpus.movieIds.append(int(a_Id[1:]))
+        corpus.movieTitles.append(a_Title)
+        corpus.movieYears.append(sys.intern(a_Year))
+        corpus.movieRatings.append(a_Rating)
+        corpus.movieVotes.append(a_Votes)
+        corpus.movieGenres.append(sys.intern(a_Genres))
+
+        return movieRows[a_Id]
+
+    def AddCharacter(a_Id, a_Name, a_Movie, a_Gender = "?", a_Position = "?"):
+
+        characterRows[a_Id] = len(corpus.characterIds)
+
+        corpus.characterIds.append(int(a_Id[1:]))
+        corpus.characterNames.append(sys.intern(a_Name))
+        corpus.characterMovies.append(movieRows[a_Movie] if a_Movie in movieRows else AddMovie(a_Movie))
+        corpus.characterGenders.append(sys.intern(a_Gender.lower()))
+        corpus.characterPositions.append(sys.intern(a_Position))
+
+        return characterRows[a_Id]
+
+    titlesPath = os.path.join(a_Directory, TITLES_FILE)
+
+    if os.path.exists(titlesPath):
+
+        for (movieId, title, year, rating, votes, genres), offset in ReadRecords(titlesPath, a_Encoding, 6):
+
+            AddMovie(movieId, title, year, float(rating or 0), int(votes or 0), ",".join(GENRES.findall(genres)))
+
+    charactersPath = os.path.join(a_Directory, CHARACTERS_FILE)
+
+    if os.path.exists(charactersPath):
+
+        for (characterId, name, movieId, title, gender, position), offset in ReadRecords(charactersPath, a_Encoding, 6):
+
+            AddCharacter(characterId, name, movieId, gender, position)
+
+    texts = []
+    length = 0
+
+    corpus.lineOffsets.append(0)
+
+    for (lineId, characterId, movieId, name, text), offset in ReadRecords(os.path.join(a_Directory, LINES_FILE), a_Encoding, 5):
+
+        if movieId not in movieRows:
+
+            AddMovie(movieId)
+
+        corpus.lineIds.append(int(lineId[1:]))
+        corpus.lineCharacters.append(characterRows[characterId] if characterId in characterRows else AddCharacter(characterId, name, movieId))
+        corpus.lineMovies.append(movieRows[movieId])
+
+        texts.append(text)
+        length += len(text)
+
+        corpus.lineOffsets.append(length)
+
+    corpus.lineText = "".join(texts)
+    corpus.lineRows = array.array('l', [-1]) * ((max(corpus.lineIds) + 1) if corpus.lineIds else 0)
+
+    for row, lineId in enumerate(corpus.lineIds):
+
+        corpus.lineRows[lineId] = row
+
+    conversationsPath = os.path.join(a_Directory, CONVERSATIONS_FILE)
+
+    if os.path.exists(conversationsPath):
+
+        for (firstCharacter, secondCharacter, movieId, lineIds), offset in ReadRecords(conversationsPath, a_Encoding, 4):
+
+            for lineId in LINE_IDS.findall(lineIds):
+
+                lineId = int(lineId)
+
+                #lines the conversation lists but movie_lines.txt does not have are left out
+                if lineId < len(corpus.lineRows) and corpus.lineRows[lineId] >= 0:
+
+                    corpus.conversationLines.append(corpus.lineRows[lineId])
+
+            corpus.conversationStarts.append(len(corpus.conversationLines))
+            corpus.conversationMovies.append(movieRows.get(movieId, -1))
+            corpus.conversationEnds.append(offset)
+
+    return corpus
+
+#Cornell_Corpus::ParseCorpus(a_Directory, a_Encoding)
+
+#Cornell_Corpus::SourceSignature(a_Directory, a_Encoding) Cornell_Corpus::SourceSignature(a_Directory, a_Encoding)
+#
+#NAME
+#
+#        Cornell_Corpus::SourceSignature - what the cache was built from
+#
+#SYNOPSIS
+#
+#        list Cornell_Corpus::SourceSignature(a_Directory, a_Encoding)
+#
+#RETURNS
+#
+#        Returns the encoding and the name, size, and modification time of every
+#        corpus file, None for a file that is missing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def SourceSignature(a_Directory, a_Encoding):
+
+    signature = [a_Encoding]
+
+    for name in (LINES_FILE, CHARACTERS_FILE, TITLES_FILE, CONVERSATIONS_FILE):
+
+        path = os.path.join(a_Directory, name)
+
+        if os.path.exists(path):
+
+            status = os.stat(path)
+
+            signature.append([name, status.st_size, status.st_mtime_ns])
+
+        else:
+
+            signature.append([name, None])
+
+    return signature
+
+#Cornell_Corpus::SourceSignature(a_Directory, a_Encoding)
+
+#Cornell_Corpus::WriteCache(a_Corpus, a_Path, a_Signature) Cornell_Corpus::WriteCache(a_Corpus, a_Path, a_Signature)
+#
+#NAME
+#
+#        Cornell_Corpus::WriteCache - writes the columns to the binary cache
+#
+#SYNOPSIS
+#
+#        void Cornell_Corpus::WriteCache(a_Corpus, a_Path, a_Signature)
+#
+#            a_Corpus         --> CornellCorpus to write
+#
+#            a_Path           --> cache file
+#
+#            a_Signature      --> SourceSignature() of the files a_Corpus was parsed
+#                                 from
+#
+#DESCRIPTION
+#
+#        The cache is CACHE_MAGIC, the length of a json header, the header, then
+#        the raw bytes of every column in COLUMNS order. Arrays are written as
+#        they are in memory, string columns as utf-8 joined by newlines, which no
+#        field can hold. It is written to a temporary file renamed into place.
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def WriteCache(a_Corpus, a_Path, a_Signature):
+
+    blocks = []
+    columns = []
+
+    for name, kind, typecode in CornellCorpus.COLUMNS:
+
+        column = getattr(a_Corpus, name)
+
+        if kind == 'array':
+
+            block = column.tobytes()
+
+        elif kind == 'strings':
+
+            block = "\n".join(column).encode('utf-8')
+
+        else:
+
+            block = column.encode('utf-8')
+
+        blocks.append(block)
+        columns.append([name, len(column), len(block)])
+
+    header = json.dumps({'signature': a_Signature, 'byteorder': sys.byteorder,
+                         'itemsizes': {typecode: array.array(typecode).itemsize for typecode in 'ldq'}, 'columns': columns}).encode('utf-8')
+
+    descriptor, temporaryPath = tempfile.mkstemp(prefix = ".cornell-", suffix = ".tmp", dir = os.path.dirname(os.path.abspath(a_Path)))
+
+    try:
+
+        with open(descriptor, 'wb') as cacheFile:
+
+            cacheFile.write(CACHE_MAGIC + struct.pack('<I', len(header)) + header)
+
+            for block in blocks:
+
+                cacheFile.write(block)
+
+        os.replace(temporaryPath, a_Path)
+
+    except BaseException:
+
+        os.remove(temporaryPath)
+
+        raise
+
+#Cornell_Corpus::WriteCache(a_Corpus, a_Path, a_Signature)
+
+#Cornell_Corpus::ReadCache(a_Path, a_Signature) Cornell_Corpus::ReadCache(a_Path, a_Signature)
+#
+#NAME
+#
+#        Cornell_Corpus::ReadCache - loads the columns from the binary cache
+#
+#SYNOPSIS
+#
+#        obj Cornell_Corpus::ReadCache(a_Path, a_Signature)
+#
+#            a_Path           --> cache file
+#
+#            a_Signature      --> SourceSignature() of the corpus files now
+#
+#RETURNS
+#
+#        Returns the CornellCorpus, or None if there is no cache, it was written
+#        from other files or on a machine with other array sizes, or it is not a
+#        cache this version writes.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def ReadCache(a_Path, a_Signature):
+
+    if not os.path.exists(a_Path):
+
+        return None
+
+    with open(a_Path, 'rb') as cacheFile:
+
+        data = cacheFile.read()
+
+    if data[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+
+        return None
+
+    start = len(CACHE_MAGIC) + 4
+    headerLength, = struct.unpack('<I', data[len(CACHE_MAGIC):start])
+
+    try:
+
+        header = json.loads(data[start:start + headerLength].decode('utf-8'))
+
+    except ValueError:
+
+        return None
+
+    if (header.get('signature') != a_Signature or header.get('byteorder') != sys.byteorder or
+        header.get('itemsizes') != {typecode: array.array(typecode).itemsize for typecode in 'ldq'} or
+        [column[0] for column in header.get('columns', [])] != [name for name, kind, typecode in CornellCorpus.COLUMNS]):
+
+        return None
+
+    corpus = CornellCorpus()
+    view = memoryview(data)
+    offset = start + headerLength
+
+    for (name, kind, typecode), (columnName, count, size) in zip(CornellCorpus.COLUMNS, header['columns']):
+
+        block = view[offset:offset + size]
+        offset += size
+
+        if kind == 'array':
+
+            column = array.array(typecode)
+            column.frombytes(block)
+
+        elif kind == 'strings':
+
+            column = list(map(sys.intern, bytes(block).decode('utf-8').split("\n"))) if count else []
+
+        else:
+
+            column = bytes(block).decode('utf-8')
+
+        setattr(corpus, name, column)
+
+    return corpus
+
+#Cornell_Corpus::ReadCache(a_Path, a_Signature)
+
+#Cornell_Corpus::LoadCorpus(a_Directory, a_Encoding, a_CachePath) Cornell_Corpus::LoadCorpus(a_Directory, a_Encoding, a_CachePath)
+#
+#NAME
+#
+#        Cornell_Corpus::LoadCorpus - the corpus from the cache, parsing it only when
+#                                     the cache is missing or stale
+#
+#SYNOPSIS
+#
+#        obj Cornell_Corpus::LoadCorpus(a_Directory, a_Encoding, a_CachePath)
+#
+#            a_Directory      --> directory holding the corpus files
+#
+#            a_Encoding       --> encoding of the corpus files
+#
+#            a_CachePath      --> cache file, CACHE_NAME in a_Directory by default
+#
+#RETURNS
+#
+#        Returns the CornellCorpus.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def LoadCorpus(a_Directory, a_Encoding = 'iso-8859-1', a_CachePath = None):
+
+    cachePath = a_CachePath or os.path.join(a_Directory, CACHE_NAME)
+    signature = SourceSignature(a_Directory, a_Encoding)
+
+    corpus = ReadCache(cachePath, signature)
+
+    if corpus is None:
+
+        corpus = ParseCorpus(a_Directory, a_Encoding)
+
+        WriteCache(corpus, cachePath, signature)
+
+    return corpus
+
+#Cornell_Corpus::LoadCorpus(a_Directory, a_Encoding, a_CachePath)
+
+#Cornell_Corpus::TrainCornell(a_DialogueBot, a_Directory, a_Workers, a_BatchSize, a_Encoding, a_Manifest) Cornell_Corpus::TrainCornell(a_DialogueBot, a_Directory, a_Workers, a_BatchSize, a_Encoding, a_Manifest)
+#
+#NAME
+#
+#        Cornell_Corpus::TrainCornell - trains the chatbot on the corpus's
+#                                       conversations
+#
+#SYNOPSIS
+#
+#        int Cornell_Corpus::TrainCornell(a_DialogueBot, a_Directory, a_Workers, a_BatchSize, a_Encoding, a_Manifest)
+#
+#            a_DialogueBot    --> chatbot whose database is trained
+#
+#            a_Directory      --> directory holding the raw corpus files
+#
+#            a_Workers        --> worker processes tagging the conversations
+#
+#            a_BatchSize      --> statements written per transaction
+#
+#            a_Encoding       --> encoding of the corpus files
+#
+#            a_Manifest       --> TrainingManifest to resume from and checkpoint,
+#                                 or None to train every conversation
+#
+#            plan             --> Training_Manifest::Plan, carried on past the last
+#                                 conversation of each shard as it is merged
+#
+#DESCRIPTION
+#
+#        The conversations are cut into shards of whole conversations and
+#        trained through Sharded_Train, with the speaker's name as the persona.
+#        The manifest follows movie_conversations.txt by byte offset, so an
+#        interrupted run resumes at the next conversation and conversations
+#        added to the end of the file are trained on the next run. Statements
+#        trained from movie_lines.txt as one chain by an earlier run are removed
+#        first, as they hold the links this replaces. Without
+#        movie_conversations.txt the source is movie_lines.txt, trained whole.
+#
+#RETURNS
+#
+#        Returns the number of statements trained.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def TrainCornell(a_DialogueBot, a_Directory, a_Workers = 1, a_BatchSize = 5000, a_Encoding = 'iso-8859-1', a_Manifest = None):
+
+    corpus = LoadCorpus(a_Directory, a_Encoding)
+
+    resumable = len(corpus.conversationEnds) > 0
+    path = os.path.join(a_Directory, CONVERSATIONS_FILE if resumable else LINES_FILE)
+    source = "cornell/" + os.path.basename(path)
+
+    conversation = 'training'
+    plan = Plan()
+
+    if a_Manifest is not None:
+
+        plan = a_Manifest.PlanFile(source, path, resumable)
+
+        if plan is None:
+
+            print(source, "is already trained")
+
+            return 0
+
+        conversation = a_Manifest.Conversation(source)
+
+        if a_Manifest.Get(LINES_FILE) is not None:
+
+            print("removed", a_Manifest.Forget([LINES_FILE]), "statements trained from", LINES_FILE, "as a single conversation")
+
+    conversations = [(rows, end) for rows, end in corpus.Conversations() if end is None or end > plan.start]
+
+    if not conversations:
+
+        return 0
+
+    shardCount = max(1, min(len(conversations), 4 * a_Workers), -(-len(conversations) // CONVERSATION_SHARD_SIZE))
+    shards = [conversations[len(conversations) * number // shardCount:len(conversations) * (number + 1) // shardCount] for number in range(shardCount)]
+
+    tasks = [([[(corpus.Text(row), corpus.characterNames[corpus.lineCharacters[row]]) for row in rows] for rows, end in shard], conversation, a_BatchSize)
+             for shard in shards]
+
+    def Checkpoint(a_Connection, a_Number, a_LastStatement, a_Conversations):
+
+        plan.statements += a_Conversations[conversation]
+
+        if a_Number == len(shards) - 1:
+
+            end = os.path.getsize(path)
+
+        elif resumable:
+
+            end = shards[a_Number][-1][1]
+
+        else:
+
+            #a source trained whole is marked as started but not finished, so a
+            #stopped run has its statements removed and is trained again
+            a_Manifest.Checkpoint(a_Connection, source, path, 0, HashFile(path, 0).hexdigest(), None, '', plan.statements)
+
+            return
+
+        if resumable:
+
+            HashRange(plan.hasher, path, plan.start, end)
+
+        else:
+
+            plan.hasher = HashFile(path)
+
+        plan.start = end
+
+        a_Manifest.Checkpoint(a_Connection, source, path, end, plan.hasher.hexdigest(), None, '', plan.statements)
+
+    return ShardedTrain(a_DialogueBot, TrainConversationsShard, tasks, a_Workers, a_BatchSize, None if a_Manifest is None else Checkpoint)
+
+#Cornell_Corpus::TrainCornell(a_DialogueBot, a_Directory, a_Workers, a_BatchSize, a_Encoding, a_Manifest)
+
+#Cornell_Corpus::BenchmarkLoading(a_Directory, a_Encoding) Cornell_Corpus::BenchmarkLoading(a_Directory, a_Encoding)
+#
+#NAME
+#
+#        Cornell_Corpus::BenchmarkLoading - times parsing against the cache and
+#                                           counts the links the conversations save
+#
+#SYNOPSIS
+#
+#        void Cornell_Corpus::BenchmarkLoading(a_Directory, a_Encoding)
+#
+#            a_Directory      --> directory holding the raw corpus files
+#
+#            a_Encoding       --> encoding of the corpus files
+#
+#DESCRIPTION
+#
+#        The cache is written to a temporary file so the one beside the corpus is
+#        left alone. A single chain over movie_lines.txt, the way ChatBot_Train
+#        trains a cleaned file, links every line to the one before it. Those
+#        links are compared with the real exchanges.
+#
+#RETURNS
+#
+#        Prints the times, sizes, and link counts, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def BenchmarkLoading(a_Directory, a_Encoding = 'iso-8859-1'):
+
+    signature = SourceSignature(a_Directory, a_Encoding)
+    cachePath = os.path.join(tempfile.mkdtemp(), CACHE_NAME)
+
+    try:
+
+        started = time.perf_counter()
+        corpus = ParseCorpus(a_Directory, a_Encoding)
+        parsed = time.perf_counter()
+
+        WriteCache(corpus, cachePath, signature)
+        written = time.perf_counter()
+
+        loaded = ReadCache(cachePath, signature)
+        finished = time.perf_counter()
+
+        cacheSize = os.path.getsize(cachePath)
+
+    finally:
+
+        if os.path.exists(cachePath):
+
+            os.remove(cachePath)
+
+        os.rmdir(os.path.dirname(cachePath))
+
+    print(len(corpus.movieIds), "movies,", len(corpus.characterIds), "characters,", len(corpus.lineIds), "lines,",
+          len(corpus.conversationEnds), "conversations")
+    print("parse", round(parsed - started, 3), "s, write cache", round(written - parsed, 3), "s, load cache", round(finished - written, 3), "s,",
+          round((parsed - started) / max(finished - written, 1e-9), 1), "times faster,", round(cacheSize / 1048576.0, 1), "MB cache")
+
+    #the lines in file order, which is the order a cleaned file is trained in
+    exchanges = set(loaded.Exchanges())
+    chain = 0
+    real = 0
+
+    for row in range(1, len(loaded.lineIds)):
+
+        chain += 1
+
+        if (row - 1, row) in exchanges:
+
+            real += 1
+
+    print(len(exchanges), "exchanges, a single chain makes", chain, "links of which", real, "are exchanges and", chain - real, "are not")
+
+#Cornell_Corpus::BenchmarkLoading(a_Directory, a_Encoding)
+
+
+#Benchmarks parsing against the cache on the raw corpus
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Measure loading the Cornell corpus into columns.")
+    parser.add_argument("--corpus", default = "cornell movie-dialogs corpus", help = "directory holding the raw corpus files")
+    parser.add_argument("--encoding", default = "iso-8859-1", help = "encoding of the corpus files")
+    arguments = parser.parse_args()
+
+    BenchmarkLoading(arguments.corpus, arguments.encoding)
+
+#Cornell_Corpus.py
@@ -0,0 +1,550 @@
+#Intent_Router.py
+#
+#NAME
+#
+#        Intent_Router - single registry of every Virtual Assistant command and the
+#                        compiled keyword automaton used to route a query to its handler.
+#
+#SYNOPSIS
+#
+#        Intent_Router.py
+#
+#            collections           --> standard python library, deque is used as the
+#                                      breadth first queue when building failure links
+#
+#            timeit                --> standard python library used by the routing
+#                                      microbenchmark when this file is run directly
+#
+#            INTENT_TABLE          --> ordered list of every command the Virtual Assistant
+#                                      understands along with the keywords that trigger it,
+#                                      earlier entries win when more than one keyword is found
+#
+#            IntentRouter          --> object that matches queries against the registered
+#                                      keywords and dispatches them
+#
+#            AUTOMATON_KEYWORDS    --> keyword count above which the keywords are compiled
+#                                      into an Aho-Corasick automaton
+#
+#            TERMINAL_FIRST        --> intents the terminal checks before the rest of the
+#                                      table, in its original order
+#
+#DESCRIPTION
+#
+#        Both the terminal Virtual Assistant and the flask server used to walk their own
+#        chain of 'if "..." in query' statements, scanning the whole query again for
+#        every command and slowly drifting apart from each other. This file holds the
+#        one table of commands both of them share. When more than one keyword is
+#        present the command listed first wins, so "open google" is always chosen
+#        over "google". With the assistant's handful of commands the plain chain of
+#        substring checks is the fastest way to match, a few C level scans of a
+#        short query. Only past AUTOMATON_KEYWORDS keywords, where the chain's cost
+#        per command overtakes it, are the keywords compiled into a multi-pattern
+#        automaton that finds every keyword in one pass over the query.
+#
+#RETURNS
+#
+#        When run directly prints a microbenchmark of the per-query routing cost of the
+#        automaton against the chain of substring checks as the command set grows, the
+#        crossover it shows is what AUTOMATON_KEYWORDS is set from. Otherwise provides the IntentRouter object for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:10pm 10/17/2026                                                          #
+
+from collections import deque
+import timeit
+
+#Intent_Router::INTENT_TABLE Intent_Router::INTENT_TABLE
+#
+#NAME
+#
+#        Intent_Router::INTENT_TABLE - ordered list of (intent name, keywords, cost class)
+#                                      for every Virtual Assistant command. The position
+#                                      of an intent in the list is its priority, earlier
+#                                      entries are chosen over later ones.
+#
+#DESCRIPTION
+#
+#        The cost class tells the flask server's admission control which pool of
+#        request slots a command uses. "cheap" commands answer from local state
+#        straight away, "external" commands wait on the network or on audio
+#        playback. Queries matching no command go to the chatbot and use CHATBOT_COST.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:10pm 10/17/2026                                                          #
+
+INTENT_TABLE = [("OpenGoogle", ["open google"], "cheap"),
+                ("GoogleQuery", ["google"], "cheap"),
+                ("DayOfTheWeek", ["what day is it"], "cheap"),
+                ("WhatTime", ["what time is it"], "cheap"),
+                ("FromWikipedia", ["from wikipedia"], "external"),
+                ("NameResponse", ["who are you"], "cheap"),
+                ("NoteQuery", ["make a note"], "cheap"),
+                ("OpenEmail", ["open email"], "cheap"),
+                ("SetAlarm", ["set alarm for"], "cheap"),
+                ("ListAlarms", ["list alarms"], "cheap"),
+                ("CancelAlarm", ["cancel alarm"], "cheap"),
+                ("SnoozeAlarm", ["snooze"], "cheap"),
+                ("LaunchProgram", ["launch program"], "cheap"),
+                ("EnableVoice", ["enable voice"], "cheap"),
+                ("DisableVoice", ["disable voice"], "cheap"),
+                ("PlayAudioFile", ["play"], "external"),
+                ("Help", ["help"], "cheap"),
+                ("Goodbye", ["goodbye"], "cheap")]
+
+#Intent_Router::INTENT_TABLE
+
+#cost class of queries that fall through to the chatbot
+CHATBOT_COST = "chatbot"
+
+#BenchmarkRouting() puts the crossover at about 120 keywords, below it the chain
+#of substring checks is faster than walking the automaton character by character
+AUTOMATON_KEYWORDS = 128
+
+#the terminal has always checked goodbye straight after the time, before the
+#other commands, while the flask server checks it last. Both keep their order
+TERMINAL_FIRST = ["OpenGoogle", "GoogleQuery", "DayOfTheWeek", "WhatTime", "Goodbye"]
+
+#Intent_Router::IntentRouter Intent_Router::IntentRouter
+#
+#NAME
+#
+#        Intent_Router::IntentRouter - object holding the registered intents, their
+#                                      handlers, and the compiled keyword automaton
+#
+#SYNOPSIS
+#
+#        obj Intent_Router::IntentRouter()
+#
+#            keywords         --> list of (keyword, intent, priority) for every
+#                                 registered keyword
+#
+#            handlers         --> dictionary of intent name to the function that
+#                                 handles it, each handler receives the query string
+#
+#            costs            --> dictionary of intent name to its cost class
+#
+#            chain            --> list of (keyword, intent) in priority order, checked
+#                                 one after another while there are no more than
+#                                 AUTOMATON_KEYWORDS keywords
+#
+#            transitions      --> list of dictionaries, one per automaton state, mapping
+#                                 a character to the next state. Failure links are folded
+#                                 in at compile time so lookups never have to backtrack
+#
+#            bestOutput       --> list with one entry per automaton state holding the
+#                                 index of the highest priority keyword that ends at
+#                                 that state (or any of its suffixes), -1 if none, the
+#                                 automaton is only built past AUTOMATON_KEYWORDS
+#
+#DESCRIPTION
+#
+#        Intents are registered with one or more keywords and a handler. The first call
+#        to Match() or Dispatch() after a registration compiles the keywords. A small
+#        set is matched by checking each keyword in priority order, a large one by an
+#        Aho-Corasick automaton that walks the query one character at a time and
+#        keeps the highest priority keyword seen. Both give the same answer.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Match()
+#        and Dispatch().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:10pm 10/17/2026                                                          #
+
+class IntentRouter:
+
+    def __init__(self):
+
+        self.keywords = []
+        self.handlers = {}
+        self.costs = {}
+
+        self.chain = None
+        self.transitions = None
+        self.bestOutput = None
+
+    #IntentRouter::Register(a_Intent, a_Keywords, a_Handler, a_Priority, a_Cost)
+    #
+    #DESCRIPTION
+    #
+    #        Registers a handler for an intent along with the keywords that trigger it
+    #        and its cost class. Lower priority values win, when no priority is given
+    #        the intent is placed after everything registered before it.
+    #
+    #RETURNS
+    #
+    #        Returns nothing, the automaton is rebuilt on the next match.
+
+    def Register(self, a_Intent, a_Keywords, a_Handler, a_Priority = None, a_Cost = "cheap"):
+
+        if a_Priority is None:
+
+            a_Priority = len(self.handlers)
+
+        for keyword in a_Keywords:
+
+            self.keywords.append((keyword, a_Intent, a_Priority))
+
+        self.handlers[a_Intent] = a_Handler
+        self.costs[a_Intent] = a_Cost
+
+        self.chain = None
+        self.transitions = None
+        self.bestOutput = None
+
+    #IntentRouter::Compile(a_Automaton)
+    #
+    #DESCRIPTION
+    #
+    #        Orders the keywords into the chain. Past AUTOMATON_KEYWORDS keywords, or
+    #        when a_Automaton is True, also builds the keyword trie, links every state
+    #        to its longest proper suffix that is also in the trie, and folds those
+    #        links into the transition tables so the automaton behaves as a DFA. Each
+    #        state also remembers the best keyword ending there, merged with the best
+    #        of its failure state.
+    #
+    #RETURNS
+    #
+    #        Returns nothing, fills in chain, and transitions and bestOutput when the
+    #        automaton is built.
+
+    def Compile(self, a_Automaton = None):
+
+        #keywords are ranked by priority first and registration order second so
+        #that ties always resolve the same way
+        order = sorted(range(len(self.keywords)), key = lambda index: (self.keywords[index][2], index))
+        rank = {index: position for position, index in enumerate(order)}
+
+        self.chain = [(self.keywords[index][0], self.keywords[index][1]) for index in order]
+        self.rank = rank
+
+        if a_Automaton is None:
+
+            a_Automaton = len(self.keywords) > AUTOMATON_KEYWORDS
+
+        if not a_Automaton:
+
+            self.transitions = None
+            self.bestOutput = None
+
+            return
+
+        transitions = [{}]
+        bestOutput = [-1]
+
+        for index, (keyword, intent, priority) in enumerate(self.keywords):
+
+            state = 0
+
+            for character in keyword:
+
+                if character not in transitions[state]:
+
+                    transitions.append({})
+                    bestOutput.append(-1)
+                    transitions[state][character] = len(transitions) - 1
+
+                state = transitions[state][character]
+
+            if bestOutput[state] == -1 or rank[index] < rank[bestOutput[state]]:
+
+                bestOutput[state] = index
+
+        failure = [0] * len(transitions)
+        pending = deque(transitions[0].values())
+
+        while pending:
+
+            state = pending.popleft()
+            fallback = failure[state]
+
+            if bestOutput[fallback] != -1 and (bestOutput[state] == -1 or rank[bestOutput[fallback]] < rank[bestOutput[state]]):
+
+                bestOutput[state] = bestOutput[fallback]
+
+            for character, nextState in list(transitions[state].items()):
+
+                pending.append(nextState)
+
+                if state != 0:
+
+                    failure[nextState] = transitions[failure[state]].get(character, 0)
+
+            #inherit every transition of the failure state that this state does not
+            #define itself, the failure state is always shallower so it is complete
+            if state != 0:
+
+                for character, nextState in transitions[fallback].items():
+
+                    if character not in transitions[state]:
+
+                        transitions[state][character] = nextState
+
+        self.transitions = transitions
+        self.bestOutput = bestOutput
+
+    #IntentRouter::Match(a_Query)
+    #
+    #DESCRIPTION
+    #
+    #        Finds the highest priority keyword anywhere in the query, by the chain
+    #        for a small set of keywords and by one walk through the automaton for a
+    #        large one.
+    #
+    #RETURNS
+    #
+    #        Returns the name of the matching intent, or None if no keyword was found.
+
+    def Match(self, a_Query):
+
+        if self.chain is None:
+
+            self.Compile()
+
+        if self.transitions is None:
+
+            for keyword, intent in self.chain:
+
+                if keyword in a_Query:
+
+                    return intent
+
+            return None
+
+        transitions = self.transitions
+        bestOutput = self.bestOutput
+        rank = self.rank
+
+        state = 0
+        best = -1
+
+        for character in a_Query:
+
+            state = transitions[state].get(character, 0)
+            found = bestOutput[state]
+
+            if found != -1 and (best == -1 or rank[found] < rank[best]):
+
+                best = found
+
+        if best == -1:
+
+            return None
+
+        return self.keywords[best][1]
+
+    #IntentRouter::Dispatch(a_Query, a_Fallback)
+    #
+    #DESCRIPTION
+    #
+    #        Routes the query to the handler of its matching intent, or to a_Fallback
+    #        (normally the chatbot) when no command keyword is present.
+    #
+    #RETURNS
+    #
+    #        Returns whatever the chosen handler returns.
+
+    def Dispatch(self, a_Query, a_Fallback):
+
+        intent = self.Match(a_Query)
+
+        if intent is None:
+
+            return a_Fallback(a_Query)
+
+        return self.handlers[intent](a_Query)
+
+    #IntentRouter::Cost(a_Intent)
+    #
+    #DESCRIPTION
+    #
+    #        Looks up the cost class of an intent returned by Match().
+    #
+    #RETURNS
+    #
+    #        Returns the intent's cost class, CHATBOT_COST when a_Intent is None.
+
+    def Cost(self, a_Intent):
+
+        if a_Intent is None:
+
+            return CHATBOT_COST
+
+        return self.costs.get(a_Intent, "cheap")
+
+#Intent_Router::IntentRouter
+
+#Intent_Router::CreateRouter(a_Handlers, a_First) Intent_Router::CreateRouter(a_Handlers, a_First)
+#
+#NAME
+#
+#        Intent_Router::CreateRouter - builds an IntentRouter from INTENT_TABLE for
+#                                      whichever intents the caller has handlers for
+#
+#SYNOPSIS
+#
+#        obj Intent_Router::CreateRouter(a_Handlers, a_First)
+#
+#            a_Handlers       --> dictionary of intent name to handler function, intents
+#                                 in INTENT_TABLE without a handler are left out
+#
+#            a_First          --> intents checked before the rest, in the order given,
+#                                 for an entry point whose commands have always been
+#                                 checked in another order (see TERMINAL_FIRST)
+#
+#            router           --> the IntentRouter being built
+#
+#DESCRIPTION
+#
+#        Each entry point (terminal text mode, terminal voice mode, flask server)
+#        supplies its own handlers, but the keywords and costs always come from the
+#        single INTENT_TABLE so the entry points can no longer drift apart. The
+#        priorities come from the table too, apart from any intents in a_First.
+#
+#RETURNS
+#
+#        Returns a compiled IntentRouter.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:10pm 10/17/2026                                                          #
+
+def CreateRouter(a_Handlers, a_First = ()):
+
+    router = IntentRouter()
+
+    table = sorted(INTENT_TABLE, key = lambda entry: list(a_First).index(entry[0]) if entry[0] in a_First else len(a_First))
+
+    for priority, (intent, keywords, cost) in enumerate(table):
+
+        if intent in a_Handlers:
+
+            router.Register(intent, keywords, a_Handlers[intent], priority, cost)
+
+    router.Compile()
+
+    return router
+
+#Intent_Router::CreateRouter(a_Handlers, a_First)
+
+#Intent_Router::BenchmarkRouting(a_Sizes) Intent_Router::BenchmarkRouting(a_Sizes)
+#
+#NAME
+#
+#        Intent_Router::BenchmarkRouting - microbenchmark of the per-query routing cost
+#                                          as the number of registered commands grows
+#
+#SYNOPSIS
+#
+#        void Intent_Router::BenchmarkRouting(a_Sizes)
+#
+#            a_Sizes          --> list of command set sizes to measure
+#
+#            queries          --> sample user input, a mix of commands and small talk
+#                                 that falls through to the chatbot
+#
+#DESCRIPTION
+#
+#        Pads INTENT_TABLE with synthetic commands up to each size and times both the
+#        compiled automaton and the first-match chain of 'in' checks over the same
+#        queries. The chain costs one full scan of the query per command while the
+#        automaton costs one scan regardless of the command count, but each step of
+#        that scan is a python dictionary lookup, so the chain wins until the
+#        command count passes AUTOMATON_KEYWORDS. The last column is what Match()
+#        does at each size.
+#
+#RETURNS
+#
+#        Prints microseconds per query for each size, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:10pm 10/17/2026                                                          #
+
+def BenchmarkRouting(a_Sizes = (15, 50, 100, 200, 1000)):
+
+    queries = ["what time is it",
+               "could you google the weather in boston for me",
+               "tell me something from wikipedia about the moon",
+               "i was wondering whether you have seen any good movies lately",
+               "that is the funniest thing i have heard all week",
+               "goodbye"]
+
+    repeat = 2000
+
+    print("commands    chain (us/query)    automaton (us/query)    Match (us/query)")
+
+    for size in a_Sizes:
+
+        table = [(intent, list(keywords)) for intent, keywords, cost in INTENT_TABLE]
+
+        for number in range(len(table), size):
+
+            table.append(("Synthetic" + str(number), ["synthetic command " + str(number)]))
+
+        router = IntentRouter()
+
+        for priority, (intent, keywords) in enumerate(table):
+
+            router.Register(intent, keywords, None, priority)
+
+        chain = [(keyword, intent) for intent, keywords in table for keyword in keywords]
+
+        def RouteChain():
+
+            for query in queries:
+
+                for keyword, intent in chain:
+
+                    if keyword in query:
+
+                        break
+
+        def RouteRouter():
+
+            for query in queries:
+
+                router.Match(query)
+
+        router.Compile(True)
+        automatonTime = timeit.timeit(RouteRouter, number = repeat) / (repeat * len(queries)) * 1e6
+
+        router.Compile()
+        routerTime = timeit.timeit(RouteRouter, number = repeat) / (repeat * len(queries)) * 1e6
+
+        chainTime = timeit.timeit(RouteChain, number = repeat) / (repeat * len(queries)) * 1e6
+
+        print("%8d    %16.2f    %20.2f    %14.2f (%s)" % (size, chainTime, automatonTime, routerTime, "automaton" if router.transitions else "chain"))
+
+#Intent_Router::BenchmarkRouting(a_Sizes)
+
+
+#Runs the routing microbenchmark
+if __name__ == "__main__":
+    BenchmarkRouting()
+
+#Intent_Router.py
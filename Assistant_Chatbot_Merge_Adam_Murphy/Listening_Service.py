@@ -0,0 +1,527 @@
+#Listening_Service.py
+#
+#NAME
+#
+#        Listening_Service - long lived speech recognizer that keeps the microphone open,
+#                            calibrates for background noise once, and hands recognized
+#                            utterances to the Virtual Assistant through a queue.
+#
+#SYNOPSIS
+#
+#        Listening_Service.py
+#
+#            speech_recognition    --> simple speech to text library to allow
+#                                      voice control of the chatbot and virtual
+#                                      assistant
+#
+#            threading             --> standard python library, the listening thread and
+#                                      the event used to ask it for an utterance
+#
+#            queue                 --> standard python library, recognized utterances
+#
+#            argparse              --> standard python library, options for running this
+#                                      file directly to try out a backend
+#
+#            GoogleBackend         --> recognizes audio with recognize_google (online)
+#
+#            SphinxBackend         --> recognizes audio with recognize_sphinx (offline)
+#
+#            ReplayBackend         --> returns lines of a transcript file instead of using
+#                                      the microphone, for trying out voice mode without one
+#
+#            ListeningService      --> thread owning the recognizer and the open microphone
+#
+#DESCRIPTION
+#
+#        ListenCheck() used to build a new Recognizer and open the microphone for every
+#        turn without ever measuring the background noise, so listen() decided when the
+#        user had stopped talking against the default energy threshold and took a
+#        different amount of time on every machine. The service opens the microphone
+#        once, calibrates the energy threshold once with adjust_for_ambient_noise (and
+#        lets dynamic_energy_threshold follow the room afterwards), and keeps both open.
+#        Recognition runs on the service thread and the text is put on a queue, so a
+#        backend can be swapped without touching the callers.
+#
+#RETURNS
+#
+#        When run directly prints each utterance recognized by the chosen backend.
+#        Otherwise provides the ListeningService for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+import speech_recognition as sr
+import threading
+import queue
+import argparse
+
+#Listening_Service::GoogleBackend Listening_Service::GoogleBackend
+#
+#NAME
+#
+#        Listening_Service::GoogleBackend - online recognition through recognize_google,
+#                                           the recognizer the assistant always used
+#
+#SYNOPSIS
+#
+#        obj Listening_Service::GoogleBackend(a_Language)
+#
+#            a_Language       --> language code passed to recognize_google
+#
+#            usesMicrophone   --> True, the service opens the microphone for this backend
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Recognize().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+class GoogleBackend:
+
+    usesMicrophone = True
+
+    def __init__(self, a_Language = 'en-in'):
+
+        self.language = a_Language
+
+    #GoogleBackend::Recognize(a_Recognizer, a_Audio)
+    #
+    #DESCRIPTION
+    #
+    #        Sends the captured audio to the Google web speech service.
+    #
+    #RETURNS
+    #
+    #        Returns the recognized text, raises the speech_recognition errors.
+
+    def Recognize(self, a_Recognizer, a_Audio):
+
+        return a_Recognizer.recognize_google(a_Audio, language = self.language)
+
+#Listening_Service::GoogleBackend
+
+#Listening_Service::SphinxBackend Listening_Service::SphinxBackend
+#
+#NAME
+#
+#        Listening_Service::SphinxBackend - offline recognition through recognize_sphinx,
+#                                           needs the pocketsphinx package installed
+#
+#SYNOPSIS
+#
+#        obj Listening_Service::SphinxBackend(a_Language)
+#
+#            a_Language       --> language code passed to recognize_sphinx
+#
+#            usesMicrophone   --> True, the service opens the microphone for this backend
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Recognize().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+class SphinxBackend:
+
+    usesMicrophone = True
+
+    def __init__(self, a_Language = 'en-US'):
+
+        self.language = a_Language
+
+    #SphinxBackend::Recognize(a_Recognizer, a_Audio)
+    #
+    #DESCRIPTION
+    #
+    #        Recognizes the captured audio locally with CMU Sphinx.
+    #
+    #RETURNS
+    #
+    #        Returns the recognized text, raises the speech_recognition errors.
+
+    def Recognize(self, a_Recognizer, a_Audio):
+
+        return a_Recognizer.recognize_sphinx(a_Audio, language = self.language)
+
+#Listening_Service::SphinxBackend
+
+#Listening_Service::ReplayBackend Listening_Service::ReplayBackend
+#
+#NAME
+#
+#        Listening_Service::ReplayBackend - stand in that "hears" the lines of a
+#                                           transcript file one at a time
+#
+#SYNOPSIS
+#
+#        obj Listening_Service::ReplayBackend(a_Path)
+#
+#            a_Path           --> text file with one utterance per line, blank lines
+#                                 are skipped
+#
+#            usesMicrophone   --> False, no microphone is opened or calibrated
+#
+#DESCRIPTION
+#
+#        Lets voice mode be exercised on a machine without a microphone or network
+#        connection. Once the transcript runs out it keeps answering "goodbye".
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Recognize().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+class ReplayBackend:
+
+    usesMicrophone = False
+
+    def __init__(self, a_Path):
+
+        with open(a_Path, 'r', encoding = 'utf-8') as replayFile:
+
+            self.lines = [line.strip() for line in replayFile if line.strip()]
+
+        self.position = 0
+
+    #ReplayBackend::Recognize(a_Recognizer, a_Audio)
+    #
+    #DESCRIPTION
+    #
+    #        Ignores the recognizer and audio and returns the next transcript line.
+    #
+    #RETURNS
+    #
+    #        Returns the next line, or "goodbye" when the transcript is finished.
+
+    def Recognize(self, a_Recognizer, a_Audio):
+
+        if self.position >= len(self.lines):
+
+            return "goodbye"
+
+        self.position += 1
+
+        return self.lines[self.position - 1]
+
+#Listening_Service::ReplayBackend
+
+#Listening_Service::CreateBackend(a_Name) Listening_Service::CreateBackend(a_Name)
+#
+#NAME
+#
+#        Listening_Service::CreateBackend - builds a recognition backend from its name
+#
+#SYNOPSIS
+#
+#        obj Listening_Service::CreateBackend(a_Name)
+#
+#            a_Name           --> "google", "sphinx", or "replay:<transcript path>"
+#
+#RETURNS
+#
+#        Returns the backend, raises ValueError for an unknown name.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+def CreateBackend(a_Name):
+
+    if a_Name == "google":
+
+        return GoogleBackend()
+
+    if a_Name == "sphinx":
+
+        return SphinxBackend()
+
+    if a_Name.startswith("replay:"):
+
+        return ReplayBackend(a_Name[len("replay:"):])
+
+    raise ValueError('Unknown speech recognition backend ' + a_Name)
+
+#Listening_Service::CreateBackend(a_Name)
+
+#Listening_Service::ListeningService Listening_Service::ListeningService
+#
+#NAME
+#
+#        Listening_Service::ListeningService - daemon thread that owns the recognizer and
+#                                              the open microphone stream
+#
+#SYNOPSIS
+#
+#        obj Listening_Service::ListeningService(a_Backend, a_PauseThreshold,
+#                                                a_CalibrationSeconds, a_Continuous)
+#
+#            a_Backend        --> object with Recognize(recognizer, audio) and
+#                                 usesMicrophone, see CreateBackend()
+#
+#            a_PauseThreshold --> seconds of silence that end an utterance
+#
+#            a_CalibrationSeconds
+#                             --> seconds of background noise sampled before the first
+#                                 utterance to set the energy threshold
+#
+#            a_Continuous     --> when False (the default) the service only listens after
+#                                 Listen() asks it to, so it never records the assistant
+#                                 speaking. When True it listens back to back and queues
+#                                 every utterance
+#
+#            recognized       --> the persistent sr.Recognizer
+#
+#            utterances       --> queue of recognized text, "None" for audio that could
+#                                 not be understood
+#
+#            requested        --> event set while an utterance is wanted
+#
+#DESCRIPTION
+#
+#        The microphone is opened and calibrated on the service thread the first time
+#        it runs and stays open until Stop(). Recalibrate() asks for the noise level to
+#        be measured again before the next utterance, for example after moving rooms.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Listen().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+class ListeningService(threading.Thread):
+
+    def __init__(self, a_Backend, a_PauseThreshold = 1.0, a_CalibrationSeconds = 1.0, a_Continuous = False):
+
+        threading.Thread.__init__(self, name = "ListeningService", daemon = True)
+
+        self.backend = a_Backend
+        self.calibrationSeconds = a_CalibrationSeconds
+        self.continuous = a_Continuous
+
+        self.recognized = sr.Recognizer()
+        self.recognized.pause_threshold = a_PauseThreshold
+        self.recognized.dynamic_energy_threshold = True
+
+        self.microphone = None
+        self.source = None
+
+        self.utterances = queue.Queue()
+        self.requested = threading.Event()
+        self.calibrate = threading.Event()
+        self.stopping = threading.Event()
+
+        self.calibrate.set()
+
+    #ListeningService::OpenMicrophone()
+    #
+    #DESCRIPTION
+    #
+    #        Opens the default microphone and keeps the stream open.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def OpenMicrophone(self):
+
+        self.microphone = sr.Microphone()
+        self.source = self.microphone.__enter__()
+
+    #ListeningService::Recalibrate()
+    #
+    #DESCRIPTION
+    #
+    #        Asks the service to measure the background noise again before it next
+    #        listens.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Recalibrate(self):
+
+        self.calibrate.set()
+
+    #ListeningService::CaptureUtterance()
+    #
+    #DESCRIPTION
+    #
+    #        Listens for one utterance on the open microphone, calibrating first if
+    #        asked to, and runs it through the backend.
+    #
+    #RETURNS
+    #
+    #        Returns the recognized text, or "None" if it could not be recognized.
+
+    def CaptureUtterance(self):
+
+        audio = None
+
+        if self.backend.usesMicrophone:
+
+            if self.source is None:
+
+                self.OpenMicrophone()
+
+            if self.calibrate.is_set():
+
+                self.calibrate.clear()
+                self.recognized.adjust_for_ambient_noise(self.source, duration = self.calibrationSeconds)
+
+            print('Listening')
+
+            audio = self.recognized.listen(self.source)
+
+        try:
+
+            print("Recognizing")
+
+            query = self.backend.Recognize(self.recognized, audio)
+            print("Recognized command = ", query)
+
+        except Exception as e:
+
+            print(type(e), e)
+            print("Error recognizing, please repeat command or statement.")
+            return "None"
+
+        return query
+
+    #ListeningService::run()
+    #
+    #DESCRIPTION
+    #
+    #        Service loop, captures utterances whenever one is requested (or all the
+    #        time in continuous mode) and queues the text.
+    #
+    #RETURNS
+    #
+    #        Returns after Stop(), closing the microphone.
+
+    def run(self):
+
+        try:
+
+            while not self.stopping.is_set():
+
+                self.requested.wait()
+
+                if self.stopping.is_set():
+
+                    break
+
+                try:
+
+                    self.utterances.put(self.CaptureUtterance())
+
+                except Exception as e:
+
+                    print(type(e), e)
+                    self.utterances.put("None")
+
+                if not self.continuous:
+
+                    self.requested.clear()
+
+        finally:
+
+            if self.microphone is not None:
+
+                self.microphone.__exit__(None, None, None)
+
+    #ListeningService::Listen(a_Timeout)
+    #
+    #DESCRIPTION
+    #
+    #        Asks for an utterance and waits for it. In continuous mode returns the
+    #        oldest utterance not yet taken.
+    #
+    #RETURNS
+    #
+    #        Returns the recognized text, "None" if it could not be recognized or
+    #        a_Timeout seconds passed.
+
+    def Listen(self, a_Timeout = None):
+
+        if self.utterances.empty():
+
+            self.requested.set()
+
+        try:
+
+            return self.utterances.get(timeout = a_Timeout)
+
+        except queue.Empty:
+
+            return "None"
+
+    #ListeningService::Stop()
+    #
+    #DESCRIPTION
+    #
+    #        Stops the service after the utterance in progress, if any.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Stop(self):
+
+        self.stopping.set()
+        self.requested.set()
+
+#Listening_Service::ListeningService
+
+
+#Prints what the chosen backend hears until interrupted or "goodbye" is heard
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Try out a speech recognition backend.")
+    parser.add_argument("--backend", default = "google", help = 'google, sphinx, or replay:<transcript path>')
+    parser.add_argument("--calibration", type = float, default = 1.0, help = "seconds of background noise to sample")
+    arguments = parser.parse_args()
+
+    service = ListeningService(CreateBackend(arguments.backend), a_CalibrationSeconds = arguments.calibration)
+    service.start()
+
+    while True:
+        query = service.Listen().lower()
+        if "goodbye" in query:
+            break
+
+    service.Stop()
+
+#Listening_Service.py
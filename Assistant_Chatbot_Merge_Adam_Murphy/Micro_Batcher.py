@@ -0,0 +1,390 @@
+#Micro_Batcher.py
+#
+#NAME
+#
+#        Micro_Batcher - collects work items that arrive close together from many
+#                        threads and hands them to one function as a single batch.
+#
+#SYNOPSIS
+#
+#        Micro_Batcher.py
+#
+#            threading             --> standard python library, the batching thread and
+#                                      the condition submitters wake it with
+#
+#            collections           --> standard python library, deque of waiting items
+#
+#            concurrent.futures    --> standard python library, the Future each submitter
+#                                      waits on for its own result
+#
+#            time                  --> standard python library, batch windows and
+#                                      queueing delay
+#
+#            MicroBatcher          --> thread forming and running the batches
+#
+#DESCRIPTION
+#
+#        Every flask request that fell through to the chatbot drew and scored its own
+#        candidates, so under load the same scoring pass was repeated once per request.
+#        A MicroBatcher sits in front of that work. Submit() queues an item and returns
+#        a Future. The batching thread takes the oldest item, then keeps collecting
+#        until a_MaxBatch items are waiting or a_Window seconds have passed since that
+#        first item arrived, and calls a_Process once with the whole batch. With only
+#        one request in flight the most it adds is a_Window, and under load batches
+#        fill before the window ends. Stats() reports how full batches run and how
+#        long items waited to be picked up, which is the delay batching adds.
+#
+#RETURNS
+#
+#        When run directly prints the batch fill and queueing delay for a simulated
+#        load. Otherwise provides the MicroBatcher for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+import threading
+import collections
+import concurrent.futures
+import time
+
+#Micro_Batcher::MicroBatcher Micro_Batcher::MicroBatcher
+#
+#NAME
+#
+#        Micro_Batcher::MicroBatcher - daemon thread running a_Process on batches of
+#                                      submitted items
+#
+#SYNOPSIS
+#
+#        obj Micro_Batcher::MicroBatcher(a_Process, a_MaxBatch, a_Window, a_Name)
+#
+#            a_Process        --> function taking a list of items and returning a list
+#                                 of results in the same order. It may also return an
+#                                 exception in place of a result to fail only that item
+#
+#            a_MaxBatch       --> most items in one batch, 1 turns batching off
+#
+#            a_Window         --> longest time in seconds the first item of a batch
+#                                 waits for others to join it
+#
+#            waiting          --> deque of (item, future, submit time)
+#
+#            started          --> True once start() has started the thread
+#
+#            batches, items, fullBatches, totalDelay, maximumDelay
+#                             --> counters for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Submit().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+class MicroBatcher(threading.Thread):
+
+    def __init__(self, a_Process, a_MaxBatch = 16, a_Window = 0.005, a_Name = "MicroBatcher"):
+
+        threading.Thread.__init__(self, name = a_Name, daemon = True)
+
+        self.process = a_Process
+        self.maxBatch = a_MaxBatch
+        self.window = a_Window
+
+        self.waiting = collections.deque()
+        self.changed = threading.Condition()
+        self.stopping = False
+        self.started = False
+
+        self.batches = 0
+        self.items = 0
+        self.fullBatches = 0
+        self.totalDelay = 0.0
+        self.maximumDelay = 0.0
+
+    #MicroBatcher::start()
+    #
+    #DESCRIPTION
+    #
+    #        Starts the batching thread. Submit() calls it, so items are never left 
+    #        waiting on a batcher nobody started, and calling it again does nothing.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def start(self):
+
+        with self.changed:
+
+            if self.started:
+
+                return
+
+            self.started = True
+
+        threading.Thread.start(self)
+
+    #MicroBatcher::Submit(a_Item)
+    #
+    #DESCRIPTION
+    #
+    #        Queues an item for the next batch, starting the batching thread if it 
+    #        is not running yet.
+    #
+    #RETURNS
+    #
+    #        Returns a concurrent.futures.Future holding the item's result.
+
+    def Submit(self, a_Item):
+
+        future = concurrent.futures.Future()
+
+        self.start()
+
+        with self.changed:
+
+            if self.stopping:
+
+                future.set_exception(RuntimeError(self.name + " is stopped"))
+
+                return future
+
+            self.waiting.append((a_Item, future, time.monotonic()))
+
+            if len(self.waiting) == 1 or len(self.waiting) >= self.maxBatch:
+
+                self.changed.notify()
+
+        return future
+
+    #MicroBatcher::NextBatch()
+    #
+    #DESCRIPTION
+    #
+    #        Waits for an item, then for the batch to fill or its window to close.
+    #
+    #RETURNS
+    #
+    #        Returns a list of (item, future, submit time), empty once stopped.
+
+    def NextBatch(self):
+
+        with self.changed:
+
+            while not self.waiting and not self.stopping:
+
+                self.changed.wait()
+
+            if not self.waiting:
+
+                return []
+
+            closes = self.waiting[0][2] + self.window
+
+            while len(self.waiting) < self.maxBatch and not self.stopping:
+
+                remaining = closes - time.monotonic()
+
+                if remaining <= 0:
+
+                    break
+
+                self.changed.wait(remaining)
+
+            batch = [self.waiting.popleft() for i in range(min(self.maxBatch, len(self.waiting)))]
+
+            started = time.monotonic()
+            delays = [started - submitted for item, future, submitted in batch]
+
+            self.batches += 1
+            self.items += len(batch)
+            self.fullBatches += len(batch) == self.maxBatch
+            self.totalDelay += sum(delays)
+            self.maximumDelay = max([self.maximumDelay] + delays)
+
+            return batch
+
+    #MicroBatcher::run()
+    #
+    #DESCRIPTION
+    #
+    #        Runs a_Process on each batch and hands every submitter its own result.
+    #        If a_Process raises, every item in the batch fails with that error.
+    #
+    #RETURNS
+    #
+    #        Returns after Stop(), once the items already queued have been run.
+
+    def run(self):
+
+        while True:
+
+            batch = self.NextBatch()
+
+            if not batch:
+
+                return
+
+            try:
+
+                results = self.process([item for item, future, submitted in batch])
+
+            except Exception as e:
+
+                results = [e] * len(batch)
+
+            for (item, future, submitted), result in zip(batch, results):
+
+                if isinstance(result, Exception):
+
+                    future.set_exception(result)
+
+                else:
+
+                    future.set_result(result)
+
+    #MicroBatcher::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the batch counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of batches run, items batched, the average batch
+    #        size and fill (size over a_MaxBatch), the share of batches that were
+    #        full, the average and longest queueing delay in milliseconds, and the
+    #        items waiting now.
+
+    def Stats(self):
+
+        with self.changed:
+
+            batches = max(self.batches, 1)
+            items = max(self.items, 1)
+
+            return {'batches': self.batches,
+                    'items': self.items,
+                    'average_batch': self.items / batches,
+                    'average_fill': self.items / batches / self.maxBatch,
+                    'full_batches': self.fullBatches / batches,
+                    'average_delay_ms': 1000 * self.totalDelay / items,
+                    'maximum_delay_ms': 1000 * self.maximumDelay,
+                    'waiting': len(self.waiting)}
+
+    #MicroBatcher::Stop()
+    #
+    #DESCRIPTION
+    #
+    #        Closes the current window early and lets the thread exit once the
+    #        items already queued have been run. Later Submit() calls fail.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Stop(self):
+
+        with self.changed:
+
+            self.stopping = True
+            self.changed.notify_all()
+
+#Micro_Batcher::MicroBatcher
+
+#Micro_Batcher::BenchmarkBatching(a_Clients, a_Requests, a_MaxBatch, a_Window) Micro_Batcher::BenchmarkBatching(a_Clients, a_Requests, a_MaxBatch, a_Window)
+#
+#NAME
+#
+#        Micro_Batcher::BenchmarkBatching - simulated load showing batch fill and
+#                                           queueing delay
+#
+#SYNOPSIS
+#
+#        void Micro_Batcher::BenchmarkBatching(a_Clients, a_Requests, a_MaxBatch, a_Window)
+#
+#            a_Clients        --> number of threads submitting at once
+#
+#            a_Requests       --> items each thread submits, one after the other
+#
+#            a_MaxBatch, a_Window
+#                             --> batcher settings being tried
+#
+#DESCRIPTION
+#
+#        The simulated work costs 2ms per batch plus 0.1ms per item, roughly the
+#        shape of one shared scoring pass followed by a short walk per query.
+#
+#RETURNS
+#
+#        Prints the batcher's Stats() and the throughput, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:20pm 10/17/2026                                                          #
+
+def BenchmarkBatching(a_Clients = 32, a_Requests = 50, a_MaxBatch = 16, a_Window = 0.005):
+
+    def Process(a_Items):
+
+        time.sleep(0.002 + 0.0001 * len(a_Items))
+
+        return [item * 2 for item in a_Items]
+
+    batcher = MicroBatcher(Process, a_MaxBatch, a_Window)
+    batcher.start()
+
+    def Client(a_Number):
+
+        for request in range(a_Requests):
+
+            assert batcher.Submit(a_Number).result() == a_Number * 2
+
+    clients = [threading.Thread(target = Client, args = (number,)) for number in range(a_Clients)]
+
+    started = time.perf_counter()
+
+    for client in clients:
+
+        client.start()
+
+    for client in clients:
+
+        client.join()
+
+    elapsed = time.perf_counter() - started
+    batcher.Stop()
+
+    print("clients", a_Clients, "batch", a_MaxBatch, "window", str(a_Window * 1000) + "ms",
+          "->", round(a_Clients * a_Requests / elapsed), "items/s")
+
+    for name, value in batcher.Stats().items():
+
+        print("   ", name, round(value, 3))
+
+#Micro_Batcher::BenchmarkBatching(a_Clients, a_Requests, a_MaxBatch, a_Window)
+
+
+#Compares batching turned off with a few batch sizes under the same load
+if __name__ == "__main__":
+
+    for maxBatch in (1, 8, 32):
+
+        BenchmarkBatching(a_MaxBatch = maxBatch)
+
+#Micro_Batcher.py
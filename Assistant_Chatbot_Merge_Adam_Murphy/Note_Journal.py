@@ -0,0 +1,444 @@
+#Note_Journal.py
+#
+#NAME
+#
+#        Note_Journal - append only note file kept open for the life of the program, with
+#                       writes buffered and flushed to disk together on an interval.
+#
+#SYNOPSIS
+#
+#        Note_Journal.py
+#
+#            threading             --> standard python library, the locks serializing writers
+#                                      and file writes, and the thread doing the timed flush
+#
+#            os                    --> standard python library, fsync and file sizes
+#
+#            atexit                --> standard python library, whatever is buffered is
+#                                      flushed when the program exits
+#
+#            datetime              --> standard python library, record timestamps
+#
+#            NoteJournal           --> thread owning the open note file
+#
+#DESCRIPTION
+#
+#        NoteQuery() and NoteQueryVoice() opened, appended to, and closed the note file
+#        for every note, and two flask requests could write at once. The journal opens
+#        the file when it is started, by its owner or by the first note written, keeps
+#        that one handle open, serializes writers with a lock, and collects their records in
+#        a buffer that one thread writes, flushes and fsyncs as a group every
+#        a_FlushInterval seconds (or sooner once a_MaxBuffered bytes are waiting).
+#        The buffer is swapped for an empty one under the lock and written outside
+#        it, so a writer never waits on the disk while a group is being fsynced.
+#        Every record is a single line of timestamp, tab, note text, so the file stays
+#        readable in a text editor. The byte offset of each record is kept in an index,
+#        built by one pass over the file when it is opened, so any note can be read
+#        back with a single seek.
+#
+#RETURNS
+#
+#        Does not return anything, provides the NoteJournal for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:05pm 10/17/2026                                                          #
+
+import threading
+import os
+import atexit
+import datetime
+
+#Note_Journal::NoteJournal Note_Journal::NoteJournal
+#
+#NAME
+#
+#        Note_Journal::NoteJournal - daemon thread that owns the note file and flushes
+#                                    buffered records to it
+#
+#SYNOPSIS
+#
+#        obj Note_Journal::NoteJournal(a_Path, a_FlushInterval, a_MaxBuffered)
+#
+#            a_Path           --> note file, created along with its folder when the
+#                                 journal is started
+#
+#            a_FlushInterval  --> longest time in seconds a record waits in the buffer
+#
+#            a_MaxBuffered    --> bytes waiting in the buffer that trigger an early flush
+#
+#            offsets          --> byte offset of every record in the file, including
+#                                 the ones still in the buffer
+#
+#            buffered         --> encoded records not yet written
+#
+#            writing          --> records swapped out of the buffer that are being
+#                                 written and fsynced
+#
+#            writtenOffset    --> size of the file on disk, records at or past this
+#                                 offset are still in writing or the buffer
+#
+#            changed          --> condition guarding the buffer and the offsets
+#
+#            fileLock         --> held while a group is written, so only one thread
+#                                 writes to the file at a time
+#
+#            opened           --> True once start() has opened the file
+#
+#            flushes, records --> counters for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Write(),
+#        Read() and Recent().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:05pm 10/17/2026                                                          #
+
+class NoteJournal(threading.Thread):
+
+    def __init__(self, a_Path, a_FlushInterval = 1.0, a_MaxBuffered = 64 * 1024):
+
+        threading.Thread.__init__(self, name = "NoteJournal", daemon = True)
+
+        self.path = a_Path
+        self.flushInterval = a_FlushInterval
+        self.maxBuffered = a_MaxBuffered
+
+        self.offsets = []
+        self.noteFile = None
+        self.readFile = None
+        self.opened = False
+
+        self.writtenOffset = 0
+        self.endOffset = 0
+
+        self.buffered = []
+        self.bufferedBytes = 0
+        self.writing = []
+        self.flushWanted = False
+
+        self.changed = threading.Condition()
+        self.fileLock = threading.RLock()
+        self.stopping = False
+
+        self.flushes = 0
+        self.records = 0
+
+    #NoteJournal::start()
+    #
+    #DESCRIPTION
+    #
+    #        Creates the note folder, indexes and opens the note file, and starts
+    #        the flush thread. Write(), Read(), Recent() and Stats() call it, so
+    #        the journal starts on first use, and calling it again does nothing.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def start(self):
+
+        with self.changed:
+
+            if self.opened:
+
+                return
+
+            folder = os.path.dirname(self.path)
+
+            if folder:
+
+                os.makedirs(folder, exist_ok = True)
+
+            self.BuildIndex()
+
+            self.noteFile = open(self.path, 'ab')
+            self.readFile = open(self.path, 'rb')
+
+            self.writtenOffset = self.noteFile.tell()
+            self.endOffset = self.writtenOffset
+
+            self.opened = True
+
+        atexit.register(self.Close)
+        threading.Thread.start(self)
+
+    #NoteJournal::BuildIndex()
+    #
+    #DESCRIPTION
+    #
+    #        Records the offset of every line already in the note file.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def BuildIndex(self):
+
+        if not os.path.exists(self.path):
+
+            return
+
+        offset = 0
+
+        with open(self.path, 'rb') as noteFile:
+
+            for line in noteFile:
+
+                self.offsets.append(offset)
+                offset += len(line)
+
+    #NoteJournal::Write(a_Text, a_Durable)
+    #
+    #DESCRIPTION
+    #
+    #        Stamps the note with the current time and buffers it. Line breaks and
+    #        tabs in the note are replaced by spaces so a record is always one line.
+    #
+    #RETURNS
+    #
+    #        Returns the record number of the note, when a_Durable is True only after
+    #        it has been fsynced to disk.
+
+    def Write(self, a_Text, a_Durable = False):
+
+        text = " ".join(str(a_Text).replace("\t", " ").splitlines())
+        record = (datetime.datetime.now().isoformat(timespec = 'seconds') + "\t" + text + "\r\n").encode('utf-8')
+
+        self.start()
+
+        with self.changed:
+
+            number = len(self.offsets)
+
+            self.offsets.append(self.endOffset)
+            self.endOffset += len(record)
+
+            self.buffered.append(record)
+            self.bufferedBytes += len(record)
+            self.records += 1
+
+            if self.bufferedBytes >= self.maxBuffered or a_Durable:
+
+                self.flushWanted = True
+                self.changed.notify_all()
+
+            if a_Durable:
+
+                target = self.endOffset
+                self.changed.wait_for(lambda: self.writtenOffset >= target or self.stopping)
+
+        return number
+
+    #NoteJournal::WriteBuffered()
+    #
+    #DESCRIPTION
+    #
+    #        Swaps the buffer for an empty one, then writes the swapped records in
+    #        one call and flushes and fsyncs the file without holding the lock, so
+    #        Write() and Read() carry on meanwhile. Called without the lock held.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def WriteBuffered(self):
+
+        with self.fileLock:
+
+            with self.changed:
+
+                self.flushWanted = False
+
+                if not self.buffered or self.stopping:
+
+                    return
+
+                self.writing = self.buffered
+                target = self.endOffset
+
+                self.buffered = []
+                self.bufferedBytes = 0
+
+            self.noteFile.write(b"".join(self.writing))
+            self.noteFile.flush()
+            os.fsync(self.noteFile.fileno())
+
+            with self.changed:
+
+                self.writtenOffset = target
+                self.writing = []
+                self.flushes += 1
+
+                self.changed.notify_all()
+
+    #NoteJournal::run()
+    #
+    #DESCRIPTION
+    #
+    #        Flushes the buffer every a_FlushInterval seconds, or early when a writer
+    #        asks for it.
+    #
+    #RETURNS
+    #
+    #        Returns after Close().
+
+    def run(self):
+
+        while True:
+
+            with self.changed:
+
+                self.changed.wait_for(lambda: self.flushWanted or self.stopping, self.flushInterval)
+
+                if self.stopping:
+
+                    return
+
+            self.WriteBuffered()
+
+    #NoteJournal::Flush()
+    #
+    #DESCRIPTION
+    #
+    #        Writes and fsyncs anything buffered right away.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Flush(self):
+
+        self.WriteBuffered()
+
+    #NoteJournal::Read(a_Number)
+    #
+    #DESCRIPTION
+    #
+    #        Looks a record up by its number, from the records being written or the
+    #        buffer if it is not on disk yet and otherwise with one seek into the file.
+    #
+    #RETURNS
+    #
+    #        Returns a (timestamp, note) pair. Lines written before the journal
+    #        existed have no timestamp and return an empty one.
+
+    def Read(self, a_Number):
+
+        self.start()
+
+        with self.changed:
+
+            offset = self.offsets[a_Number]
+
+            if offset >= self.writtenOffset:
+
+                position = self.writtenOffset
+                line = b""
+
+                for record in self.writing + self.buffered:
+
+                    if position == offset:
+
+                        line = record
+                        break
+
+                    position += len(record)
+
+            else:
+
+                self.readFile.seek(offset)
+                line = self.readFile.readline()
+
+        line = line.decode('utf-8', errors = 'replace').rstrip("\r\n")
+
+        if "\t" in line:
+
+            return tuple(line.split("\t", 1))
+
+        return ("", line)
+
+    #NoteJournal::Recent(a_Count)
+    #
+    #DESCRIPTION
+    #
+    #        Reads the last a_Count notes.
+    #
+    #RETURNS
+    #
+    #        Returns a list of (timestamp, note) pairs, oldest first.
+
+    def Recent(self, a_Count = 5):
+
+        self.start()
+
+        total = len(self.offsets)
+
+        return [self.Read(number) for number in range(max(0, total - a_Count), total)]
+
+    #NoteJournal::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the journal counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of notes in the file, notes written this run,
+    #        group flushes, and bytes waiting in the buffer.
+
+    def Stats(self):
+
+        self.start()
+
+        with self.changed:
+
+            return {'notes': len(self.offsets),
+                    'records': self.records,
+                    'flushes': self.flushes,
+                    'buffered_bytes': self.bufferedBytes}
+
+    #NoteJournal::Close()
+    #
+    #DESCRIPTION
+    #
+    #        Flushes anything buffered, stops the flush thread, and closes the file.
+    #        Safe to call more than once, or on a journal that was never started.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Close(self):
+
+        with self.fileLock:
+
+            self.WriteBuffered()
+
+            with self.changed:
+
+                if self.stopping:
+
+                    return
+
+                self.stopping = True
+                self.changed.notify_all()
+
+                if self.opened:
+
+                    self.noteFile.close()
+                    self.readFile.close()
+
+#Note_Journal::NoteJournal
+
+#Note_Journal.py
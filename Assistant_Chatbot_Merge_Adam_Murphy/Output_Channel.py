@@ -0,0 +1,510 @@
+#Output_Channel.py
+#
+#NAME
+#
+#        Output_Channel - sinks that Virtual Assistant handlers write their messages to,
+#                         chosen per request instead of always printing and speaking.
+#
+#SYNOPSIS
+#
+#        Output_Channel.py
+#
+#            threading             --> standard python library, each thread (and so each
+#                                      flask request) has its own active channel
+#
+#            contextlib            --> standard python library, used for UseChannel()
+#
+#            TerminalChannel       --> prints messages and speaks them aloud, used by the
+#                                      terminal Virtual Assistant
+#
+#            JsonChannel           --> collects messages so the flask server can return
+#                                      them to the browser, never touches the speaker
+#
+#            StreamChannel         --> JsonChannel that also pushes each message out as
+#                                      soon as it is written, for the streaming endpoint
+#
+#            CompositeChannel      --> sends every message to several channels
+#
+#            Say, Show             --> functions handlers call to write to the active channel
+#
+#DESCRIPTION
+#
+#        Handlers used to call print() and Speak() directly, so a web request typed in
+#        the browser still waited on the local speaker. Handlers now call Say() for
+#        anything meant to be heard and Show() for anything only meant to be read, and
+#        the caller decides where that goes by making a channel active for the current
+#        thread with UseChannel(). Threads without an active channel use the default
+#        channel, which the terminal Virtual Assistant sets to a TerminalChannel.
+#
+#RETURNS
+#
+#        Does not return anything, provides the channels for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+import threading
+import contextlib
+
+#Output_Channel::TerminalChannel Output_Channel::TerminalChannel
+#
+#NAME
+#
+#        Output_Channel::TerminalChannel - prints every message to the terminal and
+#                                          speaks the ones passed to Say()
+#
+#SYNOPSIS
+#
+#        obj Output_Channel::TerminalChannel(a_Speak)
+#
+#            a_Speak          --> function taking the text to speak and a_Wait, normally
+#                                 Assistant_Chatbot_Merge::Speak. None to only print
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Say() and Show().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+class TerminalChannel:
+
+    def __init__(self, a_Speak = None):
+
+        self.speak = a_Speak
+
+    #TerminalChannel::Say(a_Text, a_Spoken, a_Wait)
+    #
+    #DESCRIPTION
+    #
+    #        Prints a_Text and speaks a_Spoken, or a_Text when no separate spoken
+    #        wording is given.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Say(self, a_Text, a_Spoken = None, a_Wait = False):
+
+        print(a_Text)
+
+        if self.speak is not None:
+
+            self.speak(a_Text if a_Spoken is None else a_Spoken, a_Wait)
+
+    #TerminalChannel::Show(a_Text)
+    #
+    #DESCRIPTION
+    #
+    #        Prints a_Text without speaking it.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Show(self, a_Text):
+
+        print(a_Text)
+
+#Output_Channel::TerminalChannel
+
+#Output_Channel::JsonChannel Output_Channel::JsonChannel
+#
+#NAME
+#
+#        Output_Channel::JsonChannel - collects messages for a web response
+#
+#SYNOPSIS
+#
+#        obj Output_Channel::JsonChannel()
+#
+#            messages         --> list of {"type": "say" or "show", "text": string}
+#                                 dictionaries in the order they were written
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Say() and Show().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+class JsonChannel:
+
+    def __init__(self):
+
+        self.messages = []
+
+    #JsonChannel::Say(a_Text, a_Spoken, a_Wait)
+    #
+    #DESCRIPTION
+    #
+    #        Records a_Text, the spoken wording and a_Wait only matter to the speaker.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Say(self, a_Text, a_Spoken = None, a_Wait = False):
+
+        self.messages.append({"type": "say", "text": str(a_Text)})
+
+    #JsonChannel::Show(a_Text)
+    #
+    #DESCRIPTION
+    #
+    #        Records a_Text as display only.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Show(self, a_Text):
+
+        self.messages.append({"type": "show", "text": str(a_Text)})
+
+#Output_Channel::JsonChannel
+
+#Output_Channel::StreamChannel Output_Channel::StreamChannel
+#
+#NAME
+#
+#        Output_Channel::StreamChannel - collects messages like a JsonChannel and
+#                                        passes each one on the moment it is written
+#
+#SYNOPSIS
+#
+#        obj Output_Channel::StreamChannel(a_Publish)
+#
+#            a_Publish        --> function called with each message dictionary, so a
+#                                 long handler's early messages reach the client
+#                                 while it is still running
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Say() and Show().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:35pm 10/17/2026                                                          #
+
+class StreamChannel(JsonChannel):
+
+    def __init__(self, a_Publish):
+
+        JsonChannel.__init__(self)
+
+        self.publish = a_Publish
+
+    #StreamChannel::Say(a_Text, a_Spoken, a_Wait)
+    #
+    #DESCRIPTION
+    #
+    #        Records a_Text and publishes it.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Say(self, a_Text, a_Spoken = None, a_Wait = False):
+
+        JsonChannel.Say(self, a_Text, a_Spoken, a_Wait)
+
+        self.publish(self.messages[-1])
+
+    #StreamChannel::Show(a_Text)
+    #
+    #DESCRIPTION
+    #
+    #        Records a_Text as display only and publishes it.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Show(self, a_Text):
+
+        JsonChannel.Show(self, a_Text)
+
+        self.publish(self.messages[-1])
+
+#Output_Channel::StreamChannel
+
+#Output_Channel::CompositeChannel Output_Channel::CompositeChannel
+#
+#NAME
+#
+#        Output_Channel::CompositeChannel - forwards every message to each of its channels
+#
+#SYNOPSIS
+#
+#        obj Output_Channel::CompositeChannel(a_Channels)
+#
+#            a_Channels       --> list of channels, written to in order
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Say() and Show().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+class CompositeChannel:
+
+    def __init__(self, a_Channels):
+
+        self.channels = list(a_Channels)
+
+    #CompositeChannel::Say(a_Text, a_Spoken, a_Wait)
+    #
+    #DESCRIPTION
+    #
+    #        Passes the message to every channel.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Say(self, a_Text, a_Spoken = None, a_Wait = False):
+
+        for channel in self.channels:
+
+            channel.Say(a_Text, a_Spoken, a_Wait)
+
+    #CompositeChannel::Show(a_Text)
+    #
+    #DESCRIPTION
+    #
+    #        Passes the message to every channel.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Show(self, a_Text):
+
+        for channel in self.channels:
+
+            channel.Show(a_Text)
+
+#Output_Channel::CompositeChannel
+
+#Output_Channel::activeChannels Output_Channel::activeChannels
+#
+#NAME
+#
+#        Output_Channel::activeChannels - per thread storage of the channel made active
+#                                         by UseChannel(), with defaultChannel used by
+#                                         threads that have none
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+activeChannels = threading.local()
+defaultChannel = TerminalChannel()
+
+#Output_Channel::activeChannels
+
+#Output_Channel::SetDefaultChannel(a_Channel) Output_Channel::SetDefaultChannel(a_Channel)
+#
+#NAME
+#
+#        Output_Channel::SetDefaultChannel - sets the channel used by threads that have
+#                                            not made one active
+#
+#SYNOPSIS
+#
+#        void Output_Channel::SetDefaultChannel(a_Channel)
+#
+#            a_Channel        --> the new default channel
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+def SetDefaultChannel(a_Channel):
+
+    global defaultChannel
+
+    defaultChannel = a_Channel
+
+#Output_Channel::SetDefaultChannel(a_Channel)
+
+#Output_Channel::ActiveChannel() Output_Channel::ActiveChannel()
+#
+#NAME
+#
+#        Output_Channel::ActiveChannel - finds the channel the current thread writes to
+#
+#SYNOPSIS
+#
+#        obj Output_Channel::ActiveChannel()
+#
+#RETURNS
+#
+#        Returns the channel made active on this thread, or the default channel.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+def ActiveChannel():
+
+    return getattr(activeChannels, 'channel', None) or defaultChannel
+
+#Output_Channel::ActiveChannel()
+
+#Output_Channel::UseChannel(a_Channel) Output_Channel::UseChannel(a_Channel)
+#
+#NAME
+#
+#        Output_Channel::UseChannel - makes a channel active on the current thread for
+#                                     the length of a with block
+#
+#SYNOPSIS
+#
+#        with Output_Channel::UseChannel(a_Channel):
+#
+#            a_Channel        --> channel every Say() and Show() in the block writes to
+#
+#DESCRIPTION
+#
+#        The previously active channel is restored when the block ends, even if a
+#        handler raises, so a flask worker thread never leaks one request's channel
+#        into the next.
+#
+#RETURNS
+#
+#        Yields a_Channel.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+@contextlib.contextmanager
+def UseChannel(a_Channel):
+
+    previous = getattr(activeChannels, 'channel', None)
+    activeChannels.channel = a_Channel
+
+    try:
+
+        yield a_Channel
+
+    finally:
+
+        activeChannels.channel = previous
+
+#Output_Channel::UseChannel(a_Channel)
+
+#Output_Channel::Say(a_Text, a_Spoken, a_Wait) Output_Channel::Say(a_Text, a_Spoken, a_Wait)
+#
+#NAME
+#
+#        Output_Channel::Say - writes a message meant to be heard to the active channel
+#
+#SYNOPSIS
+#
+#        void Output_Channel::Say(a_Text, a_Spoken, a_Wait)
+#
+#            a_Text           --> text to display
+#
+#            a_Spoken         --> wording to speak when it differs from a_Text, for
+#                                 example "Google dot Com" for "google.com"
+#
+#            a_Wait           --> when True a speaking channel blocks until the audio
+#                                 has finished, used before the program exits
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+def Say(a_Text, a_Spoken = None, a_Wait = False):
+
+    ActiveChannel().Say(a_Text, a_Spoken, a_Wait)
+
+#Output_Channel::Say(a_Text, a_Spoken, a_Wait)
+
+#Output_Channel::Show(a_Text) Output_Channel::Show(a_Text)
+#
+#NAME
+#
+#        Output_Channel::Show - writes a display only message to the active channel
+#
+#SYNOPSIS
+#
+#        void Output_Channel::Show(a_Text)
+#
+#            a_Text           --> text to display
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        10:40pm 10/17/2026                                                          #
+
+def Show(a_Text):
+
+    ActiveChannel().Show(a_Text)
+
+#Output_Channel::Show(a_Text)
+
+#Output_Channel.py
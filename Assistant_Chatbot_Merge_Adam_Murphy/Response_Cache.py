@@ -0,0 +1,538 @@
+#Response_Cache.py
+#
+#NAME
+#
+#        Response_Cache - bounded least recently used cache of chatbot responses keyed
+#                         on the preprocessed query text.
+#
+#SYNOPSIS
+#
+#        Response_Cache.py
+#
+#            collections           --> standard python library, OrderedDict keeps the
+#                                      cache entries in least to most recently used order
+#
+#            threading             --> standard python library, a lock keeps the cache
+#                                      consistent when the flask server answers requests
+#                                      on more than one thread
+#
+#            time                  --> standard python library, used for entry expiry
+#
+#            os                    --> standard python library, used to notice the training
+#                                      database file being replaced
+#
+#            sqlite3, urllib       --> standard python libraries, the connection the
+#                                      training database is watched for changes through
+#
+#            LRUCache              --> general purpose size and age bounded cache with
+#                                      hit, miss and eviction counters
+#
+#            DatabaseWatch         --> tells when the training database has been written to
+#
+#            ResponseCache         --> LRUCache in front of a chatbot's get_response()
+#
+#DESCRIPTION
+#
+#        dialogueBot is read only, so for a given cleaned up query its answer only
+#        changes when two stored responses tie. The same small talk lines come in over
+#        and over and each one costs a full search of the database, so the responses
+#        are remembered here. Entries expire after a configurable time and the whole
+#        cache is dropped whenever the training database is written to.
+#
+#RETURNS
+#
+#        Does not return anything, provides the caches for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        8:10pm 10/17/2026                                                          #
+
+from collections import OrderedDict
+import threading
+import time
+import os
+import sqlite3
+import urllib.request
+
+#Response_Cache::LRUCache Response_Cache::LRUCache
+#
+#NAME
+#
+#        Response_Cache::LRUCache - cache holding at most a_MaxSize entries, each for
+#                                   at most a_TimeToLive seconds
+#
+#SYNOPSIS
+#
+#        obj Response_Cache::LRUCache(a_MaxSize, a_TimeToLive)
+#
+#            a_MaxSize        --> largest number of entries kept, the least recently
+#                                 used entry is evicted to make room for a new one
+#
+#            a_TimeToLive     --> seconds an entry stays valid, None to never expire
+#
+#            entries          --> OrderedDict of key to (value, time stored), most
+#                                 recently used entries at the end
+#
+#            hits, misses, evictions, expirations
+#                             --> counters for Stats()
+#
+#DESCRIPTION
+#
+#        Every method takes the lock so a single cache can be shared by all of the
+#        flask server's request threads.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Get() and Put().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        8:10pm 10/17/2026                                                          #
+
+class LRUCache:
+
+    #returned by Get() when the key is not cached, since None can be a cached value
+    MISSING = object()
+
+    def __init__(self, a_MaxSize = 1024, a_TimeToLive = None):
+
+        self.maxSize = a_MaxSize
+        self.timeToLive = a_TimeToLive
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    #LRUCache::Get(a_Key)
+    #
+    #DESCRIPTION
+    #
+    #        Looks up a_Key, dropping it if it has outlived the time to live, and
+    #        marks it as the most recently used entry.
+    #
+    #RETURNS
+    #
+    #        Returns the cached value, or LRUCache.MISSING.
+
+    def Get(self, a_Key):
+
+        with self.lock:
+
+            entry = self.entries.get(a_Key)
+
+            if entry is not None and self.timeToLive is not None and time.monotonic() - entry[1] > self.timeToLive:
+
+                del self.entries[a_Key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+
+                self.misses += 1
+
+                return self.MISSING
+
+            self.entries.move_to_end(a_Key)
+            self.hits += 1
+
+            return entry[0]
+
+    #LRUCache::Contains(a_Key)
+    #
+    #DESCRIPTION
+    #
+    #        Checks for an unexpired entry without counting a hit or a miss or
+    #        changing its place in the eviction order.
+    #
+    #RETURNS
+    #
+    #        Returns True if Get() would currently find a_Key.
+
+    def Contains(self, a_Key):
+
+        with self.lock:
+
+            entry = self.entries.get(a_Key)
+
+            return entry is not None and (self.timeToLive is None or time.monotonic() - entry[1] <= self.timeToLive)
+
+    #LRUCache::Put(a_Key, a_Value)
+    #
+    #DESCRIPTION
+    #
+    #        Stores a_Value under a_Key, evicting least recently used entries until
+    #        the cache is back within a_MaxSize.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Put(self, a_Key, a_Value):
+
+        with self.lock:
+
+            self.entries[a_Key] = (a_Value, time.monotonic())
+            self.entries.move_to_end(a_Key)
+
+            while len(self.entries) > self.maxSize:
+
+                self.entries.popitem(last = False)
+                self.evictions += 1
+
+    #LRUCache::Remove(a_Key)
+    #
+    #DESCRIPTION
+    #
+    #        Drops a_Key from the cache if it is there.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Remove(self, a_Key):
+
+        with self.lock:
+
+            self.entries.pop(a_Key, None)
+
+    #LRUCache::Clear()
+    #
+    #DESCRIPTION
+    #
+    #        Drops every entry, the counters are kept.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Clear(self):
+
+        with self.lock:
+
+            self.entries.clear()
+
+    #LRUCache::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the cache counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the size, hits, misses, evictions and expirations.
+
+    def Stats(self):
+
+        with self.lock:
+
+            return {'size': len(self.entries),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'expirations': self.expirations}
+
+#Response_Cache::LRUCache
+
+#Response_Cache::DatabaseWatch Response_Cache::DatabaseWatch
+#
+#NAME
+#
+#        Response_Cache::DatabaseWatch - version of a chatbot's sqlite database that 
+#                                        changes whenever another connection commits 
+#                                        to it
+#
+#SYNOPSIS
+#
+#        obj Response_Cache::DatabaseWatch(a_Storage)
+#
+#            a_Storage        --> the chatbot's sql storage adapter
+#
+#            databasePath     --> the sqlite database file, None for databases that 
+#                                 do not live in a local file
+#
+#            inode, connection --> the file being watched and the connection kept 
+#                                 open on it, None until it exists
+#
+#DESCRIPTION
+#
+#        The modification time and size of the database and its write ahead log 
+#        used to stand for its version, but chatterbot puts the database in WAL 
+#        mode and sqlalchemy opens a new connection for every session, so plain 
+#        reads create and remove the log and looked like training. One connection 
+#        is kept open on the file instead and asked for PRAGMA data_version, which 
+#        sqlite only changes when some other connection commits to the database. 
+#        Keeping it open also keeps the log from being removed between reads. A 
+#        database file that is deleted and trained again from scratch has a new 
+#        inode, which changes the version as well.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Version().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        6:40pm 10/17/2026                                                          #
+
+class DatabaseWatch:
+
+    def __init__(self, a_Storage):
+
+        databaseUri = getattr(a_Storage, 'database_uri', '') or ''
+
+        self.databasePath = databaseUri[len('sqlite:///'):] if databaseUri.startswith('sqlite:///') else None
+
+        self.lock = threading.Lock()
+        self.inode = None
+        self.connection = None
+
+    #DatabaseWatch::Version()
+    #
+    #DESCRIPTION
+    #
+    #        Reopens the watching connection if the file has been replaced, then 
+    #        reads its data_version. The connection is opened read and write 
+    #        without create, so watching a database that has not been trained yet 
+    #        does not create an empty one, and nothing is ever written through it.
+    #
+    #RETURNS
+    #
+    #        Returns a value that changes whenever the database is written to, 
+    #        None for a database that is not a local file or does not exist.
+
+    def Version(self):
+
+        if self.databasePath is None:
+
+            return None
+
+        with self.lock:
+
+            try:
+
+                inode = os.stat(self.databasePath).st_ino
+
+            except OSError:
+
+                inode = None
+
+            if inode != self.inode:
+
+                if self.connection is not None:
+
+                    self.connection.close()
+
+                self.inode = inode
+                self.connection = None
+
+                if inode is not None:
+
+                    try:
+
+                        address = 'file:' + urllib.request.pathname2url(os.path.abspath(self.databasePath)) + '?mode=rw'
+                        self.connection = sqlite3.connect(address, uri = True, check_same_thread = False)
+
+                    except sqlite3.Error:
+
+                        self.inode = None
+
+            if self.connection is None:
+
+                return None
+
+            return (self.inode, self.connection.execute("PRAGMA data_version").fetchone()[0])
+
+#Response_Cache::DatabaseWatch
+
+#Response_Cache::ResponseCache Response_Cache::ResponseCache
+#
+#NAME
+#
+#        Response_Cache::ResponseCache - LRUCache of a chatbot's responses that is
+#                                        emptied whenever its database changes
+#
+#SYNOPSIS
+#
+#        obj Response_Cache::ResponseCache(a_ChatBot, a_MaxSize, a_TimeToLive)
+#
+#            a_ChatBot        --> read only chatbot whose responses are cached
+#
+#            a_MaxSize        --> largest number of responses kept
+#
+#            a_TimeToLive     --> seconds a response stays valid
+#
+#            watch            --> DatabaseWatch of the chatbot's database
+#
+#            version          --> watch.Version() when the cache was last known to
+#                                 be valid
+#
+#DESCRIPTION
+#
+#        Queries are run through the chatbot's own preprocessors before they are
+#        looked up, so "hello  there" and "hello there" share an entry. The database
+#        version is checked with a stat and a pragma on every lookup, which is far
+#        cheaper than the search it can save. Invalidations counts how often the cache was dropped
+#        because training changed the database, and degraded how many answers were
+#        not cached because they were given without every logic adapter.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see GetResponse(),
+#        GetCached() and Answer().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        8:10pm 10/17/2026                                                          #
+
+class ResponseCache(LRUCache):
+
+    def __init__(self, a_ChatBot, a_MaxSize = 1024, a_TimeToLive = 3600):
+
+        LRUCache.__init__(self, a_MaxSize, a_TimeToLive)
+
+        self.chatbot = a_ChatBot
+        self.invalidations = 0
+        self.degraded = 0
+
+        self.watch = DatabaseWatch(a_ChatBot.storage)
+        self.version = self.watch.Version()
+
+    #ResponseCache::NormalizeQuery(a_Query)
+    #
+    #DESCRIPTION
+    #
+    #        Runs the query through the chatbot's preprocessors, the same cleanup
+    #        get_response() applies before it searches.
+    #
+    #RETURNS
+    #
+    #        Returns the cleaned up query text used as the cache key.
+
+    def NormalizeQuery(self, a_Query):
+
+        Statement = self.chatbot.storage.get_object('statement')
+        statement = Statement(text = a_Query)
+
+        for preprocessor in self.chatbot.preprocessors:
+
+            statement = preprocessor(statement)
+
+        return statement.text
+
+    #ResponseCache::GetResponse(a_Query)
+    #
+    #DESCRIPTION
+    #
+    #        Returns the cached response for the query, asking the chatbot and
+    #        caching its answer on a miss. The cache is cleared first if the
+    #        database has changed since it was last checked.
+    #
+    #RETURNS
+    #
+    #        Returns the chatbot's response statement.
+
+    def GetResponse(self, a_Query):
+
+        key = self.NormalizeQuery(a_Query)
+        response = self.GetCached(key)
+
+        if response is self.MISSING:
+
+            response = self.Answer(key)
+
+        return response
+
+    #ResponseCache::GetCached(a_Key)
+    #
+    #DESCRIPTION
+    #
+    #        Looks up a query already run through NormalizeQuery(), clearing the
+    #        cache first if the database has changed since it was last checked.
+    #
+    #RETURNS
+    #
+    #        Returns the cached response, or LRUCache.MISSING.
+
+    def GetCached(self, a_Key):
+
+        version = self.watch.Version()
+
+        if version != self.version:
+
+            self.Clear()
+            self.version = version
+            self.invalidations += 1
+
+        return self.Get(a_Key)
+
+    #ResponseCache::Answer(a_Key)
+    #
+    #DESCRIPTION
+    #
+    #        Asks the chatbot about a query already run through NormalizeQuery()
+    #        and caches the answer, without looking in the cache first. An answer
+    #        marked degraded, one given without every logic adapter because some
+    #        ran out of time or failed, is returned but not cached, so the next
+    #        ask gets a full answer rather than the fallback for an hour.
+    #
+    #RETURNS
+    #
+    #        Returns the chatbot's response statement.
+
+    def Answer(self, a_Key):
+
+        response = self.chatbot.get_response(a_Key)
+
+        if getattr(response, 'degraded', False):
+
+            with self.lock:
+
+                self.degraded += 1
+
+            return response
+
+        self.Put(a_Key, response)
+
+        return response
+
+    #ResponseCache::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the cache counters, including database invalidations and
+    #        degraded answers left uncached.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the cache counters.
+
+    def Stats(self):
+
+        stats = LRUCache.Stats(self)
+        stats['invalidations'] = self.invalidations
+        stats['degraded'] = self.degraded
+
+        return stats
+
+#Response_Cache::ResponseCache
+
+#Response_Cache.py
@@ -0,0 +1,299 @@
+#Session_Store.py
+#
+#NAME
+#
+#        Session_Store - per client state for the flask server, kept in a bounded least
+#                        recently used table that drops clients who have gone idle.
+#
+#SYNOPSIS
+#
+#        Session_Store.py
+#
+#            collections           --> standard python library, OrderedDict keeps sessions
+#                                      in least to most recently used order
+#
+#            threading             --> standard python library, the store's lock
+#
+#            secrets               --> standard python library, unguessable session tokens
+#
+#            queue                 --> standard python library, event queues of the clients
+#                                      streaming from a session
+#
+#            time                  --> standard python library, idle times
+#
+#            Session               --> state of one client
+#
+#            SessionStore          --> the bounded table of sessions
+#
+#DESCRIPTION
+#
+#        The flask server kept the control mode in one global, so enabling voice in one
+#        browser tab switched every client, and requests could not safely run side by
+#        side. Each client now has a Session found by its token (sent back as a cookie,
+#        or passed explicitly by clients that do not keep cookies) holding its control
+#        mode and its event streams. The store holds at most a_MaxSessions
+#        sessions. Because the table is kept in order of last use, sessions idle for
+#        longer than a_IdleSeconds are always at its front and are dropped from there
+#        on each lookup, so memory stays bounded however many clients come and go.
+#        A session can also have any number of open event streams, each with its own
+#        bounded queue that Publish() puts events on.
+#
+#RETURNS
+#
+#        Does not return anything, provides the SessionStore for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+from collections import OrderedDict
+import threading
+import secrets
+import queue
+import time
+
+#Session_Store::Session Session_Store::Session
+#
+#NAME
+#
+#        Session_Store::Session - state of one client of the flask server
+#
+#SYNOPSIS
+#
+#        obj Session_Store::Session(a_Token, a_Voice)
+#
+#            token            --> the session's token
+#
+#            voice            --> control mode, 0 for text and 1 for voice
+#
+#            lastSeen         --> monotonic time of the last request
+#
+#            subscribers      --> event queues of the streams open for this session
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Publish().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+class Session:
+
+    def __init__(self, a_Token, a_Voice = 0):
+
+        self.token = a_Token
+        self.voice = a_Voice
+        self.lastSeen = time.monotonic()
+
+        self.subscribers = []
+        self.subscribersLock = threading.Lock()
+
+    #Session::Subscribe(a_MaxEvents)
+    #
+    #DESCRIPTION
+    #
+    #        Opens an event queue that receives everything published to the session
+    #        from now on, until Unsubscribe().
+    #
+    #RETURNS
+    #
+    #        Returns the new queue.
+
+    def Subscribe(self, a_MaxEvents = 256):
+
+        events = queue.Queue(maxsize = a_MaxEvents)
+
+        with self.subscribersLock:
+
+            self.subscribers.append(events)
+
+        return events
+
+    #Session::Unsubscribe(a_Events)
+    #
+    #DESCRIPTION
+    #
+    #        Closes a queue opened by Subscribe().
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Unsubscribe(self, a_Events):
+
+        with self.subscribersLock:
+
+            if a_Events in self.subscribers:
+
+                self.subscribers.remove(a_Events)
+
+    #Session::Publish(a_Event, a_Data)
+    #
+    #DESCRIPTION
+    #
+    #        Puts an (event name, data) pair on every open queue. A queue that is full
+    #        because its client stopped reading drops its oldest event, so a stalled
+    #        stream never blocks the request publishing to it.
+    #
+    #RETURNS
+    #
+    #        Returns the number of streams the event was put on.
+
+    def Publish(self, a_Event, a_Data):
+
+        with self.subscribersLock:
+
+            subscribers = list(self.subscribers)
+
+        for events in subscribers:
+
+            while True:
+
+                try:
+
+                    events.put_nowait((a_Event, a_Data))
+
+                    break
+
+                except queue.Full:
+
+                    try:
+
+                        events.get_nowait()
+
+                    except queue.Empty:
+
+                        pass
+
+        return len(subscribers)
+
+#Session_Store::Session
+
+#Session_Store::SessionStore Session_Store::SessionStore
+#
+#NAME
+#
+#        Session_Store::SessionStore - bounded table of sessions with idle eviction
+#
+#SYNOPSIS
+#
+#        obj Session_Store::SessionStore(a_MaxSessions, a_IdleSeconds)
+#
+#            a_MaxSessions    --> most sessions kept, the least recently used is dropped
+#                                 to make room for a new one
+#
+#            a_IdleSeconds    --> seconds without a request after which a session is dropped
+#
+#            defaultVoice     --> control mode new sessions start in, set from the mode
+#                                 chosen when the server was launched
+#
+#            created, evictions, expirations
+#                             --> counters for Stats()
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see GetSession().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:45pm 10/17/2026                                                          #
+
+class SessionStore:
+
+    def __init__(self, a_MaxSessions = 1000, a_IdleSeconds = 30 * 60):
+
+        self.maxSessions = a_MaxSessions
+        self.idleSeconds = a_IdleSeconds
+        self.defaultVoice = 0
+
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.created = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    #SessionStore::GetSession(a_Token)
+    #
+    #DESCRIPTION
+    #
+    #        Drops idle sessions from the front of the table, then finds the session
+    #        for a_Token and marks it as just used. A missing, unknown, or expired
+    #        token gets a new session with a new token.
+    #
+    #RETURNS
+    #
+    #        Returns the Session, compare its token with a_Token to know whether the
+    #        client needs to be sent a new one.
+
+    def GetSession(self, a_Token):
+
+        now = time.monotonic()
+
+        with self.lock:
+
+            while self.sessions:
+
+                oldest = next(iter(self.sessions.values()))
+
+                if now - oldest.lastSeen <= self.idleSeconds:
+
+                    break
+
+                self.sessions.popitem(last = False)
+                self.expirations += 1
+
+            session = self.sessions.get(a_Token) if a_Token else None
+
+            if session is None:
+
+                session = Session(secrets.token_urlsafe(16), self.defaultVoice)
+                self.sessions[session.token] = session
+                self.created += 1
+
+                while len(self.sessions) > self.maxSessions:
+
+                    self.sessions.popitem(last = False)
+                    self.evictions += 1
+
+            self.sessions.move_to_end(session.token)
+            session.lastSeen = now
+
+            return session
+
+    #SessionStore::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the store counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of live sessions, sessions created, and sessions
+    #        dropped for room or for being idle.
+
+    def Stats(self):
+
+        with self.lock:
+
+            return {'sessions': len(self.sessions),
+                    'created': self.created,
+                    'evictions': self.evictions,
+                    'expirations': self.expirations}
+
+#Session_Store::SessionStore
+
+#Session_Store.py
@@ -0,0 +1,1119 @@
+#Sharded_Train.py
+#
+#NAME
+#
+#        Sharded_Train - trains the chatbot on many cores by preprocessing and tagging
+#                        shards of the corpora in worker processes, each into its own
+#                        scratch database, then merging the shards in a fixed order.
+#
+#SYNOPSIS
+#
+#        Sharded_Train.py
+#
+#            concurrent.futures    --> standard python library, the worker process pool
+#
+#            sqlite3               --> standard python library, the per shard scratch
+#                                      databases
+#
+#            csv                   --> standard python library, reads the Ubuntu
+#                                      dialogue tsv files
+#
+#            datetime              --> standard python library, Ubuntu statement times
+#                                      are carried through the shards as text
+#
+#            hashlib               --> standard python library, the benchmark checks
+#                                      every worker count produces the same statements
+#
+#            os, shutil, tempfile  --> standard python library, shard files and their
+#                                      scratch directory
+#
+#            time                  --> standard python library, throughput
+#
+#            argparse              --> standard python library for the benchmark options
+#
+#            chatterbot            --> library that includes all chatbot functions, the
+#                                      workers use its Statement and PosLemmaTagger
+#
+#            Text_Normalizer       --> NormalizeStatement, the chatbot's preprocessor,
+#                                      used by the benchmark
+#
+#            collections           --> standard python library, statements merged per
+#                                      conversation
+#
+#            Training_Manifest     --> progress of every source, checkpointed as each
+#                                      shard is merged
+#
+#DESCRIPTION
+#
+#        Nearly all of the training time goes to spaCy tagging every statement for its
+#        search_text, one statement after another on one core. Here the input is cut
+#        into shards. The Cornell lines are split into byte ranges on line boundaries,
+#        and the Ubuntu dialogues into runs of whole tsv files, since every file is a
+#        conversation of its own. A pool of a_Workers processes, each loading its own
+#        tagger once, preprocesses and tags the shards and writes each to a scratch
+#        sqlite file. The shards are then merged into the chatbot's database in shard
+#        order, so the statements, their order, and their ids match a serial run
+#        whatever the number of workers. A Cornell shard also gets the last statement
+#        before its range, so its first line still answers the one before it as it
+#        does in a serial run.
+#
+#        Given a TrainingManifest, only the input not trained yet is sharded, the
+#        rest of the Cornell file after its last checkpoint and the Ubuntu dialogue
+#        files that are new or have changed. The shards are run and merged a round
+#        of four per worker at a time, and every merge checkpoints the sources it
+#        covers in its own transaction, so a stopped run loses at most one round.
+#
+#RETURNS
+#
+#        When run directly prints the time and speedup of the shard phase for 1 to
+#        --max-workers workers. Otherwise provides ShardedTrainLines() and
+#        ShardedTrainUbuntu() for ChatBot_Train to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+import concurrent.futures
+import sqlite3
+import csv
+import datetime
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import argparse
+import collections
+from Text_Normalizer import NormalizeStatement
+from Training_Manifest import Plan, HashRange, HashFile
+
+#columns of a shard's statement table, in the order its rows are written
+SHARD_COLUMNS = ('text', 'search_text', 'conversation', 'created_at', 'in_response_to', 'search_in_response_to', 'persona')
+
+#most Ubuntu dialogue files in one shard, so each merge checkpoints a bounded amount of work
+UBUNTU_SHARD_FILES = 2000
+
+#the tagger and preprocessors of a worker process, set by StartWorker()
+workerTagger = None
+workerPreprocessors = []
+
+#Sharded_Train::StartWorker(a_Language, a_Preprocessors) Sharded_Train::StartWorker(a_Language, a_Preprocessors)
+#
+#NAME
+#
+#        Sharded_Train::StartWorker - loads the tagger once in each worker process
+#
+#SYNOPSIS
+#
+#        void Sharded_Train::StartWorker(a_Language, a_Preprocessors)
+#
+#            a_Language       --> language of the chatbot's tagger
+#
+#            a_Preprocessors  --> the chatbot's preprocessor functions
+#
+#RETURNS
+#
+#        Returns nothing, sets workerTagger and workerPreprocessors.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def StartWorker(a_Language, a_Preprocessors):
+
+    global workerTagger, workerPreprocessors
+
+    from chatterbot.tagging import PosLemmaTagger
+
+    workerTagger = PosLemmaTagger(language = a_Language)
+    workerPreprocessors = list(a_Preprocessors)
+
+#Sharded_Train::StartWorker(a_Language, a_Preprocessors)
+
+#Sharded_Train::Preprocess(a_Text, a_Preprocessors) Sharded_Train::Preprocess(a_Text, a_Preprocessors)
+#
+#NAME
+#
+#        Sharded_Train::Preprocess - runs text through the chatbot's preprocessors
+#
+#SYNOPSIS
+#
+#        str Sharded_Train::Preprocess(a_Text, a_Preprocessors)
+#
+#            a_Text           --> text of one statement
+#
+#            a_Preprocessors  --> preprocessor functions, the worker's by default
+#
+#RETURNS
+#
+#        Returns the preprocessed text.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def Preprocess(a_Text, a_Preprocessors = None):
+
+    from chatterbot.conversation import Statement
+
+    statement = Statement(text = a_Text)
+
+    for preprocessor in (workerPreprocessors if a_Preprocessors is None else a_Preprocessors):
+
+        statement = preprocessor(statement)
+
+    return statement.text
+
+#Sharded_Train::Preprocess(a_Text, a_Preprocessors)
+
+#Sharded_Train::OpenShard(a_Path) Sharded_Train::OpenShard(a_Path)
+#
+#NAME
+#
+#        Sharded_Train::OpenShard - creates a shard's scratch database
+#
+#SYNOPSIS
+#
+#        obj Sharded_Train::OpenShard(a_Path)
+#
+#            a_Path           --> file the shard is written to
+#
+#DESCRIPTION
+#
+#        The shard is thrown away after the merge, so it is written without a
+#        journal or syncing. seq keeps the rows in the order they were written.
+#
+#RETURNS
+#
+#        Returns the sqlite3 connection.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def OpenShard(a_Path):
+
+    connection = sqlite3.connect(a_Path)
+
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.execute("CREATE TABLE statement (seq INTEGER PRIMARY KEY, " + ", ".join(SHARD_COLUMNS) + ")")
+
+    return connection
+
+#Sharded_Train::OpenShard(a_Path)
+
+#Sharded_Train::WriteShard(a_Connection, a_Rows) Sharded_Train::WriteShard(a_Connection, a_Rows)
+#
+#NAME
+#
+#        Sharded_Train::WriteShard - writes a batch of rows to a shard in one
+#                                    transaction
+#
+#SYNOPSIS
+#
+#        void Sharded_Train::WriteShard(a_Connection, a_Rows)
+#
+#            a_Connection     --> shard connection from OpenShard()
+#
+#            a_Rows           --> list of tuples in SHARD_COLUMNS order
+#
+#RETURNS
+#
+#        Returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def WriteShard(a_Connection, a_Rows):
+
+    with a_Connection:
+
+        a_Connection.executemany("INSERT INTO statement (" + ", ".join(SHARD_COLUMNS) + ") VALUES (" + ", ".join("?" * len(SHARD_COLUMNS)) + ")", a_Rows)
+
+#Sharded_Train::WriteShard(a_Connection, a_Rows)
+
+#Sharded_Train::TrainLinesShard(a_Task) Sharded_Train::TrainLinesShard(a_Task)
+#
+#NAME
+#
+#        Sharded_Train::TrainLinesShard - worker job for one byte range of a corpus
+#                                         file with a statement on every line
+#
+#SYNOPSIS
+#
+#        tuple Sharded_Train::TrainLinesShard(a_Task)
+#
+#            a_Task           --> (shard path, corpus path, start offset, end offset,
+#                                 encoding, line before the range or None,
+#                                 conversation, batch size)
+#
+#DESCRIPTION
+#
+#        Treats the file as one conversation like ChatBot_Train::StreamTrain(),
+#        every line answering the one before it and blank lines skipped.
+#
+#RETURNS
+#
+#        Returns (shard path, statements written, seconds taken).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def TrainLinesShard(a_Task):
+
+    shardPath, corpusPath, start, end, encoding, seedLine, conversation, batchSize = a_Task
+
+    started = time.perf_counter()
+    connection = OpenShard(shardPath)
+
+    previousText = None
+    previousSearchText = ''
+
+    if seedLine is not None:
+
+        previousText = Preprocess(seedLine)
+        previousSearchText = workerTagger.get_text_index_string(previousText)
+
+    rows = []
+    written = 0
+
+    with open(corpusPath, 'rb') as corpusFile:
+
+        corpusFile.seek(start)
+        offset = start
+
+        for line in corpusFile:
+
+            if offset >= end:
+
+                break
+
+            offset += len(line)
+
+            text = Preprocess(line.decode(encoding, 'replace').rstrip('\r\n'))
+
+            if not text:
+
+                continue
+
+            searchText = workerTagger.get_text_index_string(text)
+
+            rows.append((text, searchText, conversation, None, previousText, previousSearchText, ''))
+
+            previousText = text
+            previousSearchText = searchText
+
+            if len(rows) >= batchSize:
+
+                WriteShard(connection, rows)
+                written += len(rows)
+                rows = []
+
+    WriteShard(connection, rows)
+    written += len(rows)
+
+    connection.close()
+
+    return shardPath, written, time.perf_counter() - started
+
+#Sharded_Train::TrainLinesShard(a_Task)
+
+#Sharded_Train::TrainUbuntuShard(a_Task) Sharded_Train::TrainUbuntuShard(a_Task)
+#
+#NAME
+#
+#        Sharded_Train::TrainUbuntuShard - worker job for a run of Ubuntu dialogue
+#                                          tsv files
+#
+#SYNOPSIS
+#
+#        tuple Sharded_Train::TrainUbuntuShard(a_Task)
+#
+#            a_Task           --> (shard path, list of (tsv file, conversation), batch
+#                                 size)
+#
+#DESCRIPTION
+#
+#        Reads each file the way chatterbot's UbuntuCorpusTrainer does, every row
+#        (date, sender, recipient, text) answering the row before it in the same
+#        file, with the sender as the persona and the date as the creation time.
+#
+#RETURNS
+#
+#        Returns (shard path, statements written, seconds taken).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def TrainUbuntuShard(a_Task):
+
+    shardPath, tsvFiles, batchSize = a_Task
+
+    from dateutil import parser as dateParser
+
+    started = time.perf_counter()
+    connection = OpenShard(shardPath)
+
+    rows = []
+    written = 0
+
+    for tsvFile, conversation in tsvFiles:
+
+        with open(tsvFile, 'r', encoding = 'utf-8') as tsv:
+
+            previousText = None
+            previousSearchText = ''
+
+            for row in csv.reader(tsv, delimiter = '\t'):
+
+                if len(row) == 0:
+
+                    continue
+
+                text = Preprocess(row[3])
+                searchText = workerTagger.get_text_index_string(text)
+
+                rows.append((text, searchText, conversation, dateParser.parse(row[0]).isoformat(), previousText, previousSearchText, row[1]))
+
+                previousText = text
+                previousSearchText = searchText
+
+                if len(rows) >= batchSize:
+
+                    WriteShard(connection, rows)
+                    written += len(rows)
+                    rows = []
+
+    WriteShard(connection, rows)
+    written += len(rows)
+
+    connection.close()
+
+    return shardPath, written, time.perf_counter() - started
+
+#Sharded_Train::TrainUbuntuShard(a_Task)
+
+#Sharded_Train::TrainConversationsShard(a_Task) Sharded_Train::TrainConversationsShard(a_Task)
+#
+#NAME
+#
+#        Sharded_Train::TrainConversationsShard - worker job for a run of
+#                                                 conversations already read
+#
+#SYNOPSIS
+#
+#        tuple Sharded_Train::TrainConversationsShard(a_Task)
+#
+#            a_Task           --> (shard path, list of conversations each a list of
+#                                 (text, persona), conversation, batch size)
+#
+#DESCRIPTION
+#
+#        Every conversation is its own chain, its first statement answering
+#        nothing and every later one answering the one before it, the way
+#        ListTrainer trains a list. Lines that are blank once preprocessed are
+#        skipped.
+#
+#RETURNS
+#
+#        Returns (shard path, statements written, seconds taken).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        3:25pm 10/17/2026                                                          #
+
+def TrainConversationsShard(a_Task):
+
+    shardPath, conversations, conversation, batchSize = a_Task
+
+    started = time.perf_counter()
+    connection = OpenShard(shardPath)
+
+    rows = []
+    written = 0
+
+    for lines in conversations:
+
+        previousText = None
+        previousSearchText = ''
+
+        for text, persona in lines:
+
+            text = Preprocess(text)
+
+            if not text:
+
+                continue
+
+            searchText = workerTagger.get_text_index_string(text)
+
+            rows.append((text, searchText, conversation, None, previousText, previousSearchText, persona))
+
+            previousText = text
+            previousSearchText = searchText
+
+            if len(rows) >= batchSize:
+
+                WriteShard(connection, rows)
+                written += len(rows)
+                rows = []
+
+    WriteShard(connection, rows)
+    written += len(rows)
+
+    connection.close()
+
+    return shardPath, written, time.perf_counter() - started
+
+#Sharded_Train::TrainConversationsShard(a_Task)
+
+#Sharded_Train::LineShards(a_Path, a_Count, a_Encoding, a_Preprocessors, a_Start) Sharded_Train::LineShards(a_Path, a_Count, a_Encoding, a_Preprocessors, a_Start)
+#
+#NAME
+#
+#        Sharded_Train::LineShards - cuts a corpus file into byte ranges on line
+#                                    boundaries
+#
+#SYNOPSIS
+#
+#        list Sharded_Train::LineShards(a_Path, a_Count, a_Encoding, a_Preprocessors, a_Start)
+#
+#            a_Path           --> corpus file, one statement per line
+#
+#            a_Count          --> number of ranges wanted
+#
+#            a_Encoding       --> encoding of a_Path
+#
+#            a_Preprocessors  --> the chatbot's preprocessors, to tell which lines
+#                                 are blank once preprocessed
+#
+#            a_Start          --> byte offset the first range starts at, always at
+#                                 the start of a line
+#
+#RETURNS
+#
+#        Returns a list of (start offset, end offset, last statement before start
+#        or None).
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def LineShards(a_Path, a_Count, a_Encoding, a_Preprocessors, a_Start = 0):
+
+    size = os.path.getsize(a_Path)
+    boundaries = [a_Start]
+
+    with open(a_Path, 'rb') as corpusFile:
+
+        for number in range(1, a_Count):
+
+            corpusFile.seek(a_Start + (size - a_Start) * number // a_Count)
+            corpusFile.readline()
+
+            boundary = min(corpusFile.tell(), size)
+
+            if boundary > boundaries[-1]:
+
+                boundaries.append(boundary)
+
+        if boundaries[-1] < size:
+
+            boundaries.append(size)
+
+        shards = []
+
+        for start, end in zip(boundaries, boundaries[1:]):
+
+            shards.append((start, end, SeedLine(corpusFile, start, a_Encoding, a_Preprocessors)))
+
+    return shards
+
+#Sharded_Train::LineShards(a_Path, a_Count, a_Encoding, a_Preprocessors, a_Start)
+
+#Sharded_Train::SeedLine(a_File, a_Offset, a_Encoding, a_Preprocessors) Sharded_Train::SeedLine(a_File, a_Offset, a_Encoding, a_Preprocessors)
+#
+#NAME
+#
+#        Sharded_Train::SeedLine - finds the last statement before a shard starts
+#
+#SYNOPSIS
+#
+#        str Sharded_Train::SeedLine(a_File, a_Offset, a_Encoding, a_Preprocessors)
+#
+#            a_File           --> corpus file opened in binary
+#
+#            a_Offset         --> start of the shard, always at the start of a line
+#
+#DESCRIPTION
+#
+#        Reads backwards from a_Offset a block at a time until it finds a line
+#        that is not blank once preprocessed.
+#
+#RETURNS
+#
+#        Returns the raw text of that line, or None if there is none.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def SeedLine(a_File, a_Offset, a_Encoding, a_Preprocessors):
+
+    blockSize = 65536
+    start = a_Offset
+
+    while start > 0:
+
+        start = max(0, start - blockSize)
+
+        a_File.seek(start)
+        block = a_File.read(a_Offset - start)
+
+        lines = block.split(b'\n')
+
+        #the first piece may be the end of a line that started before the block
+        if start > 0:
+
+            lines = lines[1:]
+
+        for line in reversed(lines):
+
+            text = line.decode(a_Encoding, 'replace').rstrip('\r\n')
+
+            if Preprocess(text, a_Preprocessors):
+
+                return text
+
+        blockSize *= 2
+
+    return None
+
+#Sharded_Train::SeedLine(a_File, a_Offset, a_Encoding, a_Preprocessors)
+
+#Sharded_Train::RunShards(a_Function, a_Tasks, a_Workers, a_Language, a_Preprocessors, a_Directory, a_First, a_Total) Sharded_Train::RunShards(a_Function, a_Tasks, a_Workers, a_Language, a_Preprocessors, a_Directory, a_First, a_Total)
+#
+#NAME
+#
+#        Sharded_Train::RunShards - runs the shard jobs on a process pool
+#
+#SYNOPSIS
+#
+#        list Sharded_Train::RunShards(a_Function, a_Tasks, a_Workers, a_Language,
+#                                      a_Preprocessors, a_Directory, a_First, a_Total)
+#
+#            a_Function       --> TrainLinesShard, TrainUbuntuShard, or
+#                                 TrainConversationsShard
+#
+#            a_Tasks          --> the jobs, without their shard paths
+#
+#            a_Workers        --> worker processes
+#
+#            a_Language, a_Preprocessors
+#                             --> passed to StartWorker() in every worker
+#
+#            a_Directory      --> scratch directory the shards are written to
+#
+#            a_First, a_Total --> number of the first of a_Tasks and of all the
+#                                 shards, when the shards are run in rounds
+#
+#RETURNS
+#
+#        Returns the shard paths in order and the number of statements written.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def RunShards(a_Function, a_Tasks, a_Workers, a_Language, a_Preprocessors, a_Directory, a_First = 0, a_Total = None):
+
+    tasks = [(os.path.join(a_Directory, "shard-" + str(number).zfill(5) + ".sqlite3"),) + tuple(task) for number, task in enumerate(a_Tasks, a_First)]
+
+    written = 0
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers = a_Workers, initializer = StartWorker, initargs = (a_Language, a_Preprocessors)) as pool:
+
+        for number, (shardPath, count, seconds) in enumerate(pool.map(a_Function, tasks), a_First):
+
+            written += count
+
+            print("\rshard", number + 1, "of", a_Total or len(tasks), "-", written, "statements", end = "", flush = True)
+
+    print()
+
+    return [task[0] for task in tasks], written
+
+#Sharded_Train::RunShards(a_Function, a_Tasks, a_Workers, a_Language, a_Preprocessors, a_Directory, a_First, a_Total)
+
+#Sharded_Train::MergeShards(a_Storage, a_ShardPaths, a_BatchSize, a_Checkpoint, a_First) Sharded_Train::MergeShards(a_Storage, a_ShardPaths, a_BatchSize, a_Checkpoint, a_First)
+#
+#NAME
+#
+#        Sharded_Train::MergeShards - copies the shards into the chatbot's database
+#                                     in shard order
+#
+#SYNOPSIS
+#
+#        int Sharded_Train::MergeShards(a_Storage, a_ShardPaths, a_BatchSize, a_Checkpoint, a_First)
+#
+#            a_Storage        --> the chatbot's sql storage adapter
+#
+#            a_ShardPaths     --> shard files in the order they are merged
+#
+#            a_BatchSize      --> rows inserted with each executemany
+#
+#            a_Checkpoint     --> called as a_Checkpoint(connection, shard number,
+#                                 last statement merged or None, Counter of
+#                                 statements per conversation) before each shard's
+#                                 transaction commits, or None
+#
+#            a_First          --> number of the first of a_ShardPaths
+#
+#DESCRIPTION
+#
+#        Each shard is copied in the order its rows were written and in its own
+#        transaction, so the statement ids come out the same as a serial run.
+#        Statements with no time of their own are given the time of the merge.
+#        The shard's checkpoint is written in the same transaction, so its
+#        statements are never stored without it or it without them. Each shard
+#        file is removed once merged.
+#
+#RETURNS
+#
+#        Returns the number of statements merged.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def MergeShards(a_Storage, a_ShardPaths, a_BatchSize = 5000, a_Checkpoint = None, a_First = 0):
+
+    statementTable = a_Storage.get_model('statement').__table__
+    mergedAt = datetime.datetime.now()
+
+    merged = 0
+
+    for number, shardPath in enumerate(a_ShardPaths, a_First):
+
+        shard = sqlite3.connect(shardPath)
+        cursor = shard.execute("SELECT " + ", ".join(SHARD_COLUMNS) + " FROM statement ORDER BY seq")
+
+        lastStatement = None
+        conversations = collections.Counter()
+
+        with a_Storage.engine.begin() as connection:
+
+            while True:
+
+                rows = cursor.fetchmany(a_BatchSize)
+
+                if not rows:
+
+                    break
+
+                statements = []
+
+                for row in rows:
+
+                    statement = dict(zip(SHARD_COLUMNS, row))
+                    statement['created_at'] = datetime.datetime.fromisoformat(statement['created_at']) if statement['created_at'] else mergedAt
+
+                    statements.append(statement)
+                    conversations[statement['conversation']] += 1
+
+                connection.execute(statementTable.insert(), statements)
+                merged += len(statements)
+
+                lastStatement = statements[-1]
+
+            if a_Checkpoint is not None:
+
+                a_Checkpoint(connection, number, lastStatement, conversations)
+
+        shard.close()
+        os.remove(shardPath)
+
+    return merged
+
+#Sharded_Train::MergeShards(a_Storage, a_ShardPaths, a_BatchSize, a_Checkpoint, a_First)
+
+#Sharded_Train::ShardedTrain(a_DialogueBot, a_Function, a_Tasks, a_Workers, a_BatchSize, a_Checkpoint) Sharded_Train::ShardedTrain(a_DialogueBot, a_Function, a_Tasks, a_Workers, a_BatchSize, a_Checkpoint)
+#
+#NAME
+#
+#        Sharded_Train::ShardedTrain - shard phase then merge phase for one corpus
+#
+#SYNOPSIS
+#
+#        int Sharded_Train::ShardedTrain(a_DialogueBot, a_Function, a_Tasks, a_Workers, a_BatchSize, a_Checkpoint)
+#
+#            a_DialogueBot    --> chatbot whose database is trained
+#
+#            a_Function, a_Tasks, a_Workers
+#                             --> see RunShards()
+#
+#            a_BatchSize, a_Checkpoint
+#                             --> see MergeShards()
+#
+#DESCRIPTION
+#
+#        The shards are run and merged in rounds of four per worker, each round
+#        merged before the next is tagged, so the merged statements and their
+#        checkpoints build up as the run goes rather than all at the end.
+#
+#RETURNS
+#
+#        Prints the time of each phase, returns the number of statements trained.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def ShardedTrain(a_DialogueBot, a_Function, a_Tasks, a_Workers, a_BatchSize, a_Checkpoint = None):
+
+    directory = tempfile.mkdtemp(prefix = "shards-")
+    roundSize = 4 * a_Workers
+
+    written = 0
+    merged = 0
+    shardSeconds = 0.0
+    mergeSeconds = 0.0
+
+    try:
+
+        for first in range(0, len(a_Tasks), roundSize):
+
+            started = time.perf_counter()
+
+            shardPaths, count = RunShards(a_Function, a_Tasks[first:first + roundSize], a_Workers, a_DialogueBot.storage.tagger.language, a_DialogueBot.preprocessors,
+                                          directory, first, len(a_Tasks))
+
+            sharded = time.perf_counter()
+
+            merged += MergeShards(a_DialogueBot.storage, shardPaths, a_BatchSize, a_Checkpoint, first)
+
+            written += count
+            shardSeconds += sharded - started
+            mergeSeconds += time.perf_counter() - sharded
+
+    finally:
+
+        shutil.rmtree(directory, ignore_errors = True)
+
+    print(written, "statements tagged by", a_Workers, "workers in", round(shardSeconds, 1), "s, merged in", round(mergeSeconds, 1), "s,",
+          round(merged / max(shardSeconds + mergeSeconds, 1e-9)), "statements/s")
+
+    return merged
+
+#Sharded_Train::ShardedTrain(a_DialogueBot, a_Function, a_Tasks, a_Workers, a_BatchSize, a_Checkpoint)
+
+#Sharded_Train::ShardedTrainLines(a_DialogueBot, a_Path, a_Workers, a_BatchSize, a_Encoding, a_Manifest, a_Source) Sharded_Train::ShardedTrainLines(a_DialogueBot, a_Path, a_Workers, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+#
+#NAME
+#
+#        Sharded_Train::ShardedTrainLines - parallel ChatBot_Train::StreamTrain()
+#
+#SYNOPSIS
+#
+#        int Sharded_Train::ShardedTrainLines(a_DialogueBot, a_Path, a_Workers, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+#
+#            a_Path           --> corpus file, one statement per line
+#
+#            a_Workers        --> worker processes, the file is cut into four
+#                                 shards per worker to keep them all busy
+#
+#            a_Manifest       --> TrainingManifest to resume from and checkpoint,
+#                                 or None to train the whole file
+#
+#            a_Source         --> name of the file in the manifest, its base name
+#                                 by default
+#
+#            plan             --> Training_Manifest::Plan, carried on past the end
+#                                 of each shard as it is merged
+#
+#RETURNS
+#
+#        Returns the number of statements trained.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def ShardedTrainLines(a_DialogueBot, a_Path, a_Workers, a_BatchSize = 5000, a_Encoding = 'iso-8859-1', a_Manifest = None, a_Source = None):
+
+    source = a_Source or os.path.basename(a_Path)
+    conversation = 'training'
+    plan = Plan()
+
+    if a_Manifest is not None:
+
+        plan = a_Manifest.PlanFile(source, a_Path)
+
+        if plan is None:
+
+            print(source, "is already trained")
+
+            return 0
+
+        conversation = a_Manifest.Conversation(source)
+
+    shards = LineShards(a_Path, 4 * a_Workers, a_Encoding, a_DialogueBot.preprocessors, plan.start)
+    tasks = [(a_Path, start, end, a_Encoding, seedLine, conversation, a_BatchSize) for start, end, seedLine in shards]
+
+    def Checkpoint(a_Connection, a_Number, a_LastStatement, a_Conversations):
+
+        start, end, seedLine = shards[a_Number]
+
+        HashRange(plan.hasher, a_Path, start, end)
+
+        if a_LastStatement is not None:
+
+            plan.lastText = a_LastStatement['text']
+            plan.lastSearchText = a_LastStatement['search_text']
+
+        plan.statements += a_Conversations[conversation]
+
+        a_Manifest.Checkpoint(a_Connection, source, a_Path, end, plan.hasher.hexdigest(), plan.lastText, plan.lastSearchText, plan.statements)
+
+    return ShardedTrain(a_DialogueBot, TrainLinesShard, tasks, a_Workers, a_BatchSize, None if a_Manifest is None else Checkpoint)
+
+#Sharded_Train::ShardedTrainLines(a_DialogueBot, a_Path, a_Workers, a_BatchSize, a_Encoding, a_Manifest, a_Source)
+
+#Sharded_Train::ShardedTrainUbuntu(a_DialogueBot, a_Workers, a_BatchSize, a_Manifest) Sharded_Train::ShardedTrainUbuntu(a_DialogueBot, a_Workers, a_BatchSize, a_Manifest)
+#
+#NAME
+#
+#        Sharded_Train::ShardedTrainUbuntu - parallel UbuntuCorpusTrainer
+#
+#SYNOPSIS
+#
+#        int Sharded_Train::ShardedTrainUbuntu(a_DialogueBot, a_Workers, a_BatchSize, a_Manifest)
+#
+#            a_Workers        --> worker processes
+#
+#            a_Manifest       --> TrainingManifest to skip trained dialogues with
+#                                 and checkpoint, or None to train every dialogue
+#
+#DESCRIPTION
+#
+#        Downloads and extracts the corpus with chatterbot's own trainer if that
+#        has not been done yet. The tsv files are sorted so the merge order does
+#        not depend on the order the file system lists them in. Each dialogue
+#        file is its own source, "ubuntu/" and its path in the corpus, trained
+#        whole. Dialogues already trained are skipped and any that have changed
+#        are removed first and trained again. Every shard holds at most
+#        UBUNTU_SHARD_FILES dialogues.
+#
+#RETURNS
+#
+#        Returns the number of statements trained.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def ShardedTrainUbuntu(a_DialogueBot, a_Workers, a_BatchSize = 5000, a_Manifest = None):
+
+    import glob
+    from chatterbot.trainers import UbuntuCorpusTrainer
+
+    trainer = UbuntuCorpusTrainer(a_DialogueBot)
+    downloadPath = trainer.download(trainer.data_download_url)
+
+    if not trainer.is_extracted(trainer.extracted_data_directory):
+
+        trainer.extract(downloadPath)
+
+    tsvFiles = sorted(glob.glob(os.path.join(trainer.extracted_data_directory, '**', '**', '*.tsv')))
+    sources = ['ubuntu/' + os.path.relpath(tsvFile, trainer.extracted_data_directory).replace(os.sep, '/') for tsvFile in tsvFiles]
+
+    if a_Manifest is None:
+
+        dialogues = [(tsvFile, source, 'training') for tsvFile, source in zip(tsvFiles, sources)]
+
+    else:
+
+        entries = a_Manifest.Entries('ubuntu/')
+        changed = []
+
+        dialogues = [(tsvFile, source, a_Manifest.Conversation(source)) for tsvFile, source in zip(tsvFiles, sources)
+                     if a_Manifest.PlanFile(source, tsvFile, False, changed, entries) is not None]
+
+        if changed:
+
+            print(len(changed), "Ubuntu dialogues have changed since they were trained, removed", a_Manifest.Forget(changed), "of their statements to train them again")
+
+        print(len(tsvFiles) - len(dialogues), "of", len(tsvFiles), "Ubuntu dialogues are already trained")
+
+    if not dialogues:
+
+        return 0
+
+    shardCount = max(1, min(len(dialogues), 4 * a_Workers), -(-len(dialogues) // UBUNTU_SHARD_FILES))
+    shards = [dialogues[len(dialogues) * number // shardCount:len(dialogues) * (number + 1) // shardCount] for number in range(shardCount)]
+    tasks = [([(tsvFile, conversation) for tsvFile, source, conversation in shard], a_BatchSize) for shard in shards]
+
+    def Checkpoint(a_Connection, a_Number, a_LastStatement, a_Conversations):
+
+        for tsvFile, source, conversation in shards[a_Number]:
+
+            a_Manifest.Checkpoint(a_Connection, source, tsvFile, os.path.getsize(tsvFile), HashFile(tsvFile).hexdigest(), None, '', a_Conversations[conversation])
+
+    return ShardedTrain(a_DialogueBot, TrainUbuntuShard, tasks, a_Workers, a_BatchSize, None if a_Manifest is None else Checkpoint)
+
+#Sharded_Train::ShardedTrainUbuntu(a_DialogueBot, a_Workers, a_BatchSize, a_Manifest)
+
+#Sharded_Train::BenchmarkScaling(a_Path, a_MaxWorkers, a_Encoding) Sharded_Train::BenchmarkScaling(a_Path, a_MaxWorkers, a_Encoding)
+#
+#NAME
+#
+#        Sharded_Train::BenchmarkScaling - times the shard phase for 1 to a_MaxWorkers
+#                                          workers on the same corpus file
+#
+#SYNOPSIS
+#
+#        void Sharded_Train::BenchmarkScaling(a_Path, a_MaxWorkers, a_Encoding)
+#
+#            a_Path           --> corpus file, one statement per line
+#
+#            a_MaxWorkers     --> most workers tried
+#
+#            a_Encoding       --> encoding of a_Path
+#
+#DESCRIPTION
+#
+#        Uses the english tagger and NormalizeStatement, the chatbot's settings,
+#        without loading the chatbot. A digest of every shard row in merge order is
+#        printed for each run and has to be the same for every worker count.
+#
+#RETURNS
+#
+#        Prints the time, speedup, and digest of every run, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        11:05am 10/17/2026                                                          #
+
+def BenchmarkScaling(a_Path, a_MaxWorkers, a_Encoding = 'iso-8859-1'):
+
+    from chatterbot import languages
+
+    preprocessors = [NormalizeStatement]
+    baseline = None
+
+    for workers in range(1, a_MaxWorkers + 1):
+
+        directory = tempfile.mkdtemp(prefix = "shards-")
+
+        try:
+
+            tasks = [(a_Path, start, end, a_Encoding, seedLine, 'training', 5000) for start, end, seedLine in LineShards(a_Path, 4 * workers, a_Encoding, preprocessors)]
+
+            started = time.perf_counter()
+            shardPaths, written = RunShards(TrainLinesShard, tasks, workers, languages.ENG, preprocessors, directory)
+            elapsed = time.perf_counter() - started
+
+            digest = hashlib.sha1()
+
+            for shardPath in shardPaths:
+
+                shard = sqlite3.connect(shardPath)
+
+                for row in shard.execute("SELECT " + ", ".join(SHARD_COLUMNS) + " FROM statement ORDER BY seq"):
+
+                    digest.update(repr(row).encode('utf-8'))
+
+                shard.close()
+
+        finally:
+
+            shutil.rmtree(directory, ignore_errors = True)
+
+        baseline = baseline or elapsed
+
+        print("workers", workers, "-", written, "statements in", round(elapsed, 2), "s,", round(written / max(elapsed, 1e-9)), "statements/s, speedup",
+              round(baseline / elapsed, 2), "digest", digest.hexdigest()[:12])
+
+#Sharded_Train::BenchmarkScaling(a_Path, a_MaxWorkers, a_Encoding)
+
+
+#Benchmarks the shard phase on the Cornell lines for an increasing number of workers
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Measure how sharded training scales with worker processes.")
+    parser.add_argument("--corpus", default = "cornell movie-dialogs corpus/movie_lines.txt", help = "corpus file with one statement per line")
+    parser.add_argument("--max-workers", type = int, default = os.cpu_count() or 1, help = "most worker processes tried")
+    parser.add_argument("--encoding", default = "iso-8859-1", help = "encoding of --corpus")
+    arguments = parser.parse_args()
+
+    BenchmarkScaling(arguments.corpus, arguments.max_workers, arguments.encoding)
+
+#Sharded_Train.py
@@ -0,0 +1,274 @@
+#Single_Flight.py
+#
+#NAME
+#
+#        Single_Flight - runs a computation once for every caller asking for the same
+#                        key while it is in progress, and hands them all its result.
+#
+#SYNOPSIS
+#
+#        Single_Flight.py
+#
+#            threading             --> standard python library, the lock over the calls in
+#                                      flight and the event followers wait on
+#
+#            time                  --> standard python library, timing for the benchmark
+#
+#            SingleFlight          --> table of the calls in flight, keyed by query
+#
+#DESCRIPTION
+#
+#        When many users send the same greeting or ask about the same topic at once,
+#        every request used to miss the cache together and compute the same answer
+#        side by side. With a SingleFlight in front of the computation the first
+#        request for a key (the leader) runs it, and any request for that key arriving
+#        before it finishes (a follower) waits for the leader and gets the same result,
+#        or the same exception. Nothing is kept once the call finishes, so this only
+#        joins requests that overlap in time. Keeping answers for later is left to the
+#        caches behind it.
+#
+#RETURNS
+#
+#        When run directly prints how many of a burst of identical requests were
+#        coalesced. Otherwise provides the SingleFlight for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:40am 10/17/2026                                                          #
+
+import threading
+import time
+
+#Single_Flight::Call Single_Flight::Call
+#
+#NAME
+#
+#        Single_Flight::Call - one computation in flight
+#
+#SYNOPSIS
+#
+#        obj Single_Flight::Call()
+#
+#            done             --> event set once the leader has finished
+#
+#            result, error    --> the leader's return value, or the exception it raised
+#
+#            followers        --> number of callers that joined this call
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:40am 10/17/2026                                                          #
+
+class Call:
+
+    def __init__(self):
+
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+#Single_Flight::Call
+
+#Single_Flight::SingleFlight Single_Flight::SingleFlight
+#
+#NAME
+#
+#        Single_Flight::SingleFlight - coalesces concurrent calls for the same key
+#
+#SYNOPSIS
+#
+#        obj Single_Flight::SingleFlight()
+#
+#            calls            --> dictionary of key to the Call in flight for it
+#
+#            executions       --> calls actually run
+#
+#            coalesced        --> calls answered by joining one already in flight
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Do().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:40am 10/17/2026                                                          #
+
+class SingleFlight:
+
+    def __init__(self):
+
+        self.calls = {}
+        self.lock = threading.Lock()
+
+        self.executions = 0
+        self.coalesced = 0
+
+    #SingleFlight::Do(a_Key, a_Function)
+    #
+    #DESCRIPTION
+    #
+    #        Runs a_Function if no call for a_Key is in flight, otherwise waits for
+    #        the one that is.
+    #
+    #RETURNS
+    #
+    #        Returns the result of the call for a_Key, raising its exception if it
+    #        failed.
+
+    def Do(self, a_Key, a_Function):
+
+        with self.lock:
+
+            call = self.calls.get(a_Key)
+
+            if call is None:
+
+                call = Call()
+                self.calls[a_Key] = call
+                self.executions += 1
+                leader = True
+
+            else:
+
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+
+            call.done.wait()
+
+            if call.error is not None:
+
+                raise call.error
+
+            return call.result
+
+        try:
+
+            call.result = a_Function()
+
+        except BaseException as e:
+
+            call.error = e
+
+            raise
+
+        finally:
+
+            with self.lock:
+
+                del self.calls[a_Key]
+
+            call.done.set()
+
+        return call.result
+
+    #SingleFlight::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of calls run, calls coalesced into another, and
+    #        calls in flight now.
+
+    def Stats(self):
+
+        with self.lock:
+
+            return {'executions': self.executions,
+                    'coalesced': self.coalesced,
+                    'in_flight': len(self.calls)}
+
+#Single_Flight::SingleFlight
+
+#Single_Flight::BenchmarkCoalescing(a_Requests, a_Keys, a_Seconds) Single_Flight::BenchmarkCoalescing(a_Requests, a_Keys, a_Seconds)
+#
+#NAME
+#
+#        Single_Flight::BenchmarkCoalescing - a burst of requests for a few keys run
+#                                             through a SingleFlight
+#
+#SYNOPSIS
+#
+#        void Single_Flight::BenchmarkCoalescing(a_Requests, a_Keys, a_Seconds)
+#
+#            a_Requests       --> threads started at once
+#
+#            a_Keys           --> distinct keys the threads ask for
+#
+#            a_Seconds        --> time each computation takes
+#
+#RETURNS
+#
+#        Prints the elapsed time and the counters, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        12:40am 10/17/2026                                                          #
+
+def BenchmarkCoalescing(a_Requests = 200, a_Keys = 3, a_Seconds = 0.05):
+
+    flight = SingleFlight()
+    start = threading.Barrier(a_Requests)
+
+    def Compute(a_Key):
+
+        time.sleep(a_Seconds)
+
+        return a_Key.upper()
+
+    def Request(a_Number):
+
+        key = "query " + str(a_Number % a_Keys)
+        start.wait()
+
+        assert flight.Do(key, lambda: Compute(key)) == key.upper()
+
+    requests = [threading.Thread(target = Request, args = (number,)) for number in range(a_Requests)]
+
+    started = time.perf_counter()
+
+    for request in requests:
+
+        request.start()
+
+    for request in requests:
+
+        request.join()
+
+    print(a_Requests, "requests for", a_Keys, "keys in", round(time.perf_counter() - started, 3), "s", flight.Stats())
+
+#Single_Flight::BenchmarkCoalescing(a_Requests, a_Keys, a_Seconds)
+
+
+#Shows a burst of identical traffic costing one computation per key
+if __name__ == "__main__":
+
+    BenchmarkCoalescing()
+
+#Single_Flight.py
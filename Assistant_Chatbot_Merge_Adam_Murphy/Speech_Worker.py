@@ -0,0 +1,387 @@
+#Speech_Worker.py
+#
+#NAME
+#
+#        Speech_Worker - single long lived text to speech engine owned by a background
+#                        thread that speaks queued utterances one after another.
+#
+#SYNOPSIS
+#
+#        Speech_Worker.py
+#
+#            pyttsx3               --> takes the input from chatbot or virtual assistant
+#                                      and synthesizes its' "voice" for the user to hear
+#
+#            threading             --> standard python library, the worker thread and the
+#                                      events callers wait on
+#
+#            queue                 --> standard python library, thread safe utterance queue
+#
+#            time                  --> standard python library, used for queue latency
+#
+#            Utterance             --> one queued piece of text, can be waited on or canceled
+#
+#            SpeechWorker          --> thread owning the pyttsx3 engine
+#
+#DESCRIPTION
+#
+#        Speak() used to call pyttsx3.init(), look up the voice list and set the voice
+#        for every sentence, and blocked the caller until the audio finished, so a
+#        wikipedia lookup paid that setup three times before returning. The engine is
+#        now created once, inside the worker thread that uses it (pyttsx3 engines must
+#        stay on the thread that created them), with the voice resolved once. Callers
+#        queue text and return straight away, and can wait for an utterance, cancel
+#        pending ones, or wait for the queue to go quiet before opening the microphone.
+#
+#RETURNS
+#
+#        Does not return anything, provides the SpeechWorker for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:30pm 10/17/2026                                                          #
+
+import pyttsx3
+import threading
+import queue
+import time
+
+#Speech_Worker::Utterance Speech_Worker::Utterance
+#
+#NAME
+#
+#        Speech_Worker::Utterance - a piece of text waiting to be spoken
+#
+#SYNOPSIS
+#
+#        obj Speech_Worker::Utterance(a_Text)
+#
+#            text             --> string to be spoken
+#
+#            canceled         --> set when the utterance is canceled before it is spoken
+#
+#            queuedAt         --> monotonic time the utterance was queued
+#
+#            done             --> event set once the utterance has been spoken,
+#                                 canceled, or failed
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Wait().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:30pm 10/17/2026                                                          #
+
+class Utterance:
+
+    def __init__(self, a_Text):
+
+        self.text = str(a_Text)
+        self.canceled = False
+        self.queuedAt = time.monotonic()
+        self.done = threading.Event()
+
+    #Utterance::Wait(a_Timeout)
+    #
+    #DESCRIPTION
+    #
+    #        Blocks until the utterance is finished or a_Timeout seconds pass.
+    #
+    #RETURNS
+    #
+    #        Returns True if the utterance finished, False on timeout.
+
+    def Wait(self, a_Timeout = None):
+
+        return self.done.wait(a_Timeout)
+
+    #Utterance::Cancel()
+    #
+    #DESCRIPTION
+    #
+    #        Marks the utterance so the worker skips it. Has no effect once the
+    #        worker has started speaking it.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Cancel(self):
+
+        self.canceled = True
+
+#Speech_Worker::Utterance
+
+#Speech_Worker::SpeechWorker Speech_Worker::SpeechWorker
+#
+#NAME
+#
+#        Speech_Worker::SpeechWorker - daemon thread that owns the pyttsx3 engine and
+#                                      speaks queued utterances in order
+#
+#SYNOPSIS
+#
+#        obj Speech_Worker::SpeechWorker(a_VoiceIndex)
+#
+#            a_VoiceIndex     --> index into the engine's voice list, 1 is the narrator
+#                                 the Virtual Assistant has always used. Falls back to
+#                                 the default voice when the system has fewer voices
+#
+#            utterances       --> queue of Utterance objects, None stops the worker
+#
+#            pending          --> utterances queued or being spoken, used by WaitIdle()
+#
+#            spoken, canceled, failed, maxDepth, totalDelay
+#                             --> counters for Stats()
+#
+#DESCRIPTION
+#
+#        A failure to create the engine or to speak one utterance is printed and
+#        counted, and the utterance is still marked done so nobody waits on it
+#        forever. The text of every utterance is still printed by its caller, so
+#        the assistant stays usable without a working audio device.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Say().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        9:30pm 10/17/2026                                                          #
+
+class SpeechWorker(threading.Thread):
+
+    def __init__(self, a_VoiceIndex = 1):
+
+        threading.Thread.__init__(self, name = "SpeechWorker", daemon = True)
+
+        self.voiceIndex = a_VoiceIndex
+        self.utterances = queue.Queue()
+
+        self.pendingLock = threading.Condition()
+        self.pending = 0
+
+        self.spoken = 0
+        self.canceled = 0
+        self.failed = 0
+        self.maxDepth = 0
+        self.totalDelay = 0.0
+
+    #SpeechWorker::CreateEngine()
+    #
+    #DESCRIPTION
+    #
+    #        Initializes pyttsx3 and resolves the voice, called once on the worker thread.
+    #
+    #RETURNS
+    #
+    #        Returns the engine, or None if no speech driver is available.
+
+    def CreateEngine(self):
+
+        try:
+
+            speechResource = pyttsx3.init()
+            voices = speechResource.getProperty('voices')
+
+            if len(voices) > self.voiceIndex:
+
+                speechResource.setProperty('voice', voices[self.voiceIndex].id)
+
+            return speechResource
+
+        except Exception as e:
+
+            print(type(e), e)
+            print("Text to speech unavailable, responses will only be printed.")
+
+            return None
+
+    #SpeechWorker::run()
+    #
+    #DESCRIPTION
+    #
+    #        Worker loop, speaks each utterance that has not been canceled.
+    #
+    #RETURNS
+    #
+    #        Returns when Stop() queues the sentinel.
+
+    def run(self):
+
+        speechResource = self.CreateEngine()
+
+        while True:
+
+            utterance = self.utterances.get()
+
+            if utterance is None:
+
+                break
+
+            try:
+
+                if utterance.canceled:
+
+                    self.canceled += 1
+
+                elif speechResource is None:
+
+                    self.failed += 1
+
+                else:
+
+                    self.totalDelay += time.monotonic() - utterance.queuedAt
+
+                    speechResource.say(utterance.text)
+                    speechResource.runAndWait()
+
+                    self.spoken += 1
+
+            except Exception as e:
+
+                print(type(e), e)
+                self.failed += 1
+
+            finally:
+
+                utterance.done.set()
+
+                with self.pendingLock:
+
+                    self.pending -= 1
+                    self.pendingLock.notify_all()
+
+    #SpeechWorker::Say(a_Text, a_Wait)
+    #
+    #DESCRIPTION
+    #
+    #        Queues a_Text to be spoken, optionally blocking until it has been.
+    #
+    #RETURNS
+    #
+    #        Returns the queued Utterance.
+
+    def Say(self, a_Text, a_Wait = False):
+
+        utterance = Utterance(a_Text)
+
+        with self.pendingLock:
+
+            self.pending += 1
+            self.maxDepth = max(self.maxDepth, self.pending)
+
+        self.utterances.put(utterance)
+
+        if a_Wait:
+
+            utterance.Wait()
+
+        return utterance
+
+    #SpeechWorker::CancelPending()
+    #
+    #DESCRIPTION
+    #
+    #        Cancels every utterance still waiting in the queue, the one being spoken
+    #        is allowed to finish.
+    #
+    #RETURNS
+    #
+    #        Returns the number of utterances canceled.
+
+    def CancelPending(self):
+
+        with self.utterances.mutex:
+
+            waiting = [utterance for utterance in self.utterances.queue if utterance is not None and not utterance.canceled]
+
+        for utterance in waiting:
+
+            utterance.Cancel()
+
+        return len(waiting)
+
+    #SpeechWorker::WaitIdle(a_Timeout)
+    #
+    #DESCRIPTION
+    #
+    #        Blocks until nothing is queued or being spoken, used before listening
+    #        so the microphone does not hear the assistant talking.
+    #
+    #RETURNS
+    #
+    #        Returns True if the worker went idle, False on timeout.
+
+    def WaitIdle(self, a_Timeout = None):
+
+        with self.pendingLock:
+
+            return self.pendingLock.wait_for(lambda: self.pending == 0, a_Timeout)
+
+    #SpeechWorker::QueueDepth()
+    #
+    #DESCRIPTION
+    #
+    #        Number of utterances queued or being spoken.
+    #
+    #RETURNS
+    #
+    #        Returns an integer.
+
+    def QueueDepth(self):
+
+        with self.pendingLock:
+
+            return self.pending
+
+    #SpeechWorker::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the worker counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the queue depth, maximum depth, utterances spoken,
+    #        canceled and failed, and the average seconds spent queued.
+
+    def Stats(self):
+
+        return {'depth': self.QueueDepth(),
+                'max_depth': self.maxDepth,
+                'spoken': self.spoken,
+                'canceled': self.canceled,
+                'failed': self.failed,
+                'average_delay': self.totalDelay / self.spoken if self.spoken else 0.0}
+
+    #SpeechWorker::Stop()
+    #
+    #DESCRIPTION
+    #
+    #        Lets the worker finish everything already queued and then exit.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Stop(self):
+
+        self.utterances.put(None)
+
+#Speech_Worker::SpeechWorker
+
+#Speech_Worker.py
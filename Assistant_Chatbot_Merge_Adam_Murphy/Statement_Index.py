@@ -0,0 +1,756 @@
+#Statement_Index.py
+#
+#NAME
+#
+#        Statement_Index - in-memory inverted index over the statements the chatbot has
+#                          been trained on, used to narrow every query down to a small
+#                          set of candidates before they are scored.
+#
+#SYNOPSIS
+#
+#        Statement_Index.py
+#
+#            math                  --> standard python library, used for the inverse
+#                                      document frequency weight of each term
+#
+#            heapq                 --> standard python library, used to pick the
+#                                      top-K scoring candidates without a full sort
+#
+#            array                 --> standard python library, compact integer arrays
+#                                      for the posting lists
+#
+#            time                  --> standard python library, used to time the
+#                                      recall report
+#
+#            threading             --> standard python library, one thread builds the
+#                                      index while the others wait for it
+#
+#            contextvars           --> standard python library, candidates prefetched
+#                                      for a batch of queries are kept per thread, and
+#                                      follow the work into worker threads that are
+#                                      handed a copy of the context
+#
+#            contextlib            --> standard python library, Prefetch() is a with block
+#
+#            argparse              --> standard python library for the command line
+#                                      options of the recall report
+#
+#            Text_Normalizer       --> search terms of the queries, and the table the
+#                                      stored statements' search terms were written to
+#                                      at training time
+#
+#            Response_Cache        --> DatabaseWatch, the same signal the response cache
+#                                      is emptied on, tells when the index is out of date
+#
+#            chatterbot            --> library that includes all chatbot functions for
+#                                      initialization, training, and interactivity
+#
+#DESCRIPTION
+#
+#        The BestMatch logic adapters ask storage for every statement sharing a word
+#        with the query and score each one with the comparison function, which after
+#        training on the Cornell and Ubuntu corpora is hundreds of thousands of
+#        comparisons per message. This file builds a token and bigram inverted index
+#        over the stored statements, once at startup and again whenever the
+#        database is written to, and hands BestMatch only the top-K statements by
+#        weighted term overlap to score. Statements are indexed by the stopword
+#        stripped search terms ChatBot_Train wrote for them, so starting up only
+#        splits strings.
+#
+#RETURNS
+#
+#        When run directly prints a recall report comparing the best match found
+#        through the index against the best match found by the full storage scan.
+#        Otherwise provides the index and search algorithm for the chatbot to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+import math
+import heapq
+import time
+import threading
+import contextvars
+import contextlib
+import argparse
+from array import array
+from chatterbot.conversation import Statement
+from Text_Normalizer import SearchTerms, searchTable
+from Response_Cache import DatabaseWatch
+
+#number of candidates handed to the comparison function for each query
+DEFAULT_CANDIDATE_COUNT = 200
+
+#terms found in more than this many statements are only used when the rarer
+#terms of the query did not produce enough candidates
+COMMON_TERM_LIMIT = 20000
+
+#Statement_Index::Tokenize(a_Text) Statement_Index::Tokenize(a_Text)
+#
+#NAME
+#
+#        Statement_Index::Tokenize - splits a statement into the terms stored in the
+#                                    index, every search word plus every pair of
+#                                    neighbouring search words
+#
+#SYNOPSIS
+#
+#        list Statement_Index::Tokenize(a_Text)
+#
+#            a_Text           --> string variable containing the statement text
+#
+#            words            --> list of the search words in a_Text, see
+#                                 Text_Normalizer::SearchTerms()
+#
+#DESCRIPTION
+#
+#        Bigrams are indexed alongside single words so that statements sharing a
+#        phrase with the query rank above statements that only share its words.
+#        Stored statements whose search words were already written at training
+#        time skip straight to Terms().
+#
+#RETURNS
+#
+#        Returns a list of the unique terms in a_Text.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+def Tokenize(a_Text):
+
+    return Terms(SearchTerms(a_Text))
+
+#Statement_Index::Tokenize(a_Text)
+
+#Statement_Index::Terms(a_Words) Statement_Index::Terms(a_Words)
+#
+#NAME
+#
+#        Statement_Index::Terms - the words and neighbouring word pairs of a list of
+#                                 search words
+#
+#SYNOPSIS
+#
+#        list Statement_Index::Terms(a_Words)
+#
+#            a_Words          --> list of search words in the order they appear
+#
+#RETURNS
+#
+#        Returns a list of the unique terms.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def Terms(a_Words):
+
+    terms = set(a_Words)
+    terms.update(first + " " + second for first, second in zip(a_Words, a_Words[1:]))
+
+    return list(terms)
+
+#Statement_Index::Terms(a_Words)
+
+#Statement_Index::StatementIndex Statement_Index::StatementIndex
+#
+#NAME
+#
+#        Statement_Index::StatementIndex - object holding the stored statements in
+#                                          columns along with the posting list of
+#                                          every term
+#
+#SYNOPSIS
+#
+#        obj Statement_Index::StatementIndex(a_Storage)
+#
+#            a_Storage        --> the chatbot's sql storage adapter to read from
+#
+#            columns          --> dictionary of column name to a list holding that
+#                                 field of every indexed statement, a statement's
+#                                 position in the lists is its document number
+#
+#            postings         --> dictionary of term to an array of the document
+#                                 numbers containing it, in ascending order
+#
+#DESCRIPTION
+#
+#        Statements are loaded from storage by Build() rather than when the index is
+#        created, so importing the chatbot for training does not pay for an index of
+#        the database it is about to rebuild. A built index is never changed, a
+#        database that has changed gets a new one, see IndexedCandidateSearch.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Candidates().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+class StatementIndex:
+
+    COLUMNS = ('id', 'text', 'search_text', 'in_response_to', 'search_in_response_to', 'conversation', 'persona')
+
+    def __init__(self, a_Storage):
+
+        self.storage = a_Storage
+
+        self.columns = None
+        self.postings = None
+
+    #StatementIndex::Build()
+    #
+    #DESCRIPTION
+    #
+    #        Reads every statement not spoken by the bot out of storage in id order
+    #        and adds its terms to the posting lists. The search words stored in
+    #        statement_search are used when training wrote them, statements
+    #        without a row there are run through SearchTerms() instead.
+    #
+    #RETURNS
+    #
+    #        Returns nothing, fills in columns and postings.
+
+    def Build(self):
+
+        statementModel = self.storage.get_model('statement')
+        session = self.storage.Session()
+
+        columns = {name: [] for name in self.COLUMNS}
+        postings = {}
+
+        try:
+
+            fields = [getattr(statementModel, name) for name in self.COLUMNS]
+
+            if self.storage.engine.has_table(searchTable.name):
+
+                query = session.query(*fields, searchTable.c.search_terms).outerjoin(searchTable, searchTable.c.statement_id == statementModel.id)
+
+            else:
+
+                query = session.query(*fields)
+
+            query = query.filter((statementModel.persona == None) | ~statementModel.persona.startswith('bot:'))
+
+            for document, row in enumerate(query.order_by(statementModel.id).yield_per(5000)):
+
+                for name, value in zip(self.COLUMNS, row):
+
+                    columns[name].append(value)
+
+                if len(row) > len(self.COLUMNS) and row[-1] is not None:
+
+                    words = row[-1].split()
+
+                else:
+
+                    words = SearchTerms(row[1] or "")
+
+                for term in Terms(words):
+
+                    if term in postings:
+
+                        postings[term].append(document)
+
+                    else:
+
+                        postings[term] = [document]
+
+        finally:
+
+            session.close()
+
+        self.columns = columns
+        self.postings = {term: array('I', documents) for term, documents in postings.items()}
+
+    #StatementIndex::Candidates(a_Text, a_Count)
+    #
+    #DESCRIPTION
+    #
+    #        Scores every statement sharing a term with a_Text by the summed inverse
+    #        document frequency of the shared terms and keeps the a_Count best. Rare
+    #        terms are visited first, and terms more common than COMMON_TERM_LIMIT are
+    #        skipped once enough candidates have been found.
+    #
+    #RETURNS
+    #
+    #        Returns a list of document numbers in ascending order, which is the order
+    #        storage would have returned them in.
+
+    def Candidates(self, a_Text, a_Count = DEFAULT_CANDIDATE_COUNT):
+
+        documentCount = len(self.columns['text'])
+        terms = [term for term in Tokenize(a_Text) if term in self.postings]
+        terms.sort(key = lambda term: len(self.postings[term]))
+
+        scores = {}
+
+        for term in terms:
+
+            posting = self.postings[term]
+
+            if len(posting) > COMMON_TERM_LIMIT and len(scores) >= a_Count:
+
+                break
+
+            weight = math.log(1.0 + documentCount / len(posting))
+
+            for document in posting:
+
+                scores[document] = scores.get(document, 0.0) + weight
+
+        best = heapq.nlargest(a_Count, scores.items(), key = lambda item: (item[1], -item[0]))
+
+        return sorted(document for document, score in best)
+
+    #StatementIndex::GetStatement(a_Document)
+    #
+    #DESCRIPTION
+    #
+    #        Rebuilds a chatterbot Statement from the stored columns.
+    #
+    #RETURNS
+    #
+    #        Returns a Statement object for the given document number.
+
+    def GetStatement(self, a_Document):
+
+        fields = {name: self.columns[name][a_Document] for name in self.COLUMNS}
+
+        return Statement(**fields)
+
+#Statement_Index::StatementIndex
+
+#Statement_Index::IndexedCandidateSearch Statement_Index::IndexedCandidateSearch
+#
+#NAME
+#
+#        Statement_Index::IndexedCandidateSearch - chatterbot search algorithm that
+#                                                  scores only the top-K candidates
+#                                                  from a StatementIndex
+#
+#SYNOPSIS
+#
+#        obj Statement_Index::IndexedCandidateSearch(a_ChatBot, a_CandidateCount)
+#
+#            a_ChatBot        --> chatbot object the search is attached to
+#
+#            a_CandidateCount --> number of candidates scored for each query
+#
+#            index            --> StatementIndex candidates are drawn from, None
+#                                 until Refresh() first builds it
+#
+#            indexVersion     --> watch.Version() of the database index was built
+#                                 from
+#
+#            watch            --> DatabaseWatch of the chatbot's database
+#
+#            buildLock        --> held while an index is built, so it is built once
+#                                 however many queries find it missing or stale
+#
+#            compare_statements --> the comparison function of the chatbot's built-in
+#                                   text search, so both searches score the same way
+#
+#            prefetched       --> context variable holding the dictionary of query text
+#                                 to (index, candidates, batch scores) set by
+#                                 UsePrefetched()
+#
+#DESCRIPTION
+#
+#        Behaves like chatterbot's IndexedTextSearch, yielding each statement that
+#        is a closer match than the one before it, so BestMatch can use it without
+#        any other change. Only the candidate set is different. When several
+#        queries arrive together, Prefetch() scores all of their candidates in one
+#        pass and the searches made inside it use those scores. Every search works
+#        on the one index it started with, so a rebuild never mixes up the
+#        document numbers of a search already under way.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see search().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+class IndexedCandidateSearch:
+
+    name = 'inverted_index_search'
+
+    def __init__(self, a_ChatBot, a_CandidateCount = DEFAULT_CANDIDATE_COUNT):
+
+        self.chatbot = a_ChatBot
+        self.candidateCount = a_CandidateCount
+
+        self.index = None
+        self.indexVersion = None
+        self.watch = DatabaseWatch(a_ChatBot.storage)
+        self.buildLock = threading.Lock()
+        self.builds = 0
+
+        self.compare_statements = a_ChatBot.search_algorithms['indexed_text_search'].compare_statements
+
+        self.prefetched = contextvars.ContextVar('prefetched', default = None)
+
+    #IndexedCandidateSearch::Refresh()
+    #
+    #DESCRIPTION
+    #
+    #        Builds the index if there is none yet, or builds a new one if the 
+    #        database has been written to since it was built. Queries arriving 
+    #        meanwhile wait for the build rather than start one of their own. 
+    #        Assistant_Chatbot_Merge calls it at startup and before each query is 
+    #        looked up, so a build never eats into a logic adapter's budget.
+    #
+    #RETURNS
+    #
+    #        Returns the up to date StatementIndex.
+
+    def Refresh(self):
+
+        version = self.watch.Version()
+        index = self.index
+
+        if index is not None and version == self.indexVersion:
+
+            return index
+
+        with self.buildLock:
+
+            if self.index is None or version != self.indexVersion:
+
+                index = StatementIndex(self.chatbot.storage)
+                index.Build()
+
+                self.index = index
+                self.indexVersion = version
+                self.builds += 1
+
+            return self.index
+
+    #IndexedCandidateSearch::ScoreCandidates(a_Texts)
+    #
+    #DESCRIPTION
+    #
+    #        Finds the candidates of every text in a_Texts and, when the comparison
+    #        function has compare_many(), scores them all in a single call. a_Texts
+    #        should already be preprocessed the way the chatbot preprocesses its
+    #        input.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of text to (index, candidates, batch scores) for
+    #        UsePrefetched(), empty when the comparison cannot score in batches.
+
+    def ScoreCandidates(self, a_Texts):
+
+        if not hasattr(self.compare_statements, 'compare_many'):
+
+            return {}
+
+        index = self.Refresh()
+
+        texts = list(dict.fromkeys(a_Texts))
+        candidates = [index.Candidates(text, self.candidateCount) for text in texts]
+        candidateTexts = [[index.columns['text'][document] for document in documents] for documents in candidates]
+
+        bounds = self.compare_statements.compare_many(texts, candidateTexts)
+
+        return {text: (index, documents, scores) for text, documents, scores in zip(texts, candidates, bounds)}
+
+    #IndexedCandidateSearch::Prefetch(a_Texts)
+    #
+    #DESCRIPTION
+    #
+    #        With block that scores the candidates of every text in a_Texts with
+    #        ScoreCandidates() and uses them for the searches inside it.
+    #
+    #RETURNS
+    #
+    #        Yields nothing, the prefetched scores are dropped when the block ends.
+
+    @contextlib.contextmanager
+    def Prefetch(self, a_Texts):
+
+        with self.UsePrefetched(self.ScoreCandidates(a_Texts)):
+
+            yield
+
+    #IndexedCandidateSearch::UsePrefetched(a_Entries)
+    #
+    #DESCRIPTION
+    #
+    #        With block in which searches for a text in a_Entries, on this thread or
+    #        on a worker running a copy of its context, skip straight to the
+    #        closest_matches() walk. a_Entries can come from ScoreCandidates() run
+    #        on another thread, so one thread can score a batch and each query be
+    #        answered on its own.
+    #
+    #RETURNS
+    #
+    #        Yields nothing, the entries are dropped when the block ends.
+
+    @contextlib.contextmanager
+    def UsePrefetched(self, a_Entries):
+
+        token = self.prefetched.set(a_Entries)
+
+        try:
+
+            yield
+
+        finally:
+
+            self.prefetched.reset(token)
+
+    #IndexedCandidateSearch::search(input_statement, **additional_parameters)
+    #
+    #DESCRIPTION
+    #
+    #        Scores the candidates for input_statement in storage order. Named and
+    #        shaped like chatterbot's own search algorithms so BestMatch can call it.
+    #
+    #RETURNS
+    #
+    #        Yields each statement that is a closer match than the previous one,
+    #        with its confidence set.
+
+    def search(self, input_statement, **additional_parameters):
+
+        self.chatbot.logger.info('Beginning indexed search for close text match')
+
+        entry = (self.prefetched.get() or {}).get(input_statement.text)
+
+        if entry is not None:
+
+            index, documents, bounds = entry
+
+        else:
+
+            index = self.Refresh()
+            documents = index.Candidates(input_statement.text, self.candidateCount)
+            bounds = None
+
+        #batch comparison functions score every candidate in one call and only
+        #hand back the ones that beat the closest match so far
+        if hasattr(self.compare_statements, 'closest_matches'):
+
+            texts = [index.columns['text'][document] for document in documents]
+
+            for position, confidence in self.compare_statements.closest_matches(input_statement, texts, bounds):
+
+                statement = index.GetStatement(documents[position])
+                statement.confidence = confidence
+
+                yield statement
+
+            return
+
+        closest_confidence = 0
+
+        for document in documents:
+
+            statement = index.GetStatement(document)
+            confidence = self.compare_statements(input_statement, statement)
+
+            if confidence > closest_confidence:
+
+                statement.confidence = confidence
+                closest_confidence = confidence
+
+                yield statement
+
+#Statement_Index::IndexedCandidateSearch
+
+#Statement_Index::AttachStatementIndex(a_ChatBot, a_CandidateCount) Statement_Index::AttachStatementIndex(a_ChatBot, a_CandidateCount)
+#
+#NAME
+#
+#        Statement_Index::AttachStatementIndex - creates a StatementIndex for the
+#                                                chatbot's storage and switches its
+#                                                BestMatch adapters over to it
+#
+#SYNOPSIS
+#
+#        obj Statement_Index::AttachStatementIndex(a_ChatBot, a_CandidateCount)
+#
+#            a_ChatBot        --> chatbot object whose adapters should use the index
+#
+#            a_CandidateCount --> number of candidates scored for each query
+#
+#            search           --> the IndexedCandidateSearch registered with the
+#                                 chatbot under 'inverted_index_search'
+#
+#DESCRIPTION
+#
+#        Registers the indexed search next to chatterbot's built-in ones and points
+#        every logic adapter that was using the default text search at it. The
+#        index itself is not built until the search's Refresh() is called. The
+#        built-in search stays registered so the full scan can still be used for
+#        comparison, see MeasureRecall().
+#
+#RETURNS
+#
+#        Returns the IndexedCandidateSearch that was attached.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+def AttachStatementIndex(a_ChatBot, a_CandidateCount = DEFAULT_CANDIDATE_COUNT):
+
+    search = IndexedCandidateSearch(a_ChatBot, a_CandidateCount)
+
+    a_ChatBot.search_algorithms[search.name] = search
+
+    for adapter in a_ChatBot.logic_adapters:
+
+        if getattr(adapter, 'search_algorithm_name', None) == 'indexed_text_search':
+
+            adapter.search_algorithm = search
+
+    return search
+
+#Statement_Index::AttachStatementIndex(a_ChatBot, a_CandidateCount)
+
+#Statement_Index::MeasureRecall(a_ChatBot, a_Queries) Statement_Index::MeasureRecall(a_ChatBot, a_Queries)
+#
+#NAME
+#
+#        Statement_Index::MeasureRecall - compares the best match found through the
+#                                         index against the best match found by the
+#                                         full storage scan
+#
+#SYNOPSIS
+#
+#        dict Statement_Index::MeasureRecall(a_ChatBot, a_Queries)
+#
+#            a_ChatBot        --> chatbot object with the index attached
+#
+#            a_Queries        --> list of sample user input strings
+#
+#            hits             --> number of queries where the index found a match
+#                                 at least as close as the full scan did
+#
+#DESCRIPTION
+#
+#        Runs every query through both chatterbot's IndexedTextSearch and the
+#        attached IndexedCandidateSearch. A query counts as recalled when the
+#        indexed best match has the same confidence as the full scan's, even if
+#        a different statement with an equal score was picked.
+#
+#RETURNS
+#
+#        Returns a dictionary with the recall, the number of queries, and the
+#        average time per query of each search.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        4:05pm 10/17/2026                                                          #
+
+def MeasureRecall(a_ChatBot, a_Queries):
+
+    fullSearch = a_ChatBot.search_algorithms['indexed_text_search']
+    indexedSearch = a_ChatBot.search_algorithms[IndexedCandidateSearch.name]
+
+    indexedSearch.Refresh()
+
+    hits = 0
+    fullTime = 0.0
+    indexedTime = 0.0
+
+    for query in a_Queries:
+
+        inputStatement = Statement(text = query)
+        inputStatement.search_text = a_ChatBot.storage.tagger.get_text_index_string(query)
+
+        start = time.perf_counter()
+        fullBest = 0
+
+        for result in fullSearch.search(inputStatement):
+
+            fullBest = result.confidence
+
+        fullTime += time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexedBest = 0
+
+        for result in indexedSearch.search(inputStatement):
+
+            indexedBest = result.confidence
+
+        indexedTime += time.perf_counter() - start
+
+        if indexedBest >= fullBest:
+
+            hits += 1
+
+    count = max(len(a_Queries), 1)
+
+    return {'queries': len(a_Queries),
+            'recall': hits / count,
+            'full_scan_seconds': fullTime / count,
+            'indexed_seconds': indexedTime / count}
+
+#Statement_Index::MeasureRecall(a_ChatBot, a_Queries)
+
+
+#Prints a recall report for the chatbot's current database
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Recall of the statement index against the full storage scan.")
+    parser.add_argument("--queries", default = "cornell movie-dialogs corpus/testing_data.txt")
+    parser.add_argument("--limit", type = int, default = 200)
+    parser.add_argument("--candidates", type = int, default = DEFAULT_CANDIDATE_COUNT)
+    arguments = parser.parse_args()
+
+    from Assistant_Chatbot_Merge import dialogueBot
+
+    dialogueBot.search_algorithms[IndexedCandidateSearch.name].candidateCount = arguments.candidates
+
+    queryFile = open(arguments.queries)
+    queries = [line.strip() for line in queryFile if line.strip()][:arguments.limit]
+    queryFile.close()
+
+    report = MeasureRecall(dialogueBot, queries)
+
+    print("K = " + str(arguments.candidates))
+    print("queries:            " + str(report['queries']))
+    print("recall:             %.3f" % report['recall'])
+    print("full scan (ms):     %.2f" % (report['full_scan_seconds'] * 1000))
+    print("indexed (ms):       %.2f" % (report['indexed_seconds'] * 1000))
+
+#Statement_Index.py
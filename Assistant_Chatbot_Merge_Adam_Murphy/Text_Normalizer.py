@@ -0,0 +1,437 @@
+#Text_Normalizer.py
+#
+#NAME
+#
+#        Text_Normalizer - one pass replacement for the chatbot's three preprocessors,
+#                          plus the stopword stripped search terms written next to
+#                          every stored statement when the chatbot is trained.
+#
+#SYNOPSIS
+#
+#        Text_Normalizer.py
+#
+#            re                    --> standard python library for regular expressions,
+#                                      collapses runs of spaces and splits words
+#
+#            html                  --> standard python library, unescapes html entities
+#
+#            unicodedata           --> standard python library, folds unicode text down
+#                                      to ascii
+#
+#            time                  --> standard python library, timing for the benchmark
+#
+#            argparse              --> standard python library for the benchmark options
+#
+#            sqlalchemy            --> library the chatbot's storage is built on, defines
+#                                      the table the search terms are kept in
+#
+#            STOPWORDS             --> words left out of the search terms
+#
+#            searchTable           --> statement_search table of statement id to its
+#                                      search terms
+#
+#DESCRIPTION
+#
+#        Every query went through clean_whitespace, unescape_html and
+#        convert_to_ascii one after another, each rewriting the whole text even
+#        though nearly every query is already plain ascii with single spaces.
+#        NormalizeText() gives exactly the same result in one call, skipping every
+#        step its quick check shows would leave the text unchanged, and
+#        NormalizeStatement() is the preprocessor form of it.
+#
+#        The stored side never changes once training is done, yet the statement
+#        index lowercased and split every stored statement again each time the
+#        server started. ChatBot_Train::NormalizeCorpus() now writes the search
+#        terms of every statement, normalized, lowercased and with stopwords taken
+#        out, into the statement_search table once at training time, and
+#        Statement_Index reads them straight back. Queries are turned into search
+#        terms with the same SearchTerms() so both sides agree.
+#
+#RETURNS
+#
+#        When run directly prints the per query and per stored statement time of
+#        the old and new normalization. Otherwise provides the normalizer for the
+#        other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+import re
+import html
+import unicodedata
+import time
+import argparse
+from sqlalchemy import MetaData, Table, Column, Integer, Text
+
+#clean_whitespace turns these into spaces before stripping the text
+WHITESPACE_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+MULTIPLE_SPACES = re.compile(' +')
+
+WORDS = re.compile(r"[a-z0-9']+")
+
+#Text_Normalizer::STOPWORDS Text_Normalizer::STOPWORDS
+#
+#NAME
+#
+#        Text_Normalizer::STOPWORDS - common english words that say little about what
+#                                     a statement is about, left out of its search
+#                                     terms
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+STOPWORDS = frozenset(['a', 'about', 'above', 'after', 'again', 'against', 'all', 'am', 'an', 'and',
+                       'any', 'are', 'as', 'at', 'be', 'because', 'been', 'before', 'being', 'below',
+                       'between', 'both', 'but', 'by', 'can', 'could', 'did', 'do', 'does', 'doing',
+                       'down', 'during', 'each', 'few', 'for', 'from', 'further', 'had', 'has', 'have',
+                       'having', 'he', 'her', 'here', 'hers', 'herself', 'him', 'himself', 'his', 'how',
+                       'i', "i'm", 'if', 'in', 'into', 'is', 'it', "it's", 'its', 'itself', 'just', 'me',
+                       'more', 'most', 'my', 'myself', 'no', 'nor', 'not', 'now', 'of', 'off', 'on',
+                       'once', 'only', 'or', 'other', 'our', 'ours', 'ourselves', 'out', 'over', 'own',
+                       'same', 'she', 'should', 'so', 'some', 'such', 'than', 'that', "that's", 'the',
+                       'their', 'theirs', 'them', 'themselves', 'then', 'there', 'these', 'they', 'this',
+                       'those', 'through', 'to', 'too', 'under', 'until', 'up', 'very', 'was', 'we',
+                       'were', 'what', "what's", 'when', 'where', 'which', 'while', 'who', 'whom', 'why',
+                       'will', 'with', 'would', 'you', "you're", 'your', 'yours', 'yourself',
+                       'yourselves'])
+
+#Text_Normalizer::STOPWORDS
+
+#Text_Normalizer::searchTable Text_Normalizer::searchTable
+#
+#NAME
+#
+#        Text_Normalizer::searchTable - statement_search table, kept beside
+#                                       chatterbot's own statement table so its
+#                                       schema is left alone
+#
+#SYNOPSIS
+#
+#            statement_id     --> id of the statement in the statement table
+#
+#            search_terms     --> SearchText() of the statement's text
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+searchTable = Table('statement_search', MetaData(),
+                    Column('statement_id', Integer, primary_key = True),
+                    Column('search_terms', Text))
+
+#Text_Normalizer::searchTable
+
+#Text_Normalizer::NormalizeText(a_Text) Text_Normalizer::NormalizeText(a_Text)
+#
+#NAME
+#
+#        Text_Normalizer::NormalizeText - clean_whitespace, unescape_html and
+#                                         convert_to_ascii in one call
+#
+#SYNOPSIS
+#
+#        str Text_Normalizer::NormalizeText(a_Text)
+#
+#            a_Text           --> string variable containing the text to normalize
+#
+#DESCRIPTION
+#
+#        Applies the three steps in the same order as the preprocessors did, so the
+#        result is identical, but only rewrites the text for the steps that would
+#        change it. Plain ascii text with single spaces costs a few character
+#        scans and is returned as it is.
+#
+#RETURNS
+#
+#        Returns the normalized text.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def NormalizeText(a_Text):
+
+    text = a_Text
+
+    if '\n' in text or '\r' in text or '\t' in text:
+
+        text = text.translate(WHITESPACE_TABLE)
+
+    text = text.strip()
+
+    if '  ' in text:
+
+        text = MULTIPLE_SPACES.sub(' ', text)
+
+    if '&' in text:
+
+        text = html.unescape(text)
+
+    if not text.isascii():
+
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
+
+    return text
+
+#Text_Normalizer::NormalizeText(a_Text)
+
+#Text_Normalizer::NormalizeStatement(statement) Text_Normalizer::NormalizeStatement(statement)
+#
+#NAME
+#
+#        Text_Normalizer::NormalizeStatement - chatterbot preprocessor form of
+#                                              NormalizeText()
+#
+#SYNOPSIS
+#
+#        obj Text_Normalizer::NormalizeStatement(statement)
+#
+#            statement        --> chatterbot Statement to normalize in place
+#
+#DESCRIPTION
+#
+#        Listed in the chatbot's preprocessors as
+#        'Text_Normalizer.NormalizeStatement' in place of the three chatterbot
+#        preprocessors.
+#
+#RETURNS
+#
+#        Returns the statement, as chatterbot preprocessors do.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def NormalizeStatement(statement):
+
+    statement.text = NormalizeText(statement.text)
+
+    return statement
+
+#Text_Normalizer::NormalizeStatement(statement)
+
+#Text_Normalizer::SearchTerms(a_Text) Text_Normalizer::SearchTerms(a_Text)
+#
+#NAME
+#
+#        Text_Normalizer::SearchTerms - the words a statement is searched by
+#
+#SYNOPSIS
+#
+#        list Text_Normalizer::SearchTerms(a_Text)
+#
+#            a_Text           --> string variable containing the statement text
+#
+#DESCRIPTION
+#
+#        Normalizes and lowercases the text and drops the STOPWORDS. Small talk
+#        like "how are you" is nothing but stopwords, so a statement that would be
+#        left with no words keeps all of them.
+#
+#RETURNS
+#
+#        Returns a list of the search words in the order they appear.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def SearchTerms(a_Text):
+
+    words = WORDS.findall(NormalizeText(a_Text).lower())
+    terms = [word for word in words if word not in STOPWORDS]
+
+    return terms or words
+
+#Text_Normalizer::SearchTerms(a_Text)
+
+#Text_Normalizer::SearchText(a_Text) Text_Normalizer::SearchText(a_Text)
+#
+#NAME
+#
+#        Text_Normalizer::SearchText - SearchTerms() joined into the string stored in
+#                                      the statement_search table
+#
+#SYNOPSIS
+#
+#        str Text_Normalizer::SearchText(a_Text)
+#
+#            a_Text           --> string variable containing the statement text
+#
+#RETURNS
+#
+#        Returns the search words separated by single spaces.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def SearchText(a_Text):
+
+    return str(' '.join(SearchTerms(a_Text)))
+
+#Text_Normalizer::SearchText(a_Text)
+
+#Text_Normalizer::BenchmarkNormalization(a_Texts, a_Repeats) Text_Normalizer::BenchmarkNormalization(a_Texts, a_Repeats)
+#
+#NAME
+#
+#        Text_Normalizer::BenchmarkNormalization - times the chained preprocessors
+#                                                  against NormalizeText(), and
+#                                                  deriving the stored search terms
+#                                                  against reading them back
+#
+#SYNOPSIS
+#
+#        void Text_Normalizer::BenchmarkNormalization(a_Texts, a_Repeats)
+#
+#            a_Texts          --> list of sample queries or statements
+#
+#            a_Repeats        --> times each sample is normalized
+#
+#DESCRIPTION
+#
+#        Checks first that NormalizeText() matches the chained preprocessors on
+#        every sample. The per query cost compares building a Statement and running
+#        the three preprocessors with NormalizeText(). The per statement cost
+#        compares SearchTerms() on the stored text, the work the index did on start
+#        up for every statement, with splitting the stored search_terms string.
+#
+#RETURNS
+#
+#        Prints the mismatches and the timings, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+def BenchmarkNormalization(a_Texts, a_Repeats = 200):
+
+    from chatterbot.conversation import Statement
+    from chatterbot.preprocessors import clean_whitespace, unescape_html, convert_to_ascii
+
+    def Chained(a_Text):
+
+        statement = Statement(text = a_Text)
+
+        for preprocessor in (clean_whitespace, unescape_html, convert_to_ascii):
+
+            statement = preprocessor(statement)
+
+        return statement.text
+
+    mismatches = [text for text in a_Texts if Chained(text) != NormalizeText(text)]
+
+    print(len(a_Texts), "samples,", len(mismatches), "mismatches")
+
+    for text in mismatches[:10]:
+
+        print("   ", repr(text), repr(Chained(text)), repr(NormalizeText(text)))
+
+    def Time(a_Function, a_Inputs):
+
+        started = time.perf_counter()
+
+        for repeat in range(a_Repeats):
+
+            for text in a_Inputs:
+
+                a_Function(text)
+
+        return 1000000 * (time.perf_counter() - started) / (a_Repeats * len(a_Inputs))
+
+    chained = Time(Chained, a_Texts)
+    fused = Time(NormalizeText, a_Texts)
+
+    print("per query:     chained preprocessors", round(chained, 2), "us, NormalizeText", round(fused, 2), "us,", round(chained / fused, 1), "x")
+
+    stored = [SearchText(text) for text in a_Texts]
+
+    derived = Time(SearchTerms, a_Texts)
+    read = Time(str.split, stored)
+
+    print("per statement: SearchTerms", round(derived, 2), "us, stored column", round(read, 2), "us,", round(derived / read, 1), "x")
+
+#Text_Normalizer::BenchmarkNormalization(a_Texts, a_Repeats)
+
+#Text_Normalizer::SAMPLE_TEXTS Text_Normalizer::SAMPLE_TEXTS
+#
+#NAME
+#
+#        Text_Normalizer::SAMPLE_TEXTS - benchmark input when no corpus file is given,
+#                                        mostly plain queries like the real traffic
+#                                        with a few that need every step
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        7:40am 10/17/2026                                                          #
+
+SAMPLE_TEXTS = ["hello there", "how are you", "what is your name", "tell me a joke",
+                "what do you think about the weather today", "I am doing well, thanks for asking",
+                "can you recommend a good movie to watch tonight", "where are you from",
+                "  too   many    spaces  ", "line one\nline two\tand a tab",
+                "fish &amp; chips &lt;3", "på fédéral café", "naïve résumé &eacute;"]
+
+#Text_Normalizer::SAMPLE_TEXTS
+
+#Runs the normalization benchmark, on the lines of a corpus file if one is given
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Compare the chained preprocessors with NormalizeText().")
+    parser.add_argument("--corpus", help = "text file with one sample per line, for example the cleaned movie_lines.txt")
+    parser.add_argument("--limit", type = int, default = 20000, help = "most lines read from --corpus")
+    parser.add_argument("--repeats", type = int, default = 200, help = "times each sample is normalized")
+    arguments = parser.parse_args()
+
+    if arguments.corpus:
+
+        with open(arguments.corpus, encoding = 'iso-8859-1') as corpusFile:
+
+            texts = [line.rstrip('\n') for number, line in zip(range(arguments.limit), corpusFile)]
+
+        BenchmarkNormalization(texts, max(1, arguments.repeats * len(SAMPLE_TEXTS) // max(len(texts), 1)))
+
+    else:
+
+        BenchmarkNormalization(SAMPLE_TEXTS, arguments.repeats)
+
+#Text_Normalizer.py
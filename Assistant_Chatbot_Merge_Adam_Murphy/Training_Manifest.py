@@ -0,0 +1,619 @@
+#Training_Manifest.py
+#
+#NAME
+#
+#        Training_Manifest - records how much of every training source has been
+#                            trained into the database, so an interrupted run picks
+#                            up where it stopped and a re-run only trains what is new.
+#
+#SYNOPSIS
+#
+#        Training_Manifest.py
+#
+#            hashlib               --> standard python library, sha256 of the bytes of
+#                                      each source already trained
+#
+#            os                    --> standard python library, source file sizes and
+#                                      modification times
+#
+#            datetime              --> standard python library, when each source was
+#                                      last checkpointed
+#
+#            sqlalchemy            --> library the chatbot's storage is built on, defines
+#                                      the table the manifest is kept in
+#
+#            Text_Normalizer       --> statement_search table, whose rows go with the
+#                                      statements a source is forgotten with
+#
+#            manifestTable         --> training_manifest table of source to its progress
+#
+#            TrainingManifest      --> reads, plans and checkpoints the manifest
+#
+#DESCRIPTION
+#
+#        Every training source, the Cornell movie_lines.txt or a single Ubuntu
+#        dialogue file, has a row in the training_manifest table holding how many
+#        of its bytes have been trained, the sha256 of those bytes, and the last
+#        statement trained from it. The row is written in the same transaction as
+#        the statements it covers, so the database and its manifest can never
+#        disagree, however the run is stopped. Statements are stored with the
+#        conversation "training:<source>", so a source that has changed can have
+#        its statements removed and be trained again from the start without
+#        touching any other source.
+#
+#        When a source is planned it is skipped if its size and modification time
+#        are what the manifest recorded and every byte has been trained. Otherwise
+#        the bytes already trained are hashed again. If they match, training
+#        resumes after them, which covers both an interrupted run and lines added
+#        to the end of a file. If they do not, the source was edited and is
+#        trained again from the start.
+#
+#        The row of "statement_search" records the id of the last statement
+#        ChatBot_Train::NormalizeCorpus() wrote search terms for, so it only
+#        normalizes the statements trained since. The row of "trainer:<file>"
+#        records how a corpus file that can be trained more than one way was
+#        trained, so ChatBot_Train can tell when that has changed.
+#
+#RETURNS
+#
+#        Does not return anything, provides the TrainingManifest for the trainers to
+#        use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+import hashlib
+import os
+import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, BigInteger, String, Text, DateTime, select, func
+from Text_Normalizer import searchTable
+
+#longest conversation label chatterbot's statement table holds
+CONVERSATION_LENGTH = 32
+
+#manifest source recording how far the statement_search table has been written
+NORMALIZED_SOURCE = "statement_search"
+
+#start of the manifest sources recording how a corpus file was trained
+TRAINER_PREFIX = "trainer:"
+
+#Training_Manifest::manifestTable Training_Manifest::manifestTable
+#
+#NAME
+#
+#        Training_Manifest::manifestTable - training_manifest table, kept beside
+#                                           chatterbot's own tables
+#
+#SYNOPSIS
+#
+#            source           --> name of the source, "movie_lines.txt" or
+#                                 "ubuntu/<dialogue file>"
+#
+#            path             --> file the source was read from, for
+#                                 "trainer:<file>" how the file was trained
+#
+#            size, modified   --> size and modification time in nanoseconds of the
+#                                 file when last checkpointed
+#
+#            trained_bytes    --> bytes from the start of the file already trained
+#
+#            sha256           --> hash of those bytes
+#
+#            last_text, last_search_text
+#                             --> the last statement trained, which the next line
+#                                 of the file answers
+#
+#            statements       --> statements trained from the source, for
+#                                 "statement_search" the id of the last statement
+#                                 whose search terms are written
+#
+#            updated_at       --> time of the last checkpoint
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+manifestTable = Table('training_manifest', MetaData(),
+                      Column('source', String(255), primary_key = True),
+                      Column('path', Text),
+                      Column('size', BigInteger),
+                      Column('modified', BigInteger),
+                      Column('trained_bytes', BigInteger),
+                      Column('sha256', String(64)),
+                      Column('last_text', Text),
+                      Column('last_search_text', Text),
+                      Column('statements', Integer),
+                      Column('updated_at', DateTime))
+
+#Training_Manifest::manifestTable
+
+#Training_Manifest::HashRange(a_Hasher, a_Path, a_Start, a_End) Training_Manifest::HashRange(a_Hasher, a_Path, a_Start, a_End)
+#
+#NAME
+#
+#        Training_Manifest::HashRange - carries a sha256 on over a byte range of a file
+#
+#SYNOPSIS
+#
+#        obj Training_Manifest::HashRange(a_Hasher, a_Path, a_Start, a_End)
+#
+#            a_Hasher         --> hashlib object holding the hash of the bytes before
+#                                 a_Start
+#
+#            a_Path           --> file to hash
+#
+#            a_Start, a_End   --> byte range to add, a_End None for the end of the file
+#
+#RETURNS
+#
+#        Returns a_Hasher.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+def HashRange(a_Hasher, a_Path, a_Start = 0, a_End = None):
+
+    remaining = (os.path.getsize(a_Path) if a_End is None else a_End) - a_Start
+
+    with open(a_Path, 'rb') as sourceFile:
+
+        sourceFile.seek(a_Start)
+
+        while remaining > 0:
+
+            block = sourceFile.read(min(remaining, 1048576))
+
+            if not block:
+
+                break
+
+            a_Hasher.update(block)
+            remaining -= len(block)
+
+    return a_Hasher
+
+#Training_Manifest::HashRange(a_Hasher, a_Path, a_Start, a_End)
+
+#Training_Manifest::HashFile(a_Path, a_Bytes) Training_Manifest::HashFile(a_Path, a_Bytes)
+#
+#NAME
+#
+#        Training_Manifest::HashFile - sha256 of the start of a file
+#
+#SYNOPSIS
+#
+#        obj Training_Manifest::HashFile(a_Path, a_Bytes)
+#
+#            a_Path           --> file to hash
+#
+#            a_Bytes          --> bytes from the start to hash, None for all of it
+#
+#RETURNS
+#
+#        Returns the hashlib object, so hashing can carry on past a_Bytes.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+def HashFile(a_Path, a_Bytes = None):
+
+    return HashRange(hashlib.sha256(), a_Path, 0, a_Bytes)
+
+#Training_Manifest::HashFile(a_Path, a_Bytes)
+
+#Training_Manifest::Plan Training_Manifest::Plan
+#
+#NAME
+#
+#        Training_Manifest::Plan - where training of one source should start
+#
+#SYNOPSIS
+#
+#        obj Training_Manifest::Plan(a_Start, a_Hasher, a_LastText, a_LastSearchText, a_Statements)
+#
+#            start            --> byte offset to train from
+#
+#            hasher           --> sha256 of the bytes before start, carried on as
+#                                 more of the file is trained
+#
+#            lastText, lastSearchText
+#                             --> the statement the line at start answers
+#
+#            statements       --> statements already trained from the source
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+class Plan:
+
+    def __init__(self, a_Start = 0, a_Hasher = None, a_LastText = None, a_LastSearchText = '', a_Statements = 0):
+
+        self.start = a_Start
+        self.hasher = a_Hasher or hashlib.sha256()
+        self.lastText = a_LastText
+        self.lastSearchText = a_LastSearchText
+        self.statements = a_Statements
+
+#Training_Manifest::Plan
+
+#Training_Manifest::TrainingManifest Training_Manifest::TrainingManifest
+#
+#NAME
+#
+#        Training_Manifest::TrainingManifest - the manifest of one chatbot database
+#
+#SYNOPSIS
+#
+#        obj Training_Manifest::TrainingManifest(a_Storage)
+#
+#            a_Storage        --> the chatbot's sql storage adapter, the manifest
+#                                 table is created in its database if it is missing
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see PlanFile()
+#        and Checkpoint().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:20pm 10/17/2026                                                          #
+
+class TrainingManifest:
+
+    def __init__(self, a_Storage):
+
+        self.storage = a_Storage
+        self.engine = a_Storage.engine
+        self.statementTable = a_Storage.get_model('statement').__table__
+
+        manifestTable.create(self.engine, checkfirst = True)
+
+    #TrainingManifest::Conversation(a_Source)
+    #
+    #DESCRIPTION
+    #
+    #        The conversation statements trained from a_Source are stored under.
+    #        chatterbot keeps conversation labels to 32 characters, so a source
+    #        name too long to fit, such as an Ubuntu dialogue path, is replaced
+    #        by the start of its sha1.
+    #
+    #RETURNS
+    #
+    #        Returns "training:" followed by the source name or its sha1.
+
+    def Conversation(self, a_Source):
+
+        conversation = 'training:' + a_Source
+
+        if len(conversation) > CONVERSATION_LENGTH:
+
+            conversation = 'training:' + hashlib.sha1(a_Source.encode('utf-8')).hexdigest()[:CONVERSATION_LENGTH - len('training:')]
+
+        return conversation
+
+    #TrainingManifest::Get(a_Source)
+    #
+    #DESCRIPTION
+    #
+    #        Reads the manifest row of a_Source.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the row's columns, or None if a_Source has never
+    #        been trained.
+
+    def Get(self, a_Source):
+
+        with self.engine.connect() as connection:
+
+            row = connection.execute(select([manifestTable]).where(manifestTable.c.source == a_Source)).fetchone()
+
+        return None if row is None else dict(row)
+
+    #TrainingManifest::Entries(a_Prefix)
+    #
+    #DESCRIPTION
+    #
+    #        Reads every manifest row whose source starts with a_Prefix in one
+    #        query, for planning many sources at once.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of source to its row as a dictionary.
+
+    def Entries(self, a_Prefix = ''):
+
+        with self.engine.connect() as connection:
+
+            rows = connection.execute(select([manifestTable]).where(manifestTable.c.source.startswith(a_Prefix))).fetchall()
+
+        return {row['source']: dict(row) for row in rows}
+
+    #TrainingManifest::PlanFile(a_Source, a_Path, a_Resumable, a_Changed, a_Entries)
+    #
+    #DESCRIPTION
+    #
+    #        Compares a_Path with what the manifest recorded for a_Source. An
+    #        edited source is forgotten first, or added to the list a_Changed if
+    #        one is given so many can be forgotten together. a_Resumable is False
+    #        for sources that have to be trained whole, such as an Ubuntu dialogue,
+    #        where an appended file counts as an edit. a_Entries, from Entries(),
+    #        saves a query per source when planning many.
+    #
+    #RETURNS
+    #
+    #        Returns None if there is nothing new to train, otherwise the Plan to
+    #        train by.
+
+    def PlanFile(self, a_Source, a_Path, a_Resumable = True, a_Changed = None, a_Entries = None):
+
+        entry = self.Get(a_Source) if a_Entries is None else a_Entries.get(a_Source)
+
+        if entry is None:
+
+            return Plan()
+
+        status = os.stat(a_Path)
+
+        if status.st_size == entry['size'] == entry['trained_bytes'] and status.st_mtime_ns == entry['modified']:
+
+            return None
+
+        reason = "has changed since it was trained"
+
+        if entry['trained_bytes'] <= status.st_size:
+
+            hasher = HashFile(a_Path, entry['trained_bytes'])
+
+            if hasher.hexdigest() == entry['sha256']:
+
+                if entry['trained_bytes'] == status.st_size:
+
+                    return None
+
+                if a_Resumable:
+
+                    return Plan(entry['trained_bytes'], hasher, entry['last_text'], entry['last_search_text'] or '', entry['statements'] or 0)
+
+                reason = "was only partly trained"
+
+        if a_Changed is not None:
+
+            a_Changed.append(a_Source)
+
+        else:
+
+            print(a_Source, reason + ", training it again")
+
+            self.Forget([a_Source])
+
+        return Plan()
+
+    #TrainingManifest::Checkpoint(a_Connection, a_Source, a_Path, a_Bytes, a_Hash, a_LastText, a_LastSearchText, a_Statements)
+    #
+    #DESCRIPTION
+    #
+    #        Records that the first a_Bytes bytes of a_Path, hashing to a_Hash,
+    #        have been trained. Must be called on the connection of the
+    #        transaction that wrote those statements.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Checkpoint(self, a_Connection, a_Source, a_Path, a_Bytes, a_Hash, a_LastText, a_LastSearchText, a_Statements):
+
+        status = os.stat(a_Path)
+
+        a_Connection.execute(manifestTable.delete().where(manifestTable.c.source == a_Source))
+        a_Connection.execute(manifestTable.insert(), {'source': a_Source,
+                                                      'path': a_Path,
+                                                      'size': status.st_size,
+                                                      'modified': status.st_mtime_ns,
+                                                      'trained_bytes': a_Bytes,
+                                                      'sha256': a_Hash,
+                                                      'last_text': a_LastText,
+                                                      'last_search_text': a_LastSearchText,
+                                                      'statements': a_Statements,
+                                                      'updated_at': datetime.datetime.now()})
+
+    #TrainingManifest::Normalized()
+    #
+    #DESCRIPTION
+    #
+    #        Reads how far the statement_search table has been written.
+    #
+    #RETURNS
+    #
+    #        Returns the id of the last statement with search terms, or None if
+    #        the table has never been written with the manifest keeping track.
+
+    def Normalized(self):
+
+        entry = self.Get(NORMALIZED_SOURCE)
+
+        return None if entry is None else entry['statements']
+
+    #TrainingManifest::MarkNormalized(a_Connection, a_LastId)
+    #
+    #DESCRIPTION
+    #
+    #        Records that every statement up to id a_LastId has search terms. Must
+    #        be called on the connection of the transaction that wrote them.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def MarkNormalized(self, a_Connection, a_LastId):
+
+        a_Connection.execute(manifestTable.delete().where(manifestTable.c.source == NORMALIZED_SOURCE))
+        a_Connection.execute(manifestTable.insert(), {'source': NORMALIZED_SOURCE,
+                                                      'statements': a_LastId,
+                                                      'updated_at': datetime.datetime.now()})
+
+    #TrainingManifest::Trainer(a_File)
+    #
+    #DESCRIPTION
+    #
+    #        Reads how the corpus file a_File was trained.
+    #
+    #RETURNS
+    #
+    #        Returns the name RecordTrainer() was given, or None if it never was.
+
+    def Trainer(self, a_File):
+
+        entry = self.Get(TRAINER_PREFIX + a_File)
+
+        return None if entry is None else entry['path']
+
+    #TrainingManifest::RecordTrainer(a_File, a_Trainer)
+    #
+    #DESCRIPTION
+    #
+    #        Records that the corpus file a_File is trained by a_Trainer.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def RecordTrainer(self, a_File, a_Trainer):
+
+        with self.engine.begin() as connection:
+
+            connection.execute(manifestTable.delete().where(manifestTable.c.source == TRAINER_PREFIX + a_File))
+            connection.execute(manifestTable.insert(), {'source': TRAINER_PREFIX + a_File,
+                                                        'path': a_Trainer,
+                                                        'updated_at': datetime.datetime.now()})
+
+    #TrainingManifest::Forget(a_Sources)
+    #
+    #DESCRIPTION
+    #
+    #        Removes the statements and manifest rows of a_Sources, a few hundred
+    #        sources per statement so each scan of the statement table covers many.
+    #        Their search terms go with them, and the statement_search mark is
+    #        brought back to the last statement left, since the ids of removed
+    #        statements at the end of the table are given out again.
+    #
+    #RETURNS
+    #
+    #        Returns the number of statements removed.
+
+    def Forget(self, a_Sources):
+
+        removed = 0
+        searched = self.engine.has_table(searchTable.name)
+
+        with self.engine.begin() as connection:
+
+            for start in range(0, len(a_Sources), 500):
+
+                sources = a_Sources[start:start + 500]
+                conversations = [self.Conversation(source) for source in sources]
+
+                if searched:
+
+                    removedIds = select([self.statementTable.c.id]).where(self.statementTable.c.conversation.in_(conversations))
+                    connection.execute(searchTable.delete().where(searchTable.c.statement_id.in_(removedIds)))
+
+                removed += connection.execute(self.statementTable.delete().where(self.statementTable.c.conversation.in_(conversations))).rowcount
+                connection.execute(manifestTable.delete().where(manifestTable.c.source.in_(sources)))
+
+            lastId = connection.execute(select([func.max(self.statementTable.c.id)])).scalar() or 0
+
+            connection.execute(manifestTable.update()
+                               .where(manifestTable.c.source == NORMALIZED_SOURCE)
+                               .where(manifestTable.c.statements > lastId)
+                               .values(statements = lastId))
+
+        return removed
+
+    #TrainingManifest::Report()
+    #
+    #DESCRIPTION
+    #
+    #        Prints every source with how much of it has been trained. Ubuntu
+    #        dialogue files are summed into one line.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Report(self):
+
+        ubuntuFiles = 0
+        ubuntuStatements = 0
+
+        with self.engine.connect() as connection:
+
+            for row in connection.execute(select([manifestTable]).order_by(manifestTable.c.source)):
+
+                if row['source'].startswith('ubuntu/'):
+
+                    ubuntuFiles += 1
+                    ubuntuStatements += row['statements'] or 0
+
+                    continue
+
+                if row['source'] == NORMALIZED_SOURCE:
+
+                    print(row['source'] + ": search terms written up to statement", row['statements'], "on", row['updated_at'])
+
+                    continue
+
+                if row['source'].startswith(TRAINER_PREFIX):
+
+                    print(row['source'][len(TRAINER_PREFIX):] + ": trained as", row['path'])
+
+                    continue
+
+                #sources that are not files, such as a chatterbot corpus, only record when they were trained
+                if row['size'] is None:
+
+                    print(row['source'] + ": trained", row['updated_at'])
+
+                    continue
+
+                print(row['source'] + ":", row['statements'], "statements,", row['trained_bytes'], "of", row['size'], "bytes, last checkpoint", row['updated_at'])
+
+        if ubuntuFiles:
+
+            print("ubuntu:", ubuntuStatements, "statements from", ubuntuFiles, "dialogue files")
+
+#Training_Manifest::TrainingManifest
+
+#Training_Manifest.py
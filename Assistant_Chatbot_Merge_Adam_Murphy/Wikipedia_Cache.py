@@ -0,0 +1,612 @@
+#Wikipedia_Cache.py
+#
+#NAME
+#
+#        Wikipedia_Cache - two tier cache of wikipedia summaries, an in memory LRUCache in
+#                          front of a sqlite file, with pluggable fetchers for the summaries
+#                          themselves.
+#
+#SYNOPSIS
+#
+#        Wikipedia_Cache.py
+#
+#            wikipedia             --> allows python to parse wikipedia for search results
+#                                      and return either a webpage or a string of the page
+#                                      contents
+#
+#            sqlite3               --> standard python library, on disk tier of the cache
+#
+#            threading             --> standard python library, guards the sqlite connection
+#                                      shared by the flask request threads
+#
+#            concurrent.futures    --> standard python library, runs the wikipedia library's
+#                                      requests on threads so they can be given up on
+#
+#            json, urllib, http.server
+#                                  --> standard python libraries, used by the fixture server
+#                                      and HttpFetcher that stand in for wikipedia
+#
+#            time, timeit, argparse, os, tempfile
+#                                  --> standard python libraries, entry ages and the
+#                                      benchmark run when this file is run directly
+#
+#            Response_Cache        --> LRUCache used as the in memory tier
+#
+#            Single_Flight         --> joins concurrent lookups of the same topic into one
+#
+#            LibraryFetcher        --> fetches summaries with the wikipedia library
+#
+#            HttpFetcher           --> fetches summaries from a FixtureServer
+#
+#            WikipediaCache        --> the two tier cache
+#
+#DESCRIPTION
+#
+#        FromWikipedia() went over the network for every request, even for a topic it
+#        had just looked up. Lookups are now keyed by the normalized topic (lower case,
+#        single spaces) and answered from memory, then from the sqlite file, and only
+#        then fetched. Pages that do not exist and topics that are ambiguous are cached
+#        too, with their own shorter time to live, so a bad topic is not fetched again
+#        on every retry. Network failures are not cached. Every fetcher returns a
+#        (status, text) pair where status is "ok", "disambiguation" or "missing".
+#        Lookups of a topic that is already being read from disk or fetched wait for
+#        that lookup instead of starting their own.
+#
+#RETURNS
+#
+#        When run directly starts a FixtureServer with simulated network latency and
+#        prints the time of a fetched, a disk and a memory lookup. Otherwise provides
+#        the WikipediaCache for the other files to use.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+import wikipedia
+import sqlite3
+import threading
+import concurrent.futures
+import json
+import urllib.request
+import urllib.parse
+import http.server
+import time
+import timeit
+import argparse
+import os
+import tempfile
+from Response_Cache import LRUCache
+from Single_Flight import SingleFlight
+
+#Wikipedia_Cache::NormalizeTopic(a_Topic) Wikipedia_Cache::NormalizeTopic(a_Topic)
+#
+#NAME
+#
+#        Wikipedia_Cache::NormalizeTopic - cache key for a topic
+#
+#SYNOPSIS
+#
+#        string Wikipedia_Cache::NormalizeTopic(a_Topic)
+#
+#            a_Topic          --> topic as the user said or typed it
+#
+#RETURNS
+#
+#        Returns the topic in lower case with surrounding and repeated spaces removed.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+def NormalizeTopic(a_Topic):
+
+    return " ".join(a_Topic.lower().split())
+
+#Wikipedia_Cache::NormalizeTopic(a_Topic)
+
+#Wikipedia_Cache::LibraryFetcher Wikipedia_Cache::LibraryFetcher
+#
+#NAME
+#
+#        Wikipedia_Cache::LibraryFetcher - fetches summaries from wikipedia.org with the
+#                                          wikipedia library
+#
+#SYNOPSIS
+#
+#        obj Wikipedia_Cache::LibraryFetcher(a_Sentences, a_Timeout, a_Workers)
+#
+#            a_Sentences      --> number of sentences of the summary to keep
+#
+#            a_Timeout        --> seconds to wait for wikipedia before giving up
+#
+#            a_Workers        --> threads the library's requests run on
+#
+#DESCRIPTION
+#
+#        The wikipedia library makes its requests with no timeout and has no option
+#        to set one, so a stalled connection never returned and held the flask
+#        thread that asked. Each summary is fetched on one of a_Workers threads
+#        instead and waited on for at most a_Timeout seconds. A stalled fetch is
+#        left to finish on its worker, so at most a_Workers stalled fetches are
+#        open at once, and while they all are the fetches queued behind them time
+#        out too rather than starting more threads.
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Fetch().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+class LibraryFetcher:
+
+    def __init__(self, a_Sentences = 1, a_Timeout = 10, a_Workers = 2):
+
+        self.sentences = a_Sentences
+        self.timeout = a_Timeout
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = a_Workers, thread_name_prefix = "WikipediaFetch")
+
+    #LibraryFetcher::Fetch(a_Topic)
+    #
+    #DESCRIPTION
+    #
+    #        Fetches the summary, turning the library's disambiguation and missing
+    #        page errors into statuses. Any other error (no network) is raised, and
+    #        a fetch that takes longer than the timeout raises TimeoutError.
+    #
+    #RETURNS
+    #
+    #        Returns a (status, text) pair, for a disambiguation the text lists the
+    #        first few pages the topic may refer to.
+
+    def Fetch(self, a_Topic):
+
+        future = self.pool.submit(wikipedia.summary, a_Topic, sentences = self.sentences)
+
+        try:
+
+            return ("ok", future.result(timeout = self.timeout))
+
+        except concurrent.futures.TimeoutError:
+
+            future.cancel()
+
+            raise TimeoutError("wikipedia did not answer within " + str(self.timeout) + " seconds")
+
+        except wikipedia.exceptions.DisambiguationError as e:
+
+            return ("disambiguation", ", ".join(e.options[:5]))
+
+        except wikipedia.exceptions.PageError:
+
+            return ("missing", "")
+
+#Wikipedia_Cache::LibraryFetcher
+
+#Wikipedia_Cache::HttpFetcher Wikipedia_Cache::HttpFetcher
+#
+#NAME
+#
+#        Wikipedia_Cache::HttpFetcher - fetches summaries from a FixtureServer, or any
+#                                       server answering /summary?topic= with a json
+#                                       {"status": ..., "text": ...} object
+#
+#SYNOPSIS
+#
+#        obj Wikipedia_Cache::HttpFetcher(a_BaseUrl)
+#
+#            a_BaseUrl        --> address of the server, for example http://127.0.0.1:8765
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Fetch().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+class HttpFetcher:
+
+    def __init__(self, a_BaseUrl):
+
+        self.baseUrl = a_BaseUrl.rstrip("/")
+
+    #HttpFetcher::Fetch(a_Topic)
+    #
+    #DESCRIPTION
+    #
+    #        Requests the topic's summary from the server.
+    #
+    #RETURNS
+    #
+    #        Returns a (status, text) pair.
+
+    def Fetch(self, a_Topic):
+
+        address = self.baseUrl + "/summary?" + urllib.parse.urlencode({"topic": a_Topic})
+
+        with urllib.request.urlopen(address, timeout = 10) as response:
+
+            answer = json.loads(response.read().decode("utf-8"))
+
+        return (answer["status"], answer["text"])
+
+#Wikipedia_Cache::HttpFetcher
+
+#Wikipedia_Cache::FixtureServer Wikipedia_Cache::FixtureServer
+#
+#NAME
+#
+#        Wikipedia_Cache::FixtureServer - local http server answering summary requests
+#                                         from a dictionary, for tests and benchmarks
+#
+#SYNOPSIS
+#
+#        obj Wikipedia_Cache::FixtureServer(a_Pages, a_Latency, a_Port)
+#
+#            a_Pages          --> dictionary of normalized topic to (status, text),
+#                                 topics not in it are answered as missing
+#
+#            a_Latency        --> seconds each answer is delayed, to stand in for the
+#                                 round trip to wikipedia.org
+#
+#            a_Port           --> port to listen on, 0 picks a free one
+#
+#            requests         --> number of summaries served
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Start().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+class FixtureServer:
+
+    def __init__(self, a_Pages, a_Latency = 0.0, a_Port = 0):
+
+        self.pages = a_Pages
+        self.latency = a_Latency
+        self.requests = 0
+
+        fixture = self
+
+        class SummaryHandler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                topic = NormalizeTopic(query.get("topic", [""])[0])
+
+                time.sleep(fixture.latency)
+                fixture.requests += 1
+
+                status, text = fixture.pages.get(topic, ("missing", ""))
+                body = json.dumps({"status": status, "text": text}).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", a_Port), SummaryHandler)
+        self.url = "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    #FixtureServer::Start()
+    #
+    #DESCRIPTION
+    #
+    #        Serves requests on a daemon thread.
+    #
+    #RETURNS
+    #
+    #        Returns the server's base url.
+
+    def Start(self):
+
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
+
+        return self.url
+
+    #FixtureServer::Stop()
+    #
+    #DESCRIPTION
+    #
+    #        Stops serving and closes the socket.
+    #
+    #RETURNS
+    #
+    #        Returns nothing.
+
+    def Stop(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+#Wikipedia_Cache::FixtureServer
+
+#Wikipedia_Cache::WikipediaCache Wikipedia_Cache::WikipediaCache
+#
+#NAME
+#
+#        Wikipedia_Cache::WikipediaCache - memory and disk cache in front of a fetcher
+#
+#SYNOPSIS
+#
+#        obj Wikipedia_Cache::WikipediaCache(a_Path, a_Fetcher, a_MaxSize,
+#                                            a_TimeToLive, a_NegativeTimeToLive)
+#
+#            a_Path           --> sqlite file for the disk tier, None for memory only,
+#                                 opened by the first lookup that reaches it
+#
+#            a_Fetcher        --> object with Fetch(topic) returning (status, text),
+#                                 LibraryFetcher by default
+#
+#            a_MaxSize        --> most summaries kept in memory
+#
+#            a_TimeToLive     --> seconds a summary stays valid
+#
+#            a_NegativeTimeToLive
+#                             --> seconds a disambiguation or missing page stays valid
+#
+#            memory           --> LRUCache of topic to (status, text, time fetched)
+#
+#            flight           --> SingleFlight that memory misses for the same topic
+#                                 go through together
+#
+#            fetches, diskHits --> counters for Stats(), memory hits and misses are
+#                                  counted by memory itself
+#
+#RETURNS
+#
+#        Since this is an object it does not return anything itself, see Lookup().
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+class WikipediaCache:
+
+    def __init__(self, a_Path, a_Fetcher = None, a_MaxSize = 512, a_TimeToLive = 7 * 24 * 3600, a_NegativeTimeToLive = 24 * 3600):
+
+        self.fetcher = a_Fetcher if a_Fetcher is not None else LibraryFetcher()
+        self.timeToLive = a_TimeToLive
+        self.negativeTimeToLive = a_NegativeTimeToLive
+
+        self.memory = LRUCache(a_MaxSize)
+        self.flight = SingleFlight()
+
+        self.fetches = 0
+        self.diskHits = 0
+
+        self.path = a_Path
+        self.diskLock = threading.Lock()
+        self.disk = None
+
+    #WikipediaCache::Disk()
+    #
+    #DESCRIPTION
+    #
+    #        Opens the sqlite file and creates its table the first time it is
+    #        needed, so creating the cache touches nothing on disk. Called with
+    #        diskLock held.
+    #
+    #RETURNS
+    #
+    #        Returns the sqlite connection.
+
+    def Disk(self):
+
+        if self.disk is None:
+
+            self.disk = sqlite3.connect(self.path, check_same_thread = False)
+            self.disk.execute("CREATE TABLE IF NOT EXISTS summary (topic TEXT PRIMARY KEY, status TEXT NOT NULL, text TEXT NOT NULL, fetched REAL NOT NULL)")
+            self.disk.commit()
+
+        return self.disk
+
+    #WikipediaCache::IsFresh(a_Entry)
+    #
+    #DESCRIPTION
+    #
+    #        Checks an entry's age against the time to live for its status.
+    #
+    #RETURNS
+    #
+    #        Returns True if the entry can still be used.
+
+    def IsFresh(self, a_Entry):
+
+        status, text, fetched = a_Entry
+        timeToLive = self.timeToLive if status == "ok" else self.negativeTimeToLive
+
+        return time.time() - fetched <= timeToLive
+
+    #WikipediaCache::Lookup(a_Topic)
+    #
+    #DESCRIPTION
+    #
+    #        Answers from memory, otherwise from LoadOrFetch(), run once for all
+    #        the concurrent lookups of the topic.
+    #
+    #RETURNS
+    #
+    #        Returns a (status, text) pair.
+
+    def Lookup(self, a_Topic):
+
+        topic = NormalizeTopic(a_Topic)
+
+        entry = self.memory.Get(topic)
+
+        if entry is not LRUCache.MISSING and self.IsFresh(entry):
+
+            return entry[:2]
+
+        return self.flight.Do(topic, lambda: self.LoadOrFetch(topic))
+
+    #WikipediaCache::LoadOrFetch(a_Topic)
+    #
+    #DESCRIPTION
+    #
+    #        Answers a normalized topic from disk, then the fetcher, storing fetched
+    #        and disk answers in the tiers above them.
+    #
+    #RETURNS
+    #
+    #        Returns a (status, text) pair.
+
+    def LoadOrFetch(self, a_Topic):
+
+        entry = None
+
+        if self.path is not None:
+
+            with self.diskLock:
+
+                entry = self.Disk().execute("SELECT status, text, fetched FROM summary WHERE topic = ?", (a_Topic,)).fetchone()
+
+            if entry is not None and self.IsFresh(entry):
+
+                self.diskHits += 1
+
+            else:
+
+                entry = None
+
+        if entry is None:
+
+            status, text = self.fetcher.Fetch(a_Topic)
+            entry = (status, text, time.time())
+            self.fetches += 1
+
+            if self.path is not None:
+
+                with self.diskLock:
+
+                    self.Disk().execute("INSERT OR REPLACE INTO summary VALUES (?, ?, ?, ?)", (a_Topic,) + entry)
+                    self.disk.commit()
+
+        self.memory.Put(a_Topic, entry)
+
+        return entry[:2]
+
+    #WikipediaCache::Stats()
+    #
+    #DESCRIPTION
+    #
+    #        Snapshot of the cache counters.
+    #
+    #RETURNS
+    #
+    #        Returns a dictionary of the memory counters, disk hits, fetches, and
+    #        lookups coalesced into one already in flight.
+
+    def Stats(self):
+
+        stats = self.memory.Stats()
+        stats['disk_hits'] = self.diskHits
+        stats['fetches'] = self.fetches
+        stats['coalesced'] = self.flight.Stats()['coalesced']
+
+        return stats
+
+#Wikipedia_Cache::WikipediaCache
+
+#Wikipedia_Cache::BenchmarkLookups(a_Latency) Wikipedia_Cache::BenchmarkLookups(a_Latency)
+#
+#NAME
+#
+#        Wikipedia_Cache::BenchmarkLookups - times a fetched, a disk and a memory lookup
+#                                            against a local FixtureServer
+#
+#SYNOPSIS
+#
+#        void Wikipedia_Cache::BenchmarkLookups(a_Latency)
+#
+#            a_Latency        --> simulated round trip of the fixture server in seconds
+#
+#RETURNS
+#
+#        Prints microseconds per lookup for each tier, returns nothing.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        1:15pm 10/17/2026                                                          #
+
+def BenchmarkLookups(a_Latency = 0.2):
+
+    pages = {"the moon": ("ok", "The Moon is Earth's only natural satellite."),
+             "mercury": ("disambiguation", "Mercury (planet), Mercury (element), Mercury (mythology)")}
+
+    fixture = FixtureServer(pages, a_Latency)
+    url = fixture.Start()
+
+    databasePath = os.path.join(tempfile.mkdtemp(), "wikipedia_benchmark.sqlite3")
+
+    cache = WikipediaCache(databasePath, HttpFetcher(url))
+
+    for topic in ["the moon", "mercury", "no such page"]:
+
+        fetchTime = timeit.timeit(lambda: cache.Lookup(topic), number = 1)
+
+        cache.memory.Clear()
+        diskTime = timeit.timeit(lambda: cache.Lookup(topic), number = 1)
+
+        repeat = 10000
+        memoryTime = timeit.timeit(lambda: cache.Lookup(topic), number = repeat) / repeat
+
+        print("%-14s %-15s fetched %10.1f us   disk %8.1f us   memory %6.2f us" % (topic, cache.Lookup(topic)[0], fetchTime * 1e6, diskTime * 1e6, memoryTime * 1e6))
+
+    print("fixture server requests: " + str(fixture.requests))
+    print(cache.Stats())
+
+    fixture.Stop()
+
+#Wikipedia_Cache::BenchmarkLookups(a_Latency)
+
+
+#Runs the lookup benchmark against a local fixture server
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark the wikipedia summary cache.")
+    parser.add_argument("--latency", type = float, default = 0.2, help = "simulated wikipedia round trip in seconds")
+    arguments = parser.parse_args()
+
+    BenchmarkLookups(arguments.latency)
+
+#Wikipedia_Cache.py
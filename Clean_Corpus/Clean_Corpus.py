@@ -1,11 +1,219 @@
+#Clean_Corpus.py
+#
+#NAME
+#
+#        Clean_Corpus - strips the lineID, characterID, movieID and character name
+#                       fields from the Cornell movie_lines.txt, leaving only the
+#                       text of each line for the chatbot to be trained on.
+#
+#SYNOPSIS
+#
+#        Clean_Corpus.py
+#
+#            os                      --> standard python library, the temporary file
+#                                        is renamed over the corpus
+#
+#            shutil                  --> standard python library, the corpus keeps
+#                                        its file permissions
+#
+#            tempfile                --> standard python library, the cleaned lines
+#                                        are written beside the corpus first
+#
+#            time                    --> standard python library, throughput
+#
+#            argparse                --> standard python library for the command line
+#                                        options
+#
+#            SEPARATOR               --> separator between the fields of a line
+#
+#DESCRIPTION
+#
+#        Each line of movie_lines.txt reads
+#        "L1045 +++$+++ u0 +++$+++ m0 +++$+++ BIANCA +++$+++ They do not!" and only
+#        the text after the last separator is kept. The corpus is read and
+#        written a line at a time through buffered files, so memory stays flat
+#        however large it is, and the cleaned lines go to a temporary file in the
+#        same directory that is renamed over the original only once every line
+#        has been written and synced. A run that is stopped part way leaves the
+#        corpus as it was. Lines without a separator are kept as they are, so
+#        cleaning a corpus twice changes nothing. Line endings are kept exactly,
+#        and the encoding is given explicitly rather than left to the platform,
+#        iso-8859-1 by default as that is what the Cornell corpus is in. With
+#        --dry-run nothing is written, the lines that would change are only
+#        counted. The Cornell_Corpus extractor needs the fields this removes,
+#        --output writes the cleaned lines to another file and leaves the
+#        corpus whole.
+#
+#RETURNS
+#
+#        This is a program so it doesn't technically have a return, it prints
+#        the lines cleaned and the throughput.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:40pm 10/17/2026                                                          #
+
+import os
+import shutil
+import tempfile
+import time
+import argparse
+
+#separator between the fields of a movie_lines.txt line
+SEPARATOR = "+++$+++ "
+
+#Clean_Corpus::CleanLine(a_Line) Clean_Corpus::CleanLine(a_Line)
+#
+#NAME
+#
+#        Clean_Corpus::CleanLine - the text of one corpus line
+#
+#SYNOPSIS
+#
+#        str Clean_Corpus::CleanLine(a_Line)
+#
+#            a_Line                   --> line of movie_lines.txt with its line ending
+#
+#RETURNS
+#
+#        Returns the part of a_Line after its last separator, line ending
+#        included, or a_Line itself if it has no separator.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:40pm 10/17/2026                                                          #
+
+def CleanLine(a_Line):
+
+    return a_Line.rpartition(SEPARATOR)[2]
+
+#Clean_Corpus::CleanLine(a_Line)
+
+#Clean_Corpus::CleanCorpus(a_Path, a_Encoding, a_Errors, a_DryRun, a_Output) Clean_Corpus::CleanCorpus(a_Path, a_Encoding, a_Errors, a_DryRun, a_Output)
+#
+#NAME
+#
+#        Clean_Corpus::CleanCorpus - streams the corpus through CleanLine() into a
+#                                    temporary file and renames it into place
+#
+#SYNOPSIS
+#
+#        dict Clean_Corpus::CleanCorpus(a_Path, a_Encoding, a_Errors, a_DryRun, a_Output)
+#
+#            a_Path                   --> movie_lines.txt
+#
+#            a_Encoding               --> encoding the corpus is read and written in
+#
+#            a_Errors                 --> how undecodable bytes are handled, "strict"
+#                                         stops before anything is replaced
+#
+#            a_DryRun                 --> only count what would change
+#
+#            a_Output                 --> file the cleaned lines are written to,
+#                                         a_Path itself by default
+#
+#RETURNS
+#
+#        Returns a dictionary of the lines read, the lines changed, the bytes
+#        read, and the seconds taken.
+#
+#AUTHOR
+#
+#        Adam Murphy
+#
+#DATE
+#
+#        2:40pm 10/17/2026                                                          #
+
+def CleanCorpus(a_Path, a_Encoding = 'iso-8859-1', a_Errors = 'strict', a_DryRun = False, a_Output = None):
+
+    output = a_Output or a_Path
+    size = os.path.getsize(a_Path)
+
+    started = time.perf_counter()
+
+    lines = 0
+    changed = 0
+    temporaryPath = None
+
+    #newline = '' keeps every line ending as it is in the corpus
+    with open(a_Path, 'r', encoding = a_Encoding, errors = a_Errors, newline = '') as corpusFile:
+
+        if a_DryRun:
+
+            cleanedFile = None
+
+        else:
+
+            descriptor, temporaryPath = tempfile.mkstemp(prefix = ".clean-", suffix = ".tmp", dir = os.path.dirname(os.path.abspath(output)))
+            cleanedFile = open(descriptor, 'w', encoding = a_Encoding, errors = a_Errors, newline = '')
+
+        try:
+
+            for line in corpusFile:
+
+                cleaned = CleanLine(line)
+
+                lines += 1
+
+                if cleaned != line:
+
+                    changed += 1
+
+                if cleanedFile is not None:
+
+                    cleanedFile.write(cleaned)
+
+            if cleanedFile is not None:
+
+                cleanedFile.flush()
+                os.fsync(cleanedFile.fileno())
+                cleanedFile.close()
+
+                if os.path.exists(output):
+
+                    shutil.copymode(output, temporaryPath)
+
+                os.replace(temporaryPath, output)
+
+        except BaseException:
+
+            if cleanedFile is not None:
+
+                cleanedFile.close()
+                os.remove(temporaryPath)
+
+            raise
+
+    return {'lines': lines, 'changed': changed, 'bytes': size, 'seconds': time.perf_counter() - started}
+
+#Clean_Corpus::CleanCorpus(a_Path, a_Encoding, a_Errors, a_DryRun, a_Output)
+
+#Cleans movie_lines.txt in place, or with --dry-run only reports what would change
 if __name__ == "__main__":
-    file = open('cornell movie-dialogs corpus/movie_lines.txt')
-    my_file = file.readlines()
 
-    file.close()
-    my_file = [m.split("+++$+++ ")[-1] for m in my_file]
-    file = open("cornell movie-dialogs corpus/movie_lines.txt", "w")
-    new_file_contents = "".join(my_file)
+    parser = argparse.ArgumentParser(description = "Strip the ID and name fields from the Cornell movie_lines.txt.")
+    parser.add_argument("--corpus", default = "cornell movie-dialogs corpus/movie_lines.txt", help = "corpus file to clean")
+    parser.add_argument("--encoding", default = "iso-8859-1", help = "encoding of --corpus")
+    parser.add_argument("--errors", default = "strict", choices = ["strict", "replace", "surrogateescape"], help = "how bytes that are not valid in --encoding are handled")
+    parser.add_argument("--dry-run", action = "store_true", help = "count the lines that would change without writing anything")
+    parser.add_argument("--output", default = None, help = "write the cleaned lines here and leave --corpus untouched")
+    arguments = parser.parse_args()
+
+    result = CleanCorpus(arguments.corpus, arguments.encoding, arguments.errors, arguments.dry_run, arguments.output)
+
+    megabytes = result['bytes'] / 1048576.0
+    seconds = max(result['seconds'], 1e-9)
+
+    print("would clean" if arguments.dry_run else "cleaned", result['changed'], "of", result['lines'], "lines,", round(megabytes, 1), "MB in",
+          round(result['seconds'], 2), "s,", round(result['lines'] / seconds), "lines/s,", round(megabytes / seconds, 1), "MB/s")
 
-    file.write(new_file_contents)
-    file.close()
+#Clean_Corpus.py